@@ -0,0 +1,23 @@
+"""Add compact progress column to jobs."""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_job_progress"
+down_revision = "0001_initial_schema"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # jobs is created outside 0001 on some deployments (db.create_all)
+    if "jobs" in sa.inspect(op.get_bind()).get_table_names():
+        op.add_column("jobs", sa.Column("progress", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    if "jobs" in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_column("jobs", "progress")
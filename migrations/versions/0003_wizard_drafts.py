@@ -0,0 +1,46 @@
+"""Add wizard_drafts table (per-step wizard state with optimistic versioning)."""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_wizard_drafts"
+down_revision = "0002_job_progress"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "wizard_drafts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "release_id",
+            sa.Integer(),
+            sa.ForeignKey("releases.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("version", sa.Integer(), nullable=False, server_default=sa.text("1")),
+        sa.Column("step", sa.Integer(), nullable=False, server_default=sa.text("3")),
+        sa.Column("file_url", sa.String(length=2000), nullable=True),
+        sa.Column("file_size", sa.BigInteger(), nullable=True),
+        sa.Column("original_filename", sa.String(length=500), nullable=True),
+        sa.Column("sha256", sa.String(length=64), nullable=True),
+        sa.Column("crc32", sa.String(length=8), nullable=True),
+        sa.Column("analysis", sa.JSON(), nullable=True),
+        sa.Column("enriched_metadata", sa.JSON(), nullable=True),
+        sa.Column("template_id", sa.Integer(), nullable=True),
+        sa.Column("options", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_wizard_drafts_release_id", "wizard_drafts", ["release_id"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_wizard_drafts_release_id", table_name="wizard_drafts")
+    op.drop_table("wizard_drafts")
@@ -0,0 +1,41 @@
+"""Add rule_revisions table (rule content history as snapshots and line deltas)."""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_rule_revisions"
+down_revision = "0003_wizard_drafts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rule_revisions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "rule_id",
+            sa.Integer(),
+            sa.ForeignKey("rules.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("revision", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(length=10), nullable=False),
+        sa.Column("base_revision", sa.Integer(), nullable=True),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("content_sha256", sa.String(length=64), nullable=False),
+        sa.Column("content_size", sa.Integer(), nullable=False),
+        sa.Column("line_count", sa.Integer(), nullable=False),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("rule_id", "revision", name="uq_rule_revisions_rule"),
+    )
+    op.create_index("ix_rule_revisions_rule_id", "rule_revisions", ["rule_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rule_revisions_rule_id", table_name="rule_revisions")
+    op.drop_table("rule_revisions")
@@ -0,0 +1,163 @@
+"""Benchmark de l'extraction de métadonnées EPUB : chemin rapide OPF vs ebooklib.
+
+Ce script compare la latence et le pic de mémoire résidente (RSS) des deux
+chemins d'extraction de MetadataExtractionService :
+- opf : EpubOpfReader (container.xml + bloc <metadata> de l'OPF uniquement)
+- ebooklib : epub.read_epub (chargement de tous les items du livre)
+
+Chaque mesure est faite dans un sous-processus dédié pour que le pic RSS
+(ru_maxrss) ne soit pas pollué par les autres mesures ni par l'import de
+l'application.
+
+Usage :
+    python scripts/benchmark_epub_metadata.py [book.epub ...]
+    python scripts/benchmark_epub_metadata.py --size-mb 300 --runs 3
+
+Sans fichier fourni, un EPUB illustré synthétique de --size-mb Mo est généré.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+# Ajouter le répertoire racine au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+IMAGE_CHUNK_MB = 4
+
+
+def build_synthetic_epub(target: Path, size_mb: int) -> Path:
+    """Génère un EPUB valide contenant des images incompressibles.
+
+    Args:
+        target: Chemin du fichier EPUB à créer.
+        size_mb: Taille approximative du livre en Mo.
+
+    Returns:
+        Chemin du fichier créé.
+    """
+    manifest = ['<item id="c1" href="c1.xhtml" media-type="application/xhtml+xml"/>']
+    images = max(1, size_mb // IMAGE_CHUNK_MB)
+    manifest += [
+        f'<item id="img{i}" href="img{i}.jpg" media-type="image/jpeg"/>' for i in range(images)
+    ]
+    opf = (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="id">'
+        '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">'
+        '<dc:identifier id="id">isbn:9781234567897</dc:identifier>'
+        "<dc:title>Benchmark Book</dc:title><dc:creator>Bench Author</dc:creator>"
+        "<dc:language>en</dc:language></metadata>"
+        f"<manifest>{''.join(manifest)}</manifest>"
+        '<spine><itemref idref="c1"/></spine></package>'
+    )
+    container = (
+        '<?xml version="1.0"?><container version="1.0" '
+        'xmlns="urn:oasis:names:tc:opendocument:xmlns:container"><rootfiles>'
+        '<rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>'
+        "</rootfiles></container>"
+    )
+    with zipfile.ZipFile(target, "w") as archive:
+        archive.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        archive.writestr("META-INF/container.xml", container)
+        archive.writestr("OEBPS/content.opf", opf, compress_type=zipfile.ZIP_DEFLATED)
+        archive.writestr(
+            "OEBPS/c1.xhtml",
+            '<html xmlns="http://www.w3.org/1999/xhtml"><body><p>x</p></body></html>',
+        )
+        for i in range(images):
+            archive.writestr(f"OEBPS/img{i}.jpg", os.urandom(IMAGE_CHUNK_MB * 1024 * 1024))
+    return target
+
+
+def measure(path: str, mode: str) -> dict[str, float]:
+    """Mesure un chemin d'extraction dans le processus courant.
+
+    Args:
+        path: Chemin du fichier EPUB.
+        mode: "opf" ou "ebooklib".
+
+    Returns:
+        Dictionnaire avec latency_ms, peak_rss_mb et rss_growth_mb (croissance
+        du pic RSS due à l'extraction seule, imports exclus).
+    """
+    from web.services.metadata.epub_opf_reader import OpfUnavailableError
+    from web.services.metadata.metadata_extraction import MetadataExtractionService
+
+    service = MetadataExtractionService()
+    if mode == "ebooklib":
+        # Forcer le repli en rendant le chemin rapide indisponible
+        def unavailable(_file_path: Path | str) -> dict[str, object]:
+            raise OpfUnavailableError("chemin rapide désactivé (benchmark)")
+
+        service._opf_reader.read = unavailable  # type: ignore[method-assign]
+
+    baseline_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    start = time.perf_counter()
+    service._extract_epub_metadata(Path(path))
+    latency_ms = (time.perf_counter() - start) * 1000
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {
+        "latency_ms": latency_ms,
+        "peak_rss_mb": peak_rss_mb,
+        "rss_growth_mb": peak_rss_mb - baseline_rss_mb,
+    }
+
+
+def run_isolated(path: Path, mode: str) -> dict[str, float]:
+    """Exécute une mesure dans un sous-processus dédié."""
+    output = subprocess.run(
+        [sys.executable, __file__, "--worker", mode, str(path)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", type=Path, help="EPUB à mesurer")
+    parser.add_argument("--size-mb", type=int, default=100, help="Taille de l'EPUB synthétique")
+    parser.add_argument("--runs", type=int, default=3, help="Mesures par chemin et par fichier")
+    parser.add_argument("--worker", choices=["opf", "ebooklib"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(str(args.files[0]), args.worker)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files = args.files or [build_synthetic_epub(Path(tmp_dir) / "bench.epub", args.size_mb)]
+
+        print("=" * 80)
+        print("BENCHMARK - Extraction métadonnées EPUB (OPF vs ebooklib)")
+        print("=" * 80)
+        for path in files:
+            size_mb = path.stat().st_size / (1024 * 1024)
+            print(f"\n{path.name} ({size_mb:.1f} Mo)")
+            for mode in ("opf", "ebooklib"):
+                results = [run_isolated(path, mode) for _ in range(args.runs)]
+                latency = statistics.median(r["latency_ms"] for r in results)
+                rss = max(r["peak_rss_mb"] for r in results)
+                growth = max(r["rss_growth_mb"] for r in results)
+                print(
+                    f"  {mode:<9} latence médiane: {latency:9.1f} ms   "
+                    f"pic RSS: {rss:8.1f} Mo (+{growth:.1f} Mo)"
+                )
+
+
+if __name__ == "__main__":
+    main()
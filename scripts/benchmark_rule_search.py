@@ -0,0 +1,109 @@
+"""Benchmark de la recherche dans les règles : LIKE '%q%' vs index inversé.
+
+Ce script crée une base SQLite en mémoire (configuration testing) remplie de
+règles synthétiques au format NFO, puis compare pour quelques requêtes :
+- like : Rule.name LIKE '%q%' OR Rule.content LIKE '%q%' (ancien filtre)
+- index : RuleSearchService.search (index à jour, extraits compris)
+
+Usage :
+    python scripts/benchmark_rule_search.py
+    python scripts/benchmark_rule_search.py --rules 200 --lines 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le répertoire racine au path Python
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from web.app import create_app  # noqa: E402
+from web.extensions import db  # noqa: E402
+from web.models import Rule  # noqa: E402
+from web.services.rule import RuleSearchService  # noqa: E402
+
+WORDS = (
+    "release", "packed", "archive", "file", "size", "nfo", "must", "include", "retail",
+    "scanned", "group", "tag", "dirname", "allowed", "mandatory", "optional", "sample",
+    "proof", "language", "english", "french", "epub", "pdf", "mobi", "cover", "source",
+)  # fmt: skip
+QUERIES = ("nfo", '"file size"', "retail epub", "proo*", "section:eBOOK mandatory", "unknownword")
+
+
+def build_rules(count: int, lines: int, seed: int = 42) -> list[Rule]:
+    """Génère des règles NFO synthétiques reproductibles."""
+    rng = random.Random(seed)  # noqa: S311 - données de test
+    sections = ("eBOOK", "TV-720p", "TV-SD", "X264", "X265", "MP3", "FLAC", "XXX")
+    rules = []
+    for index in range(count):
+        body = "\n".join(
+            f"║ {index:03d}.{line:04d} " + " ".join(rng.choices(WORDS, k=8)) + " ║"
+            for line in range(lines)
+        )
+        section = sections[index % len(sections)]
+        rules.append(
+            Rule(name=f"[{2010 + index % 13}] {section}", content=body, section=section, year=2022)
+        )
+    return rules
+
+
+def best_ms(func: object, runs: int) -> float:
+    """Retourne la meilleure durée (ms) sur runs exécutions."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()  # type: ignore[operator]
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def main() -> int:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=60, help="Nombre de règles")
+    parser.add_argument("--lines", type=int, default=2000, help="Lignes par règle")
+    parser.add_argument("--runs", type=int, default=5, help="Nombre de mesures")
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        db.session.add_all(build_rules(args.rules, args.lines))
+        db.session.commit()
+        service = RuleSearchService()
+
+        start = time.perf_counter()
+        service.index().refresh()
+        print(f"Règles : {args.rules} x {args.lines} lignes")
+        print(f"Construction de l'index : {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        for query in QUERIES:
+            term = query.strip('"*').split()[-1]
+            pattern = f"%{term}%"
+
+            def like(pattern: str = pattern) -> list[int]:
+                return list(
+                    db.session.scalars(
+                        db.select(Rule.id).where(
+                            Rule.name.like(pattern) | Rule.content.like(pattern)
+                        )
+                    )
+                )
+
+            def indexed(query: str = query) -> list[dict]:
+                return service.search(query)
+
+            print(
+                f"{query:28s} like: {best_ms(like, args.runs):8.2f} ms   "
+                f"index: {best_ms(indexed, args.runs):6.2f} ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from web.extensions import db
 from web.models import Group, Release, Rule, User
+from web.services.wizard import WizardDraftService
 
 
 def test_wizard_analyze_file_success(client, app) -> None:
@@ -57,8 +58,8 @@ def test_wizard_analyze_file_success(client, app) -> None:
     # Verify release metadata was updated
     with app.app_context():
         release = db.session.get(Release, release_id)
-        assert release.release_metadata["wizard_step"] == 5
-        assert "analysis" in release.release_metadata
+        assert WizardDraftService().effective_metadata(release)["wizard_step"] == 5
+        assert "analysis" in WizardDraftService().effective_metadata(release)
 
 
 def test_wizard_analyze_file_detects_group_and_author(client, app) -> None:
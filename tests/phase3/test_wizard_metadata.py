@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from web.extensions import db
 from web.models import Group, Release, Rule, User
+from web.services.wizard import WizardDraftService
 
 
 def test_wizard_update_metadata_success(client, app) -> None:
@@ -61,9 +62,9 @@ def test_wizard_update_metadata_success(client, app) -> None:
     # Verify release metadata was updated
     with app.app_context():
         release = db.session.get(Release, release_id)
-        assert release.release_metadata["wizard_step"] == 6
-        assert release.release_metadata["title"] == "Test Book Title"
-        assert release.release_metadata["author"] == "Test Author"
+        assert WizardDraftService().effective_metadata(release)["wizard_step"] == 6
+        assert WizardDraftService().effective_metadata(release)["title"] == "Test Book Title"
+        assert WizardDraftService().effective_metadata(release)["author"] == "Test Author"
 
 
 def test_wizard_update_metadata_merges_with_existing(client, app) -> None:
@@ -107,9 +108,9 @@ def test_wizard_update_metadata_merges_with_existing(client, app) -> None:
     # Verify metadata was merged
     with app.app_context():
         release = db.session.get(Release, release_id)
-        assert release.release_metadata["wizard_step"] == 6
-        assert release.release_metadata["existing_field"] == "existing_value"
-        assert release.release_metadata["title"] == "New Title"
+        assert WizardDraftService().effective_metadata(release)["wizard_step"] == 6
+        assert WizardDraftService().effective_metadata(release)["existing_field"] == "existing_value"
+        assert WizardDraftService().effective_metadata(release)["title"] == "New Title"
 
 
 def test_wizard_update_metadata_requires_auth(client, app) -> None:
@@ -270,7 +271,7 @@ def test_wizard_update_metadata_empty_enriched_metadata(client, app) -> None:
     # Should still update wizard_step
     with app.app_context():
         release = db.session.get(Release, release_id)
-        assert release.release_metadata["wizard_step"] == 6
+        assert WizardDraftService().effective_metadata(release)["wizard_step"] == 6
 
 
 def test_wizard_update_metadata_user_not_found(client, app) -> None:
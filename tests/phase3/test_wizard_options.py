@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from web.extensions import db
 from web.models import Group, Release, Rule, User
+from web.services.wizard import WizardDraftService
 
 
 def test_wizard_update_options_success(client, app) -> None:
@@ -62,9 +63,9 @@ def test_wizard_update_options_success(client, app) -> None:
     # Verify release config was updated
     with app.app_context():
         release = db.session.get(Release, release_id)
-        assert release.release_metadata["wizard_step"] == 8
-        assert release.config["create_nfo"] is True
-        assert release.config["zip_level"] == 6
+        assert WizardDraftService().effective_metadata(release)["wizard_step"] == 8
+        assert WizardDraftService().effective_options(release)["create_nfo"] is True
+        assert WizardDraftService().effective_options(release)["zip_level"] == 6
 
 
 def test_wizard_update_options_merges_with_existing(client, app) -> None:
@@ -109,8 +110,8 @@ def test_wizard_update_options_merges_with_existing(client, app) -> None:
     # Verify config was merged
     with app.app_context():
         release = db.session.get(Release, release_id)
-        assert release.config["existing_option"] == "existing_value"
-        assert release.config["new_option"] == "new_value"
+        assert WizardDraftService().effective_options(release)["existing_option"] == "existing_value"
+        assert WizardDraftService().effective_options(release)["new_option"] == "new_value"
 
 
 def test_wizard_update_options_requires_auth(client, app) -> None:
@@ -271,7 +272,7 @@ def test_wizard_update_options_empty_options(client, app) -> None:
     # Should still update wizard_step
     with app.app_context():
         release = db.session.get(Release, release_id)
-        assert release.release_metadata["wizard_step"] == 8
+        assert WizardDraftService().effective_metadata(release)["wizard_step"] == 8
 
 
 def test_wizard_update_options_user_not_found(client, app) -> None:
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from web.extensions import db
 from web.models import Group, Release, Rule, User
+from web.services.wizard import WizardDraftService
 
 
 def test_wizard_list_templates_success(client, app) -> None:
@@ -95,8 +96,8 @@ def test_wizard_select_template_success(client, app) -> None:
     # Verify release metadata was updated
     with app.app_context():
         release = db.session.get(Release, release_id)
-        assert release.release_metadata["wizard_step"] == 7
-        assert release.release_metadata["template_id"] == 1
+        assert WizardDraftService().effective_metadata(release)["wizard_step"] == 7
+        assert WizardDraftService().effective_metadata(release)["template_id"] == 1
 
 
 def test_wizard_select_template_none(client, app) -> None:
@@ -140,7 +141,7 @@ def test_wizard_select_template_none(client, app) -> None:
     # Verify release metadata was updated
     with app.app_context():
         release = db.session.get(Release, release_id)
-        assert release.release_metadata["wizard_step"] == 7
+        assert WizardDraftService().effective_metadata(release)["wizard_step"] == 7
 
 
 def test_wizard_templates_requires_auth(client, app) -> None:
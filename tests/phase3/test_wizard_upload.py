@@ -6,6 +6,7 @@ from io import BytesIO
 
 from web.extensions import db
 from web.models import Group, Job, Release, Rule, User
+from web.services.wizard import WizardDraftService
 
 
 def test_wizard_upload_file_local_success(client, app) -> None:
@@ -67,8 +68,8 @@ def test_wizard_upload_file_local_success(client, app) -> None:
         release = db.session.get(Release, release_id)
         assert release is not None
         assert release.file_path is not None
-        assert release.release_metadata["wizard_step"] == 4
-        assert release.release_metadata["file_size"] == len(file_content)
+        assert WizardDraftService().effective_metadata(release)["wizard_step"] == 4
+        assert WizardDraftService().effective_metadata(release)["file_size"] == len(file_content)
 
 
 def test_wizard_upload_file_remote_url_success(client, app) -> None:
@@ -120,7 +121,7 @@ def test_wizard_upload_file_remote_url_success(client, app) -> None:
     with app.app_context():
         release = db.session.get(Release, release_id)
         assert release.file_path == "https://example.com/test.epub"
-        assert release.release_metadata["wizard_step"] == 4
+        assert WizardDraftService().effective_metadata(release)["wizard_step"] == 4
 
 
 def test_wizard_upload_file_requires_auth(client, app) -> None:
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from web.extensions import db
-from web.models import Release, User
+from web.models import Job, Release, User
 
 
 def test_nfofix_action(client, auth_headers) -> None:
@@ -108,7 +108,13 @@ def test_repack_action(client, auth_headers) -> None:
 
     response = client.post(
         f"/api/releases/{release_id}/actions/repack",
-        json={"zip_size": 100},
+        json={
+            "zip_size": 100,
+            "files": [{"path": "/etc/passwd", "name": "passwd"}],
+            "output_path": "/tmp",
+            "name": "Stolen",
+            "nfo_content": "NFO",
+        },
         headers={"Authorization": f"Bearer {token}"},
     )
 
@@ -117,6 +123,12 @@ def test_repack_action(client, auth_headers) -> None:
     assert "message" in data
     assert "job_id" in data
 
+    # Package inputs are derived server-side: client paths never reach the job
+    with client.application.app_context():
+        job = db.session.get(Job, data["job_id"])
+        assert job.config_json == {"action": "repack", "zip_size": 100}
+        assert db.session.get(Release, release_id).config == {"zip_size": 50}
+
 
 def test_dirfix_action(client, auth_headers) -> None:
     """Test DIRFIX action on a release."""
@@ -37,6 +37,7 @@ def test_download_rule_scene_not_english() -> None:
     
     mock_response = Mock()
     mock_response.text = "Test content"
+    mock_response.content = b"Test content"
     mock_response.raise_for_status = Mock()
     
     with patch.object(service.session, "get", return_value=mock_response):
@@ -112,6 +113,7 @@ def test_download_rule_by_url_no_match() -> None:
     
     mock_response = Mock()
     mock_response.text = "Test content"
+    mock_response.content = b"Test content"
     mock_response.raise_for_status = Mock()
     
     with patch.object(service.session, "get", return_value=mock_response):
@@ -0,0 +1,93 @@
+"""Tests unitaires pour le formatage des noms de releases par lot.
+
+Ces tests vérifient ReleaseFormatterService.format_many (résultats
+identiques à format_release_name, erreurs isolées par élément) et le
+tableau JSON streamé de POST /api/formatter/batch.
+"""
+
+from __future__ import annotations
+
+from flask_jwt_extended import create_access_token
+
+from web.extensions import db
+from web.models import User
+from web.services.formatter import ReleaseFormatterService
+
+ITEMS = [
+    {"title": "Test Book & More!", "group": "testgroup", "date": "20250124"},
+    {"title": "  Über  -- Café  Stories ", "group": "Team X", "date": "20250124"},
+    {"title": "T" * 300, "group": "GRP", "date": "20250125"},
+]
+
+
+class TestFormatMany:
+    """Tests unitaires pour ReleaseFormatterService.format_many."""
+
+    def test_format_many_matches_single_item(self) -> None:
+        """Test noms identiques à format_release_name, dans l'ordre des éléments."""
+        service = ReleaseFormatterService()
+
+        results = list(service.format_many(ITEMS))
+
+        assert [result["index"] for result in results] == [0, 1, 2]
+        assert [result["release_name"] for result in results] == [
+            service.format_release_name(item["title"], item["group"], item["date"])
+            for item in ITEMS
+        ]
+        assert results[0]["release_name"] == "Test-Book-More-TESTGROUP-20250124"
+        assert results[1]["release_name"] == "ber-Caf-Stories-TEAMX-20250124"
+        assert len(results[2]["release_name"]) == ReleaseFormatterService.MAX_RELEASE_NAME_LENGTH
+
+    def test_format_many_isolates_errors(self) -> None:
+        """Test élément invalide signalé sans interrompre le lot, métadonnées normalisées."""
+        items = [
+            {"title": "Book", "group": "", "date": "20250124"},
+            {"title": "Book", "group": "GRP", "date": "2025"},
+            "not an item",
+            {"title": "Book", "group": "GRP", "date": "20250124", "metadata": {"year": " 2020 "}},
+        ]
+
+        results = list(ReleaseFormatterService().format_many(items))
+
+        assert "error" in results[0]
+        assert "Date invalide" in results[1]["error"]
+        assert "error" in results[2]
+        assert results[3] == {
+            "index": 3,
+            "release_name": "Book-GRP-20250124",
+            "metadata": {"year": 2020},
+        }
+
+
+class TestFormatterBatchEndpoint:
+    """Tests de POST /api/formatter/batch."""
+
+    def _headers(self) -> dict[str, str]:
+        user = User(username="formatter", email="formatter@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        return {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}
+
+    def test_batch_streams_json_array(self, app, client) -> None:
+        """Test tableau JSON streamé, un élément par entrée."""
+        headers = self._headers()
+
+        response = client.post("/api/formatter/batch", json={"items": ITEMS}, headers=headers)
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        body = response.get_json()
+        assert [result["index"] for result in body] == [0, 1, 2]
+        assert body[0]["release_name"] == "Test-Book-More-TESTGROUP-20250124"
+
+    def test_batch_rejects_invalid_requests(self, app, client) -> None:
+        """Test liste absente ou trop longue : 400."""
+        headers = self._headers()
+        app.config["FORMATTER_BATCH_MAX_ITEMS"] = 2
+
+        missing = client.post("/api/formatter/batch", json={}, headers=headers)
+        too_many = client.post("/api/formatter/batch", json={"items": ITEMS}, headers=headers)
+
+        assert missing.status_code == 400
+        assert too_many.status_code == 400
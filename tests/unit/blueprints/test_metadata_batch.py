@@ -0,0 +1,147 @@
+"""Tests unitaires pour l'extraction de métadonnées par lot.
+
+Ces tests vérifient MetadataExtractionService.extract_many (pool de
+processus, isolation des erreurs par fichier) et l'endpoint NDJSON
+POST /api/metadata/extract-batch.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+from flask_jwt_extended import create_access_token
+
+from web.extensions import db
+from web.models import Release, User
+from web.services.metadata import MetadataExtractionService, metadata_extraction
+
+_extract_one = metadata_extraction._extract_one
+
+CONTAINER_XML = (
+    '<?xml version="1.0"?><container version="1.0" '
+    'xmlns="urn:oasis:names:tc:opendocument:xmlns:container"><rootfiles>'
+    '<rootfile full-path="content.opf" media-type="application/oebps-package+xml"/>'
+    "</rootfiles></container>"
+)
+
+
+def _write_epub(path: Path, title: str) -> Path:
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("mimetype", "application/epub+zip")
+        archive.writestr("META-INF/container.xml", CONTAINER_XML)
+        archive.writestr(
+            "content.opf",
+            '<package xmlns="http://www.idpf.org/2007/opf">'
+            '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">'
+            f"<dc:title>{title}</dc:title></metadata></package>",
+        )
+    return path
+
+
+def _crashing_extract_one(path: str, *options: bool) -> dict:
+    """Worker qui plante (sortie brutale du processus) sur crash.epub."""
+    if path.endswith("crash.epub"):
+        os._exit(1)
+    return _extract_one(path, *options)
+
+
+class TestExtractMany:
+    """Tests unitaires pour MetadataExtractionService.extract_many."""
+
+    def test_extract_many_isolates_errors(self, tmp_path: Path) -> None:
+        """Test qu'un fichier corrompu n'interrompt pas le lot (pool de processus)."""
+        paths = [_write_epub(tmp_path / f"book{i}.epub", f"Book {i}") for i in range(4)]
+        corrupt = tmp_path / "corrupt.pdf"
+        corrupt.write_bytes(b"%PDF-1.4 garbage")
+
+        results = list(MetadataExtractionService().extract_many([*paths, corrupt], workers=2))
+
+        by_path = {result["path"]: result for result in results}
+        assert len(results) == 5
+        assert by_path[str(corrupt)]["success"] is False
+        assert by_path[str(paths[2])]["metadata"]["title"] == "Book 2"
+        assert all(result["elapsed_ms"] is not None for result in results)
+
+    def test_extract_many_survives_worker_crash(self, tmp_path: Path) -> None:
+        """Test pool recréé après un worker planté : tous les fichiers ont un résultat."""
+        crash = _write_epub(tmp_path / "crash.epub", "Crash")
+        paths = [_write_epub(tmp_path / f"book{i}.epub", f"Book {i}") for i in range(12)]
+
+        with patch.object(metadata_extraction, "_extract_one", _crashing_extract_one):
+            results = list(
+                MetadataExtractionService().extract_many(
+                    [crash, *paths], workers=2, calculate_checksums=False
+                )
+            )
+
+        by_path = {result["path"]: result for result in results}
+        assert len(results) == 13
+        assert by_path[str(crash)]["success"] is False
+        assert by_path[str(paths[-1])]["metadata"]["title"] == "Book 11"
+
+    def test_extract_many_sequential(self, tmp_path: Path) -> None:
+        """Test exécution sans pool (workers=1) dans l'ordre des chemins."""
+        paths = [_write_epub(tmp_path / f"book{i}.epub", f"Book {i}") for i in range(2)]
+
+        results = list(
+            MetadataExtractionService().extract_many(paths, workers=1, calculate_checksums=False)
+        )
+
+        assert [result["metadata"]["title"] for result in results] == ["Book 0", "Book 1"]
+        assert "checksums" not in results[0]["metadata"]
+
+
+class TestExtractBatchEndpoint:
+    """Tests de l'endpoint POST /api/metadata/extract-batch."""
+
+    def _login(self, app) -> tuple[dict[str, str], int]:
+        user = User(username="batchuser", email="batch@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        return {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}, user.id
+
+    def test_extract_batch_streams_ndjson(self, app, client, tmp_path: Path) -> None:
+        """Test flux NDJSON : releases, chemins autorisés et refusés, résumé final."""
+        headers, user_id = self._login(app)
+        release = Release(
+            user_id=user_id,
+            release_type="EBOOK",
+            file_path=str(_write_epub(tmp_path / "release.epub", "Release Book")),
+        )
+        db.session.add(release)
+        db.session.commit()
+        allowed = _write_epub(tmp_path / "raw.epub", "Raw Book")
+        app.config["METADATA_BATCH_ROOTS"] = [str(tmp_path)]
+
+        response = client.post(
+            "/api/metadata/extract-batch",
+            json={
+                "release_ids": [release.id, 99999],
+                "paths": [str(allowed), "/etc/passwd"],
+                "workers": 2,
+            },
+            headers=headers,
+        )
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        summary = lines[-1]["summary"]
+        assert summary == {"files": 2, "succeeded": 2, "failed": 0, "rejected": 2}
+        titles = {
+            line["metadata"]["title"]: line["release_ids"] for line in lines if "metadata" in line
+        }
+        assert titles == {"Release Book": [release.id], "Raw Book": []}
+
+    def test_extract_batch_requires_targets(self, app, client) -> None:
+        """Test requête invalide sans release_ids ni paths."""
+        headers, _ = self._login(app)
+
+        response = client.post("/api/metadata/extract-batch", json={}, headers=headers)
+
+        assert response.status_code == 400
@@ -0,0 +1,170 @@
+"""Tests unitaires pour l'inspection d'archives de releases.
+
+Ces tests vérifient ArchiveIndexService (listing depuis le répertoire
+central, cache par identité de fichier, lecture par plage d'un membre) et
+les endpoints GET /api/releases/<id>/archive et /archive/member.
+"""
+
+from __future__ import annotations
+
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from web.extensions import db
+from web.models import Release, User
+from web.services.archive import ArchiveFormatError, ArchiveIndexService
+
+CHAPTER = b"".join(f"Chapter line {i}\n".encode() for i in range(20000))
+COVER = os.urandom(50000)
+
+
+def _write_archive(path: Path) -> Path:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("mimetype", "application/epub+zip", zipfile.ZIP_STORED)
+        archive.writestr("OEBPS/", b"")
+        archive.writestr("OEBPS/chapter.xhtml", CHAPTER)
+        archive.writestr("OEBPS/cover.jpg", COVER, zipfile.ZIP_STORED)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def _clear_index_cache():
+    ArchiveIndexService.clear_cache()
+    yield
+    ArchiveIndexService.clear_cache()
+
+
+class TestArchiveIndexService:
+    """Tests unitaires pour ArchiveIndexService."""
+
+    def test_list_members_matches_zipfile(self, tmp_path: Path) -> None:
+        """Test listing identique à zipfile, lu depuis la fin du fichier seulement."""
+        path = _write_archive(tmp_path / "book.epub")
+
+        listing = ArchiveIndexService().list_members(path)
+
+        with zipfile.ZipFile(path) as archive:
+            expected = {info.filename: info for info in archive.infolist()}
+        assert listing["count"] == 4
+        assert listing["cached"] is False
+        assert listing["bytes_read"] < path.stat().st_size / 2
+        for member in listing["members"]:
+            info = expected[member["name"]]
+            assert member["size"] == info.file_size
+            assert member["crc32"] == f"{info.CRC:08x}"
+        methods = {member["name"]: member["method"] for member in listing["members"]}
+        assert methods["OEBPS/chapter.xhtml"] == "deflated"
+        assert methods["OEBPS/cover.jpg"] == "stored"
+
+    def test_listing_cached_per_file_identity(self, tmp_path: Path) -> None:
+        """Test cache réutilisé tant que le fichier est inchangé, invalidé sinon."""
+        path = _write_archive(tmp_path / "book.epub")
+        service = ArchiveIndexService()
+
+        service.list_members(path)
+        assert service.list_members(path)["cached"] is True
+
+        with zipfile.ZipFile(path, "a") as archive:
+            archive.writestr("extra.txt", b"extra")
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1))
+
+        listing = service.list_members(path)
+        assert listing["cached"] is False
+        assert listing["count"] == 5
+
+    @pytest.mark.parametrize("name", ["OEBPS/chapter.xhtml", "OEBPS/cover.jpg"])
+    def test_iter_member_range(self, tmp_path: Path, name: str) -> None:
+        """Test lecture d'une plage d'un membre compressé ou stocké."""
+        path = _write_archive(tmp_path / "book.epub")
+        service = ArchiveIndexService()
+        member = service.get_member(path, name)
+        content = CHAPTER if name.endswith("xhtml") else COVER
+
+        assert b"".join(service.iter_member_range(path, member, 0, member.file_size)) == content
+        assert b"".join(service.iter_member_range(path, member, 12345, 40000)) == (
+            content[12345:40000]
+        )
+
+    def test_not_an_archive(self, tmp_path: Path) -> None:
+        """Test fichier non ZIP."""
+        path = tmp_path / "book.pdf"
+        path.write_bytes(b"%PDF-1.4 not a zip")
+
+        with pytest.raises(ArchiveFormatError):
+            ArchiveIndexService().list_members(path)
+
+
+class TestReleaseArchiveEndpoints:
+    """Tests des endpoints GET /api/releases/<id>/archive[/member]."""
+
+    def _release(self, tmp_path: Path, username: str = "archiveuser") -> tuple[dict, int]:
+        user = User(username=username, email=f"{username}@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        release = Release(
+            user_id=user.id,
+            release_type="EBOOK",
+            file_path=str(_write_archive(tmp_path / "release.epub")),
+        )
+        db.session.add(release)
+        db.session.commit()
+        return {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}, release.id
+
+    def test_list_archive(self, app, client, tmp_path: Path) -> None:
+        """Test listing JSON des membres d'une release."""
+        headers, release_id = self._release(tmp_path)
+
+        response = client.get(f"/api/releases/{release_id}/archive", headers=headers)
+
+        assert response.status_code == 200
+        names = [member["name"] for member in response.get_json()["archive"]["members"]]
+        assert names == ["mimetype", "OEBPS/", "OEBPS/chapter.xhtml", "OEBPS/cover.jpg"]
+
+    def test_member_range(self, app, client, tmp_path: Path) -> None:
+        """Test service partiel (206) d'un membre compressé."""
+        headers, release_id = self._release(tmp_path)
+
+        response = client.get(
+            f"/api/releases/{release_id}/archive/member",
+            query_string={"name": "OEBPS/chapter.xhtml"},
+            headers={**headers, "Range": "bytes=100-199"},
+        )
+
+        assert response.status_code == 206
+        assert response.data == CHAPTER[100:200]
+        assert response.headers["Content-Range"] == f"bytes 100-199/{len(CHAPTER)}"
+
+    def test_member_full_and_errors(self, app, client, tmp_path: Path) -> None:
+        """Test membre complet, membre absent et plage hors limites."""
+        headers, release_id = self._release(tmp_path)
+        url = f"/api/releases/{release_id}/archive/member"
+
+        full = client.get(url, query_string={"name": "OEBPS/cover.jpg"}, headers=headers)
+        missing = client.get(url, query_string={"name": "nope"}, headers=headers)
+        unsatisfiable = client.get(
+            url,
+            query_string={"name": "mimetype"},
+            headers={**headers, "Range": "bytes=5000-6000"},
+        )
+
+        assert full.status_code == 200
+        assert full.data == COVER
+        assert full.mimetype == "image/jpeg"
+        assert missing.status_code == 404
+        assert unsatisfiable.status_code == 416
+
+    def test_archive_permission_denied(self, app, client, tmp_path: Path) -> None:
+        """Test accès refusé à l'archive d'une release d'un autre utilisateur."""
+        _, release_id = self._release(tmp_path)
+        other_dir = tmp_path / "other"
+        other_dir.mkdir()
+        other_headers, _ = self._release(other_dir, username="otheruser")
+
+        response = client.get(f"/api/releases/{release_id}/archive", headers=other_headers)
+
+        assert response.status_code == 403
@@ -0,0 +1,123 @@
+"""Tests unitaires pour l'état des drafts du wizard (table wizard_drafts).
+
+Ces tests vérifient que chaque étape n'écrit que ses colonnes du draft,
+que la version du draft protège contre les sauvegardes concurrentes
+(If-Match, 409) et que la finalisation matérialise release_metadata.
+"""
+
+from __future__ import annotations
+
+from flask_jwt_extended import create_access_token
+
+from web.extensions import db
+from web.models import Group, Job, Release, Rule, User, WizardDraft
+
+
+def _create_draft(client) -> tuple[dict[str, str], int]:
+    user = User(username="drafter", email="drafter@test.com")
+    user.set_password("password")
+    db.session.add_all([user, Rule(name="[2022] eBOOK", content="rule", section="eBOOK")])
+    db.session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}
+    response = client.post(
+        "/api/wizard/draft",
+        json={"group": "GRP", "release_type": "EBOOK", "rule_id": 1},
+        headers=headers,
+    )
+    return headers, response.get_json()["release_id"]
+
+
+def _draft(release_id: int) -> WizardDraft:
+    db.session.expire_all()
+    return WizardDraft.query.filter_by(release_id=release_id).one()
+
+
+class TestWizardDrafts:
+    """Tests des étapes du wizard adossées à WizardDraft."""
+
+    def test_steps_write_only_their_columns(self, app, client) -> None:
+        """Test étapes 6-8 : colonnes du draft, release_metadata et config inchangés."""
+        headers, release_id = _create_draft(client)
+
+        client.post(
+            f"/api/wizard/{release_id}/metadata",
+            json={"enriched_metadata": {"title": "Title"}},
+            headers=headers,
+        )
+        client.post(
+            f"/api/wizard/{release_id}/metadata",
+            json={"enriched_metadata": {"author": "Author"}},
+            headers=headers,
+        )
+        client.post(f"/api/wizard/{release_id}/templates", json={"template_id": 2}, headers=headers)
+        response = client.post(
+            f"/api/wizard/{release_id}/options",
+            json={"options": {"zip_level": 6}},
+            headers=headers,
+        )
+
+        draft = _draft(release_id)
+        release = db.session.get(Release, release_id)
+        assert response.get_json()["draft_version"] == draft.version == 5
+        assert draft.step == 8
+        assert draft.enriched_metadata == {"title": "Title", "author": "Author"}
+        assert draft.template_id == 2
+        assert draft.options == {"zip_level": 6}
+        assert release.release_metadata is None
+        assert release.config is None
+
+    def test_stale_version_is_rejected(self, app, client) -> None:
+        """Test If-Match périmé : 409 avec la version courante, rien n'est écrasé."""
+        headers, release_id = _create_draft(client)
+        url = f"/api/wizard/{release_id}/templates"
+
+        first = client.post(url, json={"template_id": 1}, headers={**headers, "If-Match": '"1"'})
+        stale = client.post(url, json={"template_id": 9}, headers={**headers, "If-Match": '"1"'})
+        invalid = client.post(url, json={"template_id": 9, "draft_version": "x"}, headers=headers)
+
+        assert first.status_code == 200
+        assert first.get_json()["draft_version"] == 2
+        assert stale.status_code == 409
+        assert stale.get_json()["draft_version"] == 2
+        assert invalid.status_code == 400
+        assert _draft(release_id).template_id == 1
+
+    def test_finalize_materializes_draft(self, app, client) -> None:
+        """Test finalisation : release_metadata et config écrits une fois, draft supprimé."""
+        headers, release_id = _create_draft(client)
+        client.post(
+            f"/api/wizard/{release_id}/metadata",
+            json={"enriched_metadata": {"title": "Title"}},
+            headers=headers,
+        )
+        client.post(
+            f"/api/wizard/{release_id}/options",
+            json={"options": {"create_nfo": True}},
+            headers=headers,
+        )
+        state = client.get(f"/api/wizard/{release_id}/draft", headers=headers).get_json()
+        assert state["draft"]["version"] == 3
+        assert state["metadata"]["title"] == "Title"
+
+        stale = client.post(
+            f"/api/wizard/{release_id}/finalize",
+            json={"destination_id": 4, "draft_version": 2},
+            headers=headers,
+        )
+        response = client.post(
+            f"/api/wizard/{release_id}/finalize",
+            json={"destination_id": 4, "draft_version": 3},
+            headers=headers,
+        )
+
+        release = db.session.get(Release, release_id)
+        assert stale.status_code == 409
+        assert response.status_code == 200
+        assert release.status == "ready"
+        assert release.release_metadata["title"] == "Title"
+        assert release.release_metadata["wizard_step"] == 9
+        assert release.release_metadata["destination_id"] == 4
+        assert release.config == {"create_nfo": True}
+        assert WizardDraft.query.filter_by(release_id=release_id).count() == 0
+        assert db.session.get(Job, response.get_json()["job_id"]).status == "ready"
+        assert Group.query.filter_by(name="GRP").count() == 1
@@ -0,0 +1,122 @@
+"""Tests unitaires pour ArchiveVerifierService (vérification parallèle).
+
+Ces tests vérifient la lecture du répertoire central, le mode "quick"
+(en-têtes uniquement) et le mode "full" (CRC-32 par membre, séquentiel,
+pool de threads et pool de processus).
+"""
+
+from __future__ import annotations
+
+import os
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from web.services.archive import ArchiveVerifierService
+from web.services.packaging import DiskSpaceLedger, PackagingService
+
+
+def _write_zip(path: Path, members: int = 4, size: int = 50_000) -> Path:
+    with zipfile.ZipFile(path, "w") as archive:
+        for index in range(members):
+            method = zipfile.ZIP_DEFLATED if index % 2 else zipfile.ZIP_STORED
+            archive.writestr(f"part{index}.bin", os.urandom(size // 2) * 2, compress_type=method)
+    return path
+
+
+def _flip_byte_in_member(path: Path, name: str) -> None:
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo(name)
+    data = bytearray(path.read_bytes())
+    data_offset = info.header_offset + 30 + len(info.filename.encode()) + len(info.extra)
+    data[data_offset + info.compress_size // 2] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+
+class TestArchiveVerifierService:
+    """Tests unitaires pour ArchiveVerifierService."""
+
+    def test_verify_valid_archive(self, tmp_path: Path) -> None:
+        """Test archive valide en mode full et quick."""
+        path = _write_zip(tmp_path / "ok.zip")
+
+        full = ArchiveVerifierService().verify(path)
+        quick = ArchiveVerifierService().verify(path, mode="quick")
+
+        assert full["valid"] is True
+        assert full["members"] == 4
+        assert full["bytes_verified"] > 0
+        assert quick["valid"] is True
+        assert quick["bytes_verified"] == 0
+
+    def test_full_mode_detects_corrupted_member(self, tmp_path: Path) -> None:
+        """Test CRC incorrect détecté en mode full, invisible en mode quick."""
+        path = _write_zip(tmp_path / "bad.zip")
+        _flip_byte_in_member(path, "part2.bin")
+
+        full = ArchiveVerifierService().verify(path)
+        quick = ArchiveVerifierService().verify(path, mode="quick")
+
+        assert full["valid"] is False
+        assert [error["name"] for error in full["errors"]] == ["part2.bin"]
+        assert "CRC-32" in full["errors"][0]["error"]
+        assert quick["valid"] is True
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_parallel_verification(self, tmp_path: Path, executor: str) -> None:
+        """Test répartition des membres sur un pool (threads ou processus)."""
+        path = _write_zip(tmp_path / "bad.zip", members=8)
+        _flip_byte_in_member(path, "part3.bin")
+
+        with patch("web.services.archive.verifier.PARALLEL_MIN_BYTES", 0):
+            report = ArchiveVerifierService(workers=4, executor=executor).verify(path)
+
+        assert report["members"] == 8
+        assert [error["name"] for error in report["errors"]] == ["part3.bin"]
+
+    def test_quick_mode_detects_broken_local_header(self, tmp_path: Path) -> None:
+        """Test en-tête local invalide détecté en mode quick."""
+        path = _write_zip(tmp_path / "bad.zip")
+        with zipfile.ZipFile(path) as archive:
+            offset = archive.getinfo("part1.bin").header_offset
+        data = bytearray(path.read_bytes())
+        data[offset : offset + 4] = b"XXXX"
+        path.write_bytes(bytes(data))
+
+        report = ArchiveVerifierService().verify(path, mode="quick")
+
+        assert report["valid"] is False
+        assert report["errors"][0]["name"] == "part1.bin"
+
+    def test_verify_not_a_zip(self, tmp_path: Path) -> None:
+        """Test fichier sans répertoire central."""
+        path = tmp_path / "garbage.zip"
+        path.write_bytes(b"not a zip" * 100)
+
+        report = ArchiveVerifierService().verify(path)
+
+        assert report["valid"] is False
+        assert report["errors"][0]["name"] is None
+
+    def test_corrupted_package_is_rejected_and_not_cached(self, tmp_path: Path) -> None:
+        """Test packaging en échec si la vérification échoue : ni ZIP ni manifeste."""
+        source = tmp_path / "book.epub"
+        source.write_bytes(os.urandom(1000))
+        output = tmp_path / "out"
+        service = PackagingService(
+            ledger=DiskSpaceLedger(tmp_path / "ledger.json", min_free_bytes=0)
+        )
+        invalid = {"valid": False, "errors": [{"name": "book.epub", "error": "CRC-32"}]}
+
+        with (
+            patch.object(service.verifier, "verify", return_value=invalid),
+            pytest.raises(ValueError, match="invalide"),
+        ):
+            service.package_release(
+                {"name": "Rel-GRP", "files": [{"path": str(source)}], "nfo_content": "NFO"},
+                output,
+            )
+
+        assert list(output.glob("*.zip*")) == []
@@ -0,0 +1,252 @@
+"""Tests unitaires pour le stockage dédoublonné des uploads.
+
+Ces tests vérifient BlobStoreService (écriture hachée, dédoublonnage,
+court-circuit sur SHA-256 annoncé, comptage de références, garbage
+collector) et son utilisation par POST /api/wizard/<id>/upload.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import time
+import zlib
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from web.extensions import db
+from web.models import Release, User
+from web.services.storage import BlobStoreService, BlobTooLargeError
+from web.services.wizard import WizardDraftService
+
+CONTENT = b"EPUB content " * 1000
+SHA256 = hashlib.sha256(CONTENT).hexdigest()
+
+
+class TestBlobStoreService:
+    """Tests unitaires pour BlobStoreService."""
+
+    def test_store_deduplicates_content(self, tmp_path: Path) -> None:
+        """Test qu'un même contenu n'est stocké qu'une fois, shardé par SHA-256."""
+        store = BlobStoreService(tmp_path / "blobs")
+
+        first = store.store(io.BytesIO(CONTENT), suffix=".epub")
+        second = store.store(io.BytesIO(CONTENT), suffix=".epub")
+
+        assert first["sha256"] == SHA256
+        assert first["deduplicated"] is False
+        assert second["deduplicated"] is True
+        assert first["path"] == second["path"]
+        assert first["path"].relative_to(store.objects_dir).parts[:2] == (SHA256[:2], SHA256[2:4])
+        assert first["path"].read_bytes() == CONTENT
+        assert list(store.tmp_dir.iterdir()) == []
+
+    def test_expected_sha256_short_circuits_write(self, tmp_path: Path) -> None:
+        """Test hachage seul, sans fichier temporaire, quand le blob annoncé existe."""
+        store = BlobStoreService(tmp_path / "blobs")
+        store.store(io.BytesIO(CONTENT), suffix=".epub")
+
+        writer = store.open_writer(".epub", expected_sha256=SHA256.upper())
+        writer.write(CONTENT)
+
+        assert writer.discard is True
+        assert list(store.tmp_dir.iterdir()) == []
+        result = writer.commit()
+        assert result["deduplicated"] is True
+        assert result["size"] == len(CONTENT)
+        assert result["crc32"] == f"{zlib.crc32(CONTENT):08x}"
+        with pytest.raises(ValueError, match="SHA-256"):
+            store.store(io.BytesIO(b"other"), suffix=".epub", expected_sha256=SHA256)
+
+    def test_writer_enforces_max_bytes(self, tmp_path: Path) -> None:
+        """Test limite de taille appliquée pendant l'écriture."""
+        store = BlobStoreService(tmp_path / "blobs")
+        writer = store.open_writer(max_bytes=10)
+        writer.write(b"12345")
+
+        with pytest.raises(BlobTooLargeError):
+            writer.write(b"123456")
+        writer.abort()
+
+        assert list(store.tmp_dir.iterdir()) == []
+
+    def test_mismatched_sha256_leaves_nothing(self, tmp_path: Path) -> None:
+        """Test rejet d'un SHA-256 annoncé incorrect, temporaire supprimé."""
+        store = BlobStoreService(tmp_path / "blobs")
+
+        with pytest.raises(ValueError, match="SHA-256"):
+            store.store(io.BytesIO(CONTENT), expected_sha256="0" * 64)
+
+        assert list(store.tmp_dir.iterdir()) == []
+        assert list(store.objects_dir.iterdir()) == []
+
+    def test_collect_garbage_keeps_referenced_and_recent(self, app, tmp_path: Path) -> None:
+        """Test GC : blobs référencés et récents conservés, orphelins anciens supprimés."""
+        store = BlobStoreService(tmp_path / "blobs", gc_grace_seconds=60)
+        referenced = store.store(io.BytesIO(CONTENT), suffix=".epub")["path"]
+        orphan = store.store(io.BytesIO(b"orphan" * 100), suffix=".pdf")["path"]
+        recent = store.store(io.BytesIO(b"recent"), suffix=".pdf")["path"]
+        stale_temp = store.tmp_dir / "abandoned.part"
+        stale_temp.write_bytes(b"partial")
+        old = time.time() - 3600
+        for path in (referenced, orphan, stale_temp):
+            os.utime(path, (old, old))
+
+        user = User(username="blobowner", email="blob@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        for _ in range(2):
+            db.session.add(
+                Release(user_id=user.id, release_type="EBOOK", file_path=str(referenced))
+            )
+        db.session.commit()
+
+        assert store.refcount(referenced) == 2
+        result = store.collect_garbage()
+
+        assert result == {"scanned": 3, "removed": 1, "bytes_reclaimed": 600 + len(b"partial")}
+        assert referenced.exists()
+        assert recent.exists()
+        assert not orphan.exists()
+        assert not stale_temp.exists()
+
+    def test_reference_counts_escapes_wildcards(self, app, tmp_path: Path) -> None:
+        """Test comptage : « _ » et « % » du chemin du store pris littéralement."""
+        store = BlobStoreService(tmp_path / "blob_store%", gc_grace_seconds=60)
+        blob = store.store(io.BytesIO(CONTENT), suffix=".epub")["path"]
+        lookalike = tmp_path / "blobXstore-other" / "objects" / "book.epub"
+        user = User(username="blobcounter", email="count@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        db.session.add_all(
+            Release(user_id=user.id, release_type="EBOOK", file_path=str(path))
+            for path in (blob, lookalike)
+        )
+        db.session.commit()
+
+        assert store.reference_counts() == {str(blob): 1}
+
+
+class TestWizardUploadDeduplication:
+    """Tests de POST /api/wizard/<id>/upload avec le store dédoublonné."""
+
+    def _draft(self, app, tmp_path: Path) -> tuple[dict[str, str], list[Release]]:
+        app.config["UPLOAD_BLOB_ROOT"] = str(tmp_path / "blobs")
+        user = User(username="uploader", email="uploader@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        releases = [
+            Release(user_id=user.id, release_type="EBOOK", status="draft") for _ in range(2)
+        ]
+        db.session.add_all(releases)
+        db.session.commit()
+        return {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}, releases
+
+    def test_same_file_for_two_drafts_shares_blob(self, app, client, tmp_path: Path) -> None:
+        """Test que deux drafts uploadant le même fichier partagent un seul blob."""
+        headers, releases = self._draft(app, tmp_path)
+
+        responses = [
+            client.post(
+                f"/api/wizard/{release.id}/upload",
+                data={"file": (io.BytesIO(CONTENT), "GRP-Author-Title-EPUB.epub")},
+                headers=headers,
+                content_type="multipart/form-data",
+            ).get_json()
+            for release in releases
+        ]
+
+        assert [response["deduplicated"] for response in responses] == [False, True]
+        assert responses[0]["file_path"] == responses[1]["file_path"]
+        assert responses[0]["sha256"] == SHA256
+        assert BlobStoreService(tmp_path / "blobs").refcount(responses[0]["file_path"]) == 2
+        release = db.session.get(Release, releases[0].id)
+        metadata = WizardDraftService().effective_metadata(release)
+        assert metadata["original_filename"] == "GRP-Author-Title-EPUB.epub"
+
+    def test_upload_streams_into_store(self, app, client, tmp_path: Path) -> None:
+        """Test corps multipart écrit directement dans le store (pas de spool Werkzeug)."""
+        headers, releases = self._draft(app, tmp_path)
+
+        with patch(
+            "werkzeug.wrappers.request.default_stream_factory",
+            side_effect=AssertionError("spool Werkzeug inattendu"),
+        ):
+            response = client.post(
+                f"/api/wizard/{releases[0].id}/upload",
+                data={"file": (io.BytesIO(CONTENT), "book.epub"), "sha256": SHA256},
+                headers=headers,
+                content_type="multipart/form-data",
+            )
+
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data["file_size"] == len(CONTENT)
+        assert data["crc32"] == f"{zlib.crc32(CONTENT):08x}"
+        assert Path(data["file_path"]).read_bytes() == CONTENT
+
+    def test_upload_limit_enforced_while_streaming(self, app, client, tmp_path: Path) -> None:
+        """Test 413 au-delà de UPLOAD_MAX_BYTES, aucun fichier conservé."""
+        headers, releases = self._draft(app, tmp_path)
+        app.config["UPLOAD_MAX_BYTES"] = 1000
+
+        response = client.post(
+            f"/api/wizard/{releases[0].id}/upload",
+            data={"file": (io.BytesIO(CONTENT), "book.epub")},
+            headers=headers,
+            content_type="multipart/form-data",
+        )
+
+        store = BlobStoreService(tmp_path / "blobs")
+        assert response.status_code == 413
+        assert list(store.tmp_dir.iterdir()) == []
+        assert list(store.objects_dir.iterdir()) == []
+
+    def test_upload_limit_raised_for_multipart_only(self, app, client, tmp_path: Path) -> None:
+        """Test corps JSON borné par MAX_CONTENT_LENGTH, multipart par UPLOAD_MAX_BYTES."""
+        headers, releases = self._draft(app, tmp_path)
+        app.config["MAX_CONTENT_LENGTH"] = len(CONTENT) // 2
+
+        json_response = client.post(
+            f"/api/wizard/{releases[0].id}/upload",
+            json={"file_url": "https://example.com/book.epub", "padding": "x" * len(CONTENT)},
+            headers=headers,
+        )
+        multipart_response = client.post(
+            f"/api/wizard/{releases[0].id}/upload",
+            data={"file": (io.BytesIO(CONTENT), "book.epub")},
+            headers=headers,
+            content_type="multipart/form-data",
+        )
+
+        assert json_response.status_code == 413
+        assert multipart_response.status_code == 200
+
+    def test_file_url_clears_previous_upload(self, app, client, tmp_path: Path) -> None:
+        """Test file_url après un upload local : taille, nom et empreintes effacés."""
+        headers, releases = self._draft(app, tmp_path)
+        client.post(
+            f"/api/wizard/{releases[0].id}/upload",
+            data={"file": (io.BytesIO(CONTENT), "book.epub")},
+            headers=headers,
+            content_type="multipart/form-data",
+        )
+
+        response = client.post(
+            f"/api/wizard/{releases[0].id}/upload",
+            json={"file_url": "http://93.184.216.34/other.epub"},
+            headers=headers,
+        )
+
+        assert response.status_code == 200
+        metadata = WizardDraftService().effective_metadata(db.session.get(Release, releases[0].id))
+        assert metadata["file_url"] == "http://93.184.216.34/other.epub"
+        for field in ("file_size", "original_filename", "sha256", "crc32"):
+            assert field not in metadata
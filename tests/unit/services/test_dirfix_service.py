@@ -0,0 +1,242 @@
+"""Tests unitaires pour DirfixService.
+
+Ces tests vérifient le calcul du plan de renommage DIRNAMING (dry-run),
+l'application par lots avec os.replace et le rollback en cas d'échec.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+from web.extensions import db
+from web.models import Group, Job, Release, User
+from web.services.dirfix import DirfixService
+from web.services.job import JobService
+
+
+class TestDirfixService:
+    """Tests unitaires pour DirfixService."""
+
+    def test_compute_target_name_normalizes_existing_name(self) -> None:
+        """Test normalisation d'un nom existant (espaces, accents, caractères interdits)."""
+        service = DirfixService()
+
+        assert service.compute_target_name("Éric Dupont - Mon Livre (2020)") == (
+            "Eric-Dupont-Mon-Livre-2020"
+        )
+        assert service.compute_target_name("Already-Fine-2020") == "Already-Fine-2020"
+
+    def test_compute_target_name_from_metadata(self) -> None:
+        """Test reconstruction du nom depuis les composants DIRNAMING."""
+        service = DirfixService()
+        metadata = {
+            "group": "testgrp",
+            "author": ["John Doe"],
+            "title": "Great Book",
+            "format": "epub",
+            "language": "English",
+            "publication_date": "2021-05-01",
+            "isbn": "9781234567897",
+        }
+
+        assert service.compute_target_name("whatever", metadata) == (
+            "TESTGRP-John-Doe-Great-Book-EPUB-English-2021-9781234567897-eBook"
+        )
+
+    def test_compute_target_name_missing_required_component(self) -> None:
+        """Test fallback sur la normalisation si un composant requis manque."""
+        service = DirfixService()
+
+        assert service.compute_target_name("My Book", {"title": "X"}) == "My-Book"
+
+    def test_compute_target_name_truncates(self) -> None:
+        """Test troncature à la longueur maximale DIRNAMING."""
+        service = DirfixService()
+
+        assert len(service.compute_target_name("a" * 300)) == 243
+
+    def test_plan_release_is_dry_run(self, tmp_path: Path) -> None:
+        """Test que le calcul du plan ne modifie pas le système de fichiers."""
+        release = tmp_path / "My Book (2020)"
+        (release / "Sub Dir").mkdir(parents=True)
+
+        plan = DirfixService().plan_release(release)
+
+        assert plan["scanned"] == 2
+        assert len(plan["operations"]) == 2
+        # Plus profond d'abord
+        assert plan["operations"][0]["depth"] == 1
+        assert plan["diff"][-1] == f"{release} -> {tmp_path / 'My-Book-2020'}"
+        assert release.exists()
+        assert (release / "Sub Dir").exists()
+
+    def test_plan_detects_conflicts(self, tmp_path: Path) -> None:
+        """Test détection des collisions (cible existante, cibles identiques)."""
+        (tmp_path / "My Book").mkdir()
+        (tmp_path / "My-Book").mkdir()
+        (tmp_path / "Other Book").mkdir()
+        (tmp_path / "Other_Book").mkdir()
+
+        plan = DirfixService().plan_bulk(tmp_path)
+
+        targets = [op["target"] for op in plan["operations"]]
+        assert targets == [str(tmp_path / "Other-Book")]
+        assert len(plan["conflicts"]) == 2
+
+    def test_apply_plan_bulk(self, tmp_path: Path) -> None:
+        """Test application d'un plan bulk sur un répertoire de groupe."""
+        for index in range(25):
+            (tmp_path / f"Release {index}" / "Inner Dir").mkdir(parents=True)
+
+        service = DirfixService()
+        plan = service.plan_bulk(tmp_path)
+        batches: list[tuple[int, int]] = []
+        result = service.apply_plan(
+            plan, batch_size=10, on_batch=lambda d, t: batches.append((d, t))
+        )
+
+        assert result["success"] is True
+        assert result["applied"] == 50
+        assert batches[-1] == (50, 50)
+        assert len(batches) == 5
+        assert (tmp_path / "Release-7" / "Inner-Dir").is_dir()
+        assert not (tmp_path / "Release 7").exists()
+
+    def test_apply_plan_rolls_back_on_failure(self, tmp_path: Path) -> None:
+        """Test rollback complet lorsqu'un renommage échoue."""
+        for name in ("A a", "B b", "C c"):
+            (tmp_path / name).mkdir()
+
+        service = DirfixService()
+        plan = service.plan_bulk(tmp_path)
+        # Cible créée entre le plan et l'application : le renommage doit échouer
+        (tmp_path / "C-c").mkdir()
+
+        result = service.apply_plan(plan, batch_size=1)
+
+        assert result["success"] is False
+        assert result["applied"] == 0
+        assert "C-c" in result["error"]
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["A a", "B b", "C c", "C-c"]
+
+    def test_apply_plan_reports_rollback_failures(self, tmp_path: Path) -> None:
+        """Test signalement des renommages impossibles à annuler."""
+        (tmp_path / "A a").mkdir()
+        (tmp_path / "B b").mkdir()
+        service = DirfixService()
+        plan = service.plan_bulk(tmp_path)
+        original_replace = Path.replace
+        calls = {"count": 0}
+
+        def flaky_replace(self: Path, target: Path | str) -> Path:
+            calls["count"] += 1
+            if calls["count"] > 1:
+                raise PermissionError("denied")
+            return original_replace(self, target)
+
+        with patch.object(Path, "replace", flaky_replace):
+            result = service.apply_plan(plan)
+
+        assert result["success"] is False
+        assert len(result["rollback_failures"]) == 1
+
+    def test_from_rule_content(self) -> None:
+        """Test construction depuis la section DIRNAMING d'une règle."""
+        service = DirfixService.from_rule_content("DIRNAMING\nTitle-Author-eBook\n")
+
+        assert service.naming_spec["format"] == "Title-Author-eBook"
+
+
+class TestDirfixJob:
+    """Tests d'intégration du traitement des jobs DIRFIX."""
+
+    def _create_job(self, config: dict) -> tuple[int, int]:
+        user = User(username="dirfixuser", email="dirfix@test.com")
+        user.set_password("password")
+        group = Group(name="TESTGRP")
+        db.session.add_all([user, group])
+        db.session.commit()
+
+        release = Release(
+            user_id=user.id,
+            group_id=group.id,
+            release_type="EBOOK",
+            release_metadata={
+                "author": ["John Doe"],
+                "title": "Great Book",
+                "format": "EPUB",
+                "year": 2021,
+            },
+        )
+        db.session.add(release)
+        db.session.commit()
+
+        job = Job(
+            release_id=release.id,
+            status="pending",
+            job_type="dirfix",
+            config_json=config,
+            created_by=user.id,
+        )
+        db.session.add(job)
+        db.session.commit()
+        return job.id, release.id
+
+    def test_dirfix_job_renames_release(self, app, tmp_path: Path) -> None:
+        """Test renommage d'une release depuis ses métadonnées."""
+        release_dir = tmp_path / "great book"
+        release_dir.mkdir()
+        job_id, _ = self._create_job({"file_path": str(release_dir)})
+
+        JobService().process_job(job_id)
+
+        job = db.session.get(Job, job_id)
+        assert job.status == "completed"
+        assert (tmp_path / "TESTGRP-John-Doe-Great-Book-EPUB-2021-eBook").is_dir()
+        assert job.config_json["dirfix_plan"]["diff"]
+
+    def test_dirfix_job_relocates_release_paths(self, app, tmp_path: Path) -> None:
+        """Test file_path et chemins de release_metadata reportés sur le nouveau nom."""
+        release_dir = tmp_path / "great book"
+        release_dir.mkdir()
+        (release_dir / "book.epub").write_bytes(b"epub")
+        job_id, release_id = self._create_job({"file_path": str(release_dir)})
+        release = db.session.get(Release, release_id)
+        release.file_path = str(release_dir / "book.epub")
+        release.release_metadata = {**release.release_metadata, "nfo_path": str(release_dir)}
+        db.session.commit()
+
+        JobService().process_job(job_id)
+
+        renamed = tmp_path / "TESTGRP-John-Doe-Great-Book-EPUB-2021-eBook"
+        release = db.session.get(Release, release_id)
+        assert release.file_path == str(renamed / "book.epub")
+        assert Path(release.file_path).is_file()
+        assert release.release_metadata["nfo_path"] == str(renamed)
+        assert release.release_metadata["title"] == "Great Book"
+
+    def test_dirfix_job_dry_run(self, app, tmp_path: Path) -> None:
+        """Test mode dry-run : plan journalisé, aucun renommage."""
+        release_dir = tmp_path / "great book"
+        release_dir.mkdir()
+        job_id, _ = self._create_job({"file_path": str(release_dir), "dry_run": True})
+
+        JobService().process_job(job_id)
+
+        job = db.session.get(Job, job_id)
+        assert job.status == "completed"
+        assert release_dir.is_dir()
+        assert len(job.config_json["dirfix_plan"]["diff"]) == 1
+
+    def test_dirfix_job_fails_after_rollback(self, app, tmp_path: Path) -> None:
+        """Test passage en failed lorsque l'application est annulée."""
+        (tmp_path / "A a").mkdir()
+        job_id, _ = self._create_job({"path": str(tmp_path), "bulk": True})
+
+        with patch.object(Path, "replace", side_effect=PermissionError("denied")):
+            JobService().process_job(job_id)
+
+        job = db.session.get(Job, job_id)
+        assert job.status == "failed"
+        assert "rolled back" in job.logs
@@ -0,0 +1,192 @@
+"""Tests unitaires pour le préflight espace disque du packaging.
+
+Ces tests vérifient l'estimation de taille, le registre partagé de
+réservations (DiskSpaceLedger), le refus avant toute écriture dans
+PackagingService et la mise en attente des jobs par le scheduler.
+"""
+
+from __future__ import annotations
+
+import shutil
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from web.extensions import db
+from web.models import Job, Release, User
+from web.services.job import JobService
+from web.services.packaging import DiskSpaceLedger, InsufficientDiskSpaceError, PackagingService
+from web.services.packaging.disk_space import estimate_package_size
+
+GIB = 1024**3
+
+
+def _source(tmp_path: Path, size: int = 100_000) -> Path:
+    source = tmp_path / "source.epub"
+    source.write_bytes(b"\x00" * size)
+    return source
+
+
+def _disk_usage(free: int):
+    return patch(
+        "web.services.packaging.disk_space.shutil.disk_usage",
+        return_value=shutil._ntuple_diskusage(10 * GIB, 10 * GIB - free, free),
+    )
+
+
+class TestDiskSpaceLedger:
+    """Tests unitaires pour l'estimation et le registre de réservations."""
+
+    def test_estimate_is_upper_bound(self, tmp_path: Path) -> None:
+        """Test estimation >= taille réelle du ZIP, stored < deflated."""
+        source = _source(tmp_path)
+        files = [(source, source.name)]
+
+        deflated = estimate_package_size(files, tmp_path, zipfile.ZIP_DEFLATED, nfo_size=3)
+        stored = estimate_package_size(files, tmp_path, zipfile.ZIP_STORED, nfo_size=3)
+        result = PackagingService().package_release(
+            {"name": "Rel-GRP", "files": [{"path": str(source)}], "nfo_content": "NFO"},
+            tmp_path / "out",
+        )
+
+        assert stored < deflated
+        assert Path(result["zip_path"]).stat().st_size <= deflated
+        assert result["estimated_bytes"] == deflated
+
+    def test_reservations_share_free_space(self, tmp_path: Path) -> None:
+        """Test qu'une seconde réservation est refusée tant que la première est active."""
+        ledger_path = tmp_path / "ledger.json"
+        first = DiskSpaceLedger(ledger_path, min_free_bytes=0)
+        second = DiskSpaceLedger(ledger_path, min_free_bytes=0)
+
+        with _disk_usage(free=10 * GIB):
+            assert first.reserve("a.zip", tmp_path, 6 * GIB) is True
+            assert first.reserve("a.zip", tmp_path, 6 * GIB) is False
+            with pytest.raises(InsufficientDiskSpaceError) as excinfo:
+                second.reserve("b.zip", tmp_path, 6 * GIB)
+            first.release("a.zip")
+            assert second.reserve("b.zip", tmp_path, 6 * GIB) is True
+
+        assert excinfo.value.available == 4 * GIB
+        assert second.reserved_bytes(tmp_path) == 6 * GIB
+
+    def test_stale_reservations_are_purged(self, tmp_path: Path) -> None:
+        """Test purge des réservations de processus morts."""
+        ledger_path = tmp_path / "ledger.json"
+        ledger_path.write_text(
+            '{"dead.zip": {"bytes": 1, "dev": 0, "pid": 999999999, "created_at": 1e12}}'
+        )
+
+        assert DiskSpaceLedger(ledger_path).reserved_bytes(tmp_path) == 0
+
+    def test_package_release_fails_before_writing(self, tmp_path: Path) -> None:
+        """Test refus du packaging avant toute écriture si l'espace manque."""
+        source = _source(tmp_path)
+        output = tmp_path / "out"
+        ledger = DiskSpaceLedger(tmp_path / "ledger.json", min_free_bytes=0)
+
+        with _disk_usage(free=1000), pytest.raises(InsufficientDiskSpaceError):
+            PackagingService(ledger=ledger).package_release(
+                {"name": "Rel-GRP", "files": [{"path": str(source)}], "nfo_content": "NFO"},
+                output,
+            )
+
+        assert not (output / "Rel-GRP").exists()
+        assert ledger.reserved_bytes(tmp_path) == 0
+
+
+class TestPackagingScheduler:
+    """Tests de la mise en attente des jobs de packaging par JobService."""
+
+    def test_run_pending_jobs_holds_back_without_space(self, app, tmp_path: Path) -> None:
+        """Test job REPACK retenu en pending sans espace, les autres jobs continuent."""
+        user = User(username="diskuser", email="disk@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        app.config["PACKAGING_OUTPUT_ROOT"] = str(tmp_path / "out")
+        release = Release(user=user, release_type="EBOOK", file_path=str(_source(tmp_path)))
+        db.session.add(release)
+        db.session.commit()
+        package = Job(
+            status="pending",
+            job_type="repack",
+            config_json={},
+            release_id=release.id,
+            created_by=user.id,
+        )
+        other = Job(status="pending", job_type="nfofix", config_json={}, created_by=user.id)
+        db.session.add_all([package, other])
+        db.session.commit()
+        service = JobService(ledger=DiskSpaceLedger(tmp_path / "ledger.json", min_free_bytes=0))
+
+        with _disk_usage(free=1000):
+            held = service.run_pending_jobs()
+        released = service.run_pending_jobs()
+
+        assert held == {"processed": [other.id], "held": [package.id]}
+        assert released == {"processed": [package.id], "held": []}
+        db.session.refresh(package)
+        assert package.status == "completed"
+        assert service.ledger.reserved_bytes(tmp_path) == 0
+
+    def test_preflight_error_fails_job_without_blocking(self, app, tmp_path: Path) -> None:
+        """Test source manquante : job REPACK en échec, les jobs suivants traités."""
+        user = User(username="diskuser2", email="disk2@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        app.config["PACKAGING_OUTPUT_ROOT"] = str(tmp_path / "out")
+        release = Release(user=user, release_type="EBOOK", file_path=str(tmp_path / "missing.epub"))
+        db.session.add(release)
+        db.session.commit()
+        package = Job(
+            status="pending",
+            job_type="repack",
+            config_json={},
+            release_id=release.id,
+            created_by=user.id,
+        )
+        other = Job(status="pending", job_type="nfofix", config_json={}, created_by=user.id)
+        db.session.add_all([package, other])
+        db.session.commit()
+        service = JobService(ledger=DiskSpaceLedger(tmp_path / "ledger.json", min_free_bytes=0))
+
+        result = service.run_pending_jobs()
+
+        assert result == {"processed": [package.id, other.id], "held": []}
+        db.session.refresh(package)
+        assert package.status == "failed"
+        assert "missing.epub" in package.logs
+
+    def test_preflight_ignores_client_supplied_paths(self, app, tmp_path: Path) -> None:
+        """Test files/output_path du client ignorés : rien réservé ni inspecté hors release."""
+        user = User(username="diskuser3", email="disk3@test.com")
+        user.set_password("password")
+        release = Release(user=user, release_type="EBOOK")
+        db.session.add_all([user, release])
+        db.session.commit()
+        package = Job(
+            status="pending",
+            job_type="repack",
+            config_json={
+                "name": "Probe",
+                "files": [{"path": str(_source(tmp_path, size=10 * GIB // 1024))}],
+                "output_path": str(tmp_path / "out"),
+            },
+            release_id=release.id,
+            created_by=user.id,
+        )
+        db.session.add(package)
+        db.session.commit()
+        service = JobService(ledger=DiskSpaceLedger(tmp_path / "ledger.json", min_free_bytes=0))
+
+        with _disk_usage(free=1000):
+            result = service.run_pending_jobs()
+
+        assert result == {"processed": [package.id], "held": []}
+        db.session.refresh(package)
+        assert package.status == "completed"
+        assert not (tmp_path / "out").exists()
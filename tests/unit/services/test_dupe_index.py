@@ -0,0 +1,133 @@
+"""Tests unitaires pour l'index de dupes (DupeIndexService).
+
+Ces tests vérifient l'import de dumps predb (texte, CSV, gzip), la clé
+normalisée (groupe, casse, séparateurs), la recherche exacte et par préfixe
+dans le fichier projeté en mémoire, la réouverture après reconstruction, le
+job "dupeimport" et GET /api/releases/dupecheck.
+"""
+
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+
+from flask_jwt_extended import create_access_token
+
+from web.extensions import db
+from web.models import Job, User
+from web.services.dupe import DupeIndexService
+from web.services.job import JobService
+
+DUMP_LINES = [
+    "1;GRP-Stephen.King-It-EPUB-English-2019-eBook;GRP;EBOOK;2019-05-01 10:00",
+    "2;Stephen.King-It-2019-RETAIL-eBook-OTHER;OTHER;EBOOK;2019-05-02 11:00",
+    "3;GRP-Stephen.King-It-PDF-English-1986-eBook;GRP;EBOOK;2010-01-01 09:00",
+    "4;GRP-Jane.Austen-Emma-EPUB-English-2015-eBook;GRP;EBOOK;2015-03-03 12:00",
+]
+
+
+def _dump(tmp_path: Path) -> Path:
+    path = tmp_path / "predb.csv"
+    path.write_text("id;name;team;cat;pre\n" + "\n".join(DUMP_LINES) + "\n")
+    return path
+
+
+class TestDupeIndexService:
+    """Tests unitaires pour DupeIndexService."""
+
+    def test_import_and_check(self, tmp_path: Path) -> None:
+        """Test import CSV puis dupe par variante (autre groupe, casse, séparateurs)."""
+        service = DupeIndexService(tmp_path / "index.bin")
+
+        report = service.import_dumps([_dump(tmp_path)])
+        variant = service.check("NEWGRP-stephen_king-IT-epub-English-2019-eBook")
+        exact = service.check("GRP-Stephen.King-It-EPUB-English-2019-eBook")
+
+        assert report == {"read": 4, "imported": 4, "count": 4, "keys": 4}
+        assert variant["dupe"] is True
+        assert variant["exact"] is False
+        assert variant["key"] == "stephen.king|it|2019|epub|english"
+        assert exact["exact"] is True
+        assert exact["similar"] == [
+            "GRP-Stephen.King-It-PDF-English-1986-eBook",
+            "Stephen.King-It-2019-RETAIL-eBook-OTHER",
+        ]
+
+    def test_unknown_name(self, tmp_path: Path) -> None:
+        """Test nom absent : ni dupe ni noms proches ; index absent : None."""
+        service = DupeIndexService(tmp_path / "index.bin")
+        assert service.check("GRP-Some.One-Nothing-EPUB") is None
+
+        service.import_dumps([_dump(tmp_path)])
+        result = service.check("GRP-Some.One-Nothing-EPUB")
+
+        assert result["dupe"] is False
+        assert result["matches"] == []
+        assert result["similar"] == []
+        assert result["index"]["count"] == 4
+
+    def test_gzip_merge_and_reopen(self, tmp_path: Path) -> None:
+        """Test dump gzip fusionné avec l'index existant, lecteur rouvert après remplacement."""
+        service = DupeIndexService(tmp_path / "index.bin")
+        service.import_dumps([_dump(tmp_path)])
+        first_reader = service.reader()
+        extra = tmp_path / "extra.txt.gz"
+        with gzip.open(extra, "wt") as f:
+            f.write("GRP-Terry.Pratchett-Mort-EPUB-English-1987-eBook\n")
+
+        report = service.import_dumps([extra])
+
+        assert report["imported"] == 1
+        assert report["count"] == len(DUMP_LINES) + 1
+        assert service.reader() is not first_reader
+        assert service.check("XYZ-Terry.Pratchett-Mort-EPUB-English-1987-eBook")["dupe"] is True
+        assert service.check("OTHER-Jane.Austen-Emma-EPUB-English-2015-eBook")["dupe"] is True
+
+    def test_dupeimport_job(self, app, tmp_path: Path) -> None:
+        """Test job dupeimport : index construit, rapport persisté."""
+        app.config["DUPE_INDEX_PATH"] = str(tmp_path / "index.bin")
+        user = User(username="importer", email="importer@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        job = Job(
+            job_type="dupeimport",
+            status="pending",
+            created_by=user.id,
+            config_json={"sources": [str(_dump(tmp_path))]},
+        )
+        db.session.add(job)
+        db.session.commit()
+
+        JobService().process_job(job.id)
+
+        db.session.refresh(job)
+        assert job.status == "completed"
+        assert job.config_json["dupe_import"]["count"] == len(DUMP_LINES)
+
+
+class TestDupecheckEndpoint:
+    """Tests de GET /api/releases/dupecheck."""
+
+    def test_dupecheck(self, app, client, tmp_path: Path) -> None:
+        """Test nom requis (400), index absent (503) puis réponse de l'index."""
+        app.config["DUPE_INDEX_PATH"] = str(tmp_path / "index.bin")
+        user = User(username="checker", email="checker@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        headers = {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}
+
+        missing_name = client.get("/api/releases/dupecheck", headers=headers)
+        missing_index = client.get("/api/releases/dupecheck?name=A-B-C", headers=headers)
+        DupeIndexService(tmp_path / "index.bin").import_dumps([_dump(tmp_path)])
+        response = client.get(
+            "/api/releases/dupecheck?name=NEW-Jane.Austen-Emma-EPUB-English-2015-eBook",
+            headers=headers,
+        )
+
+        assert missing_name.status_code == 400
+        assert missing_index.status_code == 503
+        assert response.status_code == 200
+        assert response.get_json()["dupe"] is True
+        assert response.get_json()["matches"] == ["GRP-Jane.Austen-Emma-EPUB-English-2015-eBook"]
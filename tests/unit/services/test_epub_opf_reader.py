@@ -0,0 +1,95 @@
+"""Tests unitaires pour EpubOpfReader (chemin rapide d'extraction EPUB).
+
+Ces tests vérifient la lecture des métadonnées Dublin Core depuis le seul
+bloc <metadata> de l'OPF et le repli sur ebooklib lorsque l'OPF est illisible.
+"""
+
+from __future__ import annotations
+
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from web.services.metadata import MetadataExtractionService
+from web.services.metadata.epub_opf_reader import EpubOpfReader, OpfUnavailableError
+
+CONTAINER_XML = (
+    '<?xml version="1.0"?><container version="1.0" '
+    'xmlns="urn:oasis:names:tc:opendocument:xmlns:container"><rootfiles>'
+    '<rootfile full-path="OEBPS/book.opf" media-type="application/oebps-package+xml"/>'
+    "</rootfiles></container>"
+)
+
+OPF_XML = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<package xmlns="http://www.idpf.org/2007/opf" version="2.0">'
+    '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/" '
+    'xmlns:opf="http://www.idpf.org/2007/opf">'
+    "<dc:identifier>urn:uuid:1234</dc:identifier>"
+    '<dc:identifier opf:scheme="ISBN">978-1-234-56789-7</dc:identifier>'
+    "<dc:title>Fast Book</dc:title>"
+    "<dc:creator>First Author</dc:creator><dc:creator>Second Author</dc:creator>"
+    "<dc:language>fr</dc:language><dc:date>2020-03-04</dc:date>"
+    "</metadata>"
+    "<manifest><broken"
+)
+
+
+def _write_epub(path: Path, container: str | None = CONTAINER_XML, opf: str = OPF_XML) -> Path:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("mimetype", "application/epub+zip")
+        if container is not None:
+            archive.writestr("META-INF/container.xml", container)
+        archive.writestr("OEBPS/book.opf", opf)
+    return path
+
+
+class TestEpubOpfReader:
+    """Tests unitaires pour EpubOpfReader."""
+
+    def test_read_stops_after_metadata(self, tmp_path: Path) -> None:
+        """Test lecture du bloc <metadata> sans parser la suite (manifest invalide)."""
+        metadata = EpubOpfReader().read(_write_epub(tmp_path / "book.epub"))
+
+        assert metadata["title"] == "Fast Book"
+        assert metadata["author"] == ["First Author", "Second Author"]
+        assert metadata["isbn"] == "978-1-234-56789-7"
+        assert metadata["language"] == "fr"
+        assert metadata["publication_date"] == "2020-03-04"
+
+    def test_read_without_container(self, tmp_path: Path) -> None:
+        """Test erreur explicite si container.xml est absent."""
+        with pytest.raises(OpfUnavailableError, match="container.xml"):
+            EpubOpfReader().read(_write_epub(tmp_path / "book.epub", container=None))
+
+    def test_read_not_a_zip(self, tmp_path: Path) -> None:
+        """Test erreur explicite sur une archive invalide."""
+        path = tmp_path / "book.epub"
+        path.write_bytes(b"PK\x03\x04")
+
+        with pytest.raises(OpfUnavailableError):
+            EpubOpfReader().read(path)
+
+    def test_extraction_service_uses_fast_path(self, tmp_path: Path) -> None:
+        """Test que MetadataExtractionService n'appelle pas ebooklib si l'OPF est lisible."""
+        path = _write_epub(tmp_path / "book.epub")
+
+        with patch("web.services.metadata.metadata_extraction.epub.read_epub") as read_epub:
+            metadata = MetadataExtractionService()._extract_epub_metadata(path)
+
+        read_epub.assert_not_called()
+        assert metadata["title"] == "Fast Book"
+
+    def test_extraction_service_falls_back_to_ebooklib(self, tmp_path: Path) -> None:
+        """Test repli sur ebooklib lorsque l'OPF ne peut pas être localisé."""
+        path = _write_epub(tmp_path / "book.epub", container=None)
+
+        with patch(
+            "web.services.metadata.metadata_extraction.epub.read_epub",
+            side_effect=Exception("fallback used"),
+        ) as read_epub, pytest.raises(Exception, match="fallback used"):
+            MetadataExtractionService()._extract_epub_metadata(path)
+
+        read_epub.assert_called_once()
@@ -0,0 +1,151 @@
+"""Tests unitaires pour l'analyse approfondie des fichiers (étape 5 du wizard).
+
+Ces tests vérifient FileAnalysisService (signature, checksums, métadonnées,
+listing d'archive, cache par identité de fichier) et le flux asynchrone de
+POST/GET /api/wizard/<id>/analyze avec le job "analyze".
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import zipfile
+import zlib
+from pathlib import Path
+
+from flask_jwt_extended import create_access_token
+
+from web.extensions import cache, db
+from web.models import Job, Release, User
+from web.services.job import JobService
+from web.services.metadata import FileAnalysisService
+
+OPF_XML = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<package xmlns="http://www.idpf.org/2007/opf" version="2.0">'
+    '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">'
+    "<dc:title>Deep Book</dc:title><dc:creator>Some Author</dc:creator>"
+    "<dc:language>en</dc:language></metadata><manifest/></package>"
+)
+CONTAINER_XML = (
+    '<?xml version="1.0"?><container version="1.0" '
+    'xmlns="urn:oasis:names:tc:opendocument:xmlns:container"><rootfiles>'
+    '<rootfile full-path="OEBPS/book.opf" media-type="application/oebps-package+xml"/>'
+    "</rootfiles></container>"
+)
+
+
+def _epub_bytes() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        archive.writestr("META-INF/container.xml", CONTAINER_XML)
+        archive.writestr("OEBPS/book.opf", OPF_XML)
+    return buffer.getvalue()
+
+
+EPUB = _epub_bytes()
+
+
+class TestFileAnalysisService:
+    """Tests unitaires pour FileAnalysisService."""
+
+    def test_analyze_epub(self, app, tmp_path: Path) -> None:
+        """Test format par signature, checksums en une passe, métadonnées et listing."""
+        cache.clear()
+        path = tmp_path / "blob.epub"
+        path.write_bytes(EPUB)
+        service = FileAnalysisService()
+
+        result = service.analyze(path)
+
+        assert result["format"] == "EPUB"
+        assert result["file_size"] == len(EPUB)
+        assert result["checksums"] == {
+            "sha256": hashlib.sha256(EPUB).hexdigest(),
+            "md5": hashlib.md5(EPUB).hexdigest(),  # noqa: S324
+            "crc32": f"{zlib.crc32(EPUB):08x}",
+        }
+        assert result["metadata"]["title"] == "Deep Book"
+        assert result["archive"]["count"] == 3
+        assert result["archive"]["members"][0]["name"] == "mimetype"
+        assert service.get_cached(service.cache_key(path)) == result
+        sha_key = service.cache_key(path, hashlib.sha256(EPUB).hexdigest())
+        assert service.get_cached(sha_key) == result
+
+    def test_unreadable_metadata_is_reported(self, app, tmp_path: Path) -> None:
+        """Test fichier non reconnu : analyse rendue avec metadata_error."""
+        cache.clear()
+        path = tmp_path / "notes.bin"
+        path.write_bytes(b"\x00" * 64)
+
+        result = FileAnalysisService().analyze(path)
+
+        assert result["format"] == "UNKNOWN"
+        assert "metadata_error" in result
+        assert "archive" not in result
+
+
+class TestWizardDeepAnalysis:
+    """Tests du flux asynchrone de l'étape 5 du wizard."""
+
+    def _upload(self, app, client, tmp_path: Path) -> tuple[dict[str, str], list[int]]:
+        cache.clear()
+        app.config["UPLOAD_BLOB_ROOT"] = str(tmp_path / "blobs")
+        user = User(username="analyst", email="analyst@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        headers = {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}
+        release_ids = []
+        for _ in range(2):
+            release = Release(user_id=user.id, release_type="EBOOK", status="draft")
+            db.session.add(release)
+            db.session.commit()
+            client.post(
+                f"/api/wizard/{release.id}/upload",
+                data={"file": (io.BytesIO(EPUB), "GRP-Author-Deep.Book-EPUB.epub")},
+                headers=headers,
+                content_type="multipart/form-data",
+            )
+            release_ids.append(release.id)
+        return headers, release_ids
+
+    def test_analyze_queues_job_then_serves_cache(self, app, client, tmp_path: Path) -> None:
+        """Test analyse en file d'attente, résultat après job, puis cache pour le même fichier."""
+        headers, (first, second) = self._upload(app, client, tmp_path)
+
+        response = client.post(f"/api/wizard/{first}/analyze", headers=headers)
+        analysis = response.get_json()["analysis"]
+        assert response.status_code == 200
+        assert analysis["detected_group"] == "GRP"
+        assert analysis["deep_status"] == "pending"
+        again = client.post(f"/api/wizard/{first}/analyze", headers=headers).get_json()
+        assert again["analysis"]["deep_job_id"] == analysis["deep_job_id"]
+
+        JobService().process_job(analysis["deep_job_id"])
+        polled = client.get(f"/api/wizard/{first}/analyze", headers=headers).get_json()
+        assert polled["analysis"]["deep_status"] == "completed"
+        assert polled["analysis"]["deep"]["metadata"]["title"] == "Deep Book"
+
+        jobs_before = Job.query.filter_by(job_type="analyze").count()
+        cached = client.post(f"/api/wizard/{second}/analyze", headers=headers).get_json()
+        assert cached["analysis"]["deep_status"] == "completed"
+        assert cached["analysis"]["deep"]["format"] == "EPUB"
+        assert Job.query.filter_by(job_type="analyze").count() == jobs_before
+
+    def test_failed_job_is_reported(self, app, client, tmp_path: Path) -> None:
+        """Test job d'analyse en échec signalé par GET /analyze."""
+        headers, (first, _second) = self._upload(app, client, tmp_path)
+        job_id = client.post(f"/api/wizard/{first}/analyze", headers=headers).get_json()[
+            "analysis"
+        ]["deep_job_id"]
+        job = db.session.get(Job, job_id)
+        job.config_json = {"file_path": str(tmp_path / "missing.epub")}
+        db.session.commit()
+
+        JobService().process_job(job_id)
+
+        polled = client.get(f"/api/wizard/{first}/analyze", headers=headers).get_json()
+        assert db.session.get(Job, job_id).status == "failed"
+        assert polled["analysis"]["deep_status"] == "failed"
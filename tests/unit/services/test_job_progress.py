@@ -0,0 +1,127 @@
+"""Tests unitaires pour la progression des jobs de packaging.
+
+Ces tests vérifient les callbacks de progression de PackagingService,
+le throttling des écritures de JobProgressReporter et la lecture de la
+colonne Job.progress par JobService.get_job_progress.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from web.extensions import db
+from web.models import Job, Release, User
+from web.services.job import JobProgressReporter, JobService
+from web.services.packaging import PackagingService
+
+PAYLOAD_SIZE = 3 * 1024 * 1024 + 17
+
+
+def _create_job(
+    job_type: str = "repack", config: dict | None = None, file_path: Path | None = None
+) -> Job:
+    user = User(username="progressuser", email="progress@test.com")
+    user.set_password("password")
+    release = Release(
+        user=user,
+        release_type="EBOOK",
+        file_path=str(file_path) if file_path else None,
+        release_metadata={"original_filename": "Test-Book-TESTGROUP-20250124.epub"},
+    )
+    db.session.add_all([user, release])
+    db.session.commit()
+    job = Job(
+        status="pending",
+        job_type=job_type,
+        config_json=config or {},
+        release_id=release.id,
+        created_by=user.id,
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def _source(tmp_path: Path) -> Path:
+    source = tmp_path / "source.epub"
+    source.write_bytes(os.urandom(PAYLOAD_SIZE))
+    return source
+
+
+class TestPackagingProgress:
+    """Tests unitaires pour les callbacks de progression du packaging."""
+
+    def test_package_release_emits_byte_progress(self, tmp_path: Path) -> None:
+        """Test événements par bloc avec octets lus/écrits croissants et membre courant."""
+        events: list[dict] = []
+
+        PackagingService().package_release(
+            {
+                "name": "Test-Book-TESTGROUP-20250124",
+                "files": [{"path": str(_source(tmp_path)), "name": "book.epub"}],
+                "metadata": {},
+                "nfo_content": "NFO",
+            },
+            tmp_path / "out",
+            progress_callback=events.append,
+        )
+
+        zip_events = [event for event in events if event["phase"] == "zip"]
+        assert events[0] == {"phase": "staging", "member": "book.epub"}
+        assert events[-1]["phase"] == "done"
+        assert zip_events[-1]["bytes_read"] == zip_events[-1]["bytes_total"] == PAYLOAD_SIZE + 3
+        assert {event["member"] for event in zip_events} == {
+            "book.epub",
+            "Test-Book-TESTGROUP-20250124.nfo",
+        }
+        reads = [event["bytes_read"] for event in zip_events]
+        assert reads == sorted(reads)
+        assert zip_events[-1]["bytes_written"] > 0
+
+
+class TestJobProgressReporter:
+    """Tests unitaires pour JobProgressReporter."""
+
+    def test_reporter_throttles_writes(self, app) -> None:
+        """Test écritures limitées par intervalle et pas de progression."""
+        job = _create_job()
+        now = [0.0]
+        reporter = JobProgressReporter(
+            job.id, min_interval_ms=1000, min_step_percent=10, clock=lambda: now[0]
+        )
+
+        for bytes_read in range(0, 101):
+            now[0] += 0.001
+            reporter({"phase": "zip", "bytes_read": bytes_read, "bytes_total": 100})
+        reporter({"phase": "done"})
+
+        # Premier événement + un tous les 10 % + événement final
+        assert reporter.writes == 12
+        db.session.refresh(job)
+        assert job.progress["percent"] == 100.0
+        assert JobService().get_job_progress(job.id) == 100
+
+    def test_repack_job_persists_progress(self, app, tmp_path: Path) -> None:
+        """Test job REPACK : ZIP construit depuis la release, progression persistée."""
+        app.config["PACKAGING_OUTPUT_ROOT"] = str(tmp_path / "out")
+        secret = tmp_path / "secret.txt"
+        secret.write_text("server file")
+        job = _create_job(
+            config={
+                "name": "Stolen",
+                "files": [{"path": str(secret), "name": "secret.txt"}],
+                "output_path": str(tmp_path / "elsewhere"),
+            },
+            file_path=_source(tmp_path),
+        )
+
+        JobService().process_job(job.id)
+
+        db.session.refresh(job)
+        assert job.status == "completed"
+        assert job.progress["phase"] == "done"
+        assert "Package built" in job.logs
+        assert not (tmp_path / "elsewhere").exists()
+        output = tmp_path / "out" / f"release_{job.release_id}"
+        assert (output / "Test-Book-TESTGROUP-20250124.zip").exists()
@@ -0,0 +1,174 @@
+"""Tests unitaires pour NfoReaderService.
+
+Ces tests vérifient le parsing des NFO (ASCII art, CP437), la résolution du
+fichier NFO d'une release et le backfill par lots de release_metadata.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+from web.extensions import db
+from web.models import Job, Release, User
+from web.services.job import JobService
+from web.services.metadata import NfoReaderService
+
+SAMPLE_NFO = """
+  ▄▄▄████▄▄▄        TEAM PRESENTS        ▄▄▄████▄▄▄
+ ▓▒░ Title ......: Great Book (Reprint)          ░▒▓
+ │  Author     : John Doe & Jane Roe             │
+ [ ISBN ] 978-1-234-56789-7     Size ..: 1,234 KB
+ ║ Language.....: English    Pages: 320 pages    ║
+ ║ Published : 2021-05-01    Date: 2023/01/02    ║
+ Title: Footer Title
+"""
+
+
+class TestNfoReaderService:
+    """Tests unitaires pour NfoReaderService."""
+
+    def test_parse_content_ascii_art(self) -> None:
+        """Test extraction des champs malgré les décorations ASCII art (CP437)."""
+        metadata = NfoReaderService().parse_content(SAMPLE_NFO.encode("cp437"))
+
+        assert metadata["title"] == "Great Book (Reprint)"
+        assert metadata["author"] == ["John Doe", "Jane Roe"]
+        assert metadata["isbn"] == "9781234567897"
+        assert metadata["language"] == "en"
+        assert metadata["publication_date"] == "2021-05-01"
+        assert metadata["release_date"] == "2023-01-02"
+        assert metadata["file_size"] == 1234 * 1024
+        assert metadata["pages"] == 320
+
+    def test_parse_content_generated_nfo(self) -> None:
+        """Test lecture d'un NFO produit par NfoGeneratorService (aller-retour)."""
+        from web.services.packaging import NfoGeneratorService
+
+        nfo = NfoGeneratorService().generate_nfo(
+            {"title": "Round Trip", "author": "Jane Roe", "isbn": "0306406152", "year": 2020}
+        )
+
+        metadata = NfoReaderService().parse_content(nfo)
+
+        assert metadata["title"] == "Round Trip"
+        assert metadata["author"] == ["Jane Roe"]
+        assert metadata["isbn"] == "0306406152"
+        assert metadata["year"] == 2020
+
+    def test_parse_content_isbn_fallback(self) -> None:
+        """Test repli sur une mention ISBN hors champ structuré."""
+        metadata = NfoReaderService().parse_content("Scanned from ISBN 0-306-40615-2 print.")
+
+        assert metadata["isbn"] == "0306406152"
+        assert metadata["title"] is None
+        assert metadata["author"] == []
+
+    def test_resolve_nfo_path(self, tmp_path: Path) -> None:
+        """Test résolution du NFO depuis un répertoire ou un fichier eBook."""
+        release_dir = tmp_path / "Release"
+        release_dir.mkdir()
+        (release_dir / "book.epub").write_bytes(b"PK")
+        (release_dir / "release-grp.nfo").write_text("Title: X")
+
+        expected = release_dir / "release-grp.nfo"
+        assert NfoReaderService.resolve_nfo_path(release_dir) == expected
+        assert NfoReaderService.resolve_nfo_path(release_dir / "book.epub") == expected
+        assert NfoReaderService.resolve_nfo_path(tmp_path / "missing.nfo") is None
+        assert NfoReaderService.resolve_nfo_path(None) is None
+
+    def _create_releases(self, tmp_path: Path, count: int) -> list[int]:
+        user = User(username="nfouser", email="nfo@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+
+        releases = []
+        for index in range(count):
+            release_dir = tmp_path / f"release{index}"
+            release_dir.mkdir()
+            (release_dir / "release.nfo").write_text(
+                f"Title: Book {index}\nAuthor: Author {index}\n", encoding="utf-8"
+            )
+            releases.append(
+                Release(
+                    user_id=user.id,
+                    release_type="EBOOK",
+                    file_path=str(release_dir),
+                    release_metadata={"title": "Kept Title"} if index == 0 else None,
+                )
+            )
+        db.session.add_all(releases)
+        db.session.commit()
+        return [release.id for release in releases]
+
+    def test_backfill_directory_batches(self, app, tmp_path: Path) -> None:
+        """Test backfill d'un répertoire par lots, sans écraser l'existant."""
+        ids = self._create_releases(tmp_path, 5)
+        batches: list[tuple[int, int]] = []
+
+        summary = NfoReaderService().backfill_releases(
+            directory=tmp_path,
+            workers=1,
+            batch_size=2,
+            on_batch=lambda d, t: batches.append((d, t)),
+        )
+
+        assert summary["total"] == 5
+        assert summary["parsed"] == 5
+        assert summary["updated"] == 5
+        assert batches[-1] == (5, 5)
+        db.session.expire_all()
+        assert db.session.get(Release, ids[0]).release_metadata["title"] == "Kept Title"
+        assert db.session.get(Release, ids[0]).release_metadata["author"] == ["Author 0"]
+        assert db.session.get(Release, ids[3]).release_metadata["title"] == "Book 3"
+
+    def test_readnfo_job_updates_release(self, app, tmp_path: Path) -> None:
+        """Test job READNFO sur la release du job."""
+        release_id = self._create_releases(tmp_path, 2)[1]
+        user_id = db.session.get(Release, release_id).user_id
+        job = Job(
+            release_id=release_id,
+            status="pending",
+            job_type="readnfo",
+            config_json={"file_path": str(tmp_path / "release1")},
+            created_by=user_id,
+        )
+        db.session.add(job)
+        db.session.commit()
+
+        JobService().process_job(job.id)
+
+        db.session.expire_all()
+        assert db.session.get(Job, job.id).status == "completed"
+        assert "1 updated" in db.session.get(Job, job.id).logs
+        assert db.session.get(Release, release_id).release_metadata["title"] == "Book 1"
+
+    def test_readnfo_job_logs_error_summary(self, app, tmp_path: Path) -> None:
+        """Test erreurs journalisées en une seule entrée : nombre et premières erreurs."""
+        user_id = db.session.get(Release, self._create_releases(tmp_path, 1)[0]).user_id
+        job = Job(
+            status="pending",
+            job_type="readnfo",
+            config_json={"directory": str(tmp_path)},
+            created_by=user_id,
+        )
+        db.session.add(job)
+        db.session.commit()
+        summary = {
+            "total": 25,
+            "parsed": 0,
+            "updated": 0,
+            "missing": 0,
+            "errors": [{"release_id": index, "error": "bad NFO"} for index in range(25)],
+        }
+
+        with patch.object(NfoReaderService, "backfill_releases", return_value=summary):
+            JobService().process_job(job.id)
+
+        logs = db.session.get(Job, job.id).logs
+        assert logs.count("NFO unreadable") == 1
+        assert "NFO unreadable for 25 release(s)" in logs
+        assert "release 19: bad NFO" in logs
+        assert "release 20:" not in logs
+        assert "... and 5 more" in logs
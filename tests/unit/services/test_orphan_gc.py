@@ -0,0 +1,217 @@
+"""Tests unitaires pour le garbage collector des fichiers orphelins.
+
+Ces tests vérifient OrphanCollectorService (uploads hérités, blobs,
+partiels, répertoires de staging, protection par les releases et les jobs
+actifs, suppression par lots) et le job "gc".
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import time
+from pathlib import Path
+
+from web.extensions import db
+from web.models import Job, Release, User
+from web.services.job import JobService
+from web.services.storage import BlobStoreService, OrphanCollectorService
+
+OLD = time.time() - 7200
+
+
+def _age(*paths: Path) -> None:
+    for path in paths:
+        os.utime(path, (OLD, OLD))
+
+
+def _user() -> User:
+    user = User(username="gcowner", email="gc@test.com")
+    user.set_password("password")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _staging(root: Path, name: str, content: bytes = b"x" * 100) -> Path:
+    directory = root / name
+    directory.mkdir(parents=True)
+    (directory / f"{name}.nfo").write_bytes(content)
+    _age(directory / f"{name}.nfo", directory)
+    return directory
+
+
+class TestOrphanCollectorService:
+    """Tests unitaires pour OrphanCollectorService."""
+
+    def _collector(self, tmp_path: Path, **kwargs) -> OrphanCollectorService:
+        return OrphanCollectorService(
+            BlobStoreService(tmp_path / "blobs"),
+            upload_roots=[tmp_path / "wizard"],
+            staging_roots=[tmp_path / "output"],
+            grace_seconds=3600,
+            **kwargs,
+        )
+
+    def test_collects_unreferenced_uploads_and_stagings(self, app, tmp_path: Path) -> None:
+        """Test suppression des orphelins anciens, conservation des références et récents."""
+        collector = self._collector(tmp_path)
+        store = collector.store
+        kept_blob = store.store(io.BytesIO(b"kept"), suffix=".epub")["path"]
+        orphan_blob = store.store(io.BytesIO(b"orphan"), suffix=".epub")["path"]
+        (tmp_path / "wizard").mkdir()
+        legacy = tmp_path / "wizard" / "release_1_book.epub"
+        legacy.write_bytes(b"legacy" * 10)
+        recent = tmp_path / "wizard" / "release_2_book.epub"
+        recent.write_bytes(b"recent")
+        partial = store.partial_dir / "abandoned.part"
+        partial.write_bytes(b"p" * 50)
+        orphan_staging = _staging(tmp_path / "output", "Old.Release-GRP")
+        kept_staging = _staging(tmp_path / "output", "Kept.Release-GRP")
+        delivered = tmp_path / "output" / "Old.Release-GRP.zip"
+        delivered.write_bytes(b"zip")
+        _age(kept_blob, orphan_blob, legacy, partial, delivered)
+
+        user = _user()
+        db.session.add_all(
+            [
+                Release(user_id=user.id, release_type="EBOOK", file_path=str(kept_blob)),
+                Release(
+                    user_id=user.id,
+                    release_type="EBOOK",
+                    file_path=str(kept_staging / "Kept.Release-GRP.nfo"),
+                ),
+            ]
+        )
+        db.session.commit()
+
+        report = collector.collect()
+
+        assert report["scanned"] == 7
+        assert report["removed"] == 4
+        assert report["bytes_reclaimed"] == len(b"orphan") + 60 + 50 + 100
+        assert kept_blob.exists() and recent.exists() and delivered.exists()
+        assert (kept_staging / "Kept.Release-GRP.nfo").exists()
+        assert not orphan_blob.exists()
+        assert not legacy.exists()
+        assert not partial.exists()
+        assert not orphan_staging.exists()
+
+    def test_active_jobs_protect_their_paths(self, app, tmp_path: Path) -> None:
+        """Test fichiers et output_path des jobs pending/running jamais collectés."""
+        collector = self._collector(tmp_path)
+        (tmp_path / "wizard").mkdir()
+        source = tmp_path / "wizard" / "release_3_book.epub"
+        source.write_bytes(b"source")
+        _age(source)
+        staging = _staging(tmp_path / "output", "Building.Release-GRP")
+        user = _user()
+        db.session.add_all(
+            [
+                Job(
+                    job_type="repack",
+                    status="running",
+                    created_by=user.id,
+                    config_json={
+                        "files": [{"path": str(source)}],
+                        "output_path": str(tmp_path / "output"),
+                    },
+                ),
+                Job(
+                    job_type="repack",
+                    status="completed",
+                    created_by=user.id,
+                    config_json={"file_path": str(tmp_path / "wizard" / "unrelated.epub")},
+                ),
+            ]
+        )
+        db.session.commit()
+
+        report = collector.collect()
+
+        assert report["orphans"] == 0
+        assert source.exists() and staging.exists()
+
+    def test_relative_file_path_under_symlinked_root(
+        self, app, tmp_path: Path, monkeypatch
+    ) -> None:
+        """Test file_path relatif sous une racine liée par symlink : fichier conservé."""
+        storage = tmp_path / "storage" / "uploads" / "wizard"
+        storage.mkdir(parents=True)
+        deploy = tmp_path / "app"
+        deploy.mkdir()
+        (deploy / "uploads").symlink_to(storage.parent, target_is_directory=True)
+        live = storage / "release_5_book.epub"
+        live.write_bytes(b"live")
+        orphan = storage / "release_6_book.epub"
+        orphan.write_bytes(b"orphan")
+        _age(live, orphan)
+        monkeypatch.chdir(deploy)
+        collector = OrphanCollectorService(
+            BlobStoreService(tmp_path / "blobs"),
+            upload_roots=[Path("uploads/wizard")],
+            grace_seconds=3600,
+        )
+        user = _user()
+        db.session.add(
+            Release(
+                user_id=user.id,
+                release_type="EBOOK",
+                file_path="uploads/wizard/release_5_book.epub",
+            )
+        )
+        db.session.commit()
+
+        report = collector.collect()
+
+        assert report["removed"] == 1
+        assert live.exists()
+        assert not orphan.exists()
+
+    def test_deletes_in_rate_limited_batches(self, app, tmp_path: Path) -> None:
+        """Test suppression par lots avec pause entre les lots, et mode dry_run."""
+        collector = self._collector(tmp_path, batch_size=2, batch_pause=0.5)
+        pauses: list[float] = []
+        collector.sleep = pauses.append
+        (tmp_path / "wizard").mkdir()
+        files = [tmp_path / "wizard" / f"release_{i}.epub" for i in range(5)]
+        for path in files:
+            path.write_bytes(b"12345")
+        _age(*files)
+
+        preview = collector.collect(dry_run=True)
+        assert preview["orphans"] == 5
+        assert preview["removed"] == 0
+        assert all(path.exists() for path in files)
+
+        report = collector.collect()
+
+        assert report["batches"] == 3
+        assert pauses == [0.5, 0.5]
+        assert report["bytes_reclaimed"] == 25
+        assert not any(path.exists() for path in files)
+
+
+class TestGcJob:
+    """Tests du job "gc"."""
+
+    def test_gc_job_persists_report(self, app, tmp_path: Path) -> None:
+        """Test job gc : orphelins supprimés, rapport stocké dans config_json."""
+        app.config["UPLOAD_BLOB_ROOT"] = str(tmp_path / "blobs")
+        app.config["UPLOAD_GC_LEGACY_DIRS"] = [str(tmp_path / "wizard")]
+        app.config["PACKAGING_STAGING_ROOTS"] = []
+        (tmp_path / "wizard").mkdir()
+        orphan = tmp_path / "wizard" / "release_9_book.epub"
+        orphan.write_bytes(b"orphan")
+        _age(orphan)
+        job = Job(job_type="gc", status="pending", config_json={}, created_by=_user().id)
+        db.session.add(job)
+        db.session.commit()
+
+        JobService().process_job(job.id)
+
+        job = db.session.get(Job, job.id)
+        assert job.status == "completed"
+        assert job.config_json["gc_report"]["removed"] == 1
+        assert job.config_json["gc_report"]["bytes_reclaimed"] == 6
+        assert not orphan.exists()
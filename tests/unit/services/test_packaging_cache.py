@@ -0,0 +1,82 @@
+"""Tests unitaires pour le cache de build de PackagingService.
+
+Ces tests vérifient le manifeste de build (checksums, NFO, nommage,
+compression), la réutilisation d'un ZIP existant et le caractère
+déterministe de la sortie ZIP.
+"""
+
+from __future__ import annotations
+
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+from web.services.packaging import PackagingService
+from web.services.packaging.packaging_service import ZIP_FIXED_DATE_TIME
+
+RELEASE_NAME = "Test-Book-TESTGROUP-20250124"
+
+
+def _release_data(source: Path, nfo: str = "NFO") -> dict:
+    return {
+        "name": RELEASE_NAME,
+        "group": "TESTGROUP",
+        "files": [{"path": str(source), "name": "book.epub"}],
+        "metadata": {},
+        "nfo_content": nfo,
+    }
+
+
+def _source(tmp_path: Path) -> Path:
+    source = tmp_path / "source.epub"
+    source.write_bytes(b"epub content" * 100)
+    return source
+
+
+class TestPackagingCache:
+    """Tests unitaires pour le manifeste et la réutilisation des packages."""
+
+    def test_manifest_hash_tracks_inputs(self, tmp_path: Path) -> None:
+        """Test hash stable pour les mêmes entrées, différent si NFO ou compression change."""
+        source = _source(tmp_path)
+        files = [{"path": str(source), "name": "book.epub"}]
+
+        first = PackagingService().compute_manifest(RELEASE_NAME, files, "NFO")
+        second = PackagingService().compute_manifest(RELEASE_NAME, files, "NFO")
+        other_nfo = PackagingService().compute_manifest(RELEASE_NAME, files, "NFO v2")
+        stored = PackagingService(compression=zipfile.ZIP_STORED).compute_manifest(
+            RELEASE_NAME, files, "NFO"
+        )
+
+        assert first["hash"] == second["hash"]
+        assert len({first["hash"], other_nfo["hash"], stored["hash"]}) == 3
+        assert first["manifest"]["files"][0]["name"] == "book.epub"
+
+    def test_repackage_reuses_existing_zip(self, tmp_path: Path) -> None:
+        """Test qu'un second packaging identique réutilise le ZIP sans le reconstruire."""
+        source = _source(tmp_path)
+        output = tmp_path / "out"
+        service = PackagingService()
+
+        first = service.package_release(_release_data(source), output)
+        with patch.object(service, "_create_zip_file") as create_zip:
+            second = service.package_release(_release_data(source), output)
+
+        create_zip.assert_not_called()
+        assert first["cached"] is False
+        assert second["cached"] is True
+        assert second["checksums"] == first["checksums"]
+        assert second["manifest_hash"] == first["manifest_hash"]
+
+    def test_zip_output_is_deterministic(self, tmp_path: Path) -> None:
+        """Test ZIP identique octet pour octet entre deux builds (dates fixes, ordre trié)."""
+        source = _source(tmp_path)
+
+        first = PackagingService().package_release(_release_data(source), tmp_path / "a")
+        source.touch()
+        second = PackagingService().package_release(_release_data(source), tmp_path / "b")
+
+        assert Path(first["zip_path"]).read_bytes() == Path(second["zip_path"]).read_bytes()
+        with zipfile.ZipFile(first["zip_path"]) as archive:
+            assert archive.namelist() == [f"{RELEASE_NAME}.nfo", "book.epub"]
+            assert {info.date_time for info in archive.infolist()} == {ZIP_FIXED_DATE_TIME}
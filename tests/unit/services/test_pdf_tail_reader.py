@@ -0,0 +1,157 @@
+"""Tests unitaires pour PdfTailReader (extraction PDF à coût borné).
+
+Ces tests vérifient la lecture de /Info, XMP et /Pages /Count depuis la fin
+du fichier (table xref classique et flux xref avec flux d'objets), ainsi que
+le respect des budgets et le rapport de timings.
+"""
+
+from __future__ import annotations
+
+import zlib
+from pathlib import Path
+
+from pypdf import PdfWriter
+
+from web.services.metadata import MetadataExtractionService
+from web.services.metadata.pdf_tail_reader import PdfTailReader
+
+XMP_PACKET = (
+    b'<x:xmpmeta xmlns:x="adobe:ns:meta/">'
+    b'<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">'
+    b'<rdf:Description xmlns:dc="http://purl.org/dc/elements/1.1/" '
+    b'xmlns:xmp="http://ns.adobe.com/xap/1.0/" xmp:CreateDate="2019-07-08T10:00:00Z">'
+    b"<dc:title><rdf:Alt><rdf:li>XMP Title</rdf:li></rdf:Alt></dc:title>"
+    b"<dc:creator><rdf:Seq><rdf:li>XMP Author</rdf:li></rdf:Seq></dc:creator>"
+    b"</rdf:Description></rdf:RDF></x:xmpmeta>"
+)
+
+
+def _write_classic_pdf(path: Path) -> Path:
+    writer = PdfWriter()
+    for _ in range(3):
+        writer.add_blank_page(100, 100)
+    writer.add_metadata(
+        {"/Title": "Bounded Title", "/Author": "Jane Roe, John Doe", "/Subject": "About"}
+    )
+    with path.open("wb") as f:
+        writer.write(f)
+    return path
+
+
+def _png_up_rows(rows: list[bytes]) -> bytes:
+    previous = bytes(len(rows[0]))
+    encoded = b""
+    for row in rows:
+        encoded += b"\x02" + bytes((b - p) & 0xFF for b, p in zip(row, previous, strict=True))
+        previous = row
+    return encoded
+
+
+def _write_xref_stream_pdf(path: Path) -> Path:
+    """PDF 1.5 : /Info dans un flux d'objets, XMP non compressé, flux xref prédit."""
+    objects: dict[int, bytes] = {
+        1: b"<< /Type /Catalog /Pages 2 0 R /Metadata 5 0 R >>",
+        2: b"<< /Type /Pages /Kids [] /Count 7 >>",
+    }
+    info = b"<< /Producer (test) /CreationDate (D:20200102030405Z) >>"
+    objstm_data = b"4 0 " + info
+    objects[3] = (
+        b"<< /Type /ObjStm /N 1 /First 4 /Filter /FlateDecode /Length %d >>\nstream\n"
+        % len(zlib.compress(objstm_data))
+        + zlib.compress(objstm_data)
+        + b"\nendstream"
+    )
+    objects[5] = (
+        b"<< /Type /Metadata /Subtype /XML /Length %d >>\nstream\n" % len(XMP_PACKET)
+        + XMP_PACKET
+        + b"\nendstream"
+    )
+
+    out = b"%PDF-1.5\n"
+    offsets: dict[int, int] = {}
+    for num in sorted(objects):
+        offsets[num] = len(out)
+        out += b"%d 0 obj\n" % num + objects[num] + b"\nendobj\n"
+
+    xref_offset = len(out)
+    offsets[6] = xref_offset
+    rows = [bytes([0]) + (0).to_bytes(4, "big") + (65535).to_bytes(2, "big")]
+    for num in range(1, 7):
+        if num == 4:  # noqa: PLR2004
+            rows.append(bytes([2]) + (3).to_bytes(4, "big") + (0).to_bytes(2, "big"))
+        else:
+            rows.append(bytes([1]) + offsets[num].to_bytes(4, "big") + (0).to_bytes(2, "big"))
+    xref_data = zlib.compress(_png_up_rows(rows))
+    out += (
+        b"6 0 obj\n<< /Type /XRef /Size 7 /W [1 4 2] /Root 1 0 R /Info 4 0 R "
+        b"/Filter /FlateDecode /DecodeParms << /Predictor 12 /Columns 7 >> "
+        b"/Length %d >>\nstream\n" % len(xref_data)
+        + xref_data
+        + b"\nendstream\nendobj\nstartxref\n%d\n%%%%EOF\n" % xref_offset
+    )
+    path.write_bytes(out)
+    return path
+
+
+class TestPdfTailReader:
+    """Tests unitaires pour PdfTailReader."""
+
+    def test_read_classic_xref(self, tmp_path: Path) -> None:
+        """Test lecture /Info et nombre de pages sur une table xref classique."""
+        result = PdfTailReader().read(_write_classic_pdf(tmp_path / "a.pdf"))
+
+        assert result["title"] == "Bounded Title"
+        assert result["author"] == ["Jane Roe", "John Doe"]
+        assert result["description"] == "About"
+        assert result["page_count"] == 3
+        assert result["extraction"]["complete"] is True
+        assert result["extraction"]["xmp_loaded"] is False
+        assert set(result["extraction"]["timings"]) >= {"xref_ms", "info_ms", "total_ms"}
+
+    def test_read_xref_stream_with_lazy_xmp(self, tmp_path: Path) -> None:
+        """Test flux xref + flux d'objets ; XMP chargé car /Info incomplet."""
+        result = PdfTailReader().read(_write_xref_stream_pdf(tmp_path / "b.pdf"))
+
+        assert result["extraction"]["error"] is None
+        assert result["title"] == "XMP Title"
+        assert result["author"] == ["XMP Author"]
+        assert result["publication_date"] == "D:20200102030405Z"
+        assert result["page_count"] == 7
+        assert result["extraction"]["xmp_loaded"] is True
+
+    def test_byte_budget_exceeded(self, tmp_path: Path) -> None:
+        """Test arrêt sur budget d'octets avec rapport incomplet."""
+        path = _write_classic_pdf(tmp_path / "a.pdf")
+
+        result = PdfTailReader(max_bytes=512).read(path)
+
+        assert result["extraction"]["complete"] is False
+        assert "Budget d'octets" in result["extraction"]["error"]
+        assert result["extraction"]["bytes_read"] > 512  # noqa: PLR2004
+
+    def test_broken_tail_is_reported_not_recovered(self, tmp_path: Path) -> None:
+        """Test qu'un PDF sans startxref est signalé sans reconstruction."""
+        path = tmp_path / "broken.pdf"
+        path.write_bytes(b"%PDF-1.4\n" + b"garbage " * 1000)
+
+        result = PdfTailReader().read(path)
+
+        assert result["extraction"]["complete"] is False
+        assert "startxref" in result["extraction"]["error"]
+        assert result["extraction"]["bytes_read"] <= 1024  # noqa: PLR2004
+
+    def test_extract_metadata_bounded_mode(self, tmp_path: Path) -> None:
+        """Test mode bounded d'extract_metadata (pages, rapport de coût, sans checksums)."""
+        path = _write_classic_pdf(tmp_path / "a.pdf")
+        service = MetadataExtractionService()
+
+        metadata = service.extract_metadata(path, bounded=True)
+        explicit = service.extract_metadata(path, calculate_checksums=True, bounded=True)
+
+        assert "checksums" not in metadata
+        assert set(explicit["checksums"]) == {"sha256", "md5"}
+
+        assert metadata["format"] == "PDF"
+        assert metadata["title"] == "Bounded Title"
+        assert metadata["pages"] == 3
+        assert metadata["extraction"]["mode"] == "bounded"
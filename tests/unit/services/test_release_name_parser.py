@@ -0,0 +1,134 @@
+"""Tests unitaires pour ReleaseNameParserService.
+
+Ces tests vérifient la grammaire des noms de releases (dispositions
+dirnaming, dated et scene), l'aller-retour avec le formatage et l'API par lot.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from web.services.formatter import ReleaseFormatterService, ReleaseNameParserService
+
+
+class TestReleaseNameParserService:
+    """Tests unitaires pour ReleaseNameParserService."""
+
+    def test_parse_dirnaming(self) -> None:
+        """Test nom DIRNAMING complet : tous les champs et le tag eBook."""
+        parsed = ReleaseNameParserService().parse(
+            "GRP-Some.Author-Some.Title-EPUB-French-2020-9781234567897-eBook"
+        )
+
+        assert parsed == {
+            "title": "Some.Title",
+            "author": "Some.Author",
+            "format": "EPUB",
+            "language": "French",
+            "year": "2020",
+            "isbn": "9781234567897",
+            "group": "GRP",
+            "date": None,
+            "tags": ["eBook"],
+            "layout": "dirnaming",
+        }
+
+    def test_parse_filename_strips_extension(self) -> None:
+        """Test nom de fichier : extension retirée, groupe et auteur détectés."""
+        parsed = ReleaseNameParserService().parse("TestGroup-AuthorName-BookTitle-EPUB.epub")
+
+        assert parsed["group"] == "TestGroup"
+        assert parsed["author"] == "AuthorName"
+        assert parsed["title"] == "BookTitle"
+        assert parsed["format"] == "EPUB"
+
+    @pytest.mark.parametrize(
+        ("name", "title", "fmt"),
+        [
+            ("my_book.epub", "my_book", None),
+            ("Stephen.King-The.Stand.epub", "Stephen.King-The.Stand", None),
+            ("Some.Title-EPUB", "Some.Title", "EPUB"),
+        ],
+    )
+    def test_plain_filenames_have_no_group(self, name: str, title: str, fmt: str | None) -> None:
+        """Test noms de fichiers ordinaires (moins de trois tokens) : titre seul."""
+        parser = ReleaseNameParserService()
+
+        parsed = parser.parse(name)
+
+        assert (parsed["group"], parsed["author"]) == (None, None)
+        assert (parsed["title"], parsed["format"]) == (title, fmt)
+        assert parser.format_name(parsed) == name.removesuffix(".epub")
+
+    def test_parse_dated_and_scene_layouts(self) -> None:
+        """Test dispositions Title-GROUP-YYYYMMDD et ...-eBook-GROUP."""
+        parser = ReleaseNameParserService()
+
+        dated = parser.parse("Test-Book-TESTGROUP-20250124")
+        scene = parser.parse("Stephen.King-It-2019-RETAIL-eBook-GRP")
+
+        assert (dated["layout"], dated["title"], dated["group"]) == (
+            "dated",
+            "Test-Book",
+            "TESTGROUP",
+        )
+        assert dated["date"] == "20250124"
+        assert scene["layout"] == "scene"
+        assert (scene["author"], scene["title"], scene["group"]) == ("Stephen.King", "It", "GRP")
+        assert scene["year"] == "2019"
+        assert scene["tags"] == ["RETAIL", "eBook"]
+
+    def test_keywords_inside_title_stay_free(self) -> None:
+        """Test mots-clés avant le dernier token libre : conservés dans le titre."""
+        parser = ReleaseNameParserService()
+
+        parsed = parser.parse("GRP-Author-1984-English-Title-EPUB-IT")
+        code_without_format = parser.parse("GRP-Author-IT")
+
+        assert parsed["title"] == "1984-English-Title"
+        assert parsed["year"] is None
+        assert parsed["language"] == "IT"
+        assert code_without_format["title"] == "IT"
+        assert code_without_format["language"] is None
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "GRP-Some.Author-Some.Title-EPUB-English-2020-9781234567897-eBook",
+            "GRP-Author-Title-PDF",
+            "Test-Book-TESTGROUP-20250124",
+            "Stephen.King-It-2019-RETAIL-eBook-GRP",
+        ],
+    )
+    def test_round_trip(self, name: str) -> None:
+        """Test aller-retour : format_name(parse(n)) == n pour un nom canonique."""
+        parser = ReleaseNameParserService()
+
+        assert parser.format_name(parser.parse(name)) == name
+
+    def test_round_trip_through_formatter(self) -> None:
+        """Test nom produit par format_release_name relu puis reformaté à l'identique."""
+        formatter = ReleaseFormatterService()
+        parser = ReleaseNameParserService(formatter)
+        name = formatter.format_release_name("Dune: Messiah", "grp", "20250124")
+
+        parsed = parser.parse(name)
+
+        assert (parsed["title"], parsed["group"]) == ("Dune-Messiah", "GRP")
+        assert parser.format_name(parsed) == name
+
+    def test_parse_many(self) -> None:
+        """Test API par lot : un résultat par nom, dans l'ordre."""
+        names = (f"GRP{i}-Author-Title-EPUB" for i in range(3))
+
+        parsed = ReleaseNameParserService().parse_many(names)
+
+        assert [p["group"] for p in parsed] == ["GRP0", "GRP1", "GRP2"]
+
+    def test_parse_empty_name(self) -> None:
+        """Test nom vide : aucun champ renseigné."""
+        parsed = ReleaseNameParserService().parse("")
+
+        assert parsed["title"] is None
+        assert parsed["group"] is None
+        assert parsed["tags"] == []
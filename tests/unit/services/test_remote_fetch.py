@@ -0,0 +1,265 @@
+"""Tests unitaires pour le rapatriement parallèle des sources distantes.
+
+Ces tests vérifient RemoteFetchService contre un serveur HTTP local
+(segments parallèles, reprise après coupure, serveur sans plages,
+vérification du SHA-256) et le job "fetch" créé par le wizard.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+from flask_jwt_extended import create_access_token
+
+from web.extensions import db
+from web.models import Job, Release, User
+from web.services.job import JobService
+from web.services.storage import BlobStoreService, RemoteFetchService, UnsafeURLError
+from web.services.wizard import WizardDraftService
+
+CONTENT = os.urandom(256 * 1024 + 123)
+SHA256 = hashlib.sha256(CONTENT).hexdigest()
+RANGE_RE = re.compile(r"bytes=(\d+)-(\d*)")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serveur de test : plages HTTP, ETag, coupure optionnelle."""
+
+    server: _Server
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_HEAD(self) -> None:
+        self._respond(head=True)
+
+    def do_GET(self) -> None:
+        self._respond(head=False)
+
+    def _respond(self, head: bool) -> None:
+        if self.server.redirect_to:
+            self.send_response(302)
+            self.send_header("Location", self.server.redirect_to)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        start, end = 0, len(CONTENT) - 1
+        match = RANGE_RE.match(self.headers.get("Range", ""))
+        partial = bool(match) and self.server.ranges
+        if partial:
+            start = int(match.group(1))
+            end = int(match.group(2) or end)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(CONTENT)}")
+        else:
+            self.send_response(200)
+        if self.server.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        if head:
+            return
+        body = CONTENT[start : end + 1]
+        with self.server.lock:
+            self.server.range_requests += int(partial)
+            cut = self.server.cut_after
+            if cut is not None:
+                self.server.cut_after = None
+        if cut is not None:
+            body = body[:cut]
+        self.wfile.write(body)
+        with self.server.lock:
+            self.server.bytes_served += len(body)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, ranges: bool = True) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.ranges = ranges
+        self.cut_after: int | None = None
+        self.redirect_to: str | None = None
+        self.range_requests = 0
+        self.bytes_served = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/files/Book-GRP.epub"
+
+
+@pytest.fixture
+def server():
+    servers: list[_Server] = []
+
+    def start(ranges: bool = True) -> _Server:
+        instance = _Server(ranges)
+        threading.Thread(target=instance.serve_forever, daemon=True).start()
+        servers.append(instance)
+        return instance
+
+    yield start
+    for instance in servers:
+        instance.shutdown()
+        instance.server_close()
+
+
+def _fetcher(tmp_path: Path, **kwargs) -> RemoteFetchService:
+    options = {
+        "segments": 4,
+        "min_segment_size": 32 * 1024,
+        "timeout": 5,
+        "allowed_hosts": ["127.0.0.1"],
+        **kwargs,
+    }
+    return RemoteFetchService(BlobStoreService(tmp_path / "blobs"), **options)
+
+
+class TestRemoteFetchService:
+    """Tests unitaires pour RemoteFetchService."""
+
+    def test_parallel_ranged_fetch(self, tmp_path: Path, server) -> None:
+        """Test téléchargement en 4 segments parallèles, blob vérifié dans le store."""
+        http = server()
+        events: list[dict] = []
+
+        result = _fetcher(tmp_path).fetch(
+            http.url, expected_sha256=SHA256, progress_callback=events.append
+        )
+
+        assert result["sha256"] == SHA256
+        assert result["segments"] == 4
+        assert result["filename"] == "Book-GRP.epub"
+        assert Path(result["path"]).read_bytes() == CONTENT
+        assert Path(result["path"]).suffix == ".epub"
+        assert http.range_requests == 4
+        assert events[-1]["phase"] == "done"
+        assert list((tmp_path / "blobs" / "partial").iterdir()) == []
+
+    def test_resume_after_interrupted_segment(self, tmp_path: Path, server) -> None:
+        """Test reprise : seuls les octets manquants sont redemandés."""
+        http = server()
+        http.cut_after = 100_000
+
+        with pytest.raises(requests.RequestException):
+            _fetcher(tmp_path, segments=1, retries=0).fetch(http.url)
+        assert http.bytes_served == 100_000
+
+        result = _fetcher(tmp_path, segments=1).fetch(http.url, expected_sha256=SHA256)
+
+        resumed = result["resumed_bytes"]
+        assert 0 < resumed <= 100_000
+        assert http.bytes_served == 100_000 + len(CONTENT) - resumed
+        assert Path(result["path"]).read_bytes() == CONTENT
+
+    def test_server_without_ranges(self, tmp_path: Path, server) -> None:
+        """Test repli sur un flux unique quand le serveur ignore les plages."""
+        http = server(ranges=False)
+
+        result = _fetcher(tmp_path).fetch(http.url)
+
+        assert result["segments"] == 1
+        assert result["sha256"] == SHA256
+
+    def test_checksum_mismatch_discards_partial(self, tmp_path: Path, server) -> None:
+        """Test rejet d'un SHA-256 différent, aucun fichier conservé."""
+        http = server()
+
+        with pytest.raises(ValueError, match="SHA-256"):
+            _fetcher(tmp_path).fetch(http.url, expected_sha256="0" * 64)
+
+        assert list((tmp_path / "blobs" / "partial").iterdir()) == []
+        assert list((tmp_path / "blobs" / "objects").iterdir()) == []
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "http://127.0.0.1/book.epub",
+            "http://localhost:8080/book.epub",
+            "http://169.254.169.254/latest/meta-data/",
+            "http://10.0.0.5/book.epub",
+            "http://[::1]/book.epub",
+            "http://[::ffff:127.0.0.1]/book.epub",
+            "ftp://93.184.216.34/book.epub",
+        ],
+    )
+    def test_internal_urls_rejected(self, url: str) -> None:
+        """Test protection SSRF : loopback, lien local, privé et schémas refusés."""
+        with pytest.raises(UnsafeURLError):
+            RemoteFetchService.validate_url(url)
+        with pytest.raises(UnsafeURLError):
+            RemoteFetchService.validate_url(url, resolve=False)
+
+        RemoteFetchService.validate_url("http://93.184.216.34/book.epub")
+        RemoteFetchService.validate_url("https://unresolvable.invalid/book.epub", resolve=False)
+        RemoteFetchService.validate_url("http://127.0.0.1/book.epub", ["127.0.0.1"])
+
+    def test_redirect_to_internal_host_rejected(self, tmp_path: Path, server) -> None:
+        """Test chaque redirection revalidée : hôte autorisé redirigeant vers localhost."""
+        http = server()
+        http.redirect_to = http.url.replace("127.0.0.1", "localhost")
+
+        with pytest.raises(UnsafeURLError, match="localhost"):
+            _fetcher(tmp_path).fetch(http.url)
+
+        assert http.bytes_served == 0
+
+
+class TestFetchJob:
+    """Tests du job "fetch" créé par le wizard pour un file_url."""
+
+    def test_wizard_url_fetched_by_job(self, app, client, tmp_path: Path, server) -> None:
+        """Test URL enregistrée par le wizard puis rapatriée par le job."""
+        http = server()
+        app.config["UPLOAD_BLOB_ROOT"] = str(tmp_path / "blobs")
+        app.config["REMOTE_FETCH_ALLOWED_HOSTS"] = ["127.0.0.1"]
+        user = User(username="fetcher", email="fetcher@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        release = Release(user_id=user.id, release_type="EBOOK", status="draft")
+        db.session.add(release)
+        db.session.commit()
+
+        response = client.post(
+            f"/api/wizard/{release.id}/upload",
+            json={"file_url": http.url, "sha256": SHA256},
+            headers={"Authorization": f"Bearer {create_access_token(identity=user.id)}"},
+        )
+        job_id = response.get_json()["fetch_job_id"]
+        JobService().process_job(job_id)
+
+        job = db.session.get(Job, job_id)
+        release = db.session.get(Release, release.id)
+        assert job.status == "completed"
+        assert job.progress["percent"] == 100.0
+        assert Path(release.file_path).read_bytes() == CONTENT
+        metadata = WizardDraftService().effective_metadata(release)
+        assert metadata["original_filename"] == "Book-GRP.epub"
+        assert metadata["file_url"] == http.url
+
+    def test_wizard_rejects_internal_url(self, app, client) -> None:
+        """Test file_url interne refusé par le wizard, aucun job créé."""
+        user = User(username="ssrf", email="ssrf@test.com")
+        user.set_password("password")
+        release = Release(user=user, release_type="EBOOK", status="draft")
+        db.session.add_all([user, release])
+        db.session.commit()
+
+        response = client.post(
+            f"/api/wizard/{release.id}/upload",
+            json={"file_url": "http://169.254.169.254/latest/meta-data/"},
+            headers={"Authorization": f"Bearer {create_access_token(identity=user.id)}"},
+        )
+
+        assert response.status_code == 400
+        assert Job.query.filter_by(job_type="fetch").count() == 0
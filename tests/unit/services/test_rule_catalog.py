@@ -0,0 +1,105 @@
+"""Tests unitaires pour RuleCatalogService (catalogue scenerules.org annoté).
+
+Ces tests vérifient la requête de projection (aucun contenu de règle lu),
+la mise en cache du catalogue et son invalidation après une écriture de
+règle via l'API (upload).
+"""
+
+from __future__ import annotations
+
+import io
+from unittest.mock import Mock
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from web.extensions import cache, db
+from web.models import Rule, User
+from web.services.rule import RuleCatalogService
+
+CATALOGUE = [
+    {"name": "[2022] eBOOK", "section": "eBOOK", "year": 2022, "scene": "English"},
+    {"name": "[2020] TV-720p", "section": "TV-720p", "year": 2020, "scene": "English"},
+]
+
+
+def _downloader() -> Mock:
+    downloader = Mock()
+    downloader.list_available_rules.return_value = CATALOGUE
+    return downloader
+
+
+class TestRuleCatalogService:
+    """Tests unitaires pour RuleCatalogService."""
+
+    def test_projection_query_skips_content(self, app) -> None:
+        """Test index (section, year) -> id sans lecture de la colonne content."""
+        db.session.add_all(
+            [
+                Rule(name="old", content="x" * 50_000, section="eBOOK", year=2022),
+                Rule(name="new", content="y" * 50_000, section="eBOOK", year=2022),
+                Rule(name="no-year", content="z", section="eBOOK"),
+            ]
+        )
+        db.session.commit()
+        statements: list[str] = []
+
+        def capture(_conn, _cursor, statement, *_args) -> None:
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", capture)
+        try:
+            index = RuleCatalogService.local_rule_ids()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", capture)
+
+        assert index == {("eBOOK", 2022): 2}
+        assert len(statements) == 1
+        assert "content" not in statements[0]
+
+    def test_catalogue_is_cached_and_invalidated(self, app) -> None:
+        """Test catalogue servi depuis le cache puis reconstruit après invalidate()."""
+        cache.clear()
+        downloader = _downloader()
+        service = RuleCatalogService(downloader)
+
+        first = service.catalogue()
+        first[0]["is_downloaded"] = "modified by caller"
+        db.session.add(Rule(name="[2022] eBOOK", content="rule", section="eBOOK", year=2022))
+        db.session.commit()
+        cached = service.catalogue()
+        RuleCatalogService.invalidate()
+        rebuilt = service.catalogue()
+
+        assert downloader.list_available_rules.call_count == 2
+        assert cached[0]["is_downloaded"] is False
+        assert rebuilt[0]["is_downloaded"] is True
+        assert rebuilt[0]["local_rule_id"] == 1
+        assert "local_rule_id" not in rebuilt[1]
+
+    def test_upload_invalidates_listing(self, app, client) -> None:
+        """Test GET /rules/scenerules reflète un upload de règle immédiatement."""
+        cache.clear()
+        user = User(username="ruler", email="ruler@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        headers = {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}
+
+        before = client.get("/api/rules/scenerules?section=eBOOK&year=2022", headers=headers)
+        client.post(
+            "/api/rules/upload",
+            data={
+                "file": (io.BytesIO(b"[2022] eBOOK rules"), "ebook.nfo"),
+                "section": "eBOOK",
+                "year": "2022",
+                "scene": "English",
+            },
+            headers=headers,
+            content_type="multipart/form-data",
+        )
+        after = client.get("/api/rules/scenerules?section=eBOOK&year=2022", headers=headers)
+
+        assert before.get_json()["rules"][0]["is_downloaded"] is False
+        assert after.get_json()["rules"][0]["is_downloaded"] is True
+        assert after.get_json()["rules"][0]["local_rule_id"] == 1
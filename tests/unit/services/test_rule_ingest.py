@@ -0,0 +1,195 @@
+"""Tests unitaires pour RuleIngestService (ingestion des fichiers de règles).
+
+Ces tests vérifient la détection du jeu de caractères, la détection des
+métadonnées en un seul parcours, la spécification compilée, et les uploads
+POST /api/rules/upload et /api/rules/upload/bulk (fichiers multiples, ZIP,
+erreurs par fichier).
+"""
+
+from __future__ import annotations
+
+import io
+import zipfile
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from web.extensions import db
+from web.models import Rule, RuleRevision, User
+from web.services.rule import RuleIngestError, RuleIngestService
+
+EBOOK = """[English Scene]
+[2022] eBOOK RULES
+1) Releases must be packed in ZIP files.
+Updated (2021), first version 2019.
+"""
+
+
+def _zip(members: dict[str, bytes]) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+class TestRuleIngestService:
+    """Tests unitaires pour RuleIngestService."""
+
+    @pytest.mark.parametrize(
+        ("raw", "expected"),
+        [
+            ("║░ règle ░║".encode(), ("║░ règle ░║", "utf-8")),
+            (b"\xef\xbb\xbfrules", ("rules", "utf-8-sig")),
+            ("rules é".encode("utf-16"), ("rules é", "utf-16")),
+            ("╔══╗ ▓▒░ RULES ░▒▓".encode("cp437"), ("╔══╗ ▓▒░ RULES ░▒▓", "cp437")),
+            ("Règles – été".encode("cp1252"), ("Règles – été", "cp1252")),
+            (b"\x81\x8d\x8f", ("\x81\x8d\x8f", "iso-8859-1")),
+        ],
+    )
+    def test_decode_detects_charset(self, raw: bytes, expected: tuple[str, str]) -> None:
+        """Test BOM, UTF-8, art ASCII CP437, CP1252 et repli ISO-8859-1."""
+        assert RuleIngestService.decode(raw) == expected
+
+    def test_sniff_priorities(self) -> None:
+        """Test scène, section (nom et non année) et année la plus récente entre crochets."""
+        assert RuleIngestService.sniff(EBOOK) == {
+            "scene": "English",
+            "section": "eBOOK",
+            "year": 2022,
+        }
+        assert RuleIngestService.sniff("X264 Rules [2020]\nScene: french") == {
+            "scene": "french",
+            "section": "X264",
+            "year": 2020,
+        }
+        assert RuleIngestService.sniff("Section: MP3 (2018) 2024 [1800]") == {
+            "scene": None,
+            "section": "MP3",
+            "year": 2018,
+        }
+        assert RuleIngestService.sniff("nothing here") == {
+            "scene": None,
+            "section": None,
+            "year": None,
+        }
+
+    def test_ingest_overrides_and_spec(self) -> None:
+        """Test valeurs fournies prioritaires et spécification eBOOK compilée."""
+        service = RuleIngestService(max_rule_bytes=1024)
+
+        item = service.ingest(EBOOK.encode(), "dir/ebook.rules.nfo", {"year": 2023})
+        other = service.ingest(b"Section: FLAC", "flac.txt", {"name": "Flac"})
+
+        assert (item["name"], item["scene"], item["year"]) == ("ebook.rules", "English", 2023)
+        assert item["spec"] is not None
+        assert "file_formats" in item["spec"]
+        assert (other["name"], other["section"], other["spec"]) == ("Flac", "FLAC", None)
+        with pytest.raises(RuleIngestError, match="too large"):
+            service.ingest(b"x" * 1025, "big.nfo")
+
+
+class TestRuleUploadEndpoints:
+    """Tests de POST /api/rules/upload et /api/rules/upload/bulk."""
+
+    @pytest.fixture
+    def headers(self, app) -> dict[str, str]:
+        user = User(username="uploader", email="uploader@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        db.session.commit()
+        return {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}
+
+    def test_single_upload_reports_encoding_and_spec(self, client, headers) -> None:
+        """Test upload simple : décodage CP437, métadonnées et spécification."""
+        response = client.post(
+            "/api/rules/upload",
+            data={"file": (io.BytesIO(f"╔═╗\n{EBOOK}".encode("cp437")), "ebook.nfo")},
+            headers=headers,
+            content_type="multipart/form-data",
+        )
+
+        data = response.get_json()
+        assert response.status_code == 201
+        assert data["encoding"] == "cp437"
+        assert data["metadata_extracted"] == {"scene": "English", "section": "eBOOK", "year": 2022}
+        assert data["rule"]["content"].startswith("╔═╗")
+        assert data["spec"] is not None
+
+    def test_bulk_upload_files_and_zip(self, app, client, headers) -> None:
+        """Test lot : fichiers et membres ZIP insérés, fichiers refusés signalés."""
+        archive = _zip(
+            {
+                "rules/tv.nfo": b"[2021] TV-720p RULES",
+                "rules/notes.md": b"ignored",
+                "__MACOSX/rules/._tv.nfo": b"ignored",
+                "mp3.txt": b"Section: MP3 [2019]",
+            }
+        )
+
+        response = client.post(
+            "/api/rules/upload/bulk",
+            data={
+                "files": [
+                    (io.BytesIO(EBOOK.encode()), "ebook.nfo"),
+                    (archive, "pack.zip"),
+                    (io.BytesIO(b"data"), "cover.jpg"),
+                ]
+            },
+            headers=headers,
+            content_type="multipart/form-data",
+        )
+
+        assert response.status_code == 400
+        assert "cover.jpg" in response.get_json()["message"]
+        assert Rule.query.count() == 0
+
+        archive.seek(0)
+        response = client.post(
+            "/api/rules/upload/bulk",
+            data={"files": [(io.BytesIO(EBOOK.encode()), "ebook.nfo"), (archive, "pack.zip")]},
+            headers=headers,
+            content_type="multipart/form-data",
+        )
+
+        data = response.get_json()
+        assert response.status_code == 201
+        assert data["count"] == 3
+        assert [(r["file"], r["section"], r["year"]) for r in data["rules"]] == [
+            ("ebook.nfo", "eBOOK", 2022),
+            ("pack.zip/rules/tv.nfo", "TV-720p", 2021),
+            ("pack.zip/mp3.txt", "MP3", 2019),
+        ]
+        assert RuleRevision.query.count() == 3
+
+    def test_bulk_upload_limits(self, app, client, headers) -> None:
+        """Test membres trop volumineux, archive invalide et nombre maximal de fichiers."""
+        app.config["RULES_UPLOAD_MAX_BYTES"] = 16
+        app.config["RULES_UPLOAD_MAX_FILES"] = 2
+
+        too_big = client.post(
+            "/api/rules/upload/bulk",
+            data={"files": [(_zip({"big.nfo": b"x" * 64}), "pack.zip")]},
+            headers=headers,
+            content_type="multipart/form-data",
+        )
+        corrupt = client.post(
+            "/api/rules/upload/bulk",
+            data={"files": [(io.BytesIO(b"not a zip"), "pack.zip")]},
+            headers=headers,
+            content_type="multipart/form-data",
+        )
+        too_many = client.post(
+            "/api/rules/upload/bulk",
+            data={"files": [(io.BytesIO(b"r"), f"{i}.nfo") for i in range(3)]},
+            headers=headers,
+            content_type="multipart/form-data",
+        )
+        empty = client.post("/api/rules/upload/bulk", headers=headers)
+
+        assert "too large" in too_big.get_json()["message"]
+        assert "invalid ZIP" in corrupt.get_json()["message"]
+        assert "Too many" in too_many.get_json()["message"]
+        assert empty.status_code == 400
+        assert Rule.query.count() == 0
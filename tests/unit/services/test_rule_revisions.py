@@ -0,0 +1,147 @@
+"""Tests unitaires pour RuleRevisionService (historique des règles).
+
+Ces tests vérifient le stockage en snapshots et deltas de lignes, la
+reconstruction exacte de chaque révision, la détection d'un historique
+corrompu, le diff unifié, et l'intégration API (PUT /rules, GET revisions
+et diff, révision épinglée par le wizard).
+"""
+
+from __future__ import annotations
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from web.extensions import db
+from web.models import Release, Rule, RuleRevision, User
+from web.services.rule import RuleRevisionService
+
+BASE = "".join(f"[{i:04d}] rule line with some ASCII art ║░░░║\n" for i in range(400))
+
+
+def _edit(content: str, index: int) -> str:
+    lines = content.splitlines(keepends=True)
+    lines[index] = f"[{index:04d}] amended in revision\n"
+    return "".join(lines)
+
+
+class TestRuleRevisionService:
+    """Tests unitaires pour RuleRevisionService."""
+
+    def test_snapshots_and_deltas_reconstruct_every_revision(self, app) -> None:
+        """Test snapshots périodiques, deltas compacts, reconstruction exacte."""
+        service = RuleRevisionService(snapshot_interval=3)
+        rule = Rule(name="[2022] eBOOK", content=BASE, section="eBOOK", year=2022)
+        db.session.add(rule)
+        contents = [BASE]
+        service.record(rule)
+        for index in range(1, 6):
+            rule.content = _edit(contents[-1], index * 50)
+            contents.append(rule.content)
+            service.record(rule)
+        db.session.commit()
+
+        revisions = service.list_revisions(rule.id)
+
+        assert [r["kind"] for r in revisions] == [
+            "snapshot", "delta", "delta", "snapshot", "delta", "delta",
+        ]  # fmt: skip
+        assert revisions[2]["base_revision"] == 1
+        assert revisions[2]["stored_size"] < len(BASE) // 20
+        for number, expected in enumerate(contents, start=1):
+            assert service.content(rule.id, number) == expected
+
+    def test_unchanged_content_reuses_revision(self, app) -> None:
+        """Test contenu identique : même numéro, aucune nouvelle ligne."""
+        service = RuleRevisionService()
+        rule = Rule(name="r", content="a\nb\n")
+        db.session.add(rule)
+
+        first = service.record(rule)
+        second = service.record(rule)
+
+        assert first == second == 1
+        assert RuleRevision.query.count() == 1
+        assert service.content(rule.id, 2) is None
+
+    def test_large_rewrite_stored_as_snapshot(self, app) -> None:
+        """Test delta trop volumineux remplacé par un snapshot."""
+        service = RuleRevisionService()
+        rule = Rule(name="r", content=BASE)
+        db.session.add(rule)
+        service.record(rule)
+        rule.content = BASE.upper()
+        service.record(rule)
+
+        assert [r["kind"] for r in service.list_revisions(rule.id)] == ["snapshot", "snapshot"]
+
+    def test_corrupted_history_detected(self, app) -> None:
+        """Test empreinte SHA-256 vérifiée à la reconstruction."""
+        service = RuleRevisionService()
+        rule = Rule(name="r", content=BASE)
+        db.session.add(rule)
+        service.record(rule)
+        RuleRevision.query.filter_by(revision=1).one().payload = "tampered"
+        db.session.flush()
+
+        with pytest.raises(ValueError, match="Corrupted revision"):
+            service.content(rule.id, 1)
+
+    def test_diff(self, app) -> None:
+        """Test diff unifié et comptage des lignes ajoutées/supprimées."""
+        service = RuleRevisionService()
+        rule = Rule(name="r", content="one\ntwo\nthree\n")
+        db.session.add(rule)
+        service.record(rule)
+        rule.content = "one\n2\nthree\nfour"
+        service.record(rule)
+
+        diff = service.diff(rule.id, 1, 2, context=0)
+
+        assert (diff["added"], diff["removed"]) == (2, 1)
+        assert "-two\n+2\n" in diff["diff"]
+        assert diff["diff"].endswith("+four\n")
+        assert service.diff(rule.id, 1, 3) is None
+
+
+class TestRuleRevisionEndpoints:
+    """Tests de l'historique via l'API."""
+
+    def test_update_revisions_diff_and_wizard_pin(self, app, client) -> None:
+        """Test PUT crée une révision, GET revisions/diff, révision épinglée par la release."""
+        user = User(username="historian", email="historian@test.com")
+        user.set_password("password")
+        rule = Rule(name="[2022] eBOOK", content=BASE, section="eBOOK", year=2022)
+        db.session.add_all([user, rule])
+        db.session.commit()
+        headers = {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}
+
+        updated = client.put(
+            f"/api/rules/{rule.id}", json={"content": _edit(BASE, 10)}, headers=headers
+        )
+        draft = client.post(
+            "/api/wizard/draft",
+            json={"group": "GRP", "release_type": "EBOOK", "rule_id": rule.id},
+            headers=headers,
+        )
+        listed = client.get(f"/api/rules/{rule.id}/revisions", headers=headers)
+        original = client.get(f"/api/rules/{rule.id}/revisions/1", headers=headers)
+        diff = client.get(f"/api/rules/{rule.id}/diff", headers=headers)
+        missing = client.get(f"/api/rules/{rule.id}/revisions/9", headers=headers)
+        release_id = draft.get_json()["release_id"]
+        client.put(f"/api/rules/{rule.id}", json={"content": BASE}, headers=headers)
+        client.post(
+            f"/api/wizard/{release_id}/finalize",
+            json={"destination_id": 1, "draft_version": 1},
+            headers=headers,
+        )
+
+        assert updated.get_json()["rule"]["revision"] == 2
+        assert [r["kind"] for r in listed.get_json()["revisions"]] == ["snapshot", "delta"]
+        assert original.get_json()["content"] == BASE
+        assert diff.get_json()["from_revision"] == 1
+        assert "+[0010] amended in revision" in diff.get_json()["diff"]
+        assert missing.status_code == 404
+        assert draft.get_json()["rule_revision"] == 2
+        release = db.session.get(Release, release_id)
+        assert release.release_metadata["rule_id"] == rule.id
+        assert release.release_metadata["rule_revision"] == 2
@@ -0,0 +1,154 @@
+"""Tests unitaires pour RuleSearchService (index inversé des règles).
+
+Ces tests vérifient la syntaxe des requêtes (termes, préfixes, phrases,
+filtres), le classement, les extraits surlignés et échappés, le
+rafraîchissement incrémental après écriture et GET /api/rules/search.
+"""
+
+from __future__ import annotations
+
+from flask_jwt_extended import create_access_token
+
+from web.extensions import db
+from web.models import Rule, User
+from web.services.rule import RuleRevisionService, RuleSearchService
+from web.services.rule.rule_search import RuleSearchIndex
+
+EBOOK = """[2022] eBOOK RULES
+1) Releases must be packed in ZIP files, maximum file size 50MB.
+2) NFO must mention the <ISBN> when available.
+3) Retail releases only; scanned books are not allowed.
+"""
+TV = """[2022] TV-720p RULES
+1) Video must be x264, file size depends on runtime.
+2) NFO must mention the source.
+"""
+
+
+def _rules() -> tuple[Rule, Rule]:
+    ebook = Rule(name="[2022] eBOOK", content=EBOOK, section="eBOOK", year=2022)
+    tv = Rule(name="[2022] TV-720p", content=TV, section="TV-720p", year=2022)
+    db.session.add_all([ebook, tv])
+    db.session.commit()
+    return ebook, tv
+
+
+class TestRuleSearchService:
+    """Tests unitaires pour RuleSearchService."""
+
+    def test_terms_phrases_prefixes_and_filters(self, app) -> None:
+        """Test ET des termes, phrase, préfixe, mot composé et filtres de section."""
+        ebook, tv = _rules()
+        service = RuleSearchService()
+
+        assert service.matching_ids("nfo mention") == [ebook.id, tv.id]
+        assert service.matching_ids('"file size" x264') == [tv.id]
+        assert service.matching_ids('"size file"') == []
+        assert service.matching_ids("scan*") == [ebook.id]
+        assert service.matching_ids("TV-720p") == [tv.id]
+        assert service.matching_ids("nfo section:ebook") == [ebook.id]
+        assert [r["id"] for r in service.search("nfo", section="TV-720p")] == [tv.id]
+        assert service.matching_ids("year:2021 nfo") == []
+        assert service.search("section:eBOOK") == []
+
+    def test_name_hits_rank_first_and_snippets(self, app) -> None:
+        """Test bonus du nom, extraits surlignés et échappés HTML."""
+        ebook, _tv = _rules()
+
+        results = RuleSearchService().search("ebook isbn")
+
+        assert results[0]["id"] == ebook.id
+        assert results[0]["section"] == "eBOOK"
+        snippet = next(s for s in results[0]["snippets"] if "ISBN" in s)
+        assert "&lt;<mark>ISBN</mark>&gt;" in snippet
+        assert "\n" not in snippet
+
+    def test_incremental_refresh_after_writes(self, app) -> None:
+        """Test règles modifiées, créées et supprimées reflétées sans reconstruction."""
+        ebook, tv = _rules()
+        index = RuleSearchService.index()
+        assert index.refresh() == 2
+        assert index.refresh() == 0
+
+        ebook.content = EBOOK.replace("ZIP", "RAR")
+        db.session.delete(tv)
+        db.session.add(Rule(name="[2022] X264", content="ZIP not allowed", section="X264"))
+        db.session.commit()
+
+        assert index.refresh() == 3
+        assert RuleSearchService().matching_ids("rar") == [ebook.id]
+        assert [r["name"] for r in RuleSearchService().search("zip")] == ["[2022] X264"]
+        assert len(index) == 2
+
+    def test_writes_within_same_second_are_seen(self, app) -> None:
+        """Test nouvelle révision et invalidate() : updated_at inchangé (MySQL, à la seconde)."""
+        ebook, tv = _rules()
+        RuleRevisionService.record_new([ebook, tv])
+        db.session.commit()
+        index = RuleSearchService.index()
+        index.refresh()
+        stamp = ebook.updated_at
+
+        ebook.content = EBOOK.replace("ZIP", "RAR")
+        ebook.updated_at = stamp
+        RuleRevisionService().record(ebook)
+        db.session.commit()
+
+        assert RuleSearchService().matching_ids("rar") == [ebook.id]
+
+        ebook.name = "[2022] Books"
+        ebook.updated_at = stamp
+        db.session.commit()
+        RuleSearchService.invalidate([ebook.id])
+
+        assert RuleSearchService().matching_ids("books") == [ebook.id]
+        assert index.refresh() == 0
+
+    def test_parse_query(self) -> None:
+        """Test analyse de la requête (filtres, phrases, préfixes)."""
+        clauses, filters = RuleSearchIndex.parse_query('Year:2022 "File  Size" pack* nfo')
+
+        assert filters == {"year": "2022"}
+        assert clauses == [("phrase", ["file", "size"]), ("prefix", ["pack"]), ("term", ["nfo"])]
+
+
+class TestRuleSearchEndpoints:
+    """Tests de GET /api/rules/search et de GET /api/rules?search=."""
+
+    def test_search_endpoint_and_listing(self, app, client) -> None:
+        """Test résultats classés, q requis, liste filtrée par l'index et à jour."""
+        user = User(username="searcher", email="searcher@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        ebook, tv = _rules()
+        headers = {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}
+
+        missing = client.get("/api/rules/search", headers=headers)
+        found = client.get('/api/rules/search?q="file size"&limit=1', headers=headers)
+        listed = client.get("/api/rules?search=x264", headers=headers)
+        client.put(f"/api/rules/{ebook.id}", json={"content": "x264 inside"}, headers=headers)
+        relisted = client.get("/api/rules?search=x264", headers=headers)
+
+        assert missing.status_code == 400
+        assert found.get_json()["count"] == 1
+        assert "<mark>file size</mark>" in found.get_json()["results"][0]["snippets"][0]
+        assert [rule["id"] for rule in listed.get_json()["rules"]] == [tv.id]
+        assert sorted(rule["id"] for rule in relisted.get_json()["rules"]) == [ebook.id, tv.id]
+
+    def test_listing_without_words_applies_filters_only(self, app, client) -> None:
+        """Test ?search= sans mot (« - », « * », filtres seuls) : liste non vidée."""
+        user = User(username="lister", email="lister@test.com")
+        user.set_password("password")
+        db.session.add(user)
+        ebook, tv = _rules()
+        headers = {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}
+
+        def listed(search: str) -> list[int]:
+            response = client.get("/api/rules", query_string={"search": search}, headers=headers)
+            return sorted(rule["id"] for rule in response.get_json()["rules"])
+
+        assert listed("-") == [ebook.id, tv.id]
+        assert listed("*") == [ebook.id, tv.id]
+        assert listed("year:2022 section:tv-720p") == [tv.id]
+        assert listed("year:2021") == []
+        assert listed("nfo section:ebook") == [ebook.id]
@@ -407,21 +407,24 @@ class TestScenerulesDownloadService:
         call_args = service.session.head.call_args
         assert "2022_TV_720p.nfo" in call_args[0][0] or "2022_TV-720p.nfo" in call_args[0][0]
 
+    @patch("web.services.rule.scenerules_download._SHARED_SESSION", None)
     @patch("web.services.rule.scenerules_download.requests.Session")
     def test_session_reuse(self, mock_session_class) -> None:
         """Test réutilisation de la session HTTP.
         
-        Vérifie que la session HTTP est réutilisée pour améliorer les performances.
+        Vérifie que la session HTTP poolée est créée une seule fois et partagée
+        entre les instances du service.
         """
         # Mock de la classe Session
         mock_session = Mock()
         mock_session_class.return_value = mock_session
         
         service = ScenerulesDownloadService()
+        other = ScenerulesDownloadService()
         
         # Vérification que la session a été créée une seule fois
-        assert mock_session_class.called
+        assert mock_session_class.call_count == 1
+        assert service.session is other.session is mock_session
         
         # Vérification que les headers ont été configurés
         mock_session.headers.update.assert_called_once()
-
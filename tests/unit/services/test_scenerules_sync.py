@@ -0,0 +1,192 @@
+"""Tests unitaires pour ScenerulesSyncService (miroir local scenerules.org).
+
+Ces tests utilisent un serveur HTTP local qui sert des NFO avec ETag et
+Last-Modified : première synchronisation complète, requêtes conditionnelles
+(304) ensuite, mise à jour d'une règle modifiée, lecture hors ligne, job
+"scenerules_sync" et téléchargement offline via l'API.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from web.extensions import db
+from web.models import Job, Role, Rule, User
+from web.services.job import JobService
+from web.services.rule import ScenerulesDownloadService, ScenerulesSyncService
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+LAST_MODIFIED = "Mon, 03 Jan 2022 10:00:00 GMT"
+
+
+class _RulesHandler(BaseHTTPRequestHandler):
+    """Serveur de NFO conditionnel (ETag dérivé du contenu)."""
+
+    files: dict[str, bytes] = {}
+    requests_log: list[tuple[str, str | None]] = []
+
+    def do_GET(self) -> None:  # noqa: N802
+        body = self.files.get(self.path)
+        self.requests_log.append((self.path, self.headers.get("If-None-Match")))
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args) -> None:
+        pass
+
+
+@pytest.fixture
+def rules_server() -> Iterator[str]:
+    """Serveur HTTP local servant /nfo/2022_eBOOK.nfo et /nfo/2022_X264.nfo."""
+    _RulesHandler.files = {
+        "/nfo/2022_eBOOK.nfo": "[2022] eBOOK\n╔═ rules v1".encode("cp437"),
+        "/nfo/2022_X264.nfo": b"[2022] X264 rules",
+    }
+    _RulesHandler.requests_log = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RulesHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _rules(base_url: str) -> list[dict]:
+    return [
+        {"name": "[2022] eBOOK", "section": "eBOOK", "year": 2022, "scene": "English",
+         "url_nfo": f"{base_url}/nfo/2022_eBOOK.nfo"},
+        {"name": "[2022] X264", "section": "X264", "year": 2022, "scene": "English",
+         "url_nfo": f"{base_url}/nfo/2022_X264.nfo"},
+        {"name": "[2022] X265", "section": "X265", "year": 2022, "scene": "English",
+         "url_nfo": f"{base_url}/nfo/2022_X265.nfo"},
+    ]  # fmt: skip
+
+
+class TestScenerulesSyncService:
+    """Tests unitaires pour ScenerulesSyncService."""
+
+    def test_sync_then_conditional_requests(self, rules_server: str, tmp_path: Path) -> None:
+        """Test synchronisation complète, puis 304 sans réécriture, puis règle modifiée."""
+        service = ScenerulesSyncService(tmp_path / "mirror", workers=4)
+        rules = _rules(rules_server)
+
+        first = service.sync(rules)
+        mtime = service.rule_path("X264", 2022).stat().st_mtime_ns
+        _RulesHandler.requests_log.clear()
+        second = service.sync(rules)
+        _RulesHandler.files["/nfo/2022_eBOOK.nfo"] = b"[2022] eBOOK rules v2"
+        third = service.sync(rules)
+
+        assert (first["updated"], first["missing"], first["failed"]) == (2, 1, 0)
+        assert first["errors"][0]["name"] == "[2022] X265"
+        assert (second["updated"], second["unchanged"]) == (0, 2)
+        assert all(etag for path, etag in _RulesHandler.requests_log if "X265" not in path)
+        assert service.rule_path("X264", 2022).stat().st_mtime_ns == mtime
+        assert third["updated_rules"] == [{"section": "eBOOK", "year": 2022}]
+        assert service.rule_path("eBOOK", 2022).read_bytes() == b"[2022] eBOOK rules v2"
+        assert service.load_index()["2022_eBOOK"]["last_modified"] == LAST_MODIFIED
+
+    def test_read_offline(self, rules_server: str, tmp_path: Path) -> None:
+        """Test lecture depuis le miroir (jeu de caractères détecté), None si absente."""
+        service = ScenerulesSyncService(tmp_path / "mirror")
+        service.sync(_rules(rules_server))
+
+        rule_data = service.read("eBOOK", 2022)
+
+        assert rule_data["name"] == "[2022] eBOOK"
+        assert rule_data["source"] == "mirror"
+        assert rule_data["content"].startswith("[2022] eBOOK\n")
+        assert rule_data["url"].endswith("/nfo/2022_eBOOK.nfo")
+        assert service.read("X265", 2022) is None
+
+    def test_read_decodes_like_download(self, rules_server: str, tmp_path: Path) -> None:
+        """Test contenu du miroir identique au téléchargement (UTF-8 et CP437)."""
+        _RulesHandler.files["/nfo/2022_X264.nfo"] = "[2022] X264 — règles ║".encode()
+        downloader = ScenerulesDownloadService(base_url=rules_server)
+        service = ScenerulesSyncService(tmp_path / "mirror", downloader=downloader)
+        service.sync(_rules(rules_server))
+
+        for section in ("eBOOK", "X264"):
+            downloaded = downloader.download_rule_by_url(f"{rules_server}/nfo/2022_{section}.nfo")
+            assert service.read(section, 2022)["content"] == downloaded["content"]
+        assert service.read("X264", 2022)["content"].endswith("règles ║")
+        assert "╔═ rules v1" in service.read("eBOOK", 2022)["content"]
+
+    def test_sync_uses_catalogue_and_shared_session(
+        self, rules_server: str, tmp_path: Path
+    ) -> None:
+        """Test liste par défaut du downloader (base_url surchargée), session partagée."""
+        downloader = ScenerulesDownloadService(base_url=rules_server)
+        service = ScenerulesSyncService(tmp_path / "mirror", downloader=downloader)
+
+        report = service.sync()
+
+        assert downloader.session is ScenerulesDownloadService().session
+        assert report["checked"] == len(downloader.list_available_rules())
+        assert report["updated"] == 2
+
+
+class TestScenerulesSyncJob:
+    """Tests du job scenerules_sync et de la lecture offline via l'API."""
+
+    def test_job_and_offline_download(self, app, client, rules_server: str, tmp_path: Path) -> None:
+        """Test job créé par l'API : miroir synchronisé, règle locale rafraîchie, lecture offline."""
+        app.config["SCENERULES_BASE_URL"] = rules_server
+        app.config["SCENERULES_MIRROR_DIR"] = str(tmp_path / "mirror")
+        user = User(username="syncer", email="syncer@test.com")
+        user.set_password("password")
+        user.roles.append(Role.query.filter_by(name="admin").one())
+        db.session.add(user)
+        db.session.add(Rule(name="[2022] X264", content="stale", section="X264", year=2022))
+        db.session.commit()
+        headers = {"Authorization": f"Bearer {create_access_token(identity=user.id)}"}
+
+        offline_missing = client.post(
+            "/api/rules/scenerules/download",
+            json={"section": "eBOOK", "offline": True},
+            headers=headers,
+        )
+        created = client.post("/api/rules/scenerules/sync", json={}, headers=headers)
+        JobService().process_job(created.get_json()["job_id"])
+        offline = client.post(
+            "/api/rules/scenerules/download",
+            json={"section": "eBOOK", "year": 2022, "offline": True},
+            headers=headers,
+        )
+
+        job = db.session.get(Job, created.get_json()["job_id"])
+        assert offline_missing.status_code == 404
+        assert created.status_code == 202
+        assert job.status == "completed"
+        assert job.config_json["scenerules_sync"]["updated"] == 2
+        assert job.config_json["scenerules_sync"]["rules_updated"] == 1
+        assert Rule.query.filter_by(section="X264").one().content == "[2022] X264 rules"
+        assert offline.status_code == 201
+        assert offline.get_json()["rule"]["content"].startswith("[2022] eBOOK")
@@ -0,0 +1,104 @@
+"""Tests unitaires pour StagingService (staging zéro-copie).
+
+Ces tests vérifient l'ordre des stratégies (hardlink, reflink, copie noyau,
+copie espace utilisateur), le repli en cas d'échec et le rapport d'octets
+évités, ainsi que l'intégration dans PackagingService.
+"""
+
+from __future__ import annotations
+
+import errno
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from web.services.packaging import PackagingService, StagingService
+
+
+def _source(tmp_path: Path, size: int = 4096) -> Path:
+    path = tmp_path / "source.epub"
+    path.write_bytes(os.urandom(size))
+    return path
+
+
+class TestStagingService:
+    """Tests unitaires pour StagingService."""
+
+    def test_stage_file_hardlink(self, tmp_path: Path) -> None:
+        """Test hardlink sur le même système de fichiers (aucun octet dupliqué)."""
+        source = _source(tmp_path)
+        dest = tmp_path / "dest.epub"
+
+        report = StagingService().stage_file(source, dest)
+
+        assert report["method"] == "hardlink"
+        assert report["bytes_avoided"] == report["bytes"] == 4096
+        assert dest.stat().st_ino == source.stat().st_ino
+
+    def test_stage_file_falls_back_to_kernel_copy(self, tmp_path: Path) -> None:
+        """Test repli hardlink (EXDEV) puis reflink (EOPNOTSUPP) vers une copie noyau."""
+        source = _source(tmp_path, size=200_000)
+        dest = tmp_path / "dest.epub"
+
+        with (
+            patch(
+                "web.services.packaging.staging.os.link",
+                side_effect=OSError(errno.EXDEV, "Invalid cross-device link"),
+            ),
+            patch(
+                "web.services.packaging.staging.fcntl.ioctl",
+                side_effect=OSError(errno.EOPNOTSUPP, "Operation not supported"),
+            ),
+        ):
+            report = StagingService().stage_file(source, dest)
+
+        assert report["method"] in {"copy_file_range", "sendfile"}
+        assert [f["method"] for f in report["fallbacks"]][:2] == ["hardlink", "reflink"]
+        assert report["bytes_avoided"] == 0
+        assert dest.read_bytes() == source.read_bytes()
+        assert dest.stat().st_ino != source.stat().st_ino
+
+    def test_stage_file_userspace_copy_only(self, tmp_path: Path) -> None:
+        """Test copie espace utilisateur lorsque seule "copy" est autorisée."""
+        source = _source(tmp_path)
+        dest = tmp_path / "dest.epub"
+
+        report = StagingService(methods=("copy",)).stage_file(source, dest)
+
+        assert report["method"] == "copy"
+        assert dest.read_bytes() == source.read_bytes()
+        assert dest.stat().st_mtime == pytest.approx(source.stat().st_mtime)
+
+    def test_stage_file_rejects_existing_dest(self, tmp_path: Path) -> None:
+        """Test refus d'écraser une destination existante."""
+        source = _source(tmp_path)
+        dest = tmp_path / "dest.epub"
+        dest.write_bytes(b"existing")
+
+        with pytest.raises(FileExistsError):
+            StagingService().stage_file(source, dest)
+
+    def test_package_release_reports_staging(self, tmp_path: Path) -> None:
+        """Test rapport de staging dans le résultat de package_release."""
+        source = _source(tmp_path)
+        output = tmp_path / "out"
+
+        result = PackagingService().package_release(
+            {
+                "name": "Test-Book-TESTGROUP-20250124",
+                "group": "TESTGROUP",
+                "files": [{"path": str(source), "name": "book.epub"}],
+                "metadata": {"title": "Test"},
+                "nfo_content": "NFO",
+            },
+            output,
+        )
+
+        assert result["staging"]["methods"] == {"hardlink": 1}
+        assert result["staging"]["bytes_avoided"] == 4096
+        assert (
+            source.read_bytes()
+            == (output / "Test-Book-TESTGROUP-20250124" / "book.epub").read_bytes()
+        )
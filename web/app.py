@@ -10,6 +10,7 @@ from flask_jwt_extended import JWTManager
 from web.config import get_config
 from web.extensions import cache, cors, db, limiter, migrate
 from web.security import init_jwt
+from web.utils.streaming_request import StreamingRequest
 
 
 def add_security_headers(app: Flask) -> None:
@@ -56,6 +57,7 @@ def create_app(config_name: str | None = None) -> Flask:
         Flask application instance.
     """
     app = Flask(__name__)
+    app.request_class = StreamingRequest
     config = get_config(config_name)
     app.config.from_object(config)
 
@@ -99,8 +101,10 @@ def create_app(config_name: str | None = None) -> Flask:
     from web.blueprints.auth import auth_bp
     from web.blueprints.config import config_bp
     from web.blueprints.dashboard import dashboard_bp
+    from web.blueprints.formatter import formatter_bp
     from web.blueprints.health import health_bp
     from web.blueprints.jobs import jobs_bp
+    from web.blueprints.metadata import metadata_bp
     from web.blueprints.releases import releases_bp
     from web.blueprints.releases_actions import releases_actions_bp
     from web.blueprints.roles import roles_bp
@@ -132,6 +136,8 @@ def create_app(config_name: str | None = None) -> Flask:
     app.register_blueprint(roles_bp, url_prefix="/api")
     app.register_blueprint(config_bp, url_prefix="/api")
     app.register_blueprint(jobs_bp, url_prefix="/api")
+    app.register_blueprint(metadata_bp, url_prefix="/api")
+    app.register_blueprint(formatter_bp, url_prefix="/api")
     app.register_blueprint(test_parser_bp, url_prefix="/api")
     app.register_blueprint(test_metadata_bp, url_prefix="/api")
 
@@ -0,0 +1,50 @@
+"""Formatter blueprint (batch release-name formatting)."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+from flask import Blueprint, Response, current_app, request
+from flask_jwt_extended import jwt_required
+
+from web.services.formatter import ReleaseFormatterService
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+formatter_bp = Blueprint("formatter", __name__)
+
+
+@formatter_bp.route("/formatter/batch", methods=["POST"])
+@jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
+def format_batch() -> Response | tuple[dict[str, Any], int]:
+    """Format many release names in one request, streaming the results.
+
+    Request body:
+        - items: List of {title, group, date, metadata (optional)}
+
+    Returns:
+        Streamed JSON array (application/json), one element per item in
+        request order: {index, release_name[, metadata]} or {index, error}.
+        JSON 400 only for invalid requests.
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get("items")
+    if not isinstance(items, list) or not items:
+        return {"message": "items must be a non-empty list"}, 400
+
+    max_items = current_app.config.get("FORMATTER_BATCH_MAX_ITEMS", 100_000)
+    if len(items) > max_items:
+        return {"message": f"Too many items (max {max_items})"}, 400
+
+    results = ReleaseFormatterService().format_many(items)
+
+    def generate() -> Iterator[str]:
+        separator = "["
+        for result in results:
+            yield separator + json.dumps(result, default=str)
+            separator = ","
+        yield "]\n"
+
+    return Response(generate(), mimetype="application/json")
@@ -193,6 +193,7 @@ def get_job_status(job_id: int) -> tuple[dict[str, Any], int]:
             "job_id": job.id,
             "status": job.status,
             "progress": progress,
+            "progress_detail": job.progress,
             "created_at": job.created_at.isoformat() if job.created_at else None,
         },
         200,
@@ -0,0 +1,159 @@
+"""Metadata blueprint (batch extraction)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from flask import Blueprint, Response, current_app, request
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from sqlalchemy import select
+
+from web.extensions import db
+from web.models import Release, User
+from web.services.metadata import MetadataExtractionService
+from web.utils.permissions import check_permission
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+metadata_bp = Blueprint("metadata", __name__)
+
+
+def _is_allowed_path(path: str, roots: list[str]) -> bool:
+    """Check that a raw path resolves under one of the configured roots.
+
+    Args:
+        path: Raw path from the request.
+        roots: Allowed root directories (METADATA_BATCH_ROOTS).
+
+    Returns:
+        True if the resolved path is inside an allowed root.
+    """
+    resolved = Path(path).resolve()
+    return any(resolved.is_relative_to(Path(root).resolve()) for root in roots)
+
+
+def _collect_targets(
+    user: User, release_ids: list[Any], paths: list[Any]
+) -> tuple[dict[str, list[int | None]], list[dict[str, Any]]]:
+    """Resolve requested releases and paths into extractable files.
+
+    Args:
+        user: Current user.
+        release_ids: Requested release IDs.
+        paths: Requested raw paths.
+
+    Returns:
+        Tuple (targets, rejected): targets maps each file path to the release
+        IDs it belongs to (None for raw paths); rejected lists per-item errors.
+    """
+    targets: dict[str, list[int | None]] = {}
+    rejected: list[dict[str, Any]] = []
+
+    ids = [release_id for release_id in release_ids if isinstance(release_id, int)]
+    rows = {
+        row.id: row
+        for row in db.session.execute(
+            select(Release.id, Release.user_id, Release.file_path).where(Release.id.in_(ids))
+        )
+    }
+    for release_id in release_ids:
+        row = rows.get(release_id) if isinstance(release_id, int) else None
+        if row is None:
+            rejected.append(
+                {"release_id": release_id, "success": False, "error": "Release not found"}
+            )
+        elif row.user_id != user.id and not check_permission(user, "releases", "read", row.user_id):
+            rejected.append(
+                {"release_id": release_id, "success": False, "error": "Permission denied"}
+            )
+        elif not row.file_path:
+            rejected.append(
+                {"release_id": release_id, "success": False, "error": "Release file path not found"}
+            )
+        else:
+            targets.setdefault(row.file_path, []).append(release_id)
+
+    roots = current_app.config.get("METADATA_BATCH_ROOTS", [])
+    for path in paths:
+        if isinstance(path, str) and path and _is_allowed_path(path, roots):
+            targets.setdefault(path, []).append(None)
+        else:
+            rejected.append({"path": path, "success": False, "error": "Path not allowed"})
+
+    return targets, rejected
+
+
+@metadata_bp.route("/metadata/extract-batch", methods=["POST"])
+@jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
+def extract_batch() -> Response | tuple[dict[str, Any], int]:
+    """Extract metadata from many files in parallel, streaming results.
+
+    Request body:
+        - release_ids: Release IDs whose file_path is analysed (optional)
+        - paths: Raw file paths, only under METADATA_BATCH_ROOTS (optional)
+        - workers: Process pool size (optional, capped by METADATA_BATCH_MAX_WORKERS)
+        - calculate_checksums: Compute SHA-256/MD5 (optional, default False)
+        - bounded: Bounded-cost PDF extraction (optional, default False)
+
+    Returns:
+        NDJSON stream (application/x-ndjson): one line per file as soon as it
+        completes (path, release_ids, success, metadata or error, elapsed_ms),
+        one line per rejected item, then a final {"summary": {...}} line.
+        Errors are isolated per file; JSON 400/404 only for invalid requests.
+    """
+    current_user_id = get_jwt_identity()
+    user = db.session.get(User, current_user_id)
+
+    if not user:
+        return {"message": "User not found"}, 404
+
+    data = request.get_json(silent=True) or {}
+    release_ids = data.get("release_ids") or []
+    paths = data.get("paths") or []
+
+    if not isinstance(release_ids, list) or not isinstance(paths, list):
+        return {"message": "release_ids and paths must be lists"}, 400
+    if not release_ids and not paths:
+        return {"message": "release_ids or paths required"}, 400
+
+    max_files = current_app.config.get("METADATA_BATCH_MAX_FILES", 1000)
+    if len(release_ids) + len(paths) > max_files:
+        return {"message": f"Too many files (max {max_files})"}, 400
+
+    try:
+        workers = int(
+            data.get("workers") or current_app.config.get("METADATA_BATCH_MAX_WORKERS", 8)
+        )
+    except (TypeError, ValueError):
+        return {"message": "workers must be an integer"}, 400
+    workers = max(1, min(workers, current_app.config.get("METADATA_BATCH_MAX_WORKERS", 8)))
+
+    targets, rejected = _collect_targets(user, release_ids, paths)
+    service = MetadataExtractionService()
+    results = service.extract_many(
+        list(targets),
+        workers=workers,
+        calculate_checksums=bool(data.get("calculate_checksums", False)),
+        bounded=bool(data.get("bounded", False)),
+    )
+
+    def generate() -> Iterator[str]:
+        succeeded = 0
+        for item in rejected:
+            yield json.dumps(item, default=str) + "\n"
+        for result in results:
+            succeeded += bool(result["success"])
+            ids = [i for i in targets.get(result["path"], []) if i is not None]
+            yield json.dumps({**result, "release_ids": ids}, default=str) + "\n"
+        summary = {
+            "files": len(targets),
+            "succeeded": succeeded,
+            "failed": len(targets) - succeeded,
+            "rejected": len(rejected),
+        }
+        yield json.dumps({"summary": summary}) + "\n"
+
+    return Response(generate(), mimetype="application/x-ndjson")
@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
+import mimetypes
+from pathlib import Path
 from typing import Any
 
-from flask import Blueprint, request
+from flask import Blueprint, Response, current_app, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from sqlalchemy import String, cast
 from sqlalchemy.orm import Query, joinedload
 
 from web.extensions import db
 from web.models import Release, User
+from web.services.archive import ArchiveFormatError, ArchiveIndexService
+from web.services.dupe import DupeIndexService
 from web.utils.permissions import check_permission
 
 releases_bp = Blueprint("releases", __name__)
@@ -128,6 +132,34 @@ def list_releases() -> tuple[dict[str, Any], int]:
     )
 
 
+@releases_bp.route("/releases/dupecheck", methods=["GET"])
+@jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
+def dupecheck() -> tuple[dict[str, Any], int]:
+    """Check a release name against the local dupe index (imported predb dumps).
+
+    Query parameters:
+        - name: Release name to check (required)
+        - limit: Maximum names per list (default: 20, max: 100)
+
+    Returns:
+        JSON response with dupe, exact, matches (same normalised key) and
+        similar (same author and title).
+    """
+    name = (request.args.get("name") or "").strip()
+    if not name:
+        return {"message": "name is required"}, 400
+    limit = min(max(request.args.get("limit", 20, type=int), 1), 100)
+
+    try:
+        result = DupeIndexService.from_config(current_app.config).check(name, limit)
+    except (OSError, ValueError) as e:
+        return {"message": f"Dupe index unavailable: {e}"}, 503
+    if result is None:
+        return {"message": "Dupe index has not been built"}, 503
+
+    return {"name": name, **result}, 200
+
+
 @releases_bp.route("/releases/<int:release_id>", methods=["GET"])
 @jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
 def get_release(release_id: int) -> tuple[dict[str, Any], int]:
@@ -240,3 +272,108 @@ def delete_release(release_id: int) -> tuple[dict[str, Any], int]:
     db.session.commit()
 
     return {"message": "Release deleted successfully"}, 200
+
+
+def _readable_release(
+    release_id: int,
+) -> tuple[Release | None, tuple[dict[str, Any], int] | None]:
+    """Load a release the current user may read.
+
+    Args:
+        release_id: Release ID.
+
+    Returns:
+        Tuple (release, error response); exactly one of them is None.
+    """
+    current_user_id = get_jwt_identity()
+    user = db.session.get(User, current_user_id)
+    if not user:
+        return None, ({"message": "User not found"}, 404)
+
+    release = db.session.get(Release, release_id)
+    if not release:
+        return None, ({"message": "Release not found"}, 404)
+
+    if release.user_id != current_user_id and not check_permission(
+        user, "releases", "read", release.user_id
+    ):
+        return None, ({"message": "Permission denied"}, 403)
+    if not release.file_path or not Path(release.file_path).is_file():
+        return None, ({"message": "Release file not found"}, 404)
+    return release, None
+
+
+@releases_bp.route("/releases/<int:release_id>/archive", methods=["GET"])
+@jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
+def get_release_archive(release_id: int) -> tuple[dict[str, Any], int]:
+    """List archive members of a release file (ZIP, EPUB, CBZ).
+
+    Only the central directory is read; the listing is cached per file identity.
+
+    Args:
+        release_id: Release ID.
+
+    Returns:
+        JSON response with members, sizes, CRCs and compression methods.
+    """
+    release, error = _readable_release(release_id)
+    if error:
+        return error
+
+    try:
+        listing = ArchiveIndexService().list_members(Path(release.file_path))
+    except ArchiveFormatError as e:
+        return {"message": f"Not a readable archive: {e}"}, 400
+
+    return {"release_id": release.id, "archive": listing}, 200
+
+
+@releases_bp.route("/releases/<int:release_id>/archive/member", methods=["GET"])
+@jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
+def get_release_archive_member(release_id: int) -> Response | tuple[dict[str, Any], int]:
+    """Serve the bytes of a single archive member, honouring HTTP Range.
+
+    Query parameters:
+        - name: Member name (required)
+
+    Args:
+        release_id: Release ID.
+
+    Returns:
+        Member bytes (200, or 206 with Content-Range), or JSON error.
+    """
+    name = request.args.get("name")
+    if not name:
+        return {"message": "name is required"}, 400
+
+    release, error = _readable_release(release_id)
+    if error:
+        return error
+
+    archive_path = Path(release.file_path)
+    service = ArchiveIndexService()
+    try:
+        member = service.get_member(archive_path, name)
+        if member is None or member.is_dir:
+            return {"message": "Member not found"}, 404
+
+        size = member.file_size
+        byte_range = request.range.range_for_length(size) if request.range else None
+        if request.range and byte_range is None:
+            return {"message": "Requested range not satisfiable"}, 416
+        start, stop = byte_range or (0, size)
+        body = service.iter_member_range(archive_path, member, start, stop)
+    except ArchiveFormatError as e:
+        return {"message": f"Not a readable archive: {e}"}, 400
+
+    response = Response(
+        body,
+        status=206 if byte_range else 200,
+        mimetype=mimetypes.guess_type(name)[0] or "application/octet-stream",
+    )
+    response.headers["Accept-Ranges"] = "bytes"
+    response.headers["Content-Length"] = str(stop - start)
+    response.headers["ETag"] = f'"{member.crc32:08x}-{size}"'
+    if byte_range:
+        response.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+    return response
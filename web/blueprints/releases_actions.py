@@ -13,6 +13,9 @@ from web.utils.permissions import check_permission
 
 releases_actions_bp = Blueprint("releases_actions", __name__)
 
+# Package inputs derived server-side by the REPACK job, never taken from the body
+_REPACK_SERVER_KEYS = ("files", "output_path", "name", "nfo_content", "group", "metadata")
+
 
 def _check_permission(release: Release, current_user: User, _action: str) -> bool:
     """Check if user has permission for action.
@@ -156,8 +159,10 @@ def repack_release(release_id: int) -> tuple[dict[str, Any], int]:
         return {"message": "Permission denied"}, 403
 
     data = request.get_json() or {}
-    config = release.config or {}
+    config = dict(release.config or {})
     config.update(data)
+    for key in _REPACK_SERVER_KEYS:
+        config.pop(key, None)
 
     # Create job for REPACK action
     job = Job(
@@ -187,6 +192,9 @@ def dirfix_release(release_id: int) -> tuple[dict[str, Any], int]:
     Args:
         release_id: Release ID.
 
+    Request body:
+        - dry_run: Only compute the rename plan, without renaming (optional)
+
     Returns:
         JSON response with job ID.
     """
@@ -207,13 +215,19 @@ def dirfix_release(release_id: int) -> tuple[dict[str, Any], int]:
     if not release.file_path:
         return {"message": "Release file path not found"}, 400
 
+    data = request.get_json(silent=True) or {}
+
     # Create job for DIRFIX action
     job = Job(
         release_id=release.id,
         created_by=current_user_id,
         status="pending",
         job_type="dirfix",
-        config_json={"action": "dirfix", "file_path": release.file_path},
+        config_json={
+            "action": "dirfix",
+            "file_path": release.file_path,
+            "dry_run": bool(data.get("dry_run", False)),
+        },
     )
     db.session.add(job)
     db.session.commit()
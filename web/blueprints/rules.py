@@ -2,29 +2,31 @@
 
 from __future__ import annotations
 
-import re
 from typing import Any
 
-from flask import Blueprint, request
+from flask import Blueprint, current_app, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
+from sqlalchemy import String, cast, func
 from werkzeug.utils import secure_filename
 
-from web.extensions import cache, db
-from web.models import Rule, User
-from web.services.rule import ScenerulesDownloadService
+from web.extensions import db
+from web.models import Job, Rule, User
+from web.services.rule import (
+    RuleCatalogService,
+    RuleIngestError,
+    RuleIngestService,
+    RuleRevisionService,
+    RuleSearchService,
+    ScenerulesDownloadService,
+    ScenerulesSyncService,
+)
 from web.utils.permissions import check_permission
 
 rules_bp = Blueprint("rules", __name__)
 
-# Constants
-EXPECTED_GROUPS_COUNT = 2
-MIN_YEAR = 1900
-MAX_YEAR = 2100
-
 
 @rules_bp.route("/rules", methods=["GET"])
 @jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
-@cache.cached(timeout=600, query_string=True)  # Cache for 10 minutes
 def list_rules() -> tuple[dict[str, Any], int]:
     """List rules with filters and pagination.
 
@@ -34,6 +36,8 @@ def list_rules() -> tuple[dict[str, Any], int]:
         - scene: Filter by scene name
         - section: Filter by section
         - year: Filter by year
+        - search: Words in name or content and section:/year:/scene: filters
+          (rule search index, see /rules/search)
 
     Returns:
         JSON response with rules list and pagination info.
@@ -64,10 +68,15 @@ def list_rules() -> tuple[dict[str, Any], int]:
     if year:
         query = query.filter(Rule.year == year)
 
-    # Text search in name and content
+    # Text search in name and content through the in-process index; a query
+    # without any word (only section:/year:/scene: filters, "-", "*") is not
+    # looked up and only its filters apply
     if search:
-        search_pattern = f"%{search}%"
-        query = query.filter((Rule.name.like(search_pattern)) | (Rule.content.like(search_pattern)))
+        clauses, filters = RuleSearchService.parse_query(search)
+        if clauses:
+            query = query.filter(Rule.id.in_(RuleSearchService().matching_ids(search)))
+        for key, value in filters.items():
+            query = query.filter(func.lower(cast(getattr(Rule, key), String)) == value)
 
     # Pagination
     pagination = query.paginate(page=page, per_page=per_page, error_out=False)
@@ -87,6 +96,31 @@ def list_rules() -> tuple[dict[str, Any], int]:
     )
 
 
+@rules_bp.route("/rules/search", methods=["GET"])
+@jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
+def search_rules() -> tuple[dict[str, Any], int]:
+    """Full-text search in rule names and contents.
+
+    Query parameters:
+        - q: Query; words are ANDed, "quoted phrases" and word* prefixes are
+          supported, as are section:, year: and scene: filters
+        - section: Restrict to a section (optional)
+        - limit: Maximum number of results (default: 20, max: 100)
+
+    Returns:
+        JSON response with ranked results and highlighted snippets.
+    """
+    query = request.args.get("q", "").strip()
+    if not query:
+        return {"message": "Query parameter 'q' is required"}, 400
+    limit = min(max(request.args.get("limit", 20, type=int), 1), 100)
+
+    results = RuleSearchService().search(
+        query, section=request.args.get("section") or None, limit=limit
+    )
+    return {"query": query, "results": results, "count": len(results)}, 200
+
+
 @rules_bp.route("/rules/<int:rule_id>", methods=["GET"])
 @jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
 def get_rule(rule_id: int) -> tuple[dict[str, Any], int]:
@@ -141,9 +175,12 @@ def create_rule() -> tuple[dict[str, Any], int]:
     )
 
     db.session.add(rule)
+    revision = RuleRevisionService().record(rule, get_jwt_identity())
     db.session.commit()
+    RuleCatalogService.invalidate()
+    RuleSearchService.invalidate([rule.id])
 
-    return {"rule": rule.to_dict()}, 201
+    return {"rule": {**rule.to_dict(), "revision": revision}}, 201
 
 
 @rules_bp.route("/rules/<int:rule_id>", methods=["PUT"])
@@ -174,6 +211,11 @@ def update_rule(rule_id: int) -> tuple[dict[str, Any], int]:
     if not data:
         return {"message": "No data provided"}, 400
 
+    revisions = RuleRevisionService()
+    if "content" in data:
+        # Keep the current content as base revision (rules created before history)
+        revisions.record(rule)
+
     # Update fields if provided
     if "name" in data:
         rule.name = data["name"]
@@ -186,9 +228,12 @@ def update_rule(rule_id: int) -> tuple[dict[str, Any], int]:
     if "year" in data:
         rule.year = data["year"]
 
+    revision = revisions.record(rule, get_jwt_identity())
     db.session.commit()
+    RuleCatalogService.invalidate()
+    RuleSearchService.invalidate([rule.id])
 
-    return {"rule": rule.to_dict()}, 200
+    return {"rule": {**rule.to_dict(), "revision": revision}}, 200
 
 
 @rules_bp.route("/rules/<int:rule_id>", methods=["DELETE"])
@@ -207,12 +252,78 @@ def delete_rule(rule_id: int) -> tuple[dict[str, Any], int]:
     if not rule:
         return {"message": "Rule not found"}, 404
 
+    RuleRevisionService.purge(rule.id)
     db.session.delete(rule)
     db.session.commit()
+    RuleCatalogService.invalidate()
+    RuleSearchService.invalidate([rule_id])
 
     return {"message": "Rule deleted successfully"}, 200
 
 
+@rules_bp.route("/rules/<int:rule_id>/revisions", methods=["GET"])
+@jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
+def list_rule_revisions(rule_id: int) -> tuple[dict[str, Any], int]:
+    """List the stored revisions of a rule (metadata only).
+
+    Args:
+        rule_id: Rule ID.
+
+    Returns:
+        JSON response with revisions, oldest first.
+    """
+    if not db.session.get(Rule, rule_id):
+        return {"message": "Rule not found"}, 404
+
+    return {"rule_id": rule_id, "revisions": RuleRevisionService().list_revisions(rule_id)}, 200
+
+
+@rules_bp.route("/rules/<int:rule_id>/revisions/<int:revision>", methods=["GET"])
+@jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
+def get_rule_revision(rule_id: int, revision: int) -> tuple[dict[str, Any], int]:
+    """Get the content of a rule at a given revision.
+
+    Args:
+        rule_id: Rule ID.
+        revision: Revision number.
+
+    Returns:
+        JSON response with the reconstructed content.
+    """
+    content = RuleRevisionService().content(rule_id, revision)
+    if content is None:
+        return {"message": "Revision not found"}, 404
+
+    return {"rule_id": rule_id, "revision": revision, "content": content}, 200
+
+
+@rules_bp.route("/rules/<int:rule_id>/diff", methods=["GET"])
+@jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
+def diff_rule_revisions(rule_id: int) -> tuple[dict[str, Any], int]:
+    """Unified diff between two revisions of a rule.
+
+    Query parameters:
+        - from: Base revision (default: previous revision of "to")
+        - to: Target revision (default: latest revision)
+        - context: Context lines around changes (default: 3)
+
+    Returns:
+        JSON response with the unified diff and line counts.
+    """
+    revisions = RuleRevisionService()
+    to_revision = request.args.get("to", type=int) or revisions.latest_revision(rule_id)
+    if to_revision is None:
+        return {"message": "Rule has no revisions"}, 404
+    from_revision = request.args.get("from", type=int) or max(to_revision - 1, 1)
+    context = min(max(request.args.get("context", 3, type=int), 0), 100)
+
+    diff = revisions.diff(rule_id, from_revision, to_revision, context)
+    if diff is None:
+        return {"message": "Revision not found"}, 404
+
+    return diff, 200
+
+
 @rules_bp.route("/rules/scenerules", methods=["GET"])
 @jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
 def list_scenerules_rules() -> tuple[dict[str, Any], int]:
@@ -237,12 +348,10 @@ def list_scenerules_rules() -> tuple[dict[str, Any], int]:
     section_filter = request.args.get("section", "")
     year_filter = request.args.get("year", type=int)
 
-    # Get available rules from scenerules.org
-    downloader = ScenerulesDownloadService()
-    available_rules = downloader.list_available_rules()
+    # Catalogue annotated with is_downloaded/local_rule_id (cached, projection query)
+    filtered_rules = RuleCatalogService.from_config(current_app.config).catalogue()
 
     # Apply filters
-    filtered_rules = available_rules
     if scene_filter:
         filtered_rules = [
             r for r in filtered_rules if r.get("scene", "").lower() == scene_filter.lower()
@@ -254,17 +363,6 @@ def list_scenerules_rules() -> tuple[dict[str, Any], int]:
     if year_filter:
         filtered_rules = [r for r in filtered_rules if r.get("year") == year_filter]
 
-    # Check which rules are already downloaded locally
-    local_rules = Rule.query.all()
-    local_rule_keys = {(r.section, r.year): r.id for r in local_rules if r.section and r.year}
-
-    # Add indicator if rule is already downloaded
-    for rule in filtered_rules:
-        rule_key = (rule.get("section"), rule.get("year"))
-        rule["is_downloaded"] = rule_key in local_rule_keys
-        if rule["is_downloaded"]:
-            rule["local_rule_id"] = local_rule_keys[rule_key]
-
     return (
         {
             "rules": filtered_rules,
@@ -284,6 +382,8 @@ def download_scenerules_rule() -> tuple[dict[str, Any], int]:  # noqa: PLR0911
         - year: Rule year (optional, default: 2022)
         - scene: Scene name (optional, default: English)
         - url: Direct URL to rule NFO (optional, alternative to section/year)
+        - offline: Read the rule from the local scenerules mirror instead of
+          the network (optional, default: false)
 
     Returns:
         JSON response with downloaded rule.
@@ -307,7 +407,15 @@ def download_scenerules_rule() -> tuple[dict[str, Any], int]:  # noqa: PLR0911
 
     try:
         # Download rule
-        if "url" in data:
+        if data.get("offline"):
+            section = data.get("section")
+            if not section:
+                return {"message": "Section is required"}, 400
+            year = data.get("year", 2022)
+            rule_data = ScenerulesSyncService.from_config(current_app.config).read(section, year)
+            if rule_data is None:
+                return {"message": f"Rule not in local mirror: {section} [{year}]"}, 404
+        elif "url" in data:
             rule_data = downloader.download_rule_by_url(data["url"])
         else:
             section = data.get("section")
@@ -323,16 +431,21 @@ def download_scenerules_rule() -> tuple[dict[str, Any], int]:  # noqa: PLR0911
             section=rule_data["section"], year=rule_data["year"]
         ).first()
 
+        revisions = RuleRevisionService()
         if existing_rule:
-            # Update existing rule
+            # Update existing rule, keeping the replaced content in its history
+            revisions.record(existing_rule)
             existing_rule.name = rule_data["name"]
             existing_rule.content = rule_data["content"]
             existing_rule.scene = rule_data.get("scene")
+            revision = revisions.record(existing_rule, current_user_id)
             db.session.commit()
+            RuleCatalogService.invalidate()
+            RuleSearchService.invalidate([existing_rule.id])
 
             return (
                 {
-                    "rule": existing_rule.to_dict(),
+                    "rule": {**existing_rule.to_dict(), "revision": revision},
                     "message": "Rule updated successfully",
                     "was_existing": True,
                 },
@@ -349,11 +462,14 @@ def download_scenerules_rule() -> tuple[dict[str, Any], int]:  # noqa: PLR0911
         )
 
         db.session.add(rule)
+        revision = revisions.record(rule, current_user_id)
         db.session.commit()
+        RuleCatalogService.invalidate()
+        RuleSearchService.invalidate([rule.id])
 
         return (
             {
-                "rule": rule.to_dict(),
+                "rule": {**rule.to_dict(), "revision": revision},
                 "message": "Rule downloaded successfully",
                 "was_existing": False,
             },
@@ -366,6 +482,43 @@ def download_scenerules_rule() -> tuple[dict[str, Any], int]:  # noqa: PLR0911
         return {"message": f"Failed to download rule: {str(e)}"}, 500
 
 
+@rules_bp.route("/rules/scenerules/sync", methods=["POST"])
+@jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
+def sync_scenerules_rules() -> tuple[dict[str, Any], int]:
+    """Queue a sync of all known scenerules.org rules into the local mirror.
+
+    Expected JSON (optional):
+        - force: Download every rule without conditional requests (default: false)
+        - update_rules: Refresh local rules whose mirrored NFO changed (default: true)
+
+    Returns:
+        JSON response with job ID.
+    """
+    current_user_id = get_jwt_identity()
+    user = db.session.get(User, current_user_id)
+
+    if not user:
+        return {"message": "User not found"}, 404
+
+    if not check_permission(user, "rules", "write"):
+        return {"message": "Permission denied"}, 403
+
+    data = request.get_json(silent=True) or {}
+    job = Job(
+        created_by=current_user_id,
+        status="pending",
+        job_type="scenerules_sync",
+        config_json={
+            "force": bool(data.get("force", False)),
+            "update_rules": bool(data.get("update_rules", True)),
+        },
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    return {"message": "Scenerules sync job created successfully", "job_id": job.id}, 202
+
+
 def _extract_metadata_from_content(content: str) -> dict[str, str | int | None]:
     """Extract metadata (scene, section, year) from rule content.
 
@@ -375,54 +528,7 @@ def _extract_metadata_from_content(content: str) -> dict[str, str | int | None]:
     Returns:
         Dictionary with extracted metadata (scene, section, year).
     """
-    metadata: dict[str, str | int | None] = {
-        "scene": None,
-        "section": None,
-        "year": None,
-    }
-
-    # Extract scene (look for common scene names)
-    scene_patterns = [
-        r"\[(English|Baltic|Danish|Dutch|Flemish|French|German|Hungarian|Italian|Lithuanian|Polish|Spanish|Swedish)\s*Scene\]",
-        r"Scene\s*[:;]\s*(English|Baltic|Danish|Dutch|Flemish|French|German|Hungarian|Italian|Lithuanian|Polish|Spanish|Swedish)",
-    ]
-    for pattern in scene_patterns:
-        match = re.search(pattern, content, re.IGNORECASE)
-        if match:
-            metadata["scene"] = match.group(1)
-            break
-
-    # Extract section (look for section names like eBOOK, TV-720p, etc.)
-    section_patterns = [
-        r"\[(\d{4})\]\s*(eBOOK|TV-720p|TV-SD|X264|X265|BLURAY|MP3|FLAC)",
-        r"Section\s*[:;]\s*(eBOOK|TV-720p|TV-SD|X264|X265|BLURAY|MP3|FLAC)",
-        r"^([A-Z0-9-]+)\s+Rules?\s+\[(\d{4})\]",
-    ]
-    for pattern in section_patterns:
-        match = re.search(pattern, content, re.IGNORECASE)
-        if match:
-            if len(match.groups()) == EXPECTED_GROUPS_COUNT:
-                metadata["section"] = match.group(1) or match.group(2)
-            else:
-                metadata["section"] = match.group(1)
-            break
-
-    # Extract year (look for [YYYY] pattern)
-    year_patterns = [
-        r"\[(\d{4})\]",  # [2022]
-        r"\((\d{4})\)",  # (2022)
-        r"\b(19\d{2}|20\d{2})\b",  # 4-digit year
-    ]
-    for pattern in year_patterns:
-        matches = re.findall(pattern, content)
-        if matches:
-            # Take the most recent year found
-            years = [int(m) for m in matches if MIN_YEAR <= int(m) <= MAX_YEAR]
-            if years:
-                metadata["year"] = max(years)
-                break
-
-    return metadata
+    return RuleIngestService.sniff(content)
 
 
 @rules_bp.route("/rules/upload", methods=["POST"])
@@ -461,59 +567,105 @@ def upload_rule() -> tuple[dict[str, Any], int]:
     if not filename or not any(filename.lower().endswith(ext) for ext in allowed_extensions):
         return {"message": f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"}, 400
 
-    # Read file content
+    ingester = RuleIngestService.from_config(current_app.config)
     try:
-        # Try UTF-8 first
-        file.seek(0)
-        content = file.read().decode("utf-8")
-    except UnicodeDecodeError:
-        try:
-            # Try ISO-8859-1 (common for NFO files)
-            file.seek(0)
-            content = file.read().decode("iso-8859-1")
-        except UnicodeDecodeError:
-            return {"message": "Invalid file encoding"}, 400
-
-    # Get metadata from form or extract from content
-    name = request.form.get("name") or filename.rsplit(".", 1)[0]
-    scene: str | None = request.form.get("scene")
-    section: str | None = request.form.get("section")
-    year: int | None = request.form.get("year", type=int)
-
-    # Extract metadata from content if not provided
-    if not scene or not section or not year:
-        extracted = _extract_metadata_from_content(content)
-        if not scene:
-            extracted_scene = extracted.get("scene")
-            scene = extracted_scene if isinstance(extracted_scene, str) else None
-        if not section:
-            extracted_section = extracted.get("section")
-            section = extracted_section if isinstance(extracted_section, str) else None
-        if not year:
-            extracted_year = extracted.get("year")
-            year = extracted_year if isinstance(extracted_year, int) else None
-
-    # Create rule
+        item = ingester.ingest(
+            file.stream.read(ingester.max_rule_bytes + 1),
+            filename,
+            {
+                "name": request.form.get("name"),
+                "scene": request.form.get("scene"),
+                "section": request.form.get("section"),
+                "year": request.form.get("year", type=int),
+            },
+        )
+    except RuleIngestError as e:
+        return {"message": str(e)}, 400
+
     rule = Rule(
-        name=name,
-        content=content,
-        scene=scene,
-        section=section,
-        year=year,
+        name=item["name"],
+        content=item["content"],
+        scene=item["scene"],
+        section=item["section"],
+        year=item["year"],
     )
 
     db.session.add(rule)
+    revision = RuleRevisionService().record(rule, current_user_id)
     db.session.commit()
+    RuleCatalogService.invalidate()
+    RuleSearchService.invalidate([rule.id])
 
     return (
         {
-            "rule": rule.to_dict(),
+            "rule": {**rule.to_dict(), "revision": revision},
             "message": "Rule uploaded successfully",
-            "metadata_extracted": {
-                "scene": scene,
-                "section": section,
-                "year": year,
-            },
+            "metadata_extracted": item["metadata_extracted"],
+            "encoding": item["encoding"],
+            "spec": item["spec"],
+        },
+        201,
+    )
+
+
+@rules_bp.route("/rules/upload/bulk", methods=["POST"])
+@jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
+def upload_rules_bulk() -> tuple[dict[str, Any], int]:
+    """Upload many rule files in one request.
+
+    Expected form data:
+        - files: Rule files (NFO, TXT) and/or ZIP archives of rule files (repeatable)
+
+    Scene, section and year are extracted from each file's content. Files that
+    cannot be ingested are reported in ``errors`` without failing the batch.
+
+    Returns:
+        JSON response with created rules, per-file errors and count.
+    """
+    current_user_id = get_jwt_identity()
+    user = db.session.get(User, current_user_id)
+
+    if not user:
+        return {"message": "User not found"}, 404
+
+    files = [file for file in request.files.getlist("files") if file.filename]
+    if not files:
+        return {"message": "No file provided"}, 400
+
+    ingester = RuleIngestService.from_config(current_app.config)
+    items: list[dict[str, Any]] = []
+    errors: list[dict[str, str]] = []
+    try:
+        for name, raw in ingester.iter_files(files):
+            try:
+                items.append(ingester.ingest(raw, name))
+            except RuleIngestError as e:
+                errors.append({"file": name, "error": str(e)})
+    except RuleIngestError as e:
+        return {"message": str(e), "errors": errors}, 400
+
+    if not items:
+        return {"message": "No rule file found", "errors": errors}, 400
+
+    rules = RuleIngestService.create_rules(items, current_user_id)
+    db.session.commit()
+    RuleCatalogService.invalidate()
+    RuleSearchService.invalidate([rule.id for rule in rules])
+
+    return (
+        {
+            "rules": [
+                {
+                    **rule.to_dict(),
+                    "revision": 1,
+                    "file": item["filename"],
+                    "encoding": item["encoding"],
+                }
+                for rule, item in zip(rules, items, strict=True)
+            ],
+            "errors": errors,
+            "count": len(rules),
+            "message": f"{len(rules)} rule(s) uploaded successfully",
         },
         201,
     )
@@ -2,30 +2,93 @@
 
 from __future__ import annotations
 
-import os
+import re
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from flask import Blueprint, request
+from flask import Blueprint, current_app, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from sqlalchemy.orm.attributes import flag_modified
+from werkzeug.exceptions import RequestEntityTooLarge
 
 from web.extensions import db, limiter
-from web.models import Group, Job, Release, Rule, User
+from web.models import Group, Job, Release, Rule, User, WizardDraft
+from web.services.formatter import ReleaseNameParserService
+from web.services.metadata import FileAnalysisService
+from web.services.rule import RuleRevisionService
+from web.services.storage import (
+    BlobStoreService,
+    BlobTooLargeError,
+    BlobWriter,
+    RemoteFetchService,
+)
+from web.services.wizard import DraftConflictError, WizardDraftService
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 wizard_bp = Blueprint("wizard", __name__)
 
-# Upload directory for wizard files
-UPLOAD_DIR = Path("uploads/wizard")
-try:
-    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-    # Set permissions if needed (Linux)
-    if hasattr(UPLOAD_DIR, "chmod"):
-        UPLOAD_DIR.chmod(0o755)
-except (PermissionError, OSError):
-    # If permission denied, use /tmp as fallback
-    UPLOAD_DIR = Path("/tmp/uploads/wizard")
-    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+# Prefix of files uploaded before the content-addressed store (release_<id>_<name>)
+LEGACY_UPLOAD_PREFIX = re.compile(r"^release_\d+_")
+
+
+def _expected_version() -> int | None:
+    """Read the draft version the client worked on (If-Match header or draft_version).
+
+    Returns:
+        Expected draft version, or None when the client did not send one.
+
+    Raises:
+        ValueError: If the version is not an integer.
+    """
+    raw = request.headers.get("If-Match")
+    if raw:
+        raw = raw.removeprefix("W/").strip('"')
+    elif request.is_json:
+        raw = (request.get_json(silent=True) or {}).get("draft_version")
+    if raw is None or raw == "*":
+        return None
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid draft version") from None
+
+
+def _conflict(error: DraftConflictError) -> tuple[dict[str, Any], int]:
+    """Build the 409 response of a save based on a stale draft version."""
+    return (
+        {
+            "message": "Draft was modified by another session, reload it and retry",
+            "draft_version": error.current_version,
+        },
+        409,
+    )
+
+
+def _save_step(
+    release: Release, step: int, fields: dict[str, Any], merge: tuple[str, ...] = ()
+) -> tuple[WizardDraft | None, tuple[dict[str, Any], int] | None]:
+    """Save the columns of a wizard step in the draft of the release.
+
+    Args:
+        release: Release being edited.
+        step: Wizard step reached.
+        fields: Draft columns written by the step.
+        merge: JSON columns merged with their current value.
+
+    Returns:
+        Tuple (saved draft, error response); exactly one of them is None.
+    """
+    try:
+        draft = WizardDraftService().save_step(
+            release, step, fields, _expected_version(), merge=merge
+        )
+    except ValueError as e:
+        return None, ({"message": str(e)}, 400)
+    except DraftConflictError as e:
+        return None, _conflict(e)
+    return draft, None
 
 
 @wizard_bp.route("/wizard/draft", methods=["POST"])
@@ -78,16 +141,19 @@ def create_draft() -> tuple[dict[str, Any], int]:  # noqa: PLR0911
     if not rule:
         return {"message": "Rule not found"}, 404
 
+    # Pin the rule revision the release is built against (reference, not a copy)
+    rule_revision = RuleRevisionService().record(rule)
+
     # Create draft release
     release = Release(
         user_id=user.id,
         group_id=group.id,
         release_type=data["release_type"],
         status="draft",
-        release_metadata={"wizard_step": 3},  # Completed steps 1-3
     )
     db.session.add(release)
     db.session.flush()
+    db.session.add(WizardDraft(release_id=release.id, step=3))  # Completed steps 1-3
 
     # Create job for tracking
     job = Job(
@@ -98,6 +164,7 @@ def create_draft() -> tuple[dict[str, Any], int]:  # noqa: PLR0911
             "group": group_name,
             "release_type": data["release_type"],
             "rule_id": data["rule_id"],
+            "rule_revision": rule_revision,
         },
     )
     db.session.add(job)
@@ -107,6 +174,8 @@ def create_draft() -> tuple[dict[str, Any], int]:  # noqa: PLR0911
         {
             "release_id": release.id,
             "job_id": job.id,
+            "draft_version": 1,
+            "rule_revision": rule_revision,
             "message": "Draft release created successfully",
         },
         201,
@@ -146,11 +215,95 @@ def list_rules() -> tuple[dict[str, Any], int]:
     )
 
 
+@wizard_bp.route("/wizard/<int:release_id>/draft", methods=["GET"])
+@jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
+def get_draft(release_id: int) -> tuple[dict[str, Any], int]:
+    """Get the wizard state of a draft release.
+
+    The returned draft version is sent back by the client (If-Match header or
+    draft_version field) so that a save based on a stale tab is rejected (409).
+
+    Args:
+        release_id: Release ID.
+
+    Returns:
+        JSON response with the draft state and its metadata view.
+    """
+    current_user_id = get_jwt_identity()
+    user = db.session.get(User, current_user_id)
+
+    if not user:
+        return {"message": "User not found"}, 404
+
+    # Verify release exists and belongs to user
+    release = db.session.get(Release, release_id)
+    if not release:
+        return {"message": "Release not found"}, 404
+
+    if release.user_id != user.id:
+        return {"message": "Permission denied"}, 403
+
+    drafts = WizardDraftService()
+    draft = drafts.get_or_create(release)
+    db.session.commit()
+
+    return (
+        {
+            "draft": draft.to_dict(),
+            "metadata": drafts.effective_metadata(release),
+            "options": drafts.effective_options(release),
+        },
+        200,
+    )
+
+
+def _blob_stream_factory(
+    store: BlobStoreService, writers: list[BlobWriter], max_size: int
+) -> Callable[[int | None, str | None, str | None, int | None], BlobWriter]:
+    """Build a multipart stream factory writing file parts into the upload store.
+
+    Args:
+        store: Upload blob store.
+        writers: List collecting the writers created for this request.
+        max_size: Maximum size of a single file part.
+
+    Returns:
+        Stream factory for StreamingRequest.file_stream_factory.
+
+    Raises:
+        ValueError: If the X-Content-SHA256 header is not a SHA-256 digest.
+    """
+    expected_sha256 = request.headers.get("X-Content-SHA256")
+    if expected_sha256:
+        # Reject a malformed digest before parsing (errors raised while parsing are swallowed)
+        store.blob_path(expected_sha256.lower())
+
+    def factory(
+        _total_content_length: int | None,
+        _content_type: str | None,
+        filename: str | None = None,
+        _content_length: int | None = None,
+    ) -> BlobWriter:
+        writer = store.open_writer(
+            BlobStoreService.normalize_suffix(filename),
+            max_bytes=max_size,
+            expected_sha256=expected_sha256,
+        )
+        writers.append(writer)
+        return writer
+
+    return factory
+
+
 @wizard_bp.route("/wizard/<int:release_id>/upload", methods=["POST"])
 @jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
-def upload_file(release_id: int) -> tuple[dict[str, Any], int]:  # noqa: PLR0911
+def upload_file(release_id: int) -> tuple[dict[str, Any], int]:
     """Upload file for wizard step 4.
 
+    The multipart body is streamed straight into the upload store: each file
+    part is hashed (SHA-256, CRC-32), sized and size-limited while it is
+    received, then renamed into place, so an upload costs one disk write.
+
     Args:
         release_id: Release ID.
 
@@ -171,26 +324,83 @@ def upload_file(release_id: int) -> tuple[dict[str, Any], int]:  # noqa: PLR0911
     if release.user_id != user.id:
         return {"message": "Permission denied"}, 403
 
+    # Stream file parts into the content-addressed store while parsing
+    store = BlobStoreService.from_config(current_app.config)
+    max_size = current_app.config["UPLOAD_MAX_BYTES"]
+    writers: list[BlobWriter] = []
+    # Only streamed multipart bodies may exceed MAX_CONTENT_LENGTH; a JSON body
+    # (file_url) is buffered in memory and keeps the application limit
+    if request.mimetype == "multipart/form-data":
+        request.max_content_length = max_size + current_app.config["UPLOAD_MULTIPART_OVERHEAD"]
+    try:
+        request.file_stream_factory = _blob_stream_factory(store, writers, max_size)
+        return _save_upload(release, writers)
+    except (BlobTooLargeError, RequestEntityTooLarge):
+        return {"message": f"File too large (max {max_size} bytes)"}, 413
+    except ValueError as e:
+        return {"message": str(e)}, 400
+    finally:
+        # Temporary files of parts that were not committed (no-op otherwise)
+        for writer in writers:
+            writer.abort()
+
+
+def _save_upload(  # noqa: PLR0911
+    release: Release, writers: list[BlobWriter]
+) -> tuple[dict[str, Any], int]:
+    """Commit the streamed upload (or remote URL) to the release.
+
+    Args:
+        release: Release being edited.
+        writers: Writers created by the stream factory while parsing.
+
+    Returns:
+        JSON response with file info.
+    """
     # Check if file is in request
     if "file" not in request.files:
         # Check for remote URL
         data = request.get_json()
         if data and data.get("file_url"):
             file_url = data["file_url"]
-            # Store URL in release metadata
-            if not release.release_metadata:
-                release.release_metadata = {}
-            release.release_metadata["file_url"] = file_url
-            release.release_metadata["wizard_step"] = 4
+            # Fetched server-side: reject internal hosts before creating the job
+            # (no DNS lookup here; the fetch job resolves and revalidates each hop)
+            RemoteFetchService.validate_url(
+                file_url, current_app.config.get("REMOTE_FETCH_ALLOWED_HOSTS", ()), resolve=False
+            )
             release.file_path = file_url
-            flag_modified(release, "release_metadata")
-            db.session.commit()
+
+            # Background download into the upload store (see JobService fetch jobs)
+            fetch_job = Job(
+                release_id=release.id,
+                created_by=release.user_id,
+                status="pending",
+                job_type="fetch",
+                config_json={"url": file_url, "sha256": data.get("sha256")},
+            )
+            db.session.add(fetch_job)
+            # Clear the previous local upload: its sha256 would key the analysis cache
+            draft, error = _save_step(
+                release,
+                4,
+                {
+                    "file_url": file_url,
+                    "file_size": None,
+                    "original_filename": None,
+                    "sha256": None,
+                    "crc32": None,
+                },
+            )
+            if error:
+                return error
 
             return (
                 {
                     "message": "File URL saved successfully",
                     "file_path": file_url,
                     "file_type": "remote",
+                    "fetch_job_id": fetch_job.id,
+                    "draft_version": draft.version,
                 },
                 200,
             )
@@ -200,35 +410,40 @@ def upload_file(release_id: int) -> tuple[dict[str, Any], int]:  # noqa: PLR0911
     if file.filename == "":
         return {"message": "No file selected"}, 400
 
-    # Validate file size (max 20GB)
-    max_size = 20 * 1024 * 1024 * 1024  # 20GB
-    file.seek(0, os.SEEK_END)
-    file_size = file.tell()
-    file.seek(0)
-
-    if file_size > max_size:
-        return {"message": "File too large (max 20GB)"}, 400
-
-    # Save file
-    filename = f"release_{release_id}_{file.filename}"
-    file_path = UPLOAD_DIR / filename
-    file.save(str(file_path))
-
-    # Update release
-    if not release.release_metadata:
-        release.release_metadata = {}
-    release.release_metadata["wizard_step"] = 4
-    release.release_metadata["file_size"] = file_size
+    writer = file.stream
+    if not isinstance(writer, BlobWriter) or writer not in writers:
+        return {"message": "Upload was not streamed to the upload store"}, 400
+    if not writer.expected_sha256 and request.form.get("sha256"):
+        writer.expected_sha256 = request.form["sha256"].lower()
+    blob = writer.commit()
+    file_path = blob["path"]
+
+    # Update release and the upload columns of the draft
     release.file_path = str(file_path)
-    flag_modified(release, "release_metadata")
-    db.session.commit()
+    draft, error = _save_step(
+        release,
+        4,
+        {
+            "file_url": None,
+            "file_size": blob["size"],
+            "original_filename": file.filename,
+            "sha256": blob["sha256"],
+            "crc32": blob["crc32"],
+        },
+    )
+    if error:
+        return error
 
     return (
         {
             "message": "File uploaded successfully",
             "file_path": str(file_path),
             "file_type": "local",
-            "file_size": file_size,
+            "file_size": blob["size"],
+            "sha256": blob["sha256"],
+            "crc32": blob["crc32"],
+            "deduplicated": blob["deduplicated"],
+            "draft_version": draft.version,
         },
         200,
     )
@@ -239,6 +454,11 @@ def upload_file(release_id: int) -> tuple[dict[str, Any], int]:  # noqa: PLR0911
 def analyze_file(release_id: int) -> tuple[dict[str, Any], int]:
     """Analyze file for wizard step 5.
 
+    The filename analysis is returned immediately. The deep analysis (format
+    sniffing, metadata, checksums, archive listing) is served from the cache
+    when the same file was already analyzed, otherwise an "analyze" job is
+    queued and its handle returned (poll GET /wizard/<id>/analyze).
+
     Args:
         release_id: Release ID.
 
@@ -262,56 +482,121 @@ def analyze_file(release_id: int) -> tuple[dict[str, Any], int]:
     if not release.file_path:
         return {"message": "No file uploaded"}, 400
 
+    drafts = WizardDraftService()
+    metadata = drafts.effective_metadata(release)
+
     # Basic analysis (can be enhanced with MediaInfo for specific formats)
     analysis: dict[str, Any] = {
         "file_path": release.file_path,
-        "file_size": (
-            release.release_metadata.get("file_size", 0) if release.release_metadata else 0
-        ),
+        "file_size": metadata.get("file_size", 0),
     }
 
-    # Extract metadata from filename if possible
-    filename = Path(release.file_path).name
+    # Extract metadata from filename if possible (stored blobs are named by hash)
+    filename = metadata.get("original_filename") or Path(release.file_path).name
     analysis["filename"] = filename
 
-    # Try to extract basic info from filename
-    # Expected format: GroupName-Author-Title-Format-Language-Year-ISBN-eBook
-    # Or: release_X_GroupName-Author-Title-Format...
-    min_filename_parts = 3
-    parts = filename.replace(".epub", "").replace(".pdf", "").replace(".cbz", "").split("-")
-
-    # Remove release_X_ prefix if present (for uploaded files)
-    if len(parts) > 0 and parts[0].startswith("release_") and "_" in parts[0]:
-        # Extract group name after release_X_ prefix
-        prefix_parts = parts[0].split("_", 2)
-        min_prefix_parts = 3
-        if len(prefix_parts) >= min_prefix_parts:
-            parts[0] = prefix_parts[2]  # Group name after release_X_
-
-    if len(parts) >= min_filename_parts:
-        analysis["detected_group"] = parts[0] if parts else None
-        analysis["detected_author"] = parts[1] if len(parts) > 1 else None
-
-    # Update release metadata
-    if not release.release_metadata:
-        release.release_metadata = {}
-    release.release_metadata["wizard_step"] = 5
-    release.release_metadata["analysis"] = analysis
-
-    # SQLAlchemy needs to be notified when JSON fields are modified
-    flag_modified(release, "release_metadata")
+    # Parse the release-name grammar (legacy uploads carry a release_<id>_ prefix)
+    parsed = ReleaseNameParserService().parse(LEGACY_UPLOAD_PREFIX.sub("", filename, count=1))
+    analysis["release_name"] = parsed
+    if parsed["group"]:
+        analysis["detected_group"] = parsed["group"]
+    if parsed["author"]:
+        analysis["detected_author"] = parsed["author"]
 
-    db.session.commit()
+    analysis.update(_deep_analysis(release, metadata))
+    draft, error = _save_step(release, 5, {"analysis": analysis})
+    if error:
+        return error
 
     return (
         {
             "message": "File analyzed successfully",
             "analysis": analysis,
+            "draft_version": draft.version,
         },
         200,
     )
 
 
+def _deep_analysis(release: Release, metadata: dict[str, Any]) -> dict[str, Any]:
+    """Resolve the deep analysis of the uploaded file: cached result or queued job.
+
+    Args:
+        release: Release being edited.
+        metadata: Metadata view of the draft (upload checksum, previous analysis).
+
+    Returns:
+        Analysis fields: cache_key, deep_status, and deep (cached) or deep_job_id.
+    """
+    analyzer = FileAnalysisService(current_app.config["ANALYSIS_CACHE_TIMEOUT"])
+    try:
+        key = analyzer.cache_key(Path(release.file_path), metadata.get("sha256"))
+    except OSError:
+        # Remote file not fetched yet
+        return {"deep_status": "unavailable"}
+
+    previous = metadata.get("analysis") or {}
+    cached = analyzer.get_cached(key)
+    if cached is None and previous.get("cache_key") == key:
+        cached = previous.get("deep")
+    if cached is not None:
+        return {"cache_key": key, "deep_status": "completed", "deep": cached}
+
+    # Reuse the job already queued for this file
+    if previous.get("cache_key") == key and previous.get("deep_job_id"):
+        job = db.session.get(Job, previous["deep_job_id"])
+        if job and job.status in ("pending", "running"):
+            return {"cache_key": key, "deep_status": "pending", "deep_job_id": job.id}
+
+    job = Job(
+        release_id=release.id,
+        created_by=release.user_id,
+        status="pending",
+        job_type="analyze",
+        config_json={"file_path": release.file_path, "cache_key": key},
+    )
+    db.session.add(job)
+    db.session.flush()
+    return {"cache_key": key, "deep_status": "pending", "deep_job_id": job.id}
+
+
+@wizard_bp.route("/wizard/<int:release_id>/analyze", methods=["GET"])
+@jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
+def get_analysis(release_id: int) -> tuple[dict[str, Any], int]:
+    """Get the analysis of wizard step 5 (deep analysis status and result).
+
+    Args:
+        release_id: Release ID.
+
+    Returns:
+        JSON response with the current analysis.
+    """
+    current_user_id = get_jwt_identity()
+    user = db.session.get(User, current_user_id)
+
+    if not user:
+        return {"message": "User not found"}, 404
+
+    # Verify release exists and belongs to user
+    release = db.session.get(Release, release_id)
+    if not release:
+        return {"message": "Release not found"}, 404
+
+    if release.user_id != user.id:
+        return {"message": "Permission denied"}, 403
+
+    analysis = WizardDraftService().effective_metadata(release).get("analysis")
+    if not analysis:
+        return {"message": "File not analyzed"}, 404
+
+    if analysis.get("deep_status") == "pending":
+        job = db.session.get(Job, analysis.get("deep_job_id"))
+        if job is None or job.status in ("failed", "cancelled"):
+            analysis = {**analysis, "deep_status": "failed"}
+
+    return {"analysis": analysis}, 200
+
+
 @wizard_bp.route("/wizard/<int:release_id>/metadata", methods=["POST"])
 @jwt_required()  # type: ignore[misc]  # MyPy: Flask decorators not fully typed
 def update_metadata(release_id: int) -> tuple[dict[str, Any], int]:
@@ -341,24 +626,21 @@ def update_metadata(release_id: int) -> tuple[dict[str, Any], int]:
     if not data:
         return {"message": "No data provided"}, 400
 
-    # Update release metadata
-    if not release.release_metadata:
-        release.release_metadata = {}
-
-    # Merge enriched metadata
-    enriched_metadata = data.get("enriched_metadata", {})
-    release.release_metadata.update(enriched_metadata)
-    release.release_metadata["wizard_step"] = 6
-
-    # SQLAlchemy needs to be notified when JSON fields are modified
-    flag_modified(release, "release_metadata")
-
-    db.session.commit()
+    # Merge enriched metadata into the draft (only this column is written)
+    draft, error = _save_step(
+        release,
+        6,
+        {"enriched_metadata": data.get("enriched_metadata") or {}},
+        merge=("enriched_metadata",),
+    )
+    if error:
+        return error
 
     return (
         {
             "message": "Metadata updated successfully",
-            "metadata": release.release_metadata,
+            "metadata": WizardDraftService().effective_metadata(release),
+            "draft_version": draft.version,
         },
         200,
     )
@@ -412,21 +694,15 @@ def handle_templates(release_id: int) -> tuple[dict[str, Any], int]:
     data = request.get_json()
     template_id = data.get("template_id") if data else None
 
-    # Update release metadata
-    if not release.release_metadata:
-        release.release_metadata = {}
-    release.release_metadata["wizard_step"] = 7
-    release.release_metadata["template_id"] = template_id
-
-    # SQLAlchemy needs to be notified when JSON fields are modified
-    flag_modified(release, "release_metadata")
-
-    db.session.commit()
+    draft, error = _save_step(release, 7, {"template_id": template_id})
+    if error:
+        return error
 
     return (
         {
             "message": "Template selected successfully",
             "template_id": template_id,
+            "draft_version": draft.version,
         },
         200,
     )
@@ -461,27 +737,16 @@ def update_options(release_id: int) -> tuple[dict[str, Any], int]:
     if not data:
         return {"message": "No data provided"}, 400
 
-    # Update release config
-    options = data.get("options", {})
-    if not release.config:
-        release.config = {}
-    release.config.update(options)
-
-    # Update release metadata
-    if not release.release_metadata:
-        release.release_metadata = {}
-    release.release_metadata["wizard_step"] = 8
-
-    # SQLAlchemy needs to be notified when JSON fields are modified
-    flag_modified(release, "config")
-    flag_modified(release, "release_metadata")
-
-    db.session.commit()
+    # Merge options into the draft (copied to release.config on finalize)
+    draft, error = _save_step(release, 8, {"options": data.get("options") or {}}, ("options",))
+    if error:
+        return error
 
     return (
         {
             "message": "Options updated successfully",
-            "options": release.config,
+            "options": WizardDraftService().effective_options(release),
+            "draft_version": draft.version,
         },
         200,
     )
@@ -515,21 +780,28 @@ def finalize_release(release_id: int) -> tuple[dict[str, Any], int]:
     data = request.get_json()
     destination_id = data.get("destination_id") if data else None
 
-    # Get job associated with release
-    job = Job.query.filter_by(release_id=release_id).first()
+    # Get the wizard job of the release (created with the draft, before any fetch job)
+    job = Job.query.filter_by(release_id=release_id).order_by(Job.id).first()
 
-    # Update release status
-    release.status = "ready"
-    if not release.release_metadata:
-        release.release_metadata = {}
-    release.release_metadata["wizard_step"] = 9
-    release.release_metadata["completed"] = True
+    drafts = WizardDraftService()
+    try:
+        expected_version = _expected_version()
+    except ValueError as e:
+        return {"message": str(e)}, 400
+    current_version = drafts.current_version(release)
+    if expected_version is not None and expected_version != current_version:
+        return _conflict(DraftConflictError(release.id, current_version))
 
+    # Update release status; the draft is written to release_metadata once
+    release.status = "ready"
+    extra_metadata: dict[str, Any] = {"wizard_step": 9, "completed": True}
+    # Rule revision pinned when the draft was created
+    if job and job.config_json and job.config_json.get("rule_revision"):
+        extra_metadata["rule_id"] = job.config_json["rule_id"]
+        extra_metadata["rule_revision"] = job.config_json["rule_revision"]
     if destination_id:
-        release.release_metadata["destination_id"] = destination_id
-
-    # SQLAlchemy needs to be notified when JSON fields are modified
-    flag_modified(release, "release_metadata")
+        extra_metadata["destination_id"] = destination_id
+    drafts.finalize(release, extra_metadata)
 
     # Update job status
     if job:
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+import tempfile
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -58,6 +59,70 @@ class BaseConfig:
     # API Keys Encryption
     API_KEYS_ENCRYPTION_KEY = os.getenv("API_KEYS_ENCRYPTION_KEY", "")
 
+    # Batch metadata extraction
+    # Répertoires sous lesquels des chemins bruts sont acceptés (séparés par ":")
+    METADATA_BATCH_ROOTS = [
+        root for root in os.getenv("METADATA_BATCH_ROOTS", "").split(os.pathsep) if root
+    ]
+    METADATA_BATCH_MAX_FILES = int(os.getenv("METADATA_BATCH_MAX_FILES", "1000"))
+    METADATA_BATCH_MAX_WORKERS = int(os.getenv("METADATA_BATCH_MAX_WORKERS", "8"))
+    # Batch release-name formatting (POST /api/formatter/batch)
+    FORMATTER_BATCH_MAX_ITEMS = int(os.getenv("FORMATTER_BATCH_MAX_ITEMS", "100000"))
+
+    # Packaging disk-space reservations (registre partagé entre workers)
+    PACKAGING_LEDGER_PATH = os.getenv(
+        "PACKAGING_LEDGER_PATH", str(Path(tempfile.gettempdir()) / "scene-packer-disk-ledger.json")
+    )
+    PACKAGING_MIN_FREE_BYTES = int(os.getenv("PACKAGING_MIN_FREE_BYTES", str(256 * 1024 * 1024)))
+    PACKAGING_RESERVATION_TTL = int(os.getenv("PACKAGING_RESERVATION_TTL", "21600"))  # 6h
+
+    # Stockage dédoublonné des uploads (blobs adressés par SHA-256)
+    UPLOAD_BLOB_ROOT = os.getenv("UPLOAD_BLOB_ROOT", "uploads/blobs")
+    UPLOAD_GC_GRACE_SECONDS = int(os.getenv("UPLOAD_GC_GRACE_SECONDS", "3600"))
+    # Garbage collector des orphelins : suppressions par lot, pause entre lots (secondes)
+    UPLOAD_GC_BATCH_SIZE = int(os.getenv("UPLOAD_GC_BATCH_SIZE", "100"))
+    UPLOAD_GC_BATCH_PAUSE = float(os.getenv("UPLOAD_GC_BATCH_PAUSE", "0.05"))
+    # Répertoires d'uploads hérités (release_{id}_{filename}) et racines de sortie
+    # du packaging dont les répertoires de staging sont collectés (séparés par ":")
+    UPLOAD_GC_LEGACY_DIRS = [
+        root
+        for root in os.getenv("UPLOAD_GC_LEGACY_DIRS", "uploads/wizard").split(os.pathsep)
+        if root
+    ]
+    PACKAGING_STAGING_ROOTS = [
+        root for root in os.getenv("PACKAGING_STAGING_ROOTS", "").split(os.pathsep) if root
+    ]
+    # Racine de sortie des jobs REPACK (un répertoire release_<id> par release) ;
+    # le chemin de sortie n'est jamais fourni par le client
+    PACKAGING_OUTPUT_ROOT = os.getenv("PACKAGING_OUTPUT_ROOT", "uploads/packages")
+    # Taille maximale d'un fichier uploadé (appliquée pendant le streaming) ;
+    # MAX_CONTENT_LENGTH reste la limite des autres requêtes
+    UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(20 * 1024**3)))  # 20GB
+    UPLOAD_MULTIPART_OVERHEAD = 1024 * 1024  # champs et en-têtes multipart
+    # Rapatriement des sources distantes (file_url) : connexions parallèles par fichier
+    REMOTE_FETCH_SEGMENTS = int(os.getenv("REMOTE_FETCH_SEGMENTS", "4"))
+    REMOTE_FETCH_TIMEOUT = int(os.getenv("REMOTE_FETCH_TIMEOUT", "30"))
+    # Hôtes autorisés malgré une adresse privée/loopback (miroirs internes) ;
+    # toute autre URL doit résoudre vers des adresses publiques
+    REMOTE_FETCH_ALLOWED_HOSTS = [
+        host for host in os.getenv("REMOTE_FETCH_ALLOWED_HOSTS", "").split(",") if host
+    ]
+    # Analyse approfondie du wizard (étape 5) : conservation en cache par fichier
+    ANALYSIS_CACHE_TIMEOUT = int(os.getenv("ANALYSIS_CACHE_TIMEOUT", str(7 * 24 * 3600)))
+    # Catalogue scenerules.org annoté (is_downloaded), invalidé à chaque écriture de règle
+    RULES_CATALOGUE_CACHE_TIMEOUT = int(os.getenv("RULES_CATALOGUE_CACHE_TIMEOUT", "3600"))
+    # Index de dupes (noms predb importés), projeté en mémoire par chaque worker
+    DUPE_INDEX_PATH = os.getenv("DUPE_INDEX_PATH", "uploads/dupe_index.bin")
+    # Miroir local des règles scenerules.org (synchronisation conditionnelle)
+    SCENERULES_BASE_URL = os.getenv("SCENERULES_BASE_URL", "https://scenerules.org")
+    SCENERULES_MIRROR_DIR = os.getenv("SCENERULES_MIRROR_DIR", "uploads/scenerules")
+    SCENERULES_SYNC_WORKERS = int(os.getenv("SCENERULES_SYNC_WORKERS", "8"))
+    SCENERULES_TIMEOUT = int(os.getenv("SCENERULES_TIMEOUT", "30"))
+
+    # Rule uploads (single file, multi-file or ZIP)
+    RULES_UPLOAD_MAX_FILES = int(os.getenv("RULES_UPLOAD_MAX_FILES", "500"))
+    RULES_UPLOAD_MAX_BYTES = int(os.getenv("RULES_UPLOAD_MAX_BYTES", str(5 * 1024 * 1024)))
+
 
 class DevelopmentConfig(BaseConfig):
     """Development configuration."""
@@ -8,8 +8,10 @@ from web.models.permission import Permission
 from web.models.release import Release
 from web.models.role import Role
 from web.models.rule import Rule
+from web.models.rule_revision import RuleRevision
 from web.models.token_blocklist import TokenBlocklist
 from web.models.user import User
+from web.models.wizard_draft import WizardDraft
 
 __all__ = [
     "Configuration",
@@ -19,8 +21,10 @@ __all__ = [
     "Release",
     "Role",
     "Rule",
+    "RuleRevision",
     "TokenBlocklist",
     "User",
+    "WizardDraft",
     "role_permissions",
     "user_groups",
     "user_roles",
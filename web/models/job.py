@@ -21,6 +21,7 @@ class Job(db.Model):
     status: Mapped[str] = mapped_column(db.String(50), default="pending", nullable=False)
     job_type: Mapped[str | None] = mapped_column(db.String(50), nullable=True)
     config_json: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=True)
+    progress: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
     logs: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         db.DateTime, default=lambda: datetime.now(UTC), nullable=False
@@ -38,6 +39,7 @@ class Job(db.Model):
             "status": self.status,
             "job_type": self.job_type,
             "config_json": self.config_json,
+            "progress": self.progress,
             "logs": self.logs,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "created_by": self.created_by,
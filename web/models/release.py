@@ -32,6 +32,9 @@ class Release(db.Model):
     user = relationship("User", backref="releases")
     group = relationship("Group", backref="releases")
     jobs = relationship("Job", back_populates="release", lazy="dynamic")
+    wizard_draft = relationship(
+        "WizardDraft", uselist=False, cascade="all, delete-orphan", passive_deletes=True
+    )
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from web.extensions import db
+
+
+class RuleRevision(db.Model):
+    """Stored revision of a rule's content.
+
+    A revision is either a full snapshot of the content or a line delta
+    against the snapshot revision named by base_revision (see
+    RuleRevisionService). Revisions are immutable once written.
+    """
+
+    __tablename__ = "rule_revisions"
+    __table_args__ = (db.UniqueConstraint("rule_id", "revision", name="uq_rule_revisions_rule"),)
+
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    rule_id: Mapped[int] = mapped_column(
+        db.Integer,
+        db.ForeignKey("rules.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    revision: Mapped[int] = mapped_column(db.Integer, nullable=False)
+    # "snapshot" (payload = content) or "delta" (payload = JSON line operations)
+    kind: Mapped[str] = mapped_column(db.String(10), nullable=False)
+    base_revision: Mapped[int | None] = mapped_column(db.Integer, nullable=True)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    content_sha256: Mapped[str] = mapped_column(db.String(64), nullable=False)
+    content_size: Mapped[int] = mapped_column(db.Integer, nullable=False)
+    line_count: Mapped[int] = mapped_column(db.Integer, nullable=False)
+    created_by: Mapped[int | None] = mapped_column(
+        db.Integer, db.ForeignKey("users.id"), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        db.DateTime, default=lambda: datetime.now(UTC), nullable=False
+    )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary (without payload)."""
+        return {
+            "rule_id": self.rule_id,
+            "revision": self.revision,
+            "kind": self.kind,
+            "base_revision": self.base_revision,
+            "content_sha256": self.content_sha256,
+            "content_size": self.content_size,
+            "line_count": self.line_count,
+            "stored_size": len(self.payload),
+            "created_by": self.created_by,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<RuleRevision {self.rule_id}@{self.revision}>"
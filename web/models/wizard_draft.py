@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import JSON
+from sqlalchemy.orm import Mapped, mapped_column
+
+from web.extensions import db
+from web.models.mixins import TimestampMixin
+
+
+class WizardDraft(TimestampMixin, db.Model):
+    """Wizard draft state, one row per draft release.
+
+    Each wizard step owns its columns and updates only those; version is
+    incremented on every save (optimistic concurrency between browser tabs).
+    """
+
+    __tablename__ = "wizard_drafts"
+
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    release_id: Mapped[int] = mapped_column(
+        db.Integer,
+        db.ForeignKey("releases.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+        index=True,
+    )
+    version: Mapped[int] = mapped_column(db.Integer, default=1, nullable=False)
+    step: Mapped[int] = mapped_column(db.Integer, default=3, nullable=False)
+    # Step 4 - upload
+    file_url: Mapped[str | None] = mapped_column(db.String(2000), nullable=True)
+    file_size: Mapped[int | None] = mapped_column(db.BigInteger, nullable=True)
+    original_filename: Mapped[str | None] = mapped_column(db.String(500), nullable=True)
+    sha256: Mapped[str | None] = mapped_column(db.String(64), nullable=True)
+    crc32: Mapped[str | None] = mapped_column(db.String(8), nullable=True)
+    # Step 5 - analysis
+    analysis: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    # Step 6 - enriched metadata
+    enriched_metadata: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    # Step 7 - template
+    template_id: Mapped[int | None] = mapped_column(db.Integer, nullable=True)
+    # Step 8 - packaging options
+    options: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    # created_at et updated_at hérités de TimestampMixin
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "id": self.id,
+            "release_id": self.release_id,
+            "version": self.version,
+            "step": self.step,
+            "file_url": self.file_url,
+            "file_size": self.file_size,
+            "original_filename": self.original_filename,
+            "sha256": self.sha256,
+            "crc32": self.crc32,
+            "analysis": self.analysis,
+            "enriched_metadata": self.enriched_metadata or {},
+            "template_id": self.template_id,
+            "options": self.options or {},
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
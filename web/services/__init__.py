@@ -1,18 +1,53 @@
 """Services métier organisés par domaines."""
 
+from web.services.archive import ArchiveIndexService, ArchiveVerifierService
+from web.services.dirfix import DirfixService
+from web.services.dupe import DupeIndexService
 from web.services.job import JobService, JobStateMachine
-from web.services.metadata import MetadataExtractionService
-from web.services.packaging import NfoGeneratorService, PackagingService
-from web.services.rule import RuleParserService, ScenerulesDownloadService
+from web.services.metadata import (
+    FileAnalysisService,
+    MetadataExtractionService,
+    NfoReaderService,
+)
+from web.services.packaging import NfoGeneratorService, PackagingService, StagingService
+from web.services.rule import (
+    RuleCatalogService,
+    RuleIngestError,
+    RuleIngestService,
+    RuleParserService,
+    RuleRevisionService,
+    RuleSearchService,
+    ScenerulesDownloadService,
+    ScenerulesSyncService,
+)
+from web.services.storage import BlobStoreService, OrphanCollectorService, RemoteFetchService
 from web.services.validator import ReleaseValidatorService
+from web.services.wizard import WizardDraftService
 
 __all__ = [
+    "ArchiveIndexService",
+    "ArchiveVerifierService",
+    "BlobStoreService",
+    "DirfixService",
+    "DupeIndexService",
+    "FileAnalysisService",
     "JobService",
     "JobStateMachine",
     "MetadataExtractionService",
     "NfoGeneratorService",
+    "NfoReaderService",
     "PackagingService",
+    "RuleCatalogService",
+    "RuleIngestError",
+    "RuleIngestService",
     "RuleParserService",
+    "RuleRevisionService",
+    "RuleSearchService",
     "ScenerulesDownloadService",
+    "ScenerulesSyncService",
+    "StagingService",
     "ReleaseValidatorService",
+    "OrphanCollectorService",
+    "RemoteFetchService",
+    "WizardDraftService",
 ]
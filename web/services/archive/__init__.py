@@ -0,0 +1,7 @@
+"""Services archive - Lecture et vérification d'archives ZIP (ZIP, EPUB, CBZ)."""
+
+from web.services.archive.archive_index import ArchiveIndexService
+from web.services.archive.central_directory import ArchiveFormatError
+from web.services.archive.verifier import ArchiveVerifierService
+
+__all__ = ["ArchiveFormatError", "ArchiveIndexService", "ArchiveVerifierService"]
@@ -0,0 +1,253 @@
+"""Service d'inspection d'archives ZIP/EPUB/CBZ sans extraction.
+
+Ce service liste les membres d'une archive (tailles, CRC, méthodes) en ne
+lisant que la fin du fichier (EOCD et répertoire central, via mmap), et sert
+les octets d'un seul membre par plage sans décompresser les autres.
+
+Architecture :
+- Index du répertoire central mis en cache par identité de fichier
+  (st_dev, st_ino, st_size, st_mtime_ns) : une archive remplacée ou modifiée
+  change de clé, aucune invalidation explicite n'est nécessaire
+- Cache LRU par processus, borné (ARCHIVE_INDEX_CACHE_SIZE entrées)
+- Membre stocké : lecture directe de la plage demandée (os.pread)
+- Membre compressé : décompression en flux de ce seul membre, octets
+  antérieurs à la plage décompressés puis ignorés, arrêt dès la fin de plage
+
+Complexité : O(m) pour l'indexation (m membres), O(1) en cache ;
+O(k) pour servir une plage de k octets d'un membre stocké, O(fin de plage)
+pour un membre compressé.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from web.services.archive.central_directory import (
+    FLAG_ENCRYPTED,
+    ArchiveFormatError,
+    ZipDirectory,
+    ZipMember,
+    read_central_directory,
+    read_local_header,
+)
+from web.services.archive.verifier import DECOMPRESSORS, METHOD_STORED, _inflate
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+# Nombre d'archives indexées conservées par processus
+ARCHIVE_INDEX_CACHE_SIZE = 256
+
+# Taille des blocs lus et envoyés lors du service d'un membre
+STREAM_CHUNK_SIZE = 256 * 1024
+
+FileIdentity = tuple[int, int, int, int]
+
+
+class ArchiveIndexService:
+    """Service de listing et de lecture par plage des membres d'une archive.
+
+    Exemple d'utilisation :
+        service = ArchiveIndexService()
+        listing = service.list_members(Path("book.epub"))
+        member = service.get_member(Path("book.epub"), "OEBPS/content.opf")
+        body = service.iter_member_range(Path("book.epub"), member, 0, 1024)
+    """
+
+    _cache: OrderedDict[FileIdentity, ZipDirectory] = OrderedDict()
+    _lock = threading.Lock()
+
+    def list_members(self, path: Path) -> dict[str, Any]:
+        """Liste les membres d'une archive depuis son répertoire central.
+
+        Args:
+            path: Archive ZIP, EPUB ou CBZ.
+
+        Returns:
+            Dictionnaire contenant :
+                - members : Liste de {name, size, compressed_size, crc32 (hex),
+                  method, modified, is_dir, encrypted}
+                - count : Nombre de membres
+                - total_size : Taille décompressée cumulée
+                - comment : Commentaire de l'archive
+                - cached : True si l'index provenait du cache
+                - bytes_read : Octets lus pour construire l'index (0 si en cache)
+
+        Raises:
+            FileNotFoundError: Si l'archive n'existe pas.
+            ArchiveFormatError: Si le fichier n'est pas une archive ZIP lisible.
+        """
+        directory, cached = self._load(path)
+        members = [
+            {
+                "name": member.name,
+                "size": member.file_size,
+                "compressed_size": member.compressed_size,
+                "crc32": f"{member.crc32:08x}",
+                "method": member.method_name,
+                "modified": "{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}".format(*member.date_time),
+                "is_dir": member.is_dir,
+                "encrypted": bool(member.flags & FLAG_ENCRYPTED),
+            }
+            for member in directory.members
+        ]
+        return {
+            "members": members,
+            "count": len(members),
+            "total_size": sum(member.file_size for member in directory.members),
+            "comment": directory.comment.decode("utf-8", errors="replace"),
+            "cached": cached,
+            "bytes_read": 0 if cached else directory.bytes_read,
+        }
+
+    def get_member(self, path: Path, name: str) -> ZipMember | None:
+        """Retourne l'entrée du répertoire central d'un membre.
+
+        Args:
+            path: Archive.
+            name: Nom exact du membre.
+
+        Returns:
+            ZipMember, ou None si absent.
+
+        Raises:
+            FileNotFoundError: Si l'archive n'existe pas.
+            ArchiveFormatError: Si le fichier n'est pas une archive ZIP lisible.
+        """
+        directory, _ = self._load(path)
+        return next((member for member in directory.members if member.name == name), None)
+
+    def iter_member_range(
+        self, path: Path, member: ZipMember, start: int, stop: int
+    ) -> Iterator[bytes]:
+        """Produit les octets décompressés [start, stop) d'un membre.
+
+        Le descripteur est ouvert et l'en-tête local vérifié immédiatement
+        (erreurs levées à l'appel), puis les données sont produites en flux.
+
+        Args:
+            path: Archive.
+            member: Membre (voir get_member()).
+            start: Premier octet (inclus).
+            stop: Dernier octet (exclu), <= member.file_size.
+
+        Returns:
+            Itérateur de blocs d'octets.
+
+        Raises:
+            ArchiveFormatError: Si le membre est chiffré, d'une méthode non
+                supportée, ou si son en-tête local est invalide.
+        """
+        if member.flags & FLAG_ENCRYPTED:
+            raise ArchiveFormatError(f"Membre chiffré: {member.name}")
+        if member.method not in DECOMPRESSORS:
+            raise ArchiveFormatError(f"Méthode non supportée: {member.method_name}")
+
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            data_offset, _ = read_local_header(
+                lambda offset, length: os.pread(fd, length, offset), member
+            )
+        except BaseException:
+            os.close(fd)
+            raise
+        return self._stream(fd, member, data_offset, start, stop)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Vide le cache d'index (tests, libération mémoire)."""
+        with cls._lock:
+            cls._cache.clear()
+
+    def _load(self, path: Path) -> tuple[ZipDirectory, bool]:
+        """Charge l'index du répertoire central, depuis le cache si possible.
+
+        Args:
+            path: Archive.
+
+        Returns:
+            Tuple (directory, cached).
+
+        Raises:
+            FileNotFoundError: Si l'archive n'existe pas.
+            ArchiveFormatError: Si le fichier n'est pas une archive ZIP lisible.
+        """
+        stat = path.stat()
+        key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            directory = self._cache.get(key)
+            if directory is not None:
+                self._cache.move_to_end(key)
+                return directory, True
+
+        if stat.st_size == 0:
+            raise ArchiveFormatError("Archive vide")
+        with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            directory = read_central_directory(
+                lambda offset, length: mm[offset : offset + length], stat.st_size
+            )
+
+        with self._lock:
+            self._cache[key] = directory
+            while len(self._cache) > ARCHIVE_INDEX_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return directory, False
+
+    @staticmethod
+    def _stream(
+        fd: int, member: ZipMember, data_offset: int, start: int, stop: int
+    ) -> Iterator[bytes]:
+        """Générateur de la plage [start, stop) ; ferme le descripteur en fin de flux.
+
+        Args:
+            fd: Descripteur de l'archive.
+            member: Membre servi.
+            data_offset: Début des données compressées.
+            start: Premier octet (inclus).
+            stop: Dernier octet (exclu).
+
+        Yields:
+            Blocs d'octets de la plage.
+        """
+        try:
+            if member.method == METHOD_STORED:
+                position = start
+                while position < stop:
+                    chunk = os.pread(
+                        fd, min(STREAM_CHUNK_SIZE, stop - position), data_offset + position
+                    )
+                    if not chunk:
+                        return
+                    position += len(chunk)
+                    yield chunk
+                return
+
+            decompressor = DECOMPRESSORS[member.method]()
+            produced = 0
+            read_position = data_offset
+            data_end = data_offset + member.compressed_size
+            while read_position < data_end and produced < stop:
+                chunk = os.pread(
+                    fd, min(STREAM_CHUNK_SIZE, data_end - read_position), read_position
+                )
+                if not chunk:
+                    return
+                read_position += len(chunk)
+                for data in _inflate(decompressor, chunk):
+                    block_start = produced
+                    produced += len(data)
+                    if produced <= start:
+                        continue
+                    yield data[max(0, start - block_start) : stop - block_start]
+                    if produced >= stop:
+                        return
+        except zlib.error as e:
+            raise ArchiveFormatError(f"Données corrompues: {member.name}") from e
+        finally:
+            os.close(fd)
@@ -0,0 +1,286 @@
+"""Lecture du répertoire central d'une archive ZIP (ZIP, EPUB, CBZ).
+
+Ce module lit la liste des membres d'une archive sans décompresser ni
+parcourir les données : seuls l'enregistrement de fin de répertoire central
+(EOCD, éventuellement ZIP64) et le répertoire central lui-même sont lus,
+soit quelques Ko à la fin du fichier.
+
+Architecture :
+- Lecture par callback read(offset, length) : os.pread sur un descripteur
+  partagé (vérification parallèle) ou tranche de mmap (inspection)
+- EOCD recherché dans les 4 Ko finaux, puis dans les 64 Ko + 22 octets
+  finaux (commentaire maximal)
+- Extensions ZIP64 (locator, EOCD64, champ extra 0x0001) supportées
+- Noms décodés en UTF-8 (bit 11) ou CP437, comme zipfile
+
+Complexité : O(m) où m est le nombre de membres ; octets lus proportionnels
+à la taille du répertoire central, indépendants de la taille des données.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+EOCD_SIGNATURE = b"PK\x05\x06"
+EOCD_STRUCT = struct.Struct("<4s4H2LH")
+ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+ZIP64_LOCATOR_STRUCT = struct.Struct("<4sLQL")
+ZIP64_EOCD_SIGNATURE = b"PK\x06\x06"
+ZIP64_EOCD_STRUCT = struct.Struct("<4sQ2H2L4Q")
+CENTRAL_SIGNATURE = b"PK\x01\x02"
+CENTRAL_STRUCT = struct.Struct("<4s4B4HL2L5H2L")
+LOCAL_SIGNATURE = b"PK\x03\x04"
+LOCAL_STRUCT = struct.Struct("<4s2B4HL2L2H")
+
+# Taille maximale du commentaire d'archive (champ 16 bits)
+MAX_COMMENT_SIZE = 0xFFFF
+
+# Fin de fichier lue en premier (archives sans long commentaire) ; la
+# recherche s'étend à 64 Ko seulement si l'EOCD n'y est pas
+INITIAL_TAIL_SIZE = 4096
+
+# Identifiant du champ extra ZIP64
+ZIP64_EXTRA_ID = 0x0001
+ZIP64_MARKER_32 = 0xFFFFFFFF
+ZIP64_MARKER_16 = 0xFFFF
+
+# Bits de flag utiles
+FLAG_ENCRYPTED = 0x1
+FLAG_DATA_DESCRIPTOR = 0x8
+FLAG_UTF8 = 0x800
+
+METHOD_NAMES = {0: "stored", 8: "deflated", 9: "deflate64", 12: "bzip2", 14: "lzma", 93: "zstd"}
+
+
+class ArchiveFormatError(ValueError):
+    """Archive ZIP illisible (EOCD absent, répertoire central incohérent)."""
+
+
+class ZipMember(NamedTuple):
+    """Entrée du répertoire central."""
+
+    name: str
+    raw_name: bytes
+    flags: int
+    method: int
+    crc32: int
+    compressed_size: int
+    file_size: int
+    local_header_offset: int
+    date_time: tuple[int, int, int, int, int, int]
+    external_attr: int
+
+    @property
+    def is_dir(self) -> bool:
+        """True si l'entrée est un répertoire."""
+        return self.name.endswith("/")
+
+    @property
+    def method_name(self) -> str:
+        """Nom lisible de la méthode de compression."""
+        return METHOD_NAMES.get(self.method, f"method-{self.method}")
+
+
+class ZipDirectory(NamedTuple):
+    """Résultat de la lecture du répertoire central."""
+
+    members: list[ZipMember]
+    central_directory_offset: int
+    central_directory_size: int
+    comment: bytes
+    bytes_read: int
+
+
+def read_central_directory(read: Callable[[int, int], bytes], file_size: int) -> ZipDirectory:
+    """Lit l'EOCD et le répertoire central d'une archive.
+
+    Algorithme :
+    1. Lecture des 4 derniers Ko, recherche de l'EOCD ; à défaut, lecture de la
+       fin du fichier sur 22 + 65535 octets (commentaire maximal)
+    2. Si présent, locator ZIP64 puis EOCD64 (nombres et offsets 64 bits)
+    3. Lecture du répertoire central en un bloc, décodage des entrées
+
+    Args:
+        read: Fonction read(offset, length) -> bytes.
+        file_size: Taille de l'archive.
+
+    Returns:
+        ZipDirectory (membres dans l'ordre du répertoire central).
+
+    Raises:
+        ArchiveFormatError: Si l'archive n'est pas un ZIP lisible.
+    """
+    bytes_read = 0
+    for search_size in (INITIAL_TAIL_SIZE, EOCD_STRUCT.size + MAX_COMMENT_SIZE):
+        tail_size = min(file_size, search_size)
+        tail_offset = file_size - tail_size
+        tail = read(tail_offset, tail_size)
+        bytes_read += len(tail)
+        position = tail.rfind(EOCD_SIGNATURE)
+        if position >= 0 and position + EOCD_STRUCT.size <= len(tail):
+            break
+        if tail_size == file_size:
+            break
+    if position < 0 or position + EOCD_STRUCT.size > len(tail):
+        raise ArchiveFormatError("Enregistrement de fin de répertoire central introuvable")
+    (_, _, _, _, entries, cd_size, cd_offset, comment_size) = EOCD_STRUCT.unpack_from(
+        tail, position
+    )
+    comment_start = position + EOCD_STRUCT.size
+    comment = tail[comment_start : comment_start + comment_size]
+    eocd_offset = tail_offset + position
+
+    locator_offset = eocd_offset - ZIP64_LOCATOR_STRUCT.size
+    if locator_offset >= 0:
+        locator = _read_at(read, tail, tail_offset, locator_offset, ZIP64_LOCATOR_STRUCT.size)
+        if locator.startswith(ZIP64_LOCATOR_SIGNATURE):
+            _, _, eocd64_offset, _ = ZIP64_LOCATOR_STRUCT.unpack(locator)
+            eocd64 = _read_at(read, tail, tail_offset, eocd64_offset, ZIP64_EOCD_STRUCT.size)
+            bytes_read += ZIP64_EOCD_STRUCT.size
+            if not eocd64.startswith(ZIP64_EOCD_SIGNATURE):
+                raise ArchiveFormatError("EOCD ZIP64 invalide")
+            (*_, entries, cd_size, cd_offset) = ZIP64_EOCD_STRUCT.unpack(eocd64)
+
+    if cd_offset + cd_size > file_size:
+        raise ArchiveFormatError("Répertoire central hors des limites du fichier")
+
+    data = _read_at(read, tail, tail_offset, cd_offset, cd_size)
+    if cd_offset < tail_offset:
+        bytes_read += cd_size
+    members = _parse_entries(data, entries)
+    return ZipDirectory(members, cd_offset, cd_size, comment, bytes_read)
+
+
+def read_local_header(read: Callable[[int, int], bytes], member: ZipMember) -> tuple[int, int]:
+    """Lit l'en-tête local d'un membre et retourne la position de ses données.
+
+    Args:
+        read: Fonction read(offset, length) -> bytes.
+        member: Membre du répertoire central.
+
+    Returns:
+        Tuple (data_offset, method) : début des données compressées et méthode
+        déclarée par l'en-tête local.
+
+    Raises:
+        ArchiveFormatError: Si l'en-tête local est absent ou ne correspond pas.
+    """
+    header = read(member.local_header_offset, LOCAL_STRUCT.size)
+    if len(header) < LOCAL_STRUCT.size or not header.startswith(LOCAL_SIGNATURE):
+        raise ArchiveFormatError(f"En-tête local invalide: {member.name}")
+    fields = LOCAL_STRUCT.unpack(header)
+    method, name_length, extra_length = fields[4], fields[10], fields[11]
+    raw_name = read(member.local_header_offset + LOCAL_STRUCT.size, name_length)
+    if raw_name != member.raw_name:
+        raise ArchiveFormatError(f"Nom de l'en-tête local différent: {member.name}")
+    data_offset = member.local_header_offset + LOCAL_STRUCT.size + name_length + extra_length
+    return data_offset, method
+
+
+def _read_at(
+    read: Callable[[int, int], bytes], tail: bytes, tail_offset: int, offset: int, length: int
+) -> bytes:
+    """Lit une plage en réutilisant la fin de fichier déjà chargée si possible."""
+    if offset >= tail_offset and offset + length <= tail_offset + len(tail):
+        start = offset - tail_offset
+        return tail[start : start + length]
+    return read(offset, length)
+
+
+def _parse_entries(data: bytes, expected: int) -> list[ZipMember]:
+    """Décode les entrées du répertoire central.
+
+    Args:
+        data: Octets du répertoire central.
+        expected: Nombre d'entrées annoncé par l'EOCD.
+
+    Returns:
+        Liste des membres.
+
+    Raises:
+        ArchiveFormatError: Si une entrée est tronquée ou mal signée.
+    """
+    members: list[ZipMember] = []
+    position = 0
+    while position < len(data) and len(members) < expected:
+        if data[position : position + 4] != CENTRAL_SIGNATURE:
+            raise ArchiveFormatError(f"Entrée du répertoire central invalide à {position}")
+        if position + CENTRAL_STRUCT.size > len(data):
+            raise ArchiveFormatError("Répertoire central tronqué")
+        fields = CENTRAL_STRUCT.unpack_from(data, position)
+        flags, method, dos_time, dos_date, crc = fields[5:10]
+        compressed_size, file_size = fields[10], fields[11]
+        name_length, extra_length, comment_length = fields[12:15]
+        external_attr, header_offset = fields[17], fields[18]
+
+        name_start = position + CENTRAL_STRUCT.size
+        raw_name = data[name_start : name_start + name_length]
+        extra = data[name_start + name_length : name_start + name_length + extra_length]
+        position = name_start + name_length + extra_length + comment_length
+        if position > len(data):
+            raise ArchiveFormatError("Répertoire central tronqué")
+
+        file_size, compressed_size, header_offset = _apply_zip64_extra(
+            extra, file_size, compressed_size, header_offset
+        )
+        members.append(
+            ZipMember(
+                name=raw_name.decode("utf-8" if flags & FLAG_UTF8 else "cp437"),
+                raw_name=raw_name,
+                flags=flags,
+                method=method,
+                crc32=crc,
+                compressed_size=compressed_size,
+                file_size=file_size,
+                local_header_offset=header_offset,
+                date_time=(
+                    (dos_date >> 9) + 1980,
+                    (dos_date >> 5) & 0xF,
+                    dos_date & 0x1F,
+                    dos_time >> 11,
+                    (dos_time >> 5) & 0x3F,
+                    (dos_time & 0x1F) * 2,
+                ),
+                external_attr=external_attr,
+            )
+        )
+
+    if len(members) != expected:
+        raise ArchiveFormatError(
+            f"Nombre d'entrées incohérent ({len(members)} lues, {expected} annoncées)"
+        )
+    return members
+
+
+def _apply_zip64_extra(
+    extra: bytes, file_size: int, compressed_size: int, header_offset: int
+) -> tuple[int, int, int]:
+    """Remplace les champs saturés (0xFFFFFFFF) par leurs valeurs ZIP64.
+
+    Args:
+        extra: Champ extra de l'entrée centrale.
+        file_size: Taille décompressée (32 bits).
+        compressed_size: Taille compressée (32 bits).
+        header_offset: Offset de l'en-tête local (32 bits).
+
+    Returns:
+        Tuple (file_size, compressed_size, header_offset) 64 bits.
+    """
+    position = 0
+    while position + 4 <= len(extra):
+        header_id, size = struct.unpack_from("<2H", extra, position)
+        if header_id == ZIP64_EXTRA_ID:
+            values = list(struct.unpack_from(f"<{size // 8}Q", extra, position + 4))
+            if file_size == ZIP64_MARKER_32 and values:
+                file_size = values.pop(0)
+            if compressed_size == ZIP64_MARKER_32 and values:
+                compressed_size = values.pop(0)
+            if header_offset == ZIP64_MARKER_32 and values:
+                header_offset = values.pop(0)
+            break
+        position += 4 + size
+    return file_size, compressed_size, header_offset
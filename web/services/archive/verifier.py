@@ -0,0 +1,335 @@
+"""Service de vérification parallèle des archives ZIP construites.
+
+Ce service remplace ZipFile.testzip(), qui décompresse chaque membre
+séquentiellement dans un seul thread, par une vérification répartie sur un
+pool : chaque membre est lu indépendamment par os.pread sur un descripteur
+partagé (threads) ou par processus (pool de processus), puis décompressé en
+flux et comparé au CRC-32 et à la taille du répertoire central.
+
+Architecture :
+- Lecture du répertoire central (central_directory.read_central_directory)
+- Mode "quick" : répertoire central + en-têtes locaux uniquement (signature,
+  nom, méthode, données dans les limites, membres sans chevauchement)
+- Mode "full" : mode quick + CRC-32 et taille de chaque membre, en parallèle
+- zlib.decompress et zlib.crc32 libèrent le GIL sur les gros blocs : le pool
+  de threads passe à l'échelle avec les cœurs ; le pool de processus reste
+  disponible pour bz2/lzma et les archives de très nombreux petits membres
+
+Complexité : O(m) en mode quick (m membres), O(n / w) en mode full où n est
+la taille des données et w le nombre de workers.
+"""
+
+from __future__ import annotations
+
+import bz2
+import logging
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from web.services.archive.central_directory import (
+    FLAG_ENCRYPTED,
+    ArchiveFormatError,
+    ZipMember,
+    read_central_directory,
+    read_local_header,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+VERIFY_MODES = ("quick", "full")
+EXECUTORS = ("thread", "process")
+
+# Taille des lectures pread pendant la vérification CRC
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Taille maximale d'un bloc décompressé (évite d'allouer tout un membre très
+# compressible d'un coup)
+OUTPUT_CHUNK_SIZE = 256 * 1024
+
+# En dessous de ce volume compressé total, la vérification reste séquentielle
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+METHOD_STORED = 0
+METHOD_DEFLATED = 8
+METHOD_BZIP2 = 12
+
+# Fabriques de décompresseurs par méthode (None : données stockées telles quelles)
+DECOMPRESSORS: dict[int, Callable[[], Any]] = {
+    METHOD_STORED: lambda: None,
+    METHOD_DEFLATED: lambda: zlib.decompressobj(-zlib.MAX_WBITS),
+    METHOD_BZIP2: bz2.BZ2Decompressor,
+}
+
+# Descripteurs ouverts par processus (pool de processus)
+_process_fds: dict[str, int] = {}
+
+
+class ArchiveVerifierService:
+    """Service de vérification d'intégrité d'archives ZIP.
+
+    Exemple d'utilisation :
+        service = ArchiveVerifierService(workers=8)
+        report = service.verify(Path("Release.zip"))
+        # {"valid": True, "mode": "full", "members": 3, "errors": [], ...}
+        quick = service.verify(Path("Release.zip"), mode="quick")
+    """
+
+    def __init__(self, workers: int | None = None, executor: str = "thread") -> None:
+        """Initialise le service.
+
+        Args:
+            workers: Taille du pool (défaut : nombre de cœurs, max 32).
+            executor: "thread" (descripteur partagé) ou "process".
+
+        Raises:
+            ValueError: Si executor est inconnu.
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"Exécuteur inconnu: {executor}")
+        self.workers = workers or min(32, os.cpu_count() or 1)
+        self.executor = executor
+
+    def verify(self, path: Path, mode: str = "full") -> dict[str, Any]:
+        """Vérifie une archive ZIP.
+
+        Algorithme :
+        1. Ouverture d'un descripteur unique, lecture du répertoire central
+        2. Vérification de chaque en-tête local (séquentielle, quelques octets)
+        3. Contrôle des plages de données (dans les limites, sans chevauchement)
+        4. Mode full : CRC-32 et taille de chaque membre, répartis sur le pool
+           (membres les plus gros en premier pour équilibrer la charge)
+
+        Args:
+            path: Archive à vérifier.
+            mode: "quick" ou "full".
+
+        Returns:
+            Dictionnaire contenant :
+                - valid : True si aucune erreur
+                - mode : Mode utilisé
+                - members : Nombre de membres
+                - errors : Liste de {"name", "error"} (name None pour l'archive)
+                - bytes_verified : Octets compressés relus (mode full)
+                - elapsed_ms : Durée de la vérification
+
+        Raises:
+            ValueError: Si mode est inconnu.
+            FileNotFoundError: Si l'archive n'existe pas.
+        """
+        if mode not in VERIFY_MODES:
+            raise ValueError(f"Mode de vérification inconnu: {mode}")
+
+        started = time.perf_counter()
+        errors: list[dict[str, Any]] = []
+        members: list[ZipMember] = []
+        bytes_verified = 0
+
+        fd = os.open(path, os.O_RDONLY)
+        try:
+
+            def read(offset: int, length: int) -> bytes:
+                return os.pread(fd, length, offset)
+
+            try:
+                directory = read_central_directory(read, os.fstat(fd).st_size)
+            except ArchiveFormatError as e:
+                errors.append({"name": None, "error": str(e)})
+            else:
+                members = directory.members
+                ranges = self._check_local_headers(
+                    read, members, directory.central_directory_offset, errors
+                )
+                if mode == "full":
+                    bytes_verified = self._verify_crcs(fd, str(path), ranges, errors)
+        finally:
+            os.close(fd)
+
+        return {
+            "valid": not errors,
+            "mode": mode,
+            "members": len(members),
+            "errors": errors,
+            "bytes_verified": bytes_verified,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def _check_local_headers(
+        self,
+        read: Any,
+        members: list[ZipMember],
+        data_end: int,
+        errors: list[dict[str, Any]],
+    ) -> list[tuple[ZipMember, int]]:
+        """Vérifie les en-têtes locaux et les plages de données.
+
+        Args:
+            read: Fonction read(offset, length) -> bytes.
+            members: Membres du répertoire central.
+            data_end: Début du répertoire central (fin des données).
+            errors: Liste d'erreurs complétée en place.
+
+        Returns:
+            Liste (membre, offset des données) des membres cohérents.
+        """
+        ranges: list[tuple[ZipMember, int]] = []
+        for member in members:
+            try:
+                data_offset, local_method = read_local_header(read, member)
+            except ArchiveFormatError as e:
+                errors.append({"name": member.name, "error": str(e)})
+                continue
+            if local_method != member.method:
+                errors.append({"name": member.name, "error": "Méthode locale différente"})
+            elif data_offset + member.compressed_size > data_end:
+                errors.append({"name": member.name, "error": "Données hors des limites"})
+            else:
+                ranges.append((member, data_offset))
+
+        ordered = sorted(ranges, key=lambda item: item[1])
+        for (previous, previous_offset), (member, _) in zip(ordered, ordered[1:], strict=False):
+            if previous_offset + previous.compressed_size > member.local_header_offset:
+                errors.append({"name": member.name, "error": "Chevauchement avec " + previous.name})
+        return ranges
+
+    def _verify_crcs(
+        self,
+        fd: int,
+        path: str,
+        ranges: list[tuple[ZipMember, int]],
+        errors: list[dict[str, Any]],
+    ) -> int:
+        """Vérifie CRC-32 et taille des membres, en parallèle si volumineux.
+
+        Args:
+            fd: Descripteur partagé (threads et mode séquentiel).
+            path: Chemin de l'archive (pool de processus).
+            ranges: Membres et offsets de données.
+            errors: Liste d'erreurs complétée en place.
+
+        Returns:
+            Nombre d'octets compressés relus.
+        """
+        tasks = sorted(
+            (
+                (member, offset)
+                for member, offset in ranges
+                if not member.is_dir and not member.flags & FLAG_ENCRYPTED
+            ),
+            key=lambda item: item[0].compressed_size,
+            reverse=True,
+        )
+        total = sum(member.compressed_size for member, _ in tasks)
+
+        if self.workers <= 1 or len(tasks) <= 1 or total < PARALLEL_MIN_BYTES:
+            results = [_verify_member(fd, member, offset) for member, offset in tasks]
+        elif self.executor == "process":
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = list(
+                    pool.map(
+                        _verify_member_in_process,
+                        [path] * len(tasks),
+                        [member for member, _ in tasks],
+                        [offset for _, offset in tasks],
+                    )
+                )
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(lambda task: _verify_member(fd, *task), tasks))
+
+        for (member, _), error in zip(tasks, results, strict=True):
+            if error:
+                errors.append({"name": member.name, "error": error})
+        return total
+
+
+def _verify_member(fd: int, member: ZipMember, data_offset: int) -> str | None:
+    """Relit un membre par os.pread et vérifie son CRC-32 et sa taille.
+
+    Args:
+        fd: Descripteur de l'archive (positionnel, partageable entre threads).
+        member: Membre à vérifier.
+        data_offset: Début des données compressées.
+
+    Returns:
+        Message d'erreur, ou None si le membre est valide.
+    """
+    if member.method not in DECOMPRESSORS:
+        return f"Méthode de compression non supportée: {member.method_name}"
+    decompressor = DECOMPRESSORS[member.method]()
+
+    crc = 0
+    size = 0
+    position = data_offset
+    remaining = member.compressed_size
+    try:
+        while remaining > 0:
+            chunk = os.pread(fd, min(READ_CHUNK_SIZE, remaining), position)
+            if not chunk:
+                return "Données tronquées"
+            position += len(chunk)
+            remaining -= len(chunk)
+            for data in _inflate(decompressor, chunk):
+                crc = zlib.crc32(data, crc)
+                size += len(data)
+            if size > member.file_size:
+                return f"Taille décompressée supérieure à {member.file_size}"
+        if member.method == METHOD_DEFLATED:
+            tail = decompressor.flush()
+            crc = zlib.crc32(tail, crc)
+            size += len(tail)
+    except (zlib.error, OSError, EOFError) as e:
+        return f"Données corrompues: {e}"
+
+    if size != member.file_size:
+        error = f"Taille incorrecte ({size} au lieu de {member.file_size})"
+    elif crc != member.crc32:
+        error = f"CRC-32 incorrect ({crc:08x} au lieu de {member.crc32:08x})"
+    else:
+        error = None
+    return error
+
+
+def _inflate(decompressor: Any, chunk: bytes) -> Iterator[bytes]:
+    """Décompresse un bloc lu en blocs de sortie bornés (OUTPUT_CHUNK_SIZE).
+
+    Args:
+        decompressor: zlib.decompressobj, bz2.BZ2Decompressor ou None (stored).
+        chunk: Bloc de données compressées.
+
+    Yields:
+        Blocs décompressés.
+    """
+    if decompressor is None:
+        yield chunk
+    elif isinstance(decompressor, bz2.BZ2Decompressor):
+        yield decompressor.decompress(chunk, OUTPUT_CHUNK_SIZE)
+        while not decompressor.needs_input and not decompressor.eof:
+            yield decompressor.decompress(b"", OUTPUT_CHUNK_SIZE)
+    else:
+        yield decompressor.decompress(chunk, OUTPUT_CHUNK_SIZE)
+        while decompressor.unconsumed_tail:
+            yield decompressor.decompress(decompressor.unconsumed_tail, OUTPUT_CHUNK_SIZE)
+
+
+def _verify_member_in_process(path: str, member: ZipMember, data_offset: int) -> str | None:
+    """Variante pour pool de processus : un descripteur ouvert par processus.
+
+    Args:
+        path: Chemin de l'archive.
+        member: Membre à vérifier.
+        data_offset: Début des données compressées.
+
+    Returns:
+        Message d'erreur, ou None si le membre est valide.
+    """
+    fd = _process_fds.get(path)
+    if fd is None:
+        fd = _process_fds[path] = os.open(path, os.O_RDONLY)
+    return _verify_member(fd, member, data_offset)
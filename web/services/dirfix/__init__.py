@@ -0,0 +1,5 @@
+"""Services dirfix - Correction des noms de répertoires selon DIRNAMING."""
+
+from web.services.dirfix.dirfix_service import DirfixService
+
+__all__ = ["DirfixService"]
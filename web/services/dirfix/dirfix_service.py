@@ -0,0 +1,446 @@
+"""Service DIRFIX : correction des noms de répertoires de releases selon DIRNAMING.
+
+Ce service applique sur le système de fichiers les règles de nommage extraites
+de la section DIRNAMING d'une règle Scene. Il produit d'abord un plan de renommage
+(dry-run) puis l'applique de manière transactionnelle.
+
+Architecture :
+- Parcours unique de l'arborescence avec os.scandir (pile itérative, sans récursion)
+- Calcul du nom cible via RuleParserService (DIRNAMING) et ReleaseFormatterService
+- Plan de renommage retourné sous forme de diff (source -> cible), sans effet de bord
+- Application par lots avec renommages atomiques (os.replace) et rollback complet en cas d'échec
+- Mode bulk : un répertoire de groupe contenant des milliers de releases en une passe
+
+Complexité moyenne : O(n) où n est le nombre d'entrées de l'arborescence.
+Chaque répertoire est visité une seule fois, chaque renommage est O(1).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import unicodedata
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from web.services.formatter.release_formatter import ReleaseFormatterService
+from web.services.rule.rule_parser import RuleParserService
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_BATCH_SIZE = 500  # Nombre de renommages par lot
+SEPARATOR_RUN_PATTERN = re.compile(r"[\s_]+")  # Espaces/underscores → séparateur
+DASH_RUN_PATTERN = re.compile(r"-{2,}")
+LANGUAGE_CODE_MAX_LENGTH = 3  # Codes ISO 639-1/639-2 (ex: "en", "eng")
+
+# Correspondance composants DIRNAMING → clés de métadonnées release
+COMPONENT_METADATA_KEYS: dict[str, tuple[str, ...]] = {
+    "GroupName": ("group",),
+    "Author": ("author",),
+    "Title": ("title",),
+    "Format": ("format",),
+    "Language": ("language",),
+    "Year": ("year", "publication_date"),
+    "ISBN": ("isbn",),
+}
+
+
+class DirfixService:
+    """Service de correction des noms de répertoires selon les règles DIRNAMING.
+
+    Ce service calcule un plan de renommage pour une release (ou un répertoire de
+    groupe complet) puis l'applique. Le calcul du plan n'a aucun effet de bord :
+    il peut être retourné tel quel comme diff de prévisualisation (dry-run).
+
+    Règles de nommage appliquées :
+    - Si des métadonnées sont fournies et couvrent les composants requis du format
+      DIRNAMING, le nom est reconstruit composant par composant
+    - Sinon, le nom existant est normalisé : translittération ASCII, espaces et
+      underscores → tirets, caractères interdits supprimés, tirets multiples fusionnés
+    - Troncature à max_length (243 caractères selon les règles Scene)
+
+    Garanties lors de l'application :
+    - Les renommages sont ordonnés du plus profond au moins profond, de sorte que
+      les chemins source restent valides tout au long de l'exécution
+    - Une cible existante n'est jamais écrasée (vérification avant os.replace)
+    - En cas d'échec, tous les renommages déjà appliqués sont annulés en ordre inverse
+
+    Exemple d'utilisation :
+        service = DirfixService()
+        plan = service.plan_release(Path("/releases/My Book (2020)"))
+        print("\\n".join(plan["diff"]))
+        result = service.apply_plan(plan)
+    """
+
+    def __init__(self, naming_spec: dict[str, Any] | None = None) -> None:
+        """Initialise le service DIRFIX.
+
+        Args:
+            naming_spec: Spécification de nommage issue de
+                RuleParserService.extract_naming_format(). Si None, le format
+                DIRNAMING par défaut de [2022] eBOOK est utilisé.
+        """
+        self.formatter = ReleaseFormatterService()
+        self.naming_spec = naming_spec or RuleParserService().extract_naming_format("")
+
+    @classmethod
+    def from_rule_content(cls, rule_content: str) -> DirfixService:
+        """Construit un service DIRFIX depuis le contenu brut d'une règle Scene.
+
+        Args:
+            rule_content: Contenu NFO de la règle (section DIRNAMING parsée).
+
+        Returns:
+            Instance configurée avec la spécification de nommage de la règle.
+        """
+        return cls(RuleParserService().extract_naming_format(rule_content))
+
+    def compute_target_name(self, dir_name: str, metadata: dict[str, Any] | None = None) -> str:
+        """Calcule le nom conforme DIRNAMING d'un répertoire.
+
+        Algorithme :
+        1. Si métadonnées complètes : construction depuis les composants DIRNAMING
+        2. Sinon : normalisation du nom existant
+        3. Troncature à max_length puis formatage final via format_directory_name
+
+        Complexité : O(n) où n est la longueur du nom.
+
+        Args:
+            dir_name: Nom actuel du répertoire.
+            metadata: Métadonnées de la release (group, author, title, ...), optionnel.
+
+        Returns:
+            Nom cible conforme. Peut être identique au nom actuel.
+        """
+        name = self._build_from_metadata(metadata) if metadata else None
+        if not name:
+            name = self._normalize_component(dir_name)
+
+        max_length = int(self.naming_spec.get("max_length", 243))
+        if len(name) > max_length:
+            name = name[:max_length].rstrip("-")
+
+        # Un nom vide (ex: uniquement des caractères interdits) reste inchangé
+        if not name:
+            return dir_name
+
+        return self.formatter.format_directory_name(name)
+
+    def plan_release(
+        self, release_dir: Path | str, metadata: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Calcule le plan de renommage d'une release (dry-run).
+
+        Le répertoire racine de la release est renommé selon les métadonnées si
+        fournies ; ses sous-répertoires sont normalisés.
+
+        Args:
+            release_dir: Répertoire de la release.
+            metadata: Métadonnées de la release pour reconstruire le nom racine.
+
+        Returns:
+            Plan de renommage (voir _build_plan).
+
+        Raises:
+            NotADirectoryError: Si release_dir n'est pas un répertoire.
+        """
+        root = Path(release_dir)
+        if not root.is_dir():
+            raise NotADirectoryError(f"Répertoire introuvable: {root}")
+
+        root_metadata = {0: metadata} if metadata else {}
+        return self._build_plan(root, include_root=True, metadata_by_depth=root_metadata)
+
+    def plan_bulk(self, group_dir: Path | str) -> dict[str, Any]:
+        """Calcule le plan de renommage d'un répertoire de groupe complet (dry-run).
+
+        Chaque sous-répertoire direct est considéré comme une release. Le répertoire
+        de groupe lui-même n'est jamais renommé. L'arborescence complète est
+        parcourue une seule fois, quel que soit le nombre de releases.
+
+        Args:
+            group_dir: Répertoire contenant les releases d'un groupe.
+
+        Returns:
+            Plan de renommage (voir _build_plan).
+
+        Raises:
+            NotADirectoryError: Si group_dir n'est pas un répertoire.
+        """
+        root = Path(group_dir)
+        if not root.is_dir():
+            raise NotADirectoryError(f"Répertoire introuvable: {root}")
+
+        return self._build_plan(root, include_root=False, metadata_by_depth={})
+
+    def apply_plan(
+        self,
+        plan: dict[str, Any],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        on_batch: Callable[[int, int], None] | None = None,
+    ) -> dict[str, Any]:
+        """Applique un plan de renommage par lots avec rollback en cas d'échec.
+
+        Algorithme :
+        1. Découpage des opérations en lots de batch_size
+        2. Pour chaque opération : vérification que la cible n'existe pas, puis os.replace
+        3. Après chaque lot : notification on_batch(appliqués, total)
+        4. En cas d'erreur : annulation de tous les renommages appliqués, en ordre inverse
+
+        Complexité : O(k) où k est le nombre d'opérations du plan.
+
+        Pièges potentiels :
+        - os.replace écrase silencieusement un répertoire cible vide : la cible est
+          donc revérifiée juste avant chaque renommage (le plan peut être ancien)
+        - Un rollback peut lui-même échouer (disque retiré, permissions) : les
+          opérations concernées sont listées dans rollback_failures
+
+        Args:
+            plan: Plan retourné par plan_release() ou plan_bulk().
+            batch_size: Nombre de renommages par lot.
+            on_batch: Callback optionnel appelé après chaque lot (appliqués, total).
+
+        Returns:
+            Dictionnaire contenant :
+            - success : True si toutes les opérations ont été appliquées
+            - applied : Nombre de renommages appliqués (0 après rollback)
+            - rolled_back : Nombre de renommages annulés
+            - skipped : Nombre de conflits ignorés
+            - error : Message d'erreur (si échec)
+            - rollback_failures : Opérations impossibles à annuler (si échec)
+        """
+        operations: list[dict[str, Any]] = plan.get("operations", [])
+        total = len(operations)
+        applied: list[dict[str, Any]] = []
+        batch_size = max(1, batch_size)
+
+        try:
+            for start in range(0, total, batch_size):
+                for operation in operations[start : start + batch_size]:
+                    source, target = operation["source"], operation["target"]
+                    if os.path.lexists(target):
+                        raise FileExistsError(f"Cible déjà existante: {target}")
+                    Path(source).replace(target)
+                    applied.append(operation)
+                if on_batch:
+                    on_batch(len(applied), total)
+        except OSError as e:
+            logger.error(f"Échec DIRFIX après {len(applied)}/{total} renommages: {e}")
+            rollback_failures = self._rollback(applied)
+            return {
+                "success": False,
+                "applied": 0,
+                "rolled_back": len(applied) - len(rollback_failures),
+                "skipped": len(plan.get("conflicts", [])),
+                "error": str(e),
+                "rollback_failures": rollback_failures,
+            }
+
+        logger.info(f"DIRFIX appliqué: {len(applied)} renommages")
+        return {
+            "success": True,
+            "applied": len(applied),
+            "rolled_back": 0,
+            "skipped": len(plan.get("conflicts", [])),
+        }
+
+    def _build_plan(
+        self,
+        root: Path,
+        include_root: bool,
+        metadata_by_depth: dict[int, dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Construit le plan de renommage à partir d'un parcours unique de l'arborescence.
+
+        Les noms frères sont connus grâce au même parcours, ce qui permet de détecter
+        les collisions (cible existante ou deux sources vers la même cible) sans
+        appel système supplémentaire.
+
+        Args:
+            root: Racine du parcours.
+            include_root: Si True, la racine elle-même est candidate au renommage.
+            metadata_by_depth: Métadonnées à utiliser pour une profondeur donnée
+                (0 = racine). Les autres profondeurs sont normalisées.
+
+        Returns:
+            Dictionnaire contenant :
+            - root : Racine parcourue
+            - scanned : Nombre de répertoires examinés
+            - operations : Renommages à appliquer (ordre : plus profond d'abord)
+            - conflicts : Renommages ignorés avec raison
+            - diff : Lignes "source -> cible" lisibles (prévisualisation)
+        """
+        # Noms existants par répertoire parent (pour détection des collisions)
+        siblings: dict[str, set[str]] = {}
+        candidates: list[tuple[str, str, int]] = []  # (parent, nom, profondeur)
+
+        if include_root:
+            parent = str(root.parent)
+            siblings.setdefault(parent, set()).add(root.name)
+            candidates.append((parent, root.name, 0))
+
+        scanned = 1 if include_root else 0
+        for parent, name, depth in self._scan_directories(root, siblings):
+            scanned += 1
+            candidates.append((parent, name, depth))
+
+        operations: list[dict[str, Any]] = []
+        conflicts: list[dict[str, Any]] = []
+        claimed: dict[str, set[str]] = {}
+
+        for parent, name, depth in candidates:
+            target_name = self.compute_target_name(name, metadata_by_depth.get(depth))
+            if target_name == name:
+                continue
+
+            entry = {
+                "source": str(Path(parent, name)),
+                "target": str(Path(parent, target_name)),
+                "depth": depth,
+            }
+            parent_claims = claimed.setdefault(parent, set())
+            # Le parent de la racine n'est pas parcouru : vérification directe
+            target_taken = (
+                os.path.lexists(entry["target"])
+                if depth == 0
+                else target_name in siblings.get(parent, set())
+            )
+            if target_taken or target_name in parent_claims:
+                entry["reason"] = "Cible déjà existante"
+                conflicts.append(entry)
+                continue
+
+            parent_claims.add(target_name)
+            operations.append(entry)
+
+        # Plus profond d'abord : les chemins source restent valides pendant l'application
+        operations.sort(key=lambda op: op["depth"], reverse=True)
+
+        return {
+            "root": str(root),
+            "scanned": scanned,
+            "operations": operations,
+            "conflicts": conflicts,
+            "diff": [f"{op['source']} -> {op['target']}" for op in operations],
+        }
+
+    def _scan_directories(
+        self, root: Path, siblings: dict[str, set[str]]
+    ) -> Iterator[tuple[str, str, int]]:
+        """Parcourt l'arborescence une seule fois avec os.scandir.
+
+        Le parcours est itératif (pile) pour supporter des arborescences profondes
+        et ne suit pas les liens symboliques. Tous les noms (fichiers inclus) sont
+        enregistrés dans siblings pour la détection des collisions.
+
+        Args:
+            root: Racine du parcours.
+            siblings: Dictionnaire parent → noms existants, complété au fil du parcours.
+
+        Yields:
+            Tuples (parent, nom, profondeur) pour chaque sous-répertoire.
+        """
+        stack: list[tuple[str, int]] = [(str(root), 1)]
+        while stack:
+            current, depth = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    names = siblings.setdefault(current, set())
+                    for entry in entries:
+                        names.add(entry.name)
+                        if entry.is_dir(follow_symlinks=False):
+                            yield current, entry.name, depth
+                            stack.append((entry.path, depth + 1))
+            except OSError as e:
+                logger.warning(f"Répertoire illisible ignoré {current}: {e}")
+
+    def _build_from_metadata(self, metadata: dict[str, Any]) -> str | None:
+        """Construit un nom depuis les métadonnées selon les composants DIRNAMING.
+
+        Args:
+            metadata: Métadonnées de la release.
+
+        Returns:
+            Nom construit, ou None si un composant requis est absent.
+        """
+        parts: list[str] = []
+        for component, constraints in self.naming_spec.get("components", {}).items():
+            if "fixed" in constraints:
+                parts.append(str(constraints["fixed"]))
+                continue
+
+            value = self._lookup_component(component, metadata)
+            if not value:
+                if constraints.get("required", True):
+                    return None
+                continue
+            parts.append(value)
+
+        return "-".join(parts) if parts else None
+
+    def _lookup_component(self, component: str, metadata: dict[str, Any]) -> str | None:
+        """Récupère et normalise la valeur d'un composant DIRNAMING.
+
+        Args:
+            component: Nom du composant (ex: "Author", "Year").
+            metadata: Métadonnées de la release.
+
+        Returns:
+            Valeur normalisée ou None si absente.
+        """
+        for key in COMPONENT_METADATA_KEYS.get(component, (component.lower(),)):
+            value = metadata.get(key)
+            if isinstance(value, list):
+                value = value[0] if value else None
+            if value is None or not str(value).strip():
+                continue
+
+            text = str(value)
+            if component == "Year":
+                text = text[:4]
+            elif component in ("Format", "GroupName"):
+                text = text.upper()
+            elif component == "Language":
+                text = text.upper() if len(text) <= LANGUAGE_CODE_MAX_LENGTH else text.capitalize()
+
+            normalized = self._normalize_component(text)
+            if normalized:
+                return normalized
+        return None
+
+    def _normalize_component(self, text: str) -> str:
+        """Normalise un nom ou composant selon les caractères autorisés Scene.
+
+        Args:
+            text: Texte brut.
+
+        Returns:
+            Texte ASCII ne contenant que lettres, chiffres et tirets simples.
+        """
+        ascii_text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+        dashed = SEPARATOR_RUN_PATTERN.sub("-", ascii_text.strip())
+        cleaned = self.formatter.ALLOWED_CHARS_PATTERN.sub("", dashed)
+        return DASH_RUN_PATTERN.sub("-", cleaned).strip("-")
+
+    def _rollback(self, applied: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Annule des renommages appliqués, en ordre inverse.
+
+        Args:
+            applied: Opérations appliquées (dans l'ordre d'application).
+
+        Returns:
+            Liste des opérations qui n'ont pas pu être annulées.
+        """
+        failures: list[dict[str, Any]] = []
+        for operation in reversed(applied):
+            try:
+                Path(operation["target"]).replace(operation["source"])
+            except OSError as e:
+                logger.error(f"Rollback DIRFIX impossible {operation['target']}: {e}")
+                failures.append(operation)
+        return failures
@@ -0,0 +1,5 @@
+"""Services dupe - Index local des noms de releases existants (dupe check)."""
+
+from web.services.dupe.dupe_index import DupeIndexReader, DupeIndexService
+
+__all__ = ["DupeIndexReader", "DupeIndexService"]
@@ -0,0 +1,439 @@
+"""Service d'index de dupes : noms de releases historiques (dumps predb).
+
+Avant la finalisation d'une release, il faut savoir si son nom (ou une
+variante normalisée : autre groupe, autre casse, autres séparateurs, tags de
+correction) existe déjà. list_releases ne permet qu'un LIKE sur le JSON des
+releases locales ; ce service interroge un index local de plusieurs millions
+de noms importés depuis des dumps predb.
+
+Architecture :
+- Clé normalisée : champs de ReleaseNameParserService (auteur, titre, année,
+  format, langue, ISBN) en minuscules, séparateurs unifiés ; le groupe, la
+  date et les tags sont exclus
+- Fichier d'index unique, projeté en mémoire (mmap) en lecture seule : les
+  pages sont partagées par tous les workers gunicorn via le cache de pages
+  du noyau, sans chargement ni copie par processus
+- Enregistrements "clé\\tnom\\n" triés par clé (tableau trié : recherche par
+  préfixe par dichotomie, équivalent d'un trie sans structure de nœuds)
+- Table de hachage à adressage ouvert (BLAKE2b 64 bits, sondage linéaire)
+  pointant sur le premier enregistrement de chaque clé : recherche exacte O(1)
+- Import : fusion avec l'index existant, écriture dans un fichier temporaire
+  puis os.replace atomique ; les lecteurs rouvrent l'index quand son
+  identité (inode, mtime) change
+
+Format du fichier (little-endian) :
+    en-tête HEADER | enregistrements | offsets uint64[count + 1] | table uint32[table_size]
+
+Complexité : recherche exacte O(1) (un hachage, quelques sondages), recherche
+par préfixe O(log n + k) ; import O(n log n) pour n noms.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from web.services.formatter import ReleaseNameParserService
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+# En-tête : magic, version, count, table_size, offsets_pos, table_pos, built_at
+HEADER = struct.Struct("<8sIQQQQQ")
+MAGIC = b"SRPDUPE\x00"
+FORMAT_VERSION = 1
+
+# Taux de remplissage maximal de la table de hachage (puissance de 2 >= 2n)
+TABLE_LOAD_FACTOR = 2
+
+# Champs du nom formant la clé normalisée (ordre : préfixe auteur|titre)
+KEY_FIELDS = ("author", "title", "year", "format", "language", "isbn")
+KEY_SEPARATOR = "|"
+# Séparateurs internes unifiés dans chaque champ de la clé
+SEPARATOR_PATTERN = re.compile(r"[\s._\-]+")
+
+# Dumps predb : champs séparés par ; , tabulation ou |, le nom est le premier
+# champ sans espace contenant un tiret qui n'est pas une date
+DUMP_FIELD_PATTERN = re.compile(r"[;,\t|]")
+DATE_LIKE_PATTERN = re.compile(r"[0-9:\-\s]+")
+
+# Nombre maximal de noms retournés par recherche
+DEFAULT_LIMIT = 20
+
+# Lecteurs ouverts, partagés par les requêtes d'un processus (clé : chemin)
+_READERS: dict[str, DupeIndexReader] = {}
+_READERS_LOCK = threading.Lock()
+
+
+def _hash(key: bytes) -> int:
+    """Hachage 64 bits d'une clé normalisée."""
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+class DupeIndexReader:
+    """Lecteur d'un fichier d'index de dupes projeté en mémoire.
+
+    Exemple d'utilisation :
+        reader = DupeIndexReader(Path("uploads/dupe_index.bin"))
+        names = reader.lookup_key(b"stephen|king|it")
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Ouvre et projette l'index en mémoire.
+
+        Args:
+            path: Fichier d'index.
+
+        Raises:
+            FileNotFoundError: Si le fichier n'existe pas.
+            ValueError: Si le fichier n'est pas un index valide.
+        """
+        self.path = path
+        with path.open("rb") as f:
+            stat = os.fstat(f.fileno())
+            self.identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if stat.st_size < HEADER.size:
+                raise ValueError(f"Index de dupes invalide: {path}")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, table_size, offsets_pos, table_pos, built_at = HEADER.unpack_from(
+            self._mm, 0
+        )
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"Index de dupes invalide: {path}")
+        self.count = count
+        self.table_size = table_size
+        self.built_at = built_at
+        self._offsets_pos = offsets_pos
+        self._table_pos = table_pos
+
+    def close(self) -> None:
+        """Libère la projection mémoire."""
+        self._mm.close()
+
+    def record(self, index: int) -> tuple[bytes, bytes]:
+        """Retourne (clé, nom) de l'enregistrement index."""
+        start, end = struct.unpack_from("<QQ", self._mm, self._offsets_pos + 8 * index)
+        tab = self._mm.find(b"\t", start, end)
+        return self._mm[start:tab], self._mm[tab + 1 : end - 1]
+
+    def key_at(self, index: int) -> bytes:
+        """Retourne la clé de l'enregistrement index."""
+        start, end = struct.unpack_from("<QQ", self._mm, self._offsets_pos + 8 * index)
+        return self._mm[start : self._mm.find(b"\t", start, end)]
+
+    def iter_records(self) -> Iterator[tuple[bytes, bytes]]:
+        """Itère sur tous les enregistrements (clé, nom), dans l'ordre des clés."""
+        for index in range(self.count):
+            yield self.record(index)
+
+    def lookup_key(self, key: bytes, limit: int = DEFAULT_LIMIT) -> list[str]:
+        """Retourne les noms indexés sous la clé exacte (au plus limit).
+
+        Args:
+            key: Clé normalisée encodée.
+            limit: Nombre maximal de noms.
+
+        Returns:
+            Noms indexés sous cette clé.
+        """
+        if not self.table_size:
+            return []
+        mask = self.table_size - 1
+        slot = _hash(key) & mask
+        while True:
+            (entry,) = struct.unpack_from("<I", self._mm, self._table_pos + 4 * slot)
+            if not entry:
+                return []
+            if self.key_at(entry - 1) == key:
+                return self._collect(entry - 1, key, exact=True, limit=limit)
+            slot = (slot + 1) & mask
+
+    def lookup_prefix(self, prefix: bytes, limit: int = DEFAULT_LIMIT) -> list[str]:
+        """Retourne les noms dont la clé commence par prefix (au plus limit).
+
+        Args:
+            prefix: Préfixe de clé encodé.
+            limit: Nombre maximal de noms.
+
+        Returns:
+            Noms correspondants, dans l'ordre des clés.
+        """
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.key_at(middle) < prefix:
+                low = middle + 1
+            else:
+                high = middle
+        return self._collect(low, prefix, exact=False, limit=limit)
+
+    def _collect(self, start: int, key: bytes, exact: bool, limit: int) -> list[str]:
+        """Collecte les noms à partir de start tant que la clé correspond."""
+        names: list[str] = []
+        for index in range(start, self.count):
+            if len(names) >= limit:
+                break
+            record_key, name = self.record(index)
+            matched = record_key == key if exact else record_key.startswith(key)
+            if not matched:
+                break
+            names.append(name.decode("utf-8"))
+        return names
+
+
+class DupeIndexService:
+    """Service d'import et d'interrogation de l'index de dupes.
+
+    Pièges potentiels :
+    - L'import charge les noms (index existant + dumps) en mémoire pour le
+      tri : prévoir environ 150 octets par nom (1,5 Go pour 10 millions)
+    - Le fichier est remplacé atomiquement : un lecteur ouvert conserve
+      l'ancienne version jusqu'à sa réouverture (vérifiée à chaque requête)
+    - La clé exclut le groupe et les tags : deux releases du même livre par
+      des groupes différents sont des dupes, "exact" distingue le nom identique
+
+    Exemple d'utilisation :
+        service = DupeIndexService(Path("uploads/dupe_index.bin"))
+        service.import_dumps([Path("predb-2024.csv.gz")])
+        result = service.check("GRP-Stephen.King-It-EPUB-2019-eBook")
+        # result["dupe"] == True si le livre existe déjà
+    """
+
+    def __init__(self, path: Path | str, parser: ReleaseNameParserService | None = None) -> None:
+        """Initialise le service.
+
+        Args:
+            path: Fichier d'index.
+            parser: Parser de noms de releases (défaut : instance dédiée).
+        """
+        self.path = Path(path)
+        self.parser = parser or ReleaseNameParserService()
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> DupeIndexService:
+        """Construit le service depuis la configuration Flask (DUPE_INDEX_PATH)."""
+        return cls(config.get("DUPE_INDEX_PATH", "uploads/dupe_index.bin"))
+
+    def normalize(self, name: str) -> str:
+        """Calcule la clé normalisée d'un nom de release.
+
+        Args:
+            name: Nom de release.
+
+        Returns:
+            Clé "auteur|titre|année|format|langue|isbn" (champs absents vides,
+            séparateurs finaux retirés), en minuscules.
+        """
+        parsed = self.parser.parse(name)
+        fields = [
+            SEPARATOR_PATTERN.sub(".", parsed[field]).strip(".").casefold() if parsed[field] else ""
+            for field in KEY_FIELDS
+        ]
+        return KEY_SEPARATOR.join(fields).rstrip(KEY_SEPARATOR)
+
+    def reader(self) -> DupeIndexReader | None:
+        """Retourne le lecteur partagé de l'index (rouvert si le fichier a changé).
+
+        Returns:
+            Lecteur ouvert, ou None si l'index n'a pas encore été construit.
+        """
+        key = str(self.path.absolute())
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        reader = _READERS.get(key)
+        if reader is not None and reader.identity == identity:
+            return reader
+        with _READERS_LOCK:
+            reader = _READERS.get(key)
+            if reader is None or reader.identity != identity:
+                # L'ancienne projection reste valide pour les requêtes en cours
+                reader = DupeIndexReader(self.path)
+                _READERS[key] = reader
+        return reader
+
+    def check(self, name: str, limit: int = DEFAULT_LIMIT) -> dict[str, Any] | None:
+        """Vérifie si un nom de release (ou une variante) est déjà connu.
+
+        Algorithme :
+        1. Normalisation du nom (clé)
+        2. Recherche exacte de la clé dans la table de hachage
+        3. Recherche par préfixe auteur|titre (éditions proches : autre
+           format, autre année)
+
+        Complexité : O(1) + O(log n) pour un index de n noms.
+
+        Args:
+            name: Nom de release à vérifier.
+            limit: Nombre maximal de noms retournés par liste.
+
+        Returns:
+            Dictionnaire contenant key, dupe, exact, matches (même clé) et
+            similar (même auteur et titre), ou None si l'index est absent.
+        """
+        reader = self.reader()
+        if reader is None:
+            return None
+
+        key = self.normalize(name)
+        matches = reader.lookup_key(key.encode("utf-8"), limit) if key else []
+        folded = name.strip().casefold()
+        parts = key.split(KEY_SEPARATOR)
+        similar: list[str] = []
+        if len(parts) > 1 and parts[1]:
+            prefix = KEY_SEPARATOR.join(parts[:2]) + KEY_SEPARATOR
+            similar = [
+                other
+                for other in reader.lookup_prefix(prefix.encode("utf-8"), limit + len(matches))
+                if other not in matches
+            ][:limit]
+        return {
+            "key": key,
+            "dupe": bool(matches),
+            "exact": any(match.casefold() == folded for match in matches),
+            "matches": matches,
+            "similar": similar,
+            "index": {"count": reader.count, "built_at": reader.built_at},
+        }
+
+    def import_dumps(self, sources: Iterable[Path | str], replace: bool = False) -> dict[str, Any]:
+        """Importe des dumps predb dans l'index (fusion avec l'index existant).
+
+        Chaque ligne d'un dump contient un nom de release, seul ou parmi des
+        champs séparés (CSV, ;, tabulation, |). Les dumps compressés (.gz)
+        sont lus à la volée.
+
+        Args:
+            sources: Fichiers de dumps.
+            replace: Si True, l'index existant est ignoré (reconstruction).
+
+        Returns:
+            Dictionnaire contenant read (lignes lues), imported (noms
+            retenus), count (noms indexés) et keys (clés distinctes).
+        """
+        records: set[str] = set()
+        if not replace and (reader := self.reader()) is not None:
+            records.update(
+                f"{key.decode('utf-8')}\t{name.decode('utf-8')}"
+                for key, name in reader.iter_records()
+            )
+        existing = len(records)
+
+        read = 0
+        normalize = self.normalize
+        for source in sources:
+            for name in self._iter_dump_names(Path(source)):
+                read += 1
+                key = normalize(name)
+                if key:
+                    records.add(f"{key}\t{name}")
+
+        ordered = sorted(records)
+        keys = self._write(ordered)
+        logger.info(f"Index de dupes: {len(ordered)} noms, {keys} clés ({self.path})")
+        return {
+            "read": read,
+            "imported": len(ordered) - existing,
+            "count": len(ordered),
+            "keys": keys,
+        }
+
+    @staticmethod
+    def _iter_dump_names(path: Path) -> Iterator[str]:
+        """Itère sur les noms de releases d'un dump predb (une ligne par release)."""
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                for field in DUMP_FIELD_PATTERN.split(line):
+                    candidate = field.strip().strip('"')
+                    if (
+                        "-" in candidate
+                        and " " not in candidate
+                        and not DATE_LIKE_PATTERN.fullmatch(candidate)
+                    ):
+                        yield candidate
+                        break
+
+    def _write(self, ordered: list[str]) -> int:
+        """Écrit l'index trié dans un fichier temporaire puis le publie atomiquement.
+
+        Args:
+            ordered: Enregistrements "clé\\tnom" triés.
+
+        Returns:
+            Nombre de clés distinctes.
+        """
+        count = len(ordered)
+        table_size = 1
+        while table_size < TABLE_LOAD_FACTOR * max(count, 1):
+            table_size <<= 1
+        mask = table_size - 1
+        table = array("I", bytes(4 * table_size))
+        offsets = array("Q", [HEADER.size])
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=".dupe-", suffix=".tmp")
+        keys = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(bytes(HEADER.size))
+                position = HEADER.size
+                previous_key = None
+                for index, record in enumerate(ordered):
+                    data = f"{record}\n".encode()
+                    f.write(data)
+                    position += len(data)
+                    offsets.append(position)
+
+                    key = data[: data.index(b"\t")]
+                    if key != previous_key:
+                        previous_key = key
+                        keys += 1
+                        slot = _hash(key) & mask
+                        while table[slot]:
+                            slot = (slot + 1) & mask
+                        table[slot] = index + 1
+
+                if sys.byteorder == "big":
+                    offsets.byteswap()
+                    table.byteswap()
+                offsets_pos = position
+                offsets.tofile(f)
+                table_pos = offsets_pos + 8 * len(offsets)
+                table.tofile(f)
+                f.seek(0)
+                f.write(
+                    HEADER.pack(
+                        MAGIC,
+                        FORMAT_VERSION,
+                        count,
+                        table_size,
+                        offsets_pos,
+                        table_pos,
+                        int(time.time()),
+                    )
+                )
+            Path(tmp_name).replace(self.path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return keys
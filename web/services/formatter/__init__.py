@@ -1,5 +1,6 @@
 """Services formatter - Formatage données releases pour affichage/export."""
 
 from web.services.formatter.release_formatter import ReleaseFormatterService
+from web.services.formatter.release_name_parser import ReleaseNameParserService
 
-__all__ = ["ReleaseFormatterService"]
+__all__ = ["ReleaseFormatterService", "ReleaseNameParserService"]
@@ -17,13 +17,27 @@ from __future__ import annotations
 import contextlib
 import logging
 import re
-from typing import Any
+import string
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
 
 logger = logging.getLogger(__name__)
 
 # Constants
 DATE_FORMAT_LENGTH = 8  # YYYYMMDD format length
 
+# Tables str.translate précalculées : caractères ASCII hors [A-Za-z0-9-]
+# supprimés ; dans un titre, tirets et espaces deviennent des espaces (séparateurs
+# fusionnés ensuite par split/join)
+_DISALLOWED_ASCII = "".join(
+    chr(code) for code in range(128) if chr(code) not in string.ascii_letters + string.digits + "-"
+)
+TITLE_TRANSLATION = str.maketrans("-", " ", _DISALLOWED_ASCII.replace(" ", ""))
+GROUP_TRANSLATION = str.maketrans("", "", _DISALLOWED_ASCII)
+NON_ASCII_PATTERN = re.compile(r"[^\x00-\x7f]+")
+
 
 class ReleaseFormatterService:
     """Service de formatage des données de release pour affichage et export.
@@ -86,7 +100,8 @@ class ReleaseFormatterService:
         5. Troncature si nécessaire pour respecter limite 255 caractères
 
         Complexité : O(n) où n est la longueur du titre + groupe.
-        Les opérations regex et remplacements sont O(n).
+        Normalisation par tables str.translate précalculées (regex uniquement
+        pour les caractères non ASCII).
 
         Pièges potentiels :
         - Les caractères spéciaux doivent être supprimés ou remplacés
@@ -107,40 +122,100 @@ class ReleaseFormatterService:
             ValueError: Si date n'est pas au format YYYYMMDD.
             ValueError: Si groupe est vide.
         """
+        self._validate_name_parts(group, date)
+        return self._assemble_release_name(
+            self._normalize_title(title), self._normalize_group(group), date
+        )
+
+    def format_many(self, items: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        """Formate un lot de noms de releases (imports, DIRFIX sur un groupe entier).
+
+        Chaque élément porte title, group, date et, optionnellement, metadata
+        (normalisé par normalize_metadata). Les résultats sont produits au fur
+        et à mesure (générateur), dans l'ordre des éléments.
+
+        Algorithme :
+        1. Tables de traduction et patterns précompilés au chargement du module
+        2. Groupes normalisés et dates validées mémorisés pour tout le lot
+           (quelques groupes et dates pour des centaines de milliers de titres)
+        3. Titre normalisé par str.translate puis découpage/jointure sur "-"
+        4. Erreur d'un élément isolée dans son résultat, le lot continue
+
+        Complexité : O(n) où n est la taille totale des titres.
+
+        Args:
+            items: Éléments à formater (itérable quelconque, consommé une fois).
+
+        Returns:
+            Itérateur de dictionnaires : index et release_name (et metadata si
+            fourni), ou index et error pour un élément invalide.
+        """
+        groups: dict[str, str] = {}
+        valid_dates: set[str] = set()
+        normalize_title = self._normalize_title
+        for index, item in enumerate(items):
+            try:
+                group, date = item.get("group") or "", str(item.get("date") or "")
+                normalized_group = groups.get(group)
+                if normalized_group is None or date not in valid_dates:
+                    self._validate_name_parts(group, date)
+                    normalized_group = groups[group] = self._normalize_group(group)
+                    valid_dates.add(date)
+                result: dict[str, Any] = {
+                    "index": index,
+                    "release_name": self._assemble_release_name(
+                        normalize_title(str(item.get("title") or "")), normalized_group, date
+                    ),
+                }
+                if item.get("metadata"):
+                    result["metadata"] = self.normalize_metadata(item["metadata"])
+            except (AttributeError, TypeError, ValueError) as e:
+                result = {"index": index, "error": str(e)}
+            yield result
+
+    @staticmethod
+    def _validate_name_parts(group: str, date: str) -> None:
+        """Valide le groupe (non vide) et la date (YYYYMMDD) d'un nom de release.
+
+        Raises:
+            ValueError: Si le groupe est vide ou la date invalide.
+        """
         if not group:
             raise ValueError("Le nom du groupe ne peut pas être vide")
 
         if not date or len(date) != DATE_FORMAT_LENGTH or not date.isdigit():
             raise ValueError(f"Date invalide: '{date}'. Format attendu: YYYYMMDD")
 
-        # Normaliser titre : trim, remplacer espaces par tirets, supprimer caractères spéciaux
-        normalized_title = title.strip()
-        normalized_title = normalized_title.replace(" ", "-")
-        normalized_title = self.ALLOWED_CHARS_PATTERN.sub("", normalized_title)
-        normalized_title = re.sub(
-            r"-+", "-", normalized_title
-        )  # Remplacer tirets multiples par un seul
-        normalized_title = normalized_title.strip("-")  # Supprimer tirets début/fin
-
-        # Normaliser groupe : uppercase, supprimer caractères spéciaux
-        normalized_group = group.strip().upper()
-        normalized_group = self.ALLOWED_CHARS_PATTERN.sub("", normalized_group)
-
-        # Construire nom final
-        release_name = f"{normalized_title}-{normalized_group}-{date}"
+    @staticmethod
+    def _normalize_title(title: str) -> str:
+        """Normalise un titre : espaces → tirets, caractères interdits supprimés.
 
-        # Tronquer si nécessaire pour respecter limite 255 caractères
+        Les tirets consécutifs sont fusionnés et les tirets de début/fin
+        supprimés. Seuls les titres non ASCII passent par une regex (avant le
+        découpage : str.split() découpe aussi sur les espaces Unicode).
+        """
+        text = title.translate(TITLE_TRANSLATION)
+        if not text.isascii():
+            text = NON_ASCII_PATTERN.sub("", text)
+        return "-".join(text.split())
+
+    @staticmethod
+    def _normalize_group(group: str) -> str:
+        """Normalise un groupe : majuscules, caractères interdits supprimés."""
+        text = group.strip().upper().translate(GROUP_TRANSLATION)
+        if not text.isascii():
+            text = NON_ASCII_PATTERN.sub("", text)
+        return text
+
+    def _assemble_release_name(self, title: str, group: str, date: str) -> str:
+        """Construit Title-GROUP-YYYYMMDD, titre tronqué au-delà de 255 caractères."""
+        release_name = f"{title}-{group}-{date}"
         if len(release_name) > self.MAX_RELEASE_NAME_LENGTH:
             # Tronquer le titre pour laisser place au groupe et à la date
             title_max_length = (
-                self.MAX_RELEASE_NAME_LENGTH
-                - len(normalized_group)
-                - len(date)
-                - 2  # 2 tirets séparateurs
+                self.MAX_RELEASE_NAME_LENGTH - len(group) - len(date) - 2  # 2 tirets séparateurs
             )
-            normalized_title = normalized_title[:title_max_length]
-            release_name = f"{normalized_title}-{normalized_group}-{date}"
-
+            release_name = f"{title[:title_max_length]}-{group}-{date}"
         return release_name
 
     def format_directory_name(self, release_name: str) -> str:
@@ -5,5 +5,6 @@ from web.services.job.job_state_machine import (
     InvalidTransitionError,
     JobStateMachine,
 )
+from web.services.job.progress_reporter import JobProgressReporter
 
-__all__ = ["JobService", "JobStateMachine", "InvalidTransitionError"]
+__all__ = ["JobService", "JobStateMachine", "InvalidTransitionError", "JobProgressReporter"]
@@ -7,7 +7,10 @@ Architecture :
 - Jobs stockés en base de données MySQL (modèle Job)
 - Statuts : pending → running → completed/failed/cancelled
 - Logs persistés dans la base de données (champ logs du modèle Job)
-- Progression suivie via config_json ou estimation basée sur statut
+- Jobs de packaging retenus en "pending" tant que leur réservation d'espace
+  disque (DiskSpaceLedger) ne peut pas être satisfaite
+- Progression suivie via la colonne progress (JobProgressReporter, écritures
+  throttlées), config_json ou estimation basée sur statut
 
 Complexité moyenne : O(1) pour les opérations de base (lecture/écriture DB),
 avec dépendance à la performance de SQLAlchemy pour les requêtes.
@@ -20,17 +23,37 @@ les jobs en arrière-plan sans bloquer l'application Flask.
 from __future__ import annotations
 
 import logging
+import os
+import re
 from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from flask import current_app
+from sqlalchemy import select
 
 from web.extensions import db
-from web.models import Job
+from web.models import Job, Release
 from web.services.job.job_state_machine import (
     InvalidTransitionError,
     JobStateMachine,
 )
+from web.services.job.progress_reporter import (
+    DEFAULT_MIN_INTERVAL_MS,
+    DEFAULT_MIN_STEP_PERCENT,
+    JobProgressReporter,
+)
+from web.services.packaging.disk_space import DiskSpaceLedger, InsufficientDiskSpaceError
 
 logger = logging.getLogger(__name__)
 
+# Erreurs d'extraction détaillées dans les logs d'un job READNFO (les
+# suivantes sont seulement comptées : un append_log par erreur est O(n²))
+READNFO_LOGGED_ERRORS = 20
+
+# Caractères conservés dans le nom du package REPACK (aucun séparateur de chemin)
+_PACKAGE_NAME_UNSAFE_RE = re.compile(r"[^\w.()-]+")
+
 
 class JobService:
     """Service de traitement et gestion des jobs de packaging.
@@ -57,7 +80,7 @@ class JobService:
         service.cancel_job(job_id=1)
     """
 
-    def __init__(self) -> None:
+    def __init__(self, ledger: DiskSpaceLedger | None = None) -> None:
         """Initialise le JobService.
 
         Cette méthode initialise la machine à états pour valider les transitions
@@ -66,8 +89,50 @@ class JobService:
 
         Note : Pour une implémentation avec worker asynchrone (Celery, RQ),
         on pourrait initialiser ici la connexion au broker de messages.
+
+        Args:
+            ledger: Registre de réservations d'espace disque (optionnel, défaut
+                construit depuis la configuration PACKAGING_* de l'application).
         """
         self.state_machine = JobStateMachine()
+        self._ledger = ledger
+
+    @property
+    def ledger(self) -> DiskSpaceLedger:
+        """Registre de réservations d'espace disque partagé entre workers."""
+        if self._ledger is None:
+            self._ledger = DiskSpaceLedger.from_config(current_app.config)
+        return self._ledger
+
+    def run_pending_jobs(self, limit: int | None = None) -> dict[str, list[int]]:
+        """Traite les jobs en attente, dans l'ordre de création (scheduler).
+
+        Les jobs de packaging dont la réservation d'espace disque ne peut pas
+        être satisfaite restent en "pending" (retenus) et seront repris au
+        prochain passage, sans bloquer les jobs suivants.
+
+        Complexité : O(j) appels à process_job() où j est le nombre de jobs en attente.
+
+        Args:
+            limit: Nombre maximal de jobs examinés (optionnel).
+
+        Returns:
+            Dictionnaire contenant :
+                - processed : IDs des jobs traités (completed ou failed)
+                - held : IDs des jobs retenus faute d'espace disque
+        """
+        stmt = select(Job.id).where(Job.status == "pending").order_by(Job.created_at, Job.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        job_ids = list(db.session.scalars(stmt))
+
+        processed: list[int] = []
+        held: list[int] = []
+        for job_id in job_ids:
+            self.process_job(job_id)
+            job = db.session.get(Job, job_id)
+            (held if job and job.status == "pending" else processed).append(job_id)
+        return {"processed": processed, "held": held}
 
     def process_job(self, job_id: int) -> None:
         """Traite un job de manière synchrone (simulation de traitement asynchrone).
@@ -114,8 +179,6 @@ class JobService:
         # Récupération du job depuis la base de données avec lock pour éviter traitements concurrents
         # Utilisation de select().with_for_update() pour lock exclusif
         # Ce lock empêche deux workers de traiter le même job simultanément
-        from sqlalchemy import select
-
         stmt = select(Job).where(Job.id == job_id).with_for_update()
         job = db.session.scalar(stmt)
 
@@ -138,6 +201,22 @@ class JobService:
             logger.error(f"Invalid transition for job {job_id}: {e}")
             return
 
+        # Préflight espace disque des jobs de packaging : sans réservation
+        # possible, le job reste "pending" (retenu) au lieu d'échouer en cours d'écriture
+        # Préflight impossible (source manquante, erreur disque) : le job échoue
+        # au lieu de rester "pending" et de bloquer le scheduler à chaque passage
+        try:
+            granted, reservation_key = self._reserve_packaging_space(job)
+        except OSError as e:
+            logger.error(f"Disk space preflight failed for job {job_id}: {e}")
+            error_msg = f"Job processing failed: {e}"
+            self.update_status(job_id, "running", "Job processing started...")
+            self.append_log(job_id, error_msg, "ERROR")
+            self.update_status(job_id, "failed", error_msg)
+            return
+        if not granted:
+            return
+
         # Transition d'état : pending → running
         # Cette transition est atomique : si elle échoue, le job reste "pending"
         self.update_status(job_id, "running", "Job processing started...")
@@ -154,14 +233,20 @@ class JobService:
 
             # Dispatch vers méthode spécialisée selon le type de job
             # Pattern Strategy : chaque type de job a sa propre méthode de traitement
-            if job_type == "nfofix":
-                self._process_nfofix_job(job_id)
-            elif job_type == "readnfo":
-                self._process_readnfo_job(job_id)
-            elif job_type == "repack":
-                self._process_repack_job(job_id)
-            elif job_type == "dirfix":
-                self._process_dirfix_job(job_id)
+            handlers = {
+                "nfofix": self._process_nfofix_job,
+                "readnfo": self._process_readnfo_job,
+                "repack": self._process_repack_job,
+                "dirfix": self._process_dirfix_job,
+                "fetch": self._process_fetch_job,
+                "gc": self._process_gc_job,
+                "analyze": self._process_analyze_job,
+                "dupeimport": self._process_dupeimport_job,
+                "scenerules_sync": self._process_scenerules_sync_job,
+            }
+            handler = handlers.get(job_type or "")
+            if handler is not None:
+                handler(job_id)
             else:
                 # Traitement générique pour types de jobs non spécialisés
                 # Logs du traitement et transition vers "completed"
@@ -177,6 +262,91 @@ class JobService:
             self.append_log(job_id, error_msg, "ERROR")
             # Transition vers statut "failed" avec message d'erreur
             self.update_status(job_id, "failed", error_msg)
+        finally:
+            self._release_packaging_space(reservation_key)
+
+    def _reserve_packaging_space(self, job: Job) -> tuple[bool, str | None]:
+        """Réserve l'espace disque d'un job de packaging avant son démarrage.
+
+        Seuls les jobs REPACK dont la release a un fichier local sont
+        concernés (package construit par _repack_package(), jamais depuis
+        config_json). La clé de réservation est le chemin du ZIP : la
+        réservation est réutilisée par PackagingService pendant la construction.
+        Si l'espace ne peut pas être réservé, le job est marqué en attente
+        d'espace (progress.phase = "waiting_for_disk") et reste "pending".
+
+        Args:
+            job: Job en statut "pending".
+
+        Returns:
+            Tuple (granted, key) : granted False si le job doit être retenu ;
+            key est la clé de la réservation créée (None si aucune).
+
+        Raises:
+            OSError: Si l'estimation ou la réservation échoue pour une autre
+                raison que le manque d'espace (fichier source introuvable...).
+        """
+        package = self._repack_package(job) if job.job_type == "repack" else None
+        if package is None:
+            return True, None
+
+        from web.services.packaging import PackagingService
+
+        release_data, output_path = package
+        key = str(output_path / f"{release_data['name']}.zip")
+        estimated = PackagingService().estimate_output_size(release_data["files"], output_path, "")
+        try:
+            created = self.ledger.reserve(key, output_path, estimated)
+        except InsufficientDiskSpaceError as e:
+            logger.info(f"Job {job.id} held back: {e}")
+            job.progress = {"phase": "waiting_for_disk", "required_bytes": e.required}
+            db.session.commit()
+            return False, None
+        return True, key if created else None
+
+    @staticmethod
+    def _repack_package(job: Job) -> tuple[dict[str, Any], Path] | None:
+        """Construit le package d'un job REPACK à partir des données serveur.
+
+        Les fichiers, le nom et le répertoire de sortie ne proviennent jamais
+        de config_json (corps de requête du client) : la source est
+        Release.file_path (comme DIRFIX), le nom est dérivé du nom de fichier
+        d'origine et la sortie est <PACKAGING_OUTPUT_ROOT>/release_<id>.
+
+        Args:
+            job: Job REPACK.
+
+        Returns:
+            Tuple (release_data pour PackagingService.package_release,
+            répertoire de sortie) ; None si la release n'a pas de fichier
+            local (aucune release, aucun fichier ou URL pas encore rapatriée).
+        """
+        release = db.session.get(Release, job.release_id) if job.release_id else None
+        if release is None or not release.file_path or "://" in release.file_path:
+            return None
+
+        source = Path(release.file_path)
+        metadata = dict(release.release_metadata or {})
+        filename = Path(str(metadata.get("original_filename") or source.name)).name
+        name = _PACKAGE_NAME_UNSAFE_RE.sub("_", Path(filename).stem).strip("._-")
+        release_data = {
+            "name": name or f"release-{release.id}",
+            "group": release.group.name if release.group else "",
+            "release_type": release.release_type,
+            "files": [{"path": str(source), "name": filename}],
+            "metadata": metadata,
+        }
+        output_root = Path(current_app.config.get("PACKAGING_OUTPUT_ROOT", "uploads/packages"))
+        return release_data, output_root / f"release_{release.id}"
+
+    def _release_packaging_space(self, key: str | None) -> None:
+        """Libère la réservation d'espace disque d'un job (sans effet si None).
+
+        Args:
+            key: Clé retournée par _reserve_packaging_space().
+        """
+        if key:
+            self.ledger.release(key)
 
     def _process_nfofix_job(self, job_id: int) -> None:
         """Traite un job de type NFOFIX (correction du fichier NFO).
@@ -209,93 +379,605 @@ class JobService:
         self.update_status(job_id, "completed", "NFOFIX job completed")
 
     def _process_readnfo_job(self, job_id: int) -> None:
-        """Traite un job de type READNFO (lecture et régénération du NFO).
+        """Traite un job de type READNFO (lecture du NFO et backfill des métadonnées).
 
-        Cette méthode lit le fichier NFO d'une release et régénère les métadonnées
-        depuis son contenu. Le traitement actuel est une simulation.
+        Cette méthode parse le(s) fichier(s) NFO existant(s) via NfoReaderService
+        et complète release_metadata des releases concernées.
 
-        Algorithme (simulation actuelle) :
-        1. Log du début du traitement
-        2. Simulation de la lecture
-        3. Log de succès
+        Configuration du job (config_json) :
+        - file_path : Chemin de la release du job (NFO, répertoire ou eBook)
+        - release_ids : Sélection explicite de releases (mode bulk)
+        - directory : Répertoire d'archive, toutes les releases dont file_path
+          est situé dessous sont traitées (mode bulk)
+        - workers : Nombre de processus de parsing (défaut : os.cpu_count())
+        - batch_size : Nombre de releases par UPDATE (défaut : 500)
+        - overwrite : Remplacer les valeurs déjà présentes (défaut : False)
+
+        Algorithme :
+        1. Construction de la sélection (bulk, ou release du job)
+        2. Parsing parallèle des NFO et écriture par lots (NfoReaderService)
+        3. Journalisation de la progression après chaque lot et du résumé
         4. Transition vers statut "completed"
 
-        Complexité : O(1) pour la simulation, O(n) en production où n est la taille
-        du fichier NFO à parser.
+        Complexité : O(n) où n est la taille cumulée des NFO lus ;
+        O(r / batch_size) transactions pour r releases.
 
-        Note : Dans une implémentation complète, cette méthode devrait :
-        - Charger le fichier NFO depuis le système de fichiers
-        - Parser le contenu pour extraire les métadonnées
-        - Valider et normaliser les métadonnées extraites
-        - Mettre à jour la release avec les métadonnées
+        Gestion des erreurs :
+        - Sans release ni sélection, le job est terminé sans lecture (log WARNING)
+        - Les NFO illisibles sont comptés et journalisés sans faire échouer le job
 
         Args:
             job_id: Identifiant du job à traiter.
         """
+        from web.services.metadata import NfoReaderService
+
         self.append_log(job_id, "Reading NFO file...", "INFO")
-        self.append_log(job_id, "NFO file read successfully", "INFO")
+
+        job = db.session.get(Job, job_id)
+        config = dict(job.config_json or {}) if job else {}
+        service = NfoReaderService()
+        options: dict[str, Any] = {
+            "overwrite": bool(config.get("overwrite", False)),
+            "on_batch": lambda done, total: self.append_log(
+                job_id, f"READNFO progress: {done}/{total}", "INFO"
+            ),
+        }
+        for key in ("workers", "batch_size"):
+            if config.get(key):
+                options[key] = int(config[key])
+
+        if config.get("release_ids") or config.get("directory"):
+            summary = service.backfill_releases(
+                release_ids=config.get("release_ids"),
+                directory=config.get("directory"),
+                **options,
+            )
+        elif job is not None and job.release_id is not None:
+            release = db.session.get(Release, job.release_id)
+            file_path = config.get("file_path") or (release.file_path if release else None)
+            summary = service.backfill([(job.release_id, file_path)], **options)
+        else:
+            self.append_log(job_id, "No release selected for NFO reading", "WARNING")
+            self.update_status(job_id, "completed", "READNFO job completed")
+            return
+
+        errors = summary["errors"]
+        if errors:
+            # Une seule entrée (un commit) : nombre d'erreurs et premières erreurs
+            details = "".join(
+                f"\n  release {error['release_id']}: {error['error']}"
+                for error in errors[:READNFO_LOGGED_ERRORS]
+            )
+            more = len(errors) - READNFO_LOGGED_ERRORS
+            self.append_log(
+                job_id,
+                f"NFO unreadable for {len(errors)} release(s){details}"
+                + (f"\n  ... and {more} more" if more > 0 else ""),
+                "WARNING",
+            )
+        self.append_log(
+            job_id,
+            f"READNFO summary: {summary['parsed']}/{summary['total']} parsed, "
+            f"{summary['updated']} updated, {summary['missing']} without NFO, "
+            f"{len(summary['errors'])} error(s)",
+            "INFO",
+        )
         self.update_status(job_id, "completed", "READNFO job completed")
 
     def _process_repack_job(self, job_id: int) -> None:
         """Traite un job de type REPACK (repackaging complet d'une release).
 
         Cette méthode repackage complètement une release selon les règles Scene.
-        Le traitement actuel est une simulation : en production, cette méthode
-        devrait reconstruire l'archive ZIP, régénérer les fichiers NFO/DIZ, etc.
 
-        Algorithme (simulation actuelle) :
+        Algorithme :
         1. Log du début du traitement
-        2. Simulation du repackaging
+        2. Si la release a un fichier local : reconstruction du ZIP avec
+           PackagingService à partir des données serveur (_repack_package :
+           Release.file_path, sortie sous PACKAGING_OUTPUT_ROOT), réutilisé
+           depuis le cache si identique ; progression en octets persistée
+           dans Job.progress via JobProgressReporter (écritures throttlées :
+           dès que progress_interval_ms est écoulé ou que la progression a
+           avancé de progress_step_percent)
         3. Log de succès
         4. Transition vers statut "completed"
 
-        Complexité : O(1) pour la simulation, O(n) en production où n est la taille
-        totale des fichiers à packager.
+        Sans fichier local, aucune archive n'est reconstruite : le job est
+        seulement journalisé et terminé.
 
-        Note : Dans une implémentation complète, cette méthode devrait :
-        - Charger tous les fichiers de la release
-        - Valider la conformité aux règles Scene
-        - Recréer l'archive ZIP avec la bonne structure
-        - Régénérer les fichiers NFO et DIZ
-        - Valider les checksums (MD5, SHA-256)
-        - Sauvegarder la release repackagée
+        Complexité : O(n) où n est la taille totale des fichiers à packager
+        (O(1) sans fichier local).
 
         Args:
             job_id: Identifiant du job à traiter.
         """
         self.append_log(job_id, "Repacking release...", "INFO")
+
+        job = db.session.get(Job, job_id)
+        config = (job.config_json if job else None) or {}
+        package = self._repack_package(job) if job else None
+        if package is not None:
+            from web.services.packaging import PackagingService
+
+            release_data, output_path = package
+
+            reporter = JobProgressReporter(
+                job_id,
+                min_interval_ms=int(config.get("progress_interval_ms", DEFAULT_MIN_INTERVAL_MS)),
+                min_step_percent=float(
+                    config.get("progress_step_percent", DEFAULT_MIN_STEP_PERCENT)
+                ),
+            )
+            result = PackagingService(ledger=self.ledger).package_release(
+                release_data,
+                output_path,
+                progress_callback=reporter,
+            )
+            self.append_log(
+                job_id,
+                f"Package {'reused' if result['cached'] else 'built'}: {result['zip_path']} "
+                f"({reporter.writes} progress update(s))",
+                "INFO",
+            )
+
         self.append_log(job_id, "Release repacked successfully", "INFO")
         self.update_status(job_id, "completed", "REPACK job completed")
 
+    def _process_fetch_job(self, job_id: int) -> None:
+        """Traite un job de type FETCH (rapatriement d'une source distante).
+
+        Le fichier désigné par une URL (wizard, étape 4) est téléchargé par
+        RemoteFetchService (segments parallèles, reprise, vérification) puis
+        intégré au store d'uploads ; la release pointe ensuite sur le blob
+        local, exploitable par l'analyse et le packaging.
+
+        Configuration du job (config_json) :
+        - url : URL http(s) de la source (défaut : file_url du draft du wizard)
+        - sha256 : Empreinte attendue (optionnelle)
+        - size : Taille attendue (optionnelle)
+        - segments : Connexions parallèles (défaut : REMOTE_FETCH_SEGMENTS)
+
+        Algorithme :
+        1. Résolution de l'URL (config, puis métadonnées de la release)
+        2. Téléchargement avec progression persistée (JobProgressReporter)
+        3. Mise à jour de Release.file_path et des informations du fichier
+           (colonnes du draft du wizard, ou release_metadata si finalisée)
+        4. Transition vers statut "completed"
+
+        Gestion des erreurs :
+        - Les erreurs réseau font échouer le job ; l'état partiel est conservé
+          et un nouveau job reprend le téléchargement là où il s'est arrêté
+
+        Args:
+            job_id: Identifiant du job à traiter.
+
+        Raises:
+            ValueError: Si aucune URL n'est disponible.
+        """
+        from web.services.storage import BlobStoreService, RemoteFetchService
+        from web.services.wizard import WizardDraftService
+
+        job = db.session.get(Job, job_id)
+        config = (job.config_json if job else None) or {}
+        release = db.session.get(Release, job.release_id) if job and job.release_id else None
+        drafts = WizardDraftService()
+        url = config.get("url") or (
+            drafts.effective_metadata(release).get("file_url") if release else None
+        )
+        if not url:
+            raise ValueError("No URL to fetch")
+
+        self.append_log(job_id, f"Fetching {url}...", "INFO")
+        app_config = current_app.config
+        fetcher = RemoteFetchService(
+            BlobStoreService.from_config(app_config),
+            segments=int(config.get("segments") or app_config.get("REMOTE_FETCH_SEGMENTS", 4)),
+            timeout=float(app_config.get("REMOTE_FETCH_TIMEOUT", 30)),
+            max_bytes=app_config.get("UPLOAD_MAX_BYTES"),
+            allowed_hosts=app_config.get("REMOTE_FETCH_ALLOWED_HOSTS", ()),
+        )
+        blob = fetcher.fetch(
+            url,
+            expected_sha256=config.get("sha256"),
+            expected_size=config.get("size"),
+            progress_callback=JobProgressReporter(job_id),
+        )
+
+        if release is not None:
+            file_info = {
+                "file_url": url,
+                "file_size": blob["size"],
+                "original_filename": blob["filename"],
+                "sha256": blob["sha256"],
+                "crc32": blob["crc32"],
+            }
+            release.file_path = str(blob["path"])
+            if release.status == "draft":
+                # Colonnes d'upload du draft uniquement (étape inchangée)
+                drafts.save_step(release, None, file_info)
+            else:
+                release.release_metadata = {**(release.release_metadata or {}), **file_info}
+                db.session.commit()
+
+        self.append_log(
+            job_id,
+            f"Fetched {blob['size']} bytes in {blob['segments']} segment(s) "
+            f"({blob['resumed_bytes']} resumed): {blob['path']}",
+            "INFO",
+        )
+        self.update_status(job_id, "completed", "FETCH job completed")
+
+    def _process_analyze_job(self, job_id: int) -> None:
+        """Traite un job de type ANALYZE (analyse approfondie de l'étape 5 du wizard).
+
+        Le fichier uploadé est analysé par FileAnalysisService (format,
+        métadonnées, checksums, listing d'archive) ; le résultat est mis en
+        cache par identité de fichier puis enregistré dans l'analyse du draft,
+        si celle-ci attend toujours ce job (fichier non remplacé entre-temps).
+
+        Configuration du job (config_json) :
+        - file_path : Fichier à analyser
+        - cache_key : Clé de cache calculée par le wizard
+
+        Args:
+            job_id: Identifiant du job à traiter.
+
+        Raises:
+            ValueError: Si aucun fichier n'est indiqué.
+        """
+        from web.services.metadata import FileAnalysisService
+        from web.services.wizard import WizardDraftService
+
+        job = db.session.get(Job, job_id)
+        config = (job.config_json if job else None) or {}
+        if not config.get("file_path"):
+            raise ValueError("No file to analyze")
+
+        self.append_log(job_id, f"Analyzing {config['file_path']}...", "INFO")
+        analyzer = FileAnalysisService(current_app.config["ANALYSIS_CACHE_TIMEOUT"])
+        result = analyzer.analyze(Path(config["file_path"]), config.get("cache_key"))
+
+        release = db.session.get(Release, job.release_id) if job and job.release_id else None
+        if release is not None and release.status == "draft":
+            drafts = WizardDraftService()
+            analysis = drafts.effective_metadata(release).get("analysis") or {}
+            if analysis.get("deep_job_id") == job_id:
+                drafts.save_step(
+                    release,
+                    None,
+                    {"analysis": {"deep_status": "completed", "deep": result}},
+                    merge=("analysis",),
+                )
+
+        self.append_log(
+            job_id,
+            f"Analysis completed: {result['format']}, {result['file_size']} bytes",
+            "INFO",
+        )
+        self.update_status(job_id, "completed", "ANALYZE job completed")
+
+    def _process_gc_job(self, job_id: int) -> None:
+        """Traite un job de type GC (collecte des uploads et stagings orphelins).
+
+        Les fichiers d'uploads, téléchargements partiels et répertoires de
+        staging qui ne sont plus référencés (Release.file_path, jobs actifs)
+        et plus anciens que le délai de grâce sont supprimés par lots via
+        OrphanCollectorService.
+
+        Configuration du job (config_json) :
+        - dry_run : Si True, les orphelins sont comptés sans suppression
+        - grace_seconds : Délai de grâce (défaut : UPLOAD_GC_GRACE_SECONDS)
+
+        Le rapport ({scanned, orphans, removed, bytes_reclaimed, batches})
+        est persisté dans config_json["gc_report"].
+
+        Args:
+            job_id: Identifiant du job à traiter.
+        """
+        from sqlalchemy.orm.attributes import flag_modified
+
+        from web.services.storage import OrphanCollectorService
+
+        self.append_log(job_id, "Collecting orphaned files...", "INFO")
+
+        job = db.session.get(Job, job_id)
+        config = dict(job.config_json or {}) if job else {}
+        collector = OrphanCollectorService.from_config(current_app.config)
+        if config.get("grace_seconds") is not None:
+            collector.grace_seconds = float(config["grace_seconds"])
+        report = collector.collect(dry_run=bool(config.get("dry_run")))
+
+        if job is not None:
+            config["gc_report"] = report
+            job.config_json = config
+            flag_modified(job, "config_json")
+            db.session.commit()
+
+        self.append_log(
+            job_id,
+            f"GC: {report['removed']}/{report['orphans']} orphan(s) removed in "
+            f"{report['batches']} batch(es), {report['bytes_reclaimed']} bytes reclaimed",
+            "INFO",
+        )
+        self.update_status(job_id, "completed", "GC job completed")
+
+    def _process_dupeimport_job(self, job_id: int) -> None:
+        """Traite un job d'import de dumps predb dans l'index de dupes.
+
+        Configuration du job (config_json) :
+        - sources : Fichiers de dumps (un nom de release par ligne, .gz accepté)
+        - replace : Si True, l'index est reconstruit sans les noms existants
+
+        Le rapport ({read, imported, count, keys}) est persisté dans
+        config_json["dupe_import"].
+
+        Args:
+            job_id: Identifiant du job à traiter.
+
+        Raises:
+            ValueError: Si aucune source n'est configurée.
+        """
+        from sqlalchemy.orm.attributes import flag_modified
+
+        from web.services.dupe import DupeIndexService
+
+        job = db.session.get(Job, job_id)
+        config = dict(job.config_json or {}) if job else {}
+        sources = config.get("sources") or []
+        if not sources:
+            raise ValueError("No predb dump to import (config_json.sources)")
+
+        self.append_log(job_id, f"Importing {len(sources)} predb dump(s)...", "INFO")
+        service = DupeIndexService.from_config(current_app.config)
+        report = service.import_dumps(sources, replace=bool(config.get("replace")))
+
+        if job is not None:
+            config["dupe_import"] = report
+            job.config_json = config
+            flag_modified(job, "config_json")
+            db.session.commit()
+
+        self.append_log(
+            job_id,
+            f"Dupe index: {report['imported']} new name(s), {report['count']} indexed "
+            f"under {report['keys']} key(s)",
+            "INFO",
+        )
+        self.update_status(job_id, "completed", "Dupe import completed")
+
+    def _process_scenerules_sync_job(self, job_id: int) -> None:
+        """Traite un job de synchronisation du miroir local scenerules.org.
+
+        Configuration du job (config_json) :
+        - force : Si True, télécharge toutes les règles sans requête conditionnelle
+        - update_rules : Si True (défaut), met à jour le contenu des règles déjà
+          présentes en base pour les règles modifiées dans le miroir (nouvelle
+          révision dans l'historique de la règle)
+
+        Le rapport de ScenerulesSyncService.sync (complété de rules_updated) est
+        persisté dans config_json["scenerules_sync"].
+
+        Args:
+            job_id: Identifiant du job à traiter.
+        """
+        from sqlalchemy.orm.attributes import flag_modified
+
+        from web.models import Rule
+        from web.services.rule import (
+            RuleCatalogService,
+            RuleRevisionService,
+            RuleSearchService,
+            ScenerulesSyncService,
+        )
+
+        job = db.session.get(Job, job_id)
+        config = dict(job.config_json or {}) if job else {}
+
+        self.append_log(job_id, "Synchronizing scenerules.org mirror...", "INFO")
+        service = ScenerulesSyncService.from_config(current_app.config)
+        report = service.sync(force=bool(config.get("force")))
+
+        rules_updated = 0
+        if config.get("update_rules", True):
+            revisions = RuleRevisionService()
+            for changed in report["updated_rules"]:
+                rule = Rule.query.filter_by(
+                    section=changed["section"], year=changed["year"]
+                ).first()
+                rule_data = service.read(changed["section"], changed["year"])
+                if rule is not None and rule_data and rule.content != rule_data["content"]:
+                    # Contenu remplacé conservé dans l'historique de la règle
+                    revisions.record(rule)
+                    rule.content = rule_data["content"]
+                    revisions.record(rule, job.created_by if job else None)
+                    rules_updated += 1
+            if rules_updated:
+                db.session.commit()
+                RuleCatalogService.invalidate()
+                RuleSearchService.invalidate()
+        report["rules_updated"] = rules_updated
+
+        if job is not None:
+            config["scenerules_sync"] = report
+            job.config_json = config
+            flag_modified(job, "config_json")
+            db.session.commit()
+
+        for error in report["errors"]:
+            self.append_log(job_id, f"{error['name']}: {error['error']}", "WARNING")
+        self.append_log(
+            job_id,
+            f"Scenerules mirror: {report['updated']} updated, {report['unchanged']} unchanged, "
+            f"{report['failed']} failed; {rules_updated} local rule(s) refreshed",
+            "INFO",
+        )
+        self.update_status(job_id, "completed", "Scenerules sync completed")
+
     def _process_dirfix_job(self, job_id: int) -> None:
         """Traite un job de type DIRFIX (correction de la structure de répertoires).
 
-        Cette méthode corrige la structure de répertoires d'une release selon
-        les règles Scene (nommage DIRNAMING). Le traitement actuel est une simulation.
+        Cette méthode corrige les noms de répertoires d'une release (ou d'un
+        répertoire de groupe complet en mode bulk) selon les règles DIRNAMING,
+        via DirfixService.
 
-        Algorithme (simulation actuelle) :
-        1. Log du début du traitement
-        2. Simulation de la correction
-        3. Log de succès
-        4. Transition vers statut "completed"
+        Configuration du job (config_json) :
+        - path / file_path : Répertoire de la release (ou du groupe si bulk)
+        - bulk : Si True, chaque sous-répertoire direct est traité comme une release
+        - dry_run : Si True, le plan est calculé et journalisé sans renommage
+        - rule_id : Règle dont la section DIRNAMING est utilisée (défaut : [2022] eBOOK)
 
-        Complexité : O(1) pour la simulation, O(n) en production où n est le nombre
-        de répertoires à renommer/réorganiser.
+        Algorithme :
+        1. Résolution du répertoire cible et de la spécification DIRNAMING
+        2. Calcul du plan de renommage (un seul parcours os.scandir)
+        3. Persistance du plan (diff) dans config_json["dirfix_plan"]
+        4. Application par lots avec rollback si dry_run est False
 
-        Note : Dans une implémentation complète, cette méthode devrait :
-        - Charger la structure de répertoires actuelle
-        - Valider le nommage selon les règles DIRNAMING
-        - Détecter les erreurs de nommage (composants manquants, séparateurs incorrects)
-        - Renommer les répertoires pour conformité
-        - Réorganiser la structure si nécessaire
+        Complexité : O(n) où n est le nombre d'entrées de l'arborescence.
+
+        Gestion des erreurs :
+        - Sans répertoire exploitable, le job est terminé sans renommage (log WARNING)
+        - Un échec d'application (rollback effectué) lève une exception, le job
+          passe alors en statut "failed" via process_job
 
         Args:
             job_id: Identifiant du job à traiter.
         """
+        from sqlalchemy.orm.attributes import flag_modified
+
+        from web.models import Rule
+        from web.services.dirfix import DirfixService
+
         self.append_log(job_id, "Fixing directory structure...", "INFO")
+
+        job = db.session.get(Job, job_id)
+        config = dict(job.config_json or {}) if job else {}
+        target = config.get("path") or config.get("file_path")
+
+        if not target or not Path(target).is_dir():
+            self.append_log(job_id, f"No release directory to fix: {target}", "WARNING")
+            self.update_status(job_id, "completed", "DIRFIX job completed")
+            return
+
+        rule = db.session.get(Rule, config["rule_id"]) if config.get("rule_id") else None
+        service = DirfixService.from_rule_content(rule.content) if rule else DirfixService()
+
+        if config.get("bulk"):
+            plan = service.plan_bulk(target)
+        else:
+            metadata = self._release_naming_metadata(job)
+            plan = service.plan_release(target, metadata)
+
+        self.append_log(
+            job_id,
+            f"DIRFIX plan: {len(plan['operations'])} rename(s), "
+            f"{len(plan['conflicts'])} conflict(s), {plan['scanned']} directories scanned",
+            "INFO",
+        )
+
+        if job is not None:
+            dirfix_plan = {"diff": plan["diff"], "conflicts": plan["conflicts"]}
+            job.config_json = {**config, "dirfix_plan": dirfix_plan}
+            flag_modified(job, "config_json")
+            db.session.commit()
+
+        if config.get("dry_run"):
+            self.update_status(job_id, "completed", "DIRFIX dry-run completed")
+            return
+
+        result = service.apply_plan(
+            plan,
+            on_batch=lambda done, total: self.append_log(
+                job_id, f"DIRFIX progress: {done}/{total}", "INFO"
+            ),
+        )
+        if not result["success"]:
+            raise RuntimeError(
+                f"DIRFIX rolled back ({result['rolled_back']} rename(s)): {result['error']}"
+            )
+
+        relocated = self._relocate_release_paths(job, target, plan["operations"])
+        if relocated:
+            self.append_log(job_id, f"DIRFIX: {relocated} release path(s) updated", "INFO")
+
         self.append_log(job_id, "Directory structure fixed successfully", "INFO")
         self.update_status(job_id, "completed", "DIRFIX job completed")
 
+    @staticmethod
+    def _relocate_release_paths(
+        job: Job | None, target: str, operations: list[dict[str, Any]]
+    ) -> int:
+        """Reporte les renommages DIRFIX sur les chemins des releases.
+
+        Les opérations sont rejouées dans l'ordre d'application (plus profond
+        d'abord) sur Release.file_path et sur les valeurs chaînes de
+        release_metadata, pour la release du job et les releases situées sous
+        le répertoire traité. Un seul commit.
+
+        Args:
+            job: Job DIRFIX (sa release est toujours examinée).
+            target: Répertoire traité (release ou groupe en mode bulk).
+            operations: Opérations appliquées ({"source", "target"}).
+
+        Returns:
+            Nombre de releases mises à jour.
+        """
+        if not operations:
+            return 0
+
+        def relocate(path: str) -> str:
+            current = os.path.normpath(path)
+            for operation in operations:
+                source = os.path.normpath(operation["source"])
+                if current == source or current.startswith(source + os.sep):
+                    current = os.path.normpath(operation["target"]) + current[len(source) :]
+            return current if current != os.path.normpath(path) else path
+
+        prefix = os.path.normpath(target)
+        releases = set(
+            db.session.scalars(
+                select(Release).where(Release.file_path.startswith(prefix, autoescape=True))
+            )
+        )
+        if job is not None and job.release is not None:
+            releases.add(job.release)
+
+        updated = 0
+        for release in releases:
+            changed = False
+            if release.file_path:
+                file_path = relocate(release.file_path)
+                changed = file_path != release.file_path
+                release.file_path = file_path
+            metadata = dict(release.release_metadata or {})
+            for key, value in metadata.items():
+                if isinstance(value, str) and value:
+                    moved = relocate(value)
+                    if moved != value:
+                        metadata[key] = moved
+                        changed = True
+            if changed:
+                release.release_metadata = metadata
+                updated += 1
+        db.session.commit()
+        return updated
+
+    def _release_naming_metadata(self, job: Job | None) -> dict[str, Any] | None:
+        """Rassemble les métadonnées de nommage de la release associée à un job.
+
+        Args:
+            job: Job dont la release fournit les métadonnées.
+
+        Returns:
+            Métadonnées (incluant le nom du groupe) ou None si aucune release.
+        """
+        if job is None or job.release is None:
+            return None
+
+        release = job.release
+        metadata = dict(release.release_metadata or {})
+        if release.group is not None:
+            metadata.setdefault("group", release.group.name)
+        return metadata
+
     def update_status(self, job_id: int, status: str, logs: str | None = None) -> None:
         """Met à jour le statut d'un job et optionnellement ajoute des logs.
 
@@ -514,9 +1196,11 @@ class JobService:
     def get_job_progress(self, job_id: int) -> int:
         """Récupère le pourcentage de progression d'un job.
 
-        Cette méthode calcule le pourcentage de progression d'un job de deux façons :
-        1. Si config_json contient une clé "progress", utilise cette valeur
-        2. Sinon, estime la progression basée sur le statut du job
+        Cette méthode calcule le pourcentage de progression d'un job de trois façons :
+        1. Si la colonne progress est renseignée (JobProgressReporter), utilise
+           son pourcentage calculé en octets
+        2. Si config_json contient une clé "progress", utilise cette valeur
+        3. Sinon, estime la progression basée sur le statut du job
 
         Algorithme :
         1. Récupération du job depuis la base de données
@@ -556,6 +1240,10 @@ class JobService:
             # Si le job n'existe pas, retourner 0 par défaut
             return 0
 
+        # Progression mesurée (octets traités) persistée par JobProgressReporter
+        if job.progress and "percent" in job.progress:
+            return int(job.progress["percent"])
+
         # Tentative de récupération de la progression depuis config_json
         # Cette valeur peut être mise à jour par le worker pendant le traitement
         if job.config_json and "progress" in job.config_json:
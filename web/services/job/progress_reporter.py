@@ -0,0 +1,130 @@
+"""Persistance throttlée de la progression des jobs.
+
+Ce module convertit les callbacks de progression émis par les services
+(PackagingService : octets lus, octets écrits, membre courant) en écritures
+compactes dans la colonne Job.progress, sans transformer le packaging en
+tempête d'écritures base de données.
+
+Architecture :
+- Le service émet un événement par bloc traité (1 MiB pour le ZIP)
+- JobProgressReporter ne persiste que si min_interval_ms est écoulé ou si
+  la progression a avancé d'au moins min_step_percent depuis la dernière
+  écriture ; le premier et le dernier événement sont toujours persistés
+- Écriture par UPDATE ciblé sur la seule colonne progress, puis commit
+
+Complexité : O(1) par événement. Les deux seuils sont alternatifs (l'un ou
+l'autre déclenche une écriture) : au plus durée / min_interval_ms +
+100 / min_step_percent + 2 écritures par job.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import update
+
+from web.extensions import db
+from web.models import Job
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Intervalle minimal entre deux écritures (millisecondes)
+DEFAULT_MIN_INTERVAL_MS = 500
+
+# Avancement minimal entre deux écritures (pourcentage)
+DEFAULT_MIN_STEP_PERCENT = 5.0
+
+
+class JobProgressReporter:
+    """Callback de progression persisté dans Job.progress avec throttling.
+
+    Une instance est passée comme progress_callback à un service ; chaque
+    appel reçoit un événement (dict) et décide s'il doit être persisté.
+
+    Format persisté (compact) :
+        {"phase": "zip", "percent": 42.5, "bytes_read": ..., "bytes_written": ...,
+         "bytes_total": ..., "member": "book.epub", "updated_at": "..."}
+
+    Exemple d'utilisation :
+        reporter = JobProgressReporter(job_id)
+        packaging.package_release(data, output, progress_callback=reporter)
+    """
+
+    def __init__(
+        self,
+        job_id: int,
+        min_interval_ms: int = DEFAULT_MIN_INTERVAL_MS,
+        min_step_percent: float = DEFAULT_MIN_STEP_PERCENT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialise le reporter.
+
+        Args:
+            job_id: Job dont la progression est persistée.
+            min_interval_ms: Délai depuis la dernière écriture au-delà duquel
+                un événement est persisté.
+            min_step_percent: Avancement depuis la dernière écriture au-delà
+                duquel un événement est persisté (sans attendre l'intervalle).
+            clock: Horloge monotone en secondes (injectable pour les tests).
+        """
+        self.job_id = job_id
+        self.min_interval = min_interval_ms / 1000
+        self.min_step_percent = min_step_percent
+        self.clock = clock
+        self.writes = 0
+        self._last_write_at: float | None = None
+        self._last_percent = 0.0
+
+    def __call__(self, event: dict[str, Any]) -> None:
+        """Reçoit un événement de progression et le persiste si nécessaire.
+
+        Args:
+            event: Événement émis par le service : phase, bytes_read,
+                bytes_written, bytes_total, member (clés optionnelles sauf phase).
+        """
+        bytes_total = event.get("bytes_total") or 0
+        bytes_read = event.get("bytes_read") or 0
+        final = event.get("phase") == "done"
+        if final:
+            percent = 100.0
+        elif bytes_total:
+            percent = min(100.0, round(bytes_read * 100 / bytes_total, 1))
+        else:
+            percent = self._last_percent
+
+        now = self.clock()
+        due = (
+            final
+            or self._last_write_at is None
+            or now - self._last_write_at >= self.min_interval
+            or percent - self._last_percent >= self.min_step_percent
+        )
+        if not due:
+            return
+
+        self._persist(
+            {
+                "phase": event.get("phase"),
+                "percent": percent,
+                "bytes_read": bytes_read,
+                "bytes_written": event.get("bytes_written") or 0,
+                "bytes_total": bytes_total,
+                "member": event.get("member"),
+                "updated_at": datetime.now(UTC).isoformat(),
+            }
+        )
+        self._last_write_at = now
+        self._last_percent = percent
+
+    def _persist(self, progress: dict[str, Any]) -> None:
+        """Écrit la progression par UPDATE ciblé et commit immédiat.
+
+        Args:
+            progress: Progression compacte à stocker dans Job.progress.
+        """
+        db.session.execute(update(Job).where(Job.id == self.job_id).values(progress=progress))
+        db.session.commit()
+        self.writes += 1
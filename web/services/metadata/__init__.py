@@ -1,5 +1,7 @@
 """Services metadata - Extraction de métadonnées depuis fichiers eBook."""
 
+from web.services.metadata.file_analysis import FileAnalysisService
 from web.services.metadata.metadata_extraction import MetadataExtractionService
+from web.services.metadata.nfo_reader import NfoReaderService
 
-__all__ = ["MetadataExtractionService"]
+__all__ = ["FileAnalysisService", "MetadataExtractionService", "NfoReaderService"]
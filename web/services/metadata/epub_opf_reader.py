@@ -0,0 +1,184 @@
+"""Lecture rapide des métadonnées EPUB depuis le seul fichier OPF.
+
+ebooklib.epub.read_epub charge et parse tous les items du livre (XHTML,
+images, CSS) pour exposer les champs Dublin Core. Sur un EPUB illustré de
+plusieurs centaines de Mo, cela coûte des secondes et des centaines de Mo
+de RAM pour quelques lignes de XML utiles.
+
+Ce module implémente un chemin rapide :
+1. Ouverture de l'archive ZIP (lecture du répertoire central uniquement)
+2. Lecture de META-INF/container.xml pour localiser le fichier OPF
+3. Parsing incrémental (iterparse) de l'OPF, arrêté dès la fin du bloc
+   <metadata> : le manifest et le spine ne sont ni décompressés ni parsés
+
+Complexité : O(m) où m est la taille du bloc <metadata> de l'OPF,
+indépendante de la taille du livre. Mémoire : O(m).
+"""
+
+from __future__ import annotations
+
+import logging
+import xml.etree.ElementTree as ET
+import zipfile
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Constants
+CONTAINER_PATH = "META-INF/container.xml"
+CONTAINER_NS = "urn:oasis:names:tc:opendocument:xmlns:container"
+OPF_MEDIA_TYPE = "application/oebps-package+xml"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+CONTAINER_MAX_BYTES = 64 * 1024  # container.xml fait quelques centaines d'octets
+
+# Éléments Dublin Core lus -> clé de métadonnées (None = traitement dédié)
+DC_FIELDS: dict[str, str | None] = {
+    "title": "title",
+    "creator": None,
+    "publisher": "publisher",
+    "identifier": None,
+    "language": "language",
+    "date": "publication_date",
+    "description": "description",
+}
+
+
+class OpfUnavailableError(ValueError):
+    """Exception levée lorsque le chemin rapide ne peut pas lire l'OPF.
+
+    L'appelant doit alors se replier sur ebooklib (archive non ZIP,
+    container.xml absent, OPF introuvable ou XML invalide).
+    """
+
+
+class EpubOpfReader:
+    """Lecteur de métadonnées Dublin Core limité au bloc <metadata> de l'OPF.
+
+    Le résultat a la même forme que MetadataExtractionService._extract_epub_metadata
+    (title, author, publisher, isbn, language, publication_date, description),
+    avec la même règle de sélection de l'ISBN : premier dc:identifier
+    mentionnant "isbn" (valeur ou attributs), sinon premier identifiant.
+
+    Exemple d'utilisation :
+        reader = EpubOpfReader()
+        try:
+            metadata = reader.read(Path('book.epub'))
+        except OpfUnavailableError:
+            metadata = None  # Repli sur ebooklib
+    """
+
+    def read(self, file_path: Path | str) -> dict[str, Any]:
+        """Lit les métadonnées Dublin Core d'un EPUB via son OPF.
+
+        Algorithme :
+        1. zipfile.ZipFile (répertoire central seul, O(k) pour k entrées)
+        2. Localisation de l'OPF via container.xml (rootfile de type OPF)
+        3. iterparse de l'OPF en flux, arrêt sur </metadata>
+
+        Args:
+            file_path: Chemin vers le fichier EPUB.
+
+        Returns:
+            Dictionnaire avec métadonnées extraites.
+
+        Raises:
+            OpfUnavailableError: Si l'OPF ne peut pas être localisé ou parsé.
+        """
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                opf_path = self._find_opf_path(archive)
+                with archive.open(opf_path) as opf_file:
+                    return self._parse_opf_metadata(opf_file)
+        except (OSError, KeyError, NotImplementedError, ET.ParseError, zipfile.BadZipFile) as e:
+            raise OpfUnavailableError(f"OPF illisible dans {file_path}: {e}") from e
+
+    def _find_opf_path(self, archive: zipfile.ZipFile) -> str:
+        """Retourne le chemin du fichier OPF déclaré dans container.xml.
+
+        Args:
+            archive: Archive EPUB ouverte.
+
+        Returns:
+            Chemin du fichier OPF dans l'archive.
+
+        Raises:
+            OpfUnavailableError: Si container.xml ou le rootfile est absent.
+        """
+        try:
+            info = archive.getinfo(CONTAINER_PATH)
+        except KeyError as e:
+            raise OpfUnavailableError(f"{CONTAINER_PATH} absent") from e
+        if info.file_size > CONTAINER_MAX_BYTES:
+            raise OpfUnavailableError(f"{CONTAINER_PATH} trop volumineux")
+
+        root = ET.fromstring(archive.read(info))
+        rootfiles = root.iter(f"{{{CONTAINER_NS}}}rootfile")
+        candidates = [
+            rootfile.get("full-path")
+            for rootfile in rootfiles
+            if rootfile.get("full-path")
+            and rootfile.get("media-type", OPF_MEDIA_TYPE) == OPF_MEDIA_TYPE
+        ]
+        if not candidates:
+            raise OpfUnavailableError("Aucun rootfile OPF dans container.xml")
+        return str(candidates[0])
+
+    def _parse_opf_metadata(self, opf_file: Any) -> dict[str, Any]:
+        """Parse le bloc <metadata> d'un OPF en flux.
+
+        Les éléments sont libérés (clear) dès leur traitement ; la lecture
+        s'arrête à la fermeture de <metadata>, sans décompresser la suite.
+
+        Args:
+            opf_file: Flux binaire du fichier OPF.
+
+        Returns:
+            Dictionnaire avec métadonnées extraites.
+
+        Raises:
+            OpfUnavailableError: Si aucun bloc <metadata> n'est trouvé.
+        """
+        metadata: dict[str, Any] = {
+            "title": None,
+            "author": [],
+            "publisher": None,
+            "isbn": None,
+            "language": None,
+            "publication_date": None,
+            "description": None,
+        }
+        isbn_found = False
+        metadata_closed = False
+
+        for _event, element in ET.iterparse(opf_file, events=("end",)):
+            namespace, _, local_name = element.tag.rpartition("}")
+            if local_name == "metadata":
+                metadata_closed = True
+                break
+            if namespace != f"{{{DC_NS}" or local_name not in DC_FIELDS:
+                continue
+
+            value = (element.text or "").strip()
+            if value:
+                key = DC_FIELDS[local_name]
+                if local_name == "creator":
+                    metadata["author"].append(value)
+                elif local_name == "identifier":
+                    if not isbn_found and (
+                        "isbn" in value.lower()
+                        or any("isbn" in str(attr).lower() for attr in element.attrib.values())
+                    ):
+                        metadata["isbn"] = value
+                        isbn_found = True
+                    elif metadata["isbn"] is None:
+                        metadata["isbn"] = value
+                elif key and metadata[key] is None:
+                    metadata[key] = value
+            element.clear()
+
+        if not metadata_closed:
+            raise OpfUnavailableError("Bloc <metadata> absent de l'OPF")
+        return metadata
@@ -0,0 +1,228 @@
+"""Service d'analyse approfondie des fichiers uploadés (étape 5 du wizard).
+
+L'analyse de l'étape 5 se limitait au découpage du nom de fichier. Ce service
+produit une analyse complète, exécutée en arrière-plan par un job "analyze"
+et mise en cache par identité de fichier.
+
+Architecture :
+- Détection du format par signature (magic bytes), indépendante du nom
+- Métadonnées : MetadataExtractionService en mode borné (PDF à coût borné)
+- Checksums : SHA-256, MD5 et CRC-32 en une seule lecture séquentielle
+- Archives (EPUB, ZIP, CBZ) : listing depuis le répertoire central
+  (ArchiveIndexService), sans décompression
+- Cache : extension Flask-Caching, clé dérivée du SHA-256 du contenu quand
+  il est connu (store d'uploads adressé par contenu : un même fichier uploadé
+  pour plusieurs drafts n'est analysé qu'une fois), sinon de l'identité
+  système du fichier (périphérique, inode, taille, mtime)
+
+Complexité : O(n) pour un fichier de n octets (une lecture pour les
+checksums, lectures bornées pour les métadonnées et le listing) ; O(1) en cas
+de succès du cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import zlib
+from typing import TYPE_CHECKING, Any
+
+from web.extensions import cache
+from web.services.archive import ArchiveFormatError, ArchiveIndexService
+from web.services.metadata.metadata_extraction import MetadataExtractionService
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Préfixe des clés de cache (incrémenter si le format du résultat change)
+CACHE_PREFIX = "file-analysis:v1"
+
+# Durée de conservation d'une analyse en cache (secondes)
+DEFAULT_CACHE_TIMEOUT = 7 * 24 * 3600
+
+# Taille des blocs lus pour les checksums
+CHUNK_SIZE = 1024 * 1024
+
+# Nombre maximal de membres d'archive inclus dans le résultat
+MAX_LISTED_MEMBERS = 500
+
+# Signatures magiques -> format (ordre : plus spécifique d'abord)
+_SIGNATURES: tuple[tuple[bytes, str], ...] = (
+    (b"%PDF-", "PDF"),
+    (b"PK\x03\x04", "ZIP"),
+    (b"PK\x05\x06", "ZIP"),
+    (b"Rar!\x1a\x07", "RAR"),
+    (b"7z\xbc\xaf\x27\x1c", "7Z"),
+    (b"\x1f\x8b", "GZIP"),
+)
+# Formats ZIP reconnus par le type MIME stocké en tête d'archive (EPUB OCF)
+_ZIP_MIMETYPES = {b"application/epub+zip": "EPUB"}
+# Offset du contenu du membre "mimetype" d'un EPUB (en-tête local de 30 + 8 octets)
+_EPUB_MIMETYPE_OFFSET = 38
+
+
+class FileAnalysisService:
+    """Service d'analyse approfondie d'un fichier (format, métadonnées, checksums, listing).
+
+    Pièges potentiels :
+    - Le cache est celui de l'application (Flask-Caching) : SimpleCache est
+      propre à chaque processus, un backend partagé (Redis) est nécessaire
+      pour partager les analyses entre workers
+    - Une extraction de métadonnées en échec n'invalide pas l'analyse :
+      l'erreur est reportée dans metadata_error
+
+    Exemple d'utilisation :
+        service = FileAnalysisService()
+        key = service.cache_key(Path("book.epub"), sha256=draft.sha256)
+        result = service.get_cached(key) or service.analyze(Path("book.epub"), key)
+    """
+
+    def __init__(
+        self,
+        cache_timeout: int = DEFAULT_CACHE_TIMEOUT,
+        extractor: MetadataExtractionService | None = None,
+    ) -> None:
+        """Initialise le service d'analyse.
+
+        Args:
+            cache_timeout: Durée de conservation des analyses en cache (secondes).
+            extractor: Service d'extraction de métadonnées (défaut : instance dédiée).
+        """
+        self.cache_timeout = cache_timeout
+        self._extractor = extractor
+
+    @property
+    def extractor(self) -> MetadataExtractionService:
+        """Service d'extraction de métadonnées (instancié à la première analyse)."""
+        if self._extractor is None:
+            self._extractor = MetadataExtractionService()
+        return self._extractor
+
+    @staticmethod
+    def cache_key(path: Path, sha256: str | None = None) -> str:
+        """Calcule la clé de cache d'un fichier.
+
+        Args:
+            path: Fichier analysé.
+            sha256: Empreinte du contenu si connue (uploads adressés par contenu).
+
+        Returns:
+            Clé de cache.
+
+        Raises:
+            FileNotFoundError: Si le fichier n'existe pas.
+        """
+        if sha256:
+            return f"{CACHE_PREFIX}:sha256:{sha256.lower()}"
+        stat = path.stat()
+        return f"{CACHE_PREFIX}:stat:{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    @staticmethod
+    def get_cached(key: str) -> dict[str, Any] | None:
+        """Retourne l'analyse en cache pour la clé (None si absente)."""
+        result = cache.get(key)
+        return dict(result) if result else None
+
+    def analyze(self, path: Path, key: str | None = None) -> dict[str, Any]:
+        """Analyse un fichier et enregistre le résultat en cache.
+
+        Algorithme :
+        1. Détection du format par signature (quelques octets)
+        2. Checksums SHA-256, MD5, CRC-32 en une lecture par blocs
+        3. Métadonnées (MetadataExtractionService, mode borné), erreurs reportées
+        4. Listing du répertoire central pour les archives ZIP/EPUB/CBZ
+        5. Mise en cache sous la clé fournie (et sous la clé SHA-256)
+
+        Args:
+            path: Fichier à analyser.
+            key: Clé de cache (défaut : cache_key(path)).
+
+        Returns:
+            Dictionnaire contenant format, file_size, checksums, metadata
+            (ou metadata_error) et archive (pour les archives).
+
+        Raises:
+            FileNotFoundError: Si le fichier n'existe pas.
+        """
+        if key is None:
+            key = self.cache_key(path)
+        file_format = self.sniff_format(path)
+        checksums, size = self._checksums(path)
+        result: dict[str, Any] = {
+            "format": file_format,
+            "file_size": size,
+            "checksums": checksums,
+        }
+
+        try:
+            metadata = self.extractor.extract_metadata(
+                path, calculate_checksums=False, bounded=True
+            )
+            metadata.pop("file_path", None)
+            result["metadata"] = metadata
+        except Exception as e:  # noqa: BLE001 - l'analyse reste exploitable sans métadonnées
+            logger.info(f"Analyse {path}: métadonnées indisponibles ({e})")
+            result["metadata_error"] = str(e)
+
+        if file_format in ("ZIP", "EPUB"):
+            result["archive"] = self._archive_listing(path)
+
+        for cache_key in {key, self.cache_key(path, checksums["sha256"])}:
+            cache.set(cache_key, result, timeout=self.cache_timeout)
+        return result
+
+    @staticmethod
+    def sniff_format(path: Path) -> str:
+        """Détecte le format d'un fichier par sa signature.
+
+        Args:
+            path: Fichier à examiner.
+
+        Returns:
+            Format (PDF, EPUB, ZIP, RAR, 7Z, GZIP) ou UNKNOWN.
+        """
+        with path.open("rb") as f:
+            header = f.read(_EPUB_MIMETYPE_OFFSET + 32)
+        for signature, file_format in _SIGNATURES:
+            if header.startswith(signature):
+                if file_format == "ZIP":
+                    mimetype = header[_EPUB_MIMETYPE_OFFSET:]
+                    for prefix, zip_format in _ZIP_MIMETYPES.items():
+                        if mimetype.startswith(prefix):
+                            return zip_format
+                return file_format
+        return "UNKNOWN"
+
+    @staticmethod
+    def _checksums(path: Path) -> tuple[dict[str, str], int]:
+        """Calcule SHA-256, MD5 et CRC-32 en une seule lecture."""
+        sha256 = hashlib.sha256()
+        md5 = hashlib.md5()  # noqa: S324 - compatibilité (fichiers .md5 Scene)
+        crc = 0
+        size = 0
+        with path.open("rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                sha256.update(chunk)
+                md5.update(chunk)
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+        return {"sha256": sha256.hexdigest(), "md5": md5.hexdigest(), "crc32": f"{crc:08x}"}, size
+
+    @staticmethod
+    def _archive_listing(path: Path) -> dict[str, Any]:
+        """Liste les membres d'une archive (tronqué à MAX_LISTED_MEMBERS)."""
+        try:
+            listing = ArchiveIndexService().list_members(path)
+        except ArchiveFormatError as e:
+            return {"error": str(e)}
+        return {
+            "count": listing["count"],
+            "total_size": listing["total_size"],
+            "members": [
+                {"name": member["name"], "size": member["size"], "crc32": member["crc32"]}
+                for member in listing["members"][:MAX_LISTED_MEMBERS]
+            ],
+            "truncated": listing["count"] > MAX_LISTED_MEMBERS,
+        }
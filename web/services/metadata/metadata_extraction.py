@@ -18,8 +18,19 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from web.services.metadata.epub_opf_reader import EpubOpfReader, OpfUnavailableError
+from web.services.metadata.pdf_tail_reader import (
+    PDF_DEFAULT_MAX_BYTES,
+    PDF_DEFAULT_TIME_BUDGET,
+    PdfTailReader,
+)
 
 try:
     import ebooklib
@@ -33,15 +44,22 @@ try:
 except ImportError:
     PdfReader = None  # type: ignore[assignment, misc]
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
 logger = logging.getLogger(__name__)
 
 # Constants
+BATCH_INFLIGHT_PER_WORKER = 2  # Fichiers soumis d'avance par worker (extract_many)
 ISBN_10_LENGTH = 10
 ISBN_13_LENGTH = 13
 DATE_MIN_LENGTH = 8  # Minimum date length for YYYYMMDD format
 ISO_DATE_MIN_LENGTH = 10  # Minimum length for YYYY-MM-DD format
 DATE_PARTS_MIN_COUNT = 3  # Minimum parts count for date parsing (year, month, day)
 
+# Instance de service propre à chaque worker du pool (extract_many)
+_worker_service: MetadataExtractionService | None = None
+
 
 class MetadataExtractionService:
     """Service d'extraction de métadonnées depuis fichiers eBook.
@@ -84,7 +102,11 @@ class MetadataExtractionService:
         ".prc": "PRC",
     }
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        pdf_max_bytes: int = PDF_DEFAULT_MAX_BYTES,
+        pdf_time_budget: float = PDF_DEFAULT_TIME_BUDGET,
+    ) -> None:
         """Initialise le service d'extraction de métadonnées.
 
         Vérifie la disponibilité des bibliothèques nécessaires pour l'extraction.
@@ -92,7 +114,17 @@ class MetadataExtractionService:
         désactivés avec un message d'avertissement.
 
         Complexité : O(1) - Vérifications simples d'imports.
+
+        Args:
+            pdf_max_bytes: Budget d'octets lus par PDF en mode borné.
+            pdf_time_budget: Budget de temps (secondes) par PDF en mode borné.
         """
+        # Lecteur OPF du chemin rapide EPUB (sans dépendance externe)
+        self._opf_reader = EpubOpfReader()
+
+        # Lecteur PDF à coût borné (mode bounded d'extract_metadata)
+        self._pdf_tail_reader = PdfTailReader(pdf_max_bytes, pdf_time_budget)
+
         # Vérification disponibilité ebooklib pour EPUB
         if ebooklib is None or epub is None:
             logger.warning(
@@ -108,7 +140,10 @@ class MetadataExtractionService:
             )
 
     def extract_metadata(
-        self, file_path: Path | str, calculate_checksums: bool = True
+        self,
+        file_path: Path | str,
+        calculate_checksums: bool | None = None,
+        bounded: bool = False,
     ) -> dict[str, Any]:
         """Extrait les métadonnées complètes d'un fichier eBook.
 
@@ -126,9 +161,19 @@ class MetadataExtractionService:
         Complexité globale : O(n) où n est la taille du fichier.
         La lecture complète du fichier est nécessaire pour les checksums.
 
+        Mode borné (bounded=True) : les PDF sont lus par PdfTailReader (trailer,
+        /Info et /Pages /Count depuis la fin du fichier via mmap, XMP seulement
+        si /Info est incomplet) sous budgets stricts d'octets et de temps. Une
+        structure invalide ou un budget épuisé ne lève pas d'exception : le
+        rapport "extraction" l'indique. Sans effet sur les autres formats. Les
+        checksums, qui lisent tout le fichier, ne sont pas calculés en mode
+        borné sauf demande explicite (calculate_checksums=True).
+
         Args:
             file_path: Chemin vers le fichier eBook à analyser.
-            calculate_checksums: Si True, calcule SHA-256 et MD5 (défaut: True).
+            calculate_checksums: Si True, calcule SHA-256 et MD5 (défaut : True,
+                False en mode borné).
+            bounded: Si True, extraction PDF à coût borné (défaut: False).
 
         Returns:
             Dictionnaire contenant :
@@ -143,6 +188,8 @@ class MetadataExtractionService:
             - file_size: Taille fichier en octets
             - checksums: Dictionnaire avec sha256 et md5 (si calculés)
             - mediainfo: Métadonnées techniques (taille, structure interne)
+            - pages, extraction: Nombre de pages et rapport de coût (timings par
+              étape, octets lus, complete, error) en mode borné pour les PDF
 
         Raises:
             FileNotFoundError: Si le fichier n'existe pas.
@@ -184,6 +231,10 @@ class MetadataExtractionService:
             if file_format == "EPUB":
                 epub_metadata = self._extract_epub_metadata(file_path)
                 metadata.update(epub_metadata)
+            elif file_format == "PDF" and bounded:
+                pdf_metadata = self._pdf_tail_reader.read(file_path)
+                metadata["pages"] = pdf_metadata.pop("page_count")
+                metadata.update(pdf_metadata)
             elif file_format == "PDF":
                 pdf_metadata = self._extract_pdf_metadata(file_path)
                 metadata.update(pdf_metadata)
@@ -207,13 +258,88 @@ class MetadataExtractionService:
         # Normalisation des données
         metadata = self._normalize_metadata(metadata)
 
-        # Calcul checksums si demandé
+        # Calcul checksums si demandé (lecture complète : exclue du mode borné par défaut)
+        if calculate_checksums is None:
+            calculate_checksums = not bounded
         if calculate_checksums:
             checksums = self._calculate_checksums(file_path)
             metadata["checksums"] = checksums
 
         return metadata
 
+    def extract_many(
+        self,
+        paths: Iterable[Path | str],
+        workers: int | None = None,
+        calculate_checksums: bool | None = None,
+        bounded: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        """Extrait les métadonnées d'un lot de fichiers en parallèle.
+
+        L'extraction EPUB/PDF est liée au CPU et limitée par le GIL : les
+        fichiers sont répartis sur un pool de processus. Les résultats sont
+        produits au fil de leur achèvement (ordre non garanti), chacun isolé :
+        un fichier corrompu (ou un worker qui plante) produit un résultat en
+        erreur sans interrompre le lot ; un pool cassé par un worker planté est
+        recréé pour les fichiers restants.
+
+        Algorithme :
+        1. Au plus `workers * BATCH_INFLIGHT_PER_WORKER` fichiers en cours
+           (mémoire bornée quelle que soit la taille du lot)
+        2. wait(FIRST_COMPLETED) puis production du résultat et soumission
+           du fichier suivant
+        3. Sans pool (workers <= 1 ou un seul fichier) : extraction séquentielle
+           dans le processus courant
+
+        Complexité : O(n / workers) en temps mural pour n fichiers de coût
+        comparable.
+
+        Args:
+            paths: Chemins des fichiers à analyser.
+            workers: Nombre de processus (défaut : os.cpu_count()).
+            calculate_checksums: Si True, calcule SHA-256 et MD5 pour chaque fichier
+                (défaut : True, False en mode borné).
+            bounded: Si True, extraction PDF à coût borné (voir extract_metadata).
+
+        Yields:
+            Dictionnaire par fichier : path, success, metadata (si succès) ou
+            error (si échec), elapsed_ms.
+        """
+        pending_paths = [str(path) for path in paths]
+        workers = workers or os.cpu_count() or 1
+        options = (calculate_checksums, bounded)
+
+        if workers <= 1 or len(pending_paths) <= 1:
+            for path in pending_paths:
+                yield _extract_one(path, *options)
+            return
+
+        pending_paths.reverse()  # pop() en O(1) en conservant l'ordre de soumission
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            in_flight: dict[Future[dict[str, Any]], str] = {}
+            while pending_paths or in_flight:
+                while pending_paths and len(in_flight) < workers * BATCH_INFLIGHT_PER_WORKER:
+                    path = pending_paths.pop()
+                    try:
+                        in_flight[executor.submit(_extract_one, path, *options)] = path
+                    except BrokenProcessPool:
+                        # Pool cassé par un worker planté : nouveau pool pour la suite du lot
+                        logger.warning("Pool d'extraction interrompu, redémarrage")
+                        pending_paths.append(path)
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        executor = ProcessPoolExecutor(max_workers=workers)
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = in_flight.pop(future)
+                    try:
+                        yield future.result()
+                    except Exception as e:  # Worker interrompu (BrokenProcessPool, etc.)
+                        logger.error(f"Worker d'extraction interrompu pour {path}: {e}")
+                        yield {"path": path, "success": False, "error": str(e), "elapsed_ms": None}
+        finally:
+            executor.shutdown(cancel_futures=True)
+
     def _detect_format(self, file_path: Path) -> str:
         """Détecte le format d'un fichier via extension et signature magique.
 
@@ -280,10 +406,12 @@ class MetadataExtractionService:
         - Images et styles CSS
 
         Algorithme d'extraction :
-        1. Ouverture de l'archive ZIP (O(1))
-        2. Recherche du fichier OPF (content.opf ou *.opf) (O(k) où k = nombre fichiers)
-        3. Parsing XML du fichier OPF (O(m) où m = taille fichier OPF)
-        4. Extraction métadonnées Dublin Core depuis XML (O(n) où n = nombre métadonnées)
+        1. Chemin rapide (EpubOpfReader) : répertoire central ZIP, container.xml,
+           puis parsing incrémental du seul bloc <metadata> de l'OPF (O(m) où
+           m = taille du bloc, indépendant de la taille du livre)
+        2. Repli ebooklib (read_epub, chargement de tous les items) uniquement si
+           l'OPF ne peut pas être lu par le chemin rapide
+        3. Extraction métadonnées Dublin Core (O(n) où n = nombre métadonnées)
 
         Métadonnées Dublin Core extraites :
         - dc:title : Titre
@@ -294,8 +422,8 @@ class MetadataExtractionService:
         - dc:date : Date publication
         - dc:description : Description
 
-        Complexité : O(n) où n est la taille du fichier EPUB.
-        La lecture complète de l'archive ZIP est nécessaire.
+        Complexité : O(m) sur le chemin rapide ; O(n) où n est la taille du
+        fichier EPUB en cas de repli sur ebooklib.
 
         Args:
             file_path: Chemin vers le fichier EPUB.
@@ -304,9 +432,14 @@ class MetadataExtractionService:
             Dictionnaire avec métadonnées extraites.
 
         Raises:
-            ImportError: Si ebooklib n'est pas disponible.
+            ImportError: Si le repli est nécessaire et qu'ebooklib n'est pas disponible.
             Exception: Si le fichier EPUB est corrompu ou invalide.
         """
+        try:
+            return self._opf_reader.read(file_path)
+        except OpfUnavailableError as e:
+            logger.debug(f"Chemin rapide OPF indisponible, repli ebooklib: {e}")
+
         if epub is None:
             raise ImportError(
                 "ebooklib requis pour extraction EPUB. " "Installer avec: pip install ebooklib"
@@ -812,3 +945,35 @@ class MetadataExtractionService:
         except Exception as e:
             logger.error(f"Erreur calcul checksums {file_path}: {e}", exc_info=True)
             raise Exception(f"Calcul checksums échoué: {e}") from e
+
+
+def _extract_one(path: str, calculate_checksums: bool | None, bounded: bool) -> dict[str, Any]:
+    """Extrait les métadonnées d'un fichier en isolant toute erreur (worker du pool).
+
+    Fonction de module (et non méthode) pour être sérialisable par pickle ;
+    l'instance de service est créée une fois par processus.
+
+    Args:
+        path: Chemin du fichier.
+        calculate_checksums: Si True, calcule SHA-256 et MD5 (None : selon bounded).
+        bounded: Si True, extraction PDF à coût borné.
+
+    Returns:
+        Dictionnaire path, success, metadata ou error, elapsed_ms.
+    """
+    global _worker_service  # noqa: PLW0603
+    if _worker_service is None:
+        _worker_service = MetadataExtractionService()
+
+    start = time.perf_counter()
+    result: dict[str, Any] = {"path": path}
+    try:
+        result["metadata"] = _worker_service.extract_metadata(
+            path, calculate_checksums=calculate_checksums, bounded=bounded
+        )
+        result["success"] = True
+    except Exception as e:
+        result["success"] = False
+        result["error"] = str(e)
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return result
@@ -0,0 +1,524 @@
+"""Service de lecture des fichiers NFO existants (READNFO).
+
+Ce service parse les fichiers NFO déjà publiés (ASCII art Scene, encodage
+CP437 ou UTF-8) pour en extraire les métadonnées (titre, auteur, ISBN,
+taille, dates) et les ramène au format produit par
+MetadataExtractionService._normalize_metadata. Il permet de compléter en
+masse le champ release_metadata d'un archivage existant.
+
+Algorithme général :
+1. Résolution du fichier NFO de chaque release (fichier .nfo, répertoire
+   de release ou répertoire parent du fichier eBook)
+2. Parsing ligne par ligne, tolérant aux décorations ASCII art (cadres,
+   blocs, points de conduite "Title ......: X")
+3. Normalisation via MetadataExtractionService (UTF-8, ISBN, dates ISO 8601)
+4. Parsing parallèle dans un pool de processus (I/O + regex hors du
+   processus Flask)
+5. Écriture des résultats par lots d'UPDATE (executemany par clé primaire)
+
+Complexité : O(n) où n est la taille cumulée des NFO lus, répartie sur
+`workers` processus. Les écritures en base sont en O(r / batch_size)
+transactions pour r releases.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import select, update
+
+from web.extensions import db
+from web.models import Release
+from web.services.metadata.metadata_extraction import MetadataExtractionService
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_BATCH_SIZE = 500
+POOL_MIN_ITEMS = 64  # En dessous, le coût de démarrage du pool domine
+POOL_CHUNK_SIZE = 64
+NFO_MAX_BYTES = 1024 * 1024  # Un NFO Scene dépasse rarement quelques Ko
+SQL_IN_CHUNK_SIZE = 900  # Limite de paramètres SQLite (999)
+LABEL_MAX_LENGTH = 24
+
+# Libellés NFO reconnus (minuscules, espaces normalisés) -> clé release_metadata
+NFO_FIELD_ALIASES: dict[str, str] = {
+    "title": "title",
+    "book": "title",
+    "book title": "title",
+    "author": "author",
+    "authors": "author",
+    "writer": "author",
+    "written by": "author",
+    "isbn": "isbn",
+    "isbn10": "isbn",
+    "isbn13": "isbn",
+    "isbn-10": "isbn",
+    "isbn-13": "isbn",
+    "publisher": "publisher",
+    "language": "language",
+    "lang": "language",
+    "format": "format",
+    "size": "size",
+    "file size": "size",
+    "filesize": "size",
+    "release size": "size",
+    "pages": "pages",
+    "year": "year",
+    "published": "publication_date",
+    "publication date": "publication_date",
+    "pub date": "publication_date",
+    "date": "release_date",
+    "rel date": "release_date",
+    "release date": "release_date",
+    "description": "description",
+}
+
+# Caractères décoratifs : tracés de cadres (U+2500-U+257F), blocs et carré plein (U+2580-U+25A0),
+# équivalents CP437 décodés et ASCII usuels des NFO
+ART_LEAD_PATTERN = re.compile(r"^[\s\W_]+")
+ART_TRAIL_PATTERN = re.compile(r"[\s─-■|*#=~+<>\[\]{}]+$")
+SEPARATOR_GAP_PATTERN = re.compile(r"\s+(?=[:\]>]|\.{2,})")
+FIELD_PATTERN = re.compile(
+    rf"^(?P<label>[A-Za-z][A-Za-z0-9 \-]{{0,{LABEL_MAX_LENGTH}}}?)"
+    r"\s*(?:\.{2,}\s*[:\]>]?|[:\]>])\s*(?P<value>\S.*)$"
+)
+SEGMENT_SPLIT_PATTERN = re.compile(r"\s{3,}|\s[─-■|]+\s")
+ISBN_FALLBACK_PATTERN = re.compile(r"ISBN(?:-?1[03])?\s*[:.]*\s*([0-9Xx][0-9Xx\- ]{8,16}[0-9Xx])")
+AUTHOR_SPLIT_PATTERN = re.compile(r"\s*(?:&|;|,|\band\b)\s*")
+SIZE_PATTERN = re.compile(r"([\d.,]+)\s*([KMGT]?i?B|bytes?)\b", re.IGNORECASE)
+DIGITS_PATTERN = re.compile(r"\d+")
+
+SIZE_UNITS: dict[str, int] = {
+    "b": 1,
+    "byte": 1,
+    "bytes": 1,
+    "kb": 1024,
+    "kib": 1024,
+    "mb": 1024**2,
+    "mib": 1024**2,
+    "gb": 1024**3,
+    "gib": 1024**3,
+    "tb": 1024**4,
+    "tib": 1024**4,
+}
+
+# Instance partagée par processus (workers du pool inclus)
+_extractor: MetadataExtractionService | None = None
+
+
+def _get_extractor() -> MetadataExtractionService:
+    """Retourne l'instance MetadataExtractionService du processus courant."""
+    global _extractor  # noqa: PLW0603
+    if _extractor is None:
+        _extractor = MetadataExtractionService()
+    return _extractor
+
+
+def _read_release_nfo(item: tuple[int, str | None]) -> tuple[int, str | None, Any]:
+    """Résout et parse le NFO d'une release (exécuté dans un worker du pool).
+
+    Fonction de module (et non méthode) pour être sérialisable par pickle.
+
+    Args:
+        item: Tuple (release_id, file_path de la release).
+
+    Returns:
+        Tuple (release_id, chemin NFO ou None, métadonnées | message d'erreur).
+        Les métadonnées sont un dict ; une erreur est une chaîne ; None
+        signifie qu'aucun NFO n'a été trouvé.
+    """
+    release_id, file_path = item
+    try:
+        nfo_path = NfoReaderService.resolve_nfo_path(file_path)
+        if nfo_path is None:
+            return release_id, None, None
+        return release_id, str(nfo_path), NfoReaderService().parse_file(nfo_path)
+    except (OSError, ValueError) as e:
+        return release_id, None, str(e)
+
+
+class NfoReaderService:
+    """Service de parsing des NFO et de backfill de release_metadata.
+
+    Ce service est le moteur des jobs READNFO. Il extrait les champs usuels
+    d'un NFO Scene quel que soit son habillage ASCII art :
+
+        ▓▒░ Title ......: Great Book          ░▒▓
+        │  Author  : John Doe & Jane Roe          │
+        [ ISBN ] 978-1-234-56789-7     Size ..: 2.4 MB
+
+    Formats de ligne supportés :
+    - "Label: valeur", "Label ....: valeur", "Label ...... valeur"
+    - "[ Label ] valeur", "Label > valeur"
+    - Plusieurs champs sur une même ligne (colonnes séparées par ≥ 3 espaces
+      ou par un trait vertical)
+
+    Le premier champ rencontré gagne (les NFO répètent souvent le titre dans
+    le footer). Sans champ ISBN explicite, une mention "ISBN ..." n'importe
+    où dans le texte est utilisée.
+
+    Exemple d'utilisation :
+        service = NfoReaderService()
+        metadata = service.parse_file(Path('Release-GRP.nfo'))
+        summary = service.backfill_releases(directory='/archive', workers=8)
+    """
+
+    def parse_file(self, nfo_path: Path | str) -> dict[str, Any]:
+        """Parse un fichier NFO.
+
+        Args:
+            nfo_path: Chemin du fichier NFO.
+
+        Returns:
+            Métadonnées normalisées (voir parse_content).
+
+        Raises:
+            FileNotFoundError: Si le fichier n'existe pas.
+            ValueError: Si le fichier dépasse NFO_MAX_BYTES.
+        """
+        nfo_path = Path(nfo_path)
+        with nfo_path.open("rb") as f:
+            raw = f.read(NFO_MAX_BYTES + 1)
+        if len(raw) > NFO_MAX_BYTES:
+            raise ValueError(f"Fichier NFO trop volumineux: {nfo_path}")
+        return self.parse_content(raw)
+
+    def parse_content(self, content: bytes | str) -> dict[str, Any]:
+        """Parse le contenu d'un NFO vers le format release_metadata.
+
+        Algorithme :
+        1. Décodage (UTF-8 strict, sinon CP437, l'encodage historique des NFO)
+        2. Pour chaque ligne : retrait des décorations de bord, découpage
+           en segments (colonnes), reconnaissance "libellé / valeur"
+        3. Repli ISBN sur une mention "ISBN" dans le texte brut
+        4. Conversion des valeurs (auteurs en liste, taille en octets,
+           pages/année en entiers)
+        5. Normalisation via MetadataExtractionService._normalize_metadata
+
+        Complexité : O(n) où n est la taille du NFO.
+
+        Args:
+            content: Contenu brut (bytes) ou déjà décodé.
+
+        Returns:
+            Dictionnaire avec les clés title, author (liste), publisher, isbn,
+            language, publication_date, description, plus format, file_size,
+            pages, year et release_date lorsqu'ils sont présents.
+        """
+        text = self._decode(content) if isinstance(content, bytes) else content
+        fields: dict[str, str] = {}
+
+        for line in text.splitlines():
+            for label, value in self._iter_line_fields(line):
+                key = NFO_FIELD_ALIASES.get(label)
+                if key and key not in fields:
+                    fields[key] = value
+
+        if "isbn" not in fields:
+            isbn_match = ISBN_FALLBACK_PATTERN.search(text)
+            if isbn_match:
+                fields["isbn"] = isbn_match.group(1)
+
+        metadata: dict[str, Any] = {
+            "title": fields.get("title"),
+            "author": self._split_authors(fields.get("author")),
+            "publisher": fields.get("publisher"),
+            "isbn": fields.get("isbn"),
+            "language": fields.get("language"),
+            "publication_date": fields.get("publication_date"),
+            "description": fields.get("description"),
+        }
+        if fields.get("format"):
+            metadata["format"] = fields["format"].split()[0].upper()
+        if fields.get("size"):
+            metadata["file_size"] = self._parse_size(fields["size"])
+        for key in ("pages", "year"):
+            number = DIGITS_PATTERN.search(fields.get(key) or "")
+            if number:
+                metadata[key] = int(number.group(0))
+
+        extractor = _get_extractor()
+        metadata = extractor._normalize_metadata(metadata)
+        if fields.get("release_date"):
+            metadata["release_date"] = extractor._normalize_date(fields["release_date"])
+        return metadata
+
+    @staticmethod
+    def resolve_nfo_path(file_path: Path | str | None) -> Path | None:
+        """Localise le fichier NFO associé au chemin d'une release.
+
+        Règles :
+        - Chemin se terminant par .nfo : utilisé tel quel
+        - Répertoire : premier fichier .nfo (ordre alphabétique) qu'il contient
+        - Autre fichier (eBook, ZIP) : premier .nfo de son répertoire parent
+
+        Complexité : O(k) où k est le nombre d'entrées du répertoire examiné
+        (un seul os.scandir, pas de stat supplémentaire).
+
+        Args:
+            file_path: Chemin enregistré sur la release (Release.file_path).
+
+        Returns:
+            Chemin du NFO ou None si introuvable.
+        """
+        if not file_path:
+            return None
+        path = Path(file_path)
+        if path.suffix.lower() == ".nfo":
+            return path if path.is_file() else None
+
+        directory = path if path.is_dir() else path.parent
+        if not directory.is_dir():
+            return None
+        with os.scandir(directory) as entries:
+            candidates = sorted(
+                entry.path
+                for entry in entries
+                if entry.name.lower().endswith(".nfo") and entry.is_file()
+            )
+        return Path(candidates[0]) if candidates else None
+
+    def read_many(
+        self, items: Iterable[tuple[int, str | None]], workers: int | None = None
+    ) -> Iterator[tuple[int, str | None, Any]]:
+        """Parse les NFO d'un ensemble de releases, en parallèle si utile.
+
+        Les résultats sont produits dans l'ordre des entrées. Le pool de
+        processus n'est démarré qu'au-delà de POOL_MIN_ITEMS entrées et si
+        workers > 1 ; sinon le parsing est fait dans le processus courant.
+
+        Args:
+            items: Tuples (release_id, file_path).
+            workers: Nombre de processus (défaut : os.cpu_count()).
+
+        Yields:
+            Tuples (release_id, chemin NFO, métadonnées | erreur | None),
+            voir _read_release_nfo.
+        """
+        items = list(items)
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(items) < POOL_MIN_ITEMS:
+            yield from map(_read_release_nfo, items)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(_read_release_nfo, items, chunksize=POOL_CHUNK_SIZE)
+
+    def backfill_releases(
+        self,
+        release_ids: Iterable[int] | None = None,
+        directory: Path | str | None = None,
+        **options: Any,
+    ) -> dict[str, Any]:
+        """Complète release_metadata pour une sélection de releases.
+
+        La sélection est soit une liste d'identifiants, soit toutes les
+        releases dont file_path est situé sous `directory`. Seuls (id,
+        file_path) sont chargés : aucune entité ORM n'est instanciée.
+
+        Args:
+            release_ids: Identifiants des releases à traiter.
+            directory: Répertoire d'archive (préfixe de Release.file_path).
+            **options: Transmis à backfill (workers, batch_size, overwrite,
+                on_batch).
+
+        Returns:
+            Résumé (voir backfill).
+
+        Raises:
+            ValueError: Si ni release_ids ni directory n'est fourni.
+        """
+        if release_ids is None and directory is None:
+            raise ValueError("release_ids ou directory requis")
+
+        items: list[tuple[int, str | None]] = []
+        if release_ids is not None:
+            ids = list(release_ids)
+            for start in range(0, len(ids), SQL_IN_CHUNK_SIZE):
+                chunk = ids[start : start + SQL_IN_CHUNK_SIZE]
+                rows = db.session.execute(
+                    select(Release.id, Release.file_path).where(Release.id.in_(chunk))
+                )
+                items.extend((row.id, row.file_path) for row in rows)
+        else:
+            prefix = str(Path(directory))
+            rows = db.session.execute(
+                select(Release.id, Release.file_path)
+                .where(Release.file_path.startswith(prefix, autoescape=True))
+                .order_by(Release.id)
+            )
+            items.extend((row.id, row.file_path) for row in rows)
+
+        return self.backfill(items, **options)
+
+    def backfill(
+        self,
+        items: Iterable[tuple[int, str | None]],
+        workers: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        overwrite: bool = False,
+        on_batch: Callable[[int, int], None] | None = None,
+    ) -> dict[str, Any]:
+        """Parse les NFO puis écrit release_metadata par lots d'UPDATE.
+
+        Algorithme :
+        1. Parsing parallèle (read_many), résultats consommés au fil de l'eau
+        2. Accumulation de `batch_size` résultats
+        3. Par lot : un SELECT des métadonnées existantes, fusion, un UPDATE
+           executemany par clé primaire, un commit
+
+        Politique de fusion : par défaut seules les clés absentes ou vides
+        sont complétées ; overwrite=True remplace les valeurs existantes.
+
+        Complexité : O(r) pour r releases, O(r / batch_size) transactions.
+
+        Args:
+            items: Tuples (release_id, file_path).
+            workers: Nombre de processus de parsing.
+            batch_size: Nombre de releases par UPDATE/commit.
+            overwrite: Remplacer les valeurs déjà présentes.
+            on_batch: Callback (traitées, total) appelé après chaque commit.
+
+        Returns:
+            Dictionnaire avec total, parsed, updated, missing, errors
+            (liste de {release_id, error}).
+        """
+        items = list(items)
+        total = len(items)
+        summary: dict[str, Any] = {
+            "total": total,
+            "parsed": 0,
+            "updated": 0,
+            "missing": 0,
+            "errors": [],
+        }
+        pending: dict[int, dict[str, Any]] = {}
+        done = 0
+
+        for release_id, nfo_path, result in self.read_many(items, workers):
+            done += 1
+            if isinstance(result, dict):
+                summary["parsed"] += 1
+                pending[release_id] = {**result, "nfo_path": nfo_path}
+            elif result is None:
+                summary["missing"] += 1
+            else:
+                summary["errors"].append({"release_id": release_id, "error": result})
+
+            if len(pending) >= batch_size:
+                summary["updated"] += self._write_batch(pending, overwrite)
+                pending = {}
+                if on_batch:
+                    on_batch(done, total)
+
+        if pending:
+            summary["updated"] += self._write_batch(pending, overwrite)
+        if on_batch and total:
+            on_batch(done, total)
+
+        return summary
+
+    def _write_batch(self, parsed: dict[int, dict[str, Any]], overwrite: bool) -> int:
+        """Fusionne et écrit un lot de métadonnées en un seul UPDATE.
+
+        Args:
+            parsed: Métadonnées parsées indexées par release_id.
+            overwrite: Remplacer les valeurs déjà présentes.
+
+        Returns:
+            Nombre de releases effectivement modifiées.
+        """
+        rows = db.session.execute(
+            select(Release.id, Release.release_metadata).where(Release.id.in_(list(parsed)))
+        )
+        params = []
+        for row in rows:
+            current = dict(row.release_metadata or {})
+            merged = self._merge(current, parsed[row.id], overwrite)
+            if merged != current:
+                params.append({"id": row.id, "release_metadata": merged})
+
+        if params:
+            db.session.execute(update(Release), params)
+        db.session.commit()
+        return len(params)
+
+    @staticmethod
+    def _merge(current: dict[str, Any], parsed: dict[str, Any], overwrite: bool) -> dict[str, Any]:
+        """Fusionne les métadonnées parsées dans les métadonnées existantes."""
+        merged = dict(current)
+        for key, value in parsed.items():
+            if value in (None, "", []):
+                continue
+            if overwrite or merged.get(key) in (None, "", []):
+                merged[key] = value
+        return merged
+
+    @staticmethod
+    def _decode(raw: bytes) -> str:
+        """Décode un NFO (UTF-8 strict, repli CP437 qui ne peut pas échouer)."""
+        try:
+            return raw.decode("utf-8")
+        except UnicodeDecodeError:
+            return raw.decode("cp437")
+
+    @staticmethod
+    def _iter_line_fields(line: str) -> Iterator[tuple[str, str]]:
+        """Extrait les paires (libellé normalisé, valeur) d'une ligne de NFO.
+
+        Les espaces d'alignement avant un séparateur ("Title     : X") sont
+        réduits avant le découpage en colonnes ; un segment qui n'est pas un
+        champ prolonge la valeur du champ précédent de la même ligne.
+        """
+        stripped = ART_TRAIL_PATTERN.sub("", ART_LEAD_PATTERN.sub("", line))
+        if not stripped:
+            return
+        current: list[str] | None = None
+        for segment in SEGMENT_SPLIT_PATTERN.split(SEPARATOR_GAP_PATTERN.sub(" ", stripped)):
+            match = FIELD_PATTERN.match(ART_LEAD_PATTERN.sub("", segment))
+            if match:
+                if current:
+                    yield current[0], current[1]
+                label = " ".join(match.group("label").lower().split())
+                value = ART_TRAIL_PATTERN.sub("", match.group("value"))
+                current = [label, value] if label in NFO_FIELD_ALIASES and value else None
+            elif current:
+                current[1] = f"{current[1]} {ART_TRAIL_PATTERN.sub('', segment.strip())}".strip()
+        if current:
+            yield current[0], current[1]
+
+    @staticmethod
+    def _split_authors(value: str | None) -> list[str]:
+        """Découpe une liste d'auteurs ("A & B", "A, B and C")."""
+        if not value:
+            return []
+        return [author for author in AUTHOR_SPLIT_PATTERN.split(value) if author]
+
+    @staticmethod
+    def _parse_size(value: str) -> int | None:
+        """Convertit une taille NFO ("2.4 MB", "1,234 KB", "512 bytes") en octets.
+
+        Une virgule suivie d'exactement trois chiffres (ou accompagnée d'un
+        point) est un séparateur de milliers, sinon un séparateur décimal.
+        """
+        match = SIZE_PATTERN.search(value)
+        if not match:
+            return None
+        number = match.group(1)
+        if "." in number or re.search(r",\d{3}(?!\d)", number):
+            number = number.replace(",", "")
+        else:
+            number = number.replace(",", ".")
+        try:
+            return int(float(number) * SIZE_UNITS[match.group(2).lower()])
+        except (ValueError, KeyError):
+            return None
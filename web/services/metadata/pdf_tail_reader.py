@@ -0,0 +1,726 @@
+"""Lecture à coût borné des métadonnées PDF depuis la fin du fichier.
+
+pypdf.PdfReader lit l'intégralité des tables xref (y compris les mises à jour
+incrémentales) dès sa construction et, sur un fichier endommagé, reconstruit
+la table en parcourant tout le fichier. Sur des PDF volumineux ou cassés, le
+coût d'extraction de quelques champs /Info devient imprévisible.
+
+Ce module implémente un lecteur minimal à budget strict :
+1. mmap du fichier, recherche de "startxref" dans le dernier Ko
+2. Lecture paresseuse de la section xref (table classique : accès direct à
+   l'entrée d'un objet par calcul d'offset ; flux xref : décodage d'un seul
+   flux), chaîne /Prev suivie uniquement si l'objet cherché est absent
+3. Lecture du dictionnaire /Info référencé par le trailer
+4. Lecture du flux XMP (/Root /Metadata) uniquement si /Info est incomplet
+5. Nombre de pages via /Root /Pages /Count, sans matérialiser les pages
+
+Chaque octet lu dans le mmap est décompté d'un budget ; le temps écoulé est
+contrôlé à chaque lecture. Aucune reconstruction de xref n'est tentée :
+un fichier dont la structure de fin est invalide est signalé, pas réparé.
+
+Complexité : O(1) en nombre d'objets du PDF pour une table xref classique,
+O(x) pour un flux xref de x entrées ; bornée dans tous les cas par
+max_bytes et time_budget.
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import re
+import time
+import xml.etree.ElementTree as ET
+import zlib
+from pathlib import Path
+from typing import Any, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# Constants
+PDF_DEFAULT_MAX_BYTES = 4 * 1024 * 1024  # Octets lus au plus par fichier
+PDF_DEFAULT_TIME_BUDGET = 2.0  # Secondes au plus par fichier
+TAIL_SIZE = 1024  # "startxref" doit figurer dans le dernier Ko (ISO 32000-1 §7.5.5)
+XREF_ENTRY_SIZE = 20  # Entrée de table xref classique : "nnnnnnnnnn ggggg n\r\n"
+OBJECT_WINDOW = 16 * 1024  # Fenêtre maximale lue pour un objet hors flux
+PNG_PREDICTOR_MIN = 10
+PNG_SUB, PNG_UP, PNG_AVERAGE, PNG_PAETH = 1, 2, 3, 4  # Types de filtre PNG par ligne
+XREF_IN_USE, XREF_COMPRESSED = 1, 2  # Types d'entrée d'un flux xref
+XREF_TABLE_FIELDS = 3  # offset, génération, n/f
+OCTAL_ESCAPE_DIGITS = 3
+
+WHITESPACE = b"\x00\t\n\x0c\r "
+DELIMITERS = b"()<>[]{}/%"
+NUMBER_PATTERN = re.compile(rb"[+-]?\d+")
+RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+XMP_NS = "http://ns.adobe.com/xap/1.0/"
+STRING_ESCAPES = {
+    ord("n"): b"\n",
+    ord("r"): b"\r",
+    ord("t"): b"\t",
+    ord("b"): b"\b",
+    ord("f"): b"\f",
+}
+
+
+class PdfBudgetExceededError(Exception):
+    """Exception levée lorsque le budget d'octets ou de temps est épuisé."""
+
+
+class PdfStructureError(ValueError):
+    """Exception levée lorsque la structure de fin du PDF est inexploitable."""
+
+
+class Ref(NamedTuple):
+    """Référence indirecte PDF (N G R)."""
+
+    num: int
+    gen: int
+
+
+class PdfTailReader:
+    """Lecteur de métadonnées PDF à budget d'octets et de temps strict.
+
+    Le résultat a la même forme que MetadataExtractionService._extract_pdf_metadata
+    (title, author, publisher, isbn, language, publication_date, description),
+    complété par :
+    - page_count : Valeur de /Pages /Count (None si illisible)
+    - extraction : Rapport de coût (timings par étape en ms, bytes_read,
+      xmp_loaded, complete, error)
+
+    Différence avec le mode pypdf : XMP ne complète que les champs absents de
+    /Info (il n'est lu que si /Info est incomplet) au lieu d'avoir priorité.
+
+    Exemple d'utilisation :
+        reader = PdfTailReader(max_bytes=1024 * 1024, time_budget=0.5)
+        result = reader.read(Path('book.pdf'))
+        if not result['extraction']['complete']:
+            print(result['extraction']['error'], result['extraction']['timings'])
+    """
+
+    def __init__(
+        self, max_bytes: int = PDF_DEFAULT_MAX_BYTES, time_budget: float = PDF_DEFAULT_TIME_BUDGET
+    ) -> None:
+        """Initialise le lecteur avec ses budgets.
+
+        Args:
+            max_bytes: Nombre maximal d'octets lus par fichier.
+            time_budget: Durée maximale de lecture par fichier (secondes).
+        """
+        self.max_bytes = max_bytes
+        self.time_budget = time_budget
+
+    def read(self, file_path: Path | str) -> dict[str, Any]:
+        """Lit /Info, XMP (si nécessaire) et le nombre de pages d'un PDF.
+
+        Les erreurs de structure et les dépassements de budget ne lèvent pas
+        d'exception : les champs déjà lus sont retournés et le rapport
+        extraction indique complete=False avec le motif.
+
+        Args:
+            file_path: Chemin vers le fichier PDF.
+
+        Returns:
+            Métadonnées, page_count et rapport extraction.
+
+        Raises:
+            OSError: Si le fichier ne peut pas être ouvert.
+        """
+        state = _ReadState(self.max_bytes, self.time_budget)
+        metadata: dict[str, Any] = {
+            "title": None,
+            "author": [],
+            "publisher": None,
+            "isbn": None,
+            "language": None,
+            "publication_date": None,
+            "description": None,
+            "page_count": None,
+        }
+        error: str | None = None
+
+        with Path(file_path).open("rb") as f:
+            if Path(file_path).stat().st_size == 0:
+                error = "Fichier vide"
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    try:
+                        self._read_document(_PdfDocument(buf, state), metadata, state)
+                    except (PdfBudgetExceededError, PdfStructureError) as e:
+                        error = str(e)
+                    except (ValueError, IndexError, KeyError, zlib.error, ET.ParseError) as e:
+                        error = f"Structure PDF invalide: {e}"
+
+        total_ms = (time.perf_counter() - state.started) * 1000
+        metadata["extraction"] = {
+            "mode": "bounded",
+            "timings": {**state.timings, "total_ms": round(total_ms, 3)},
+            "bytes_read": state.bytes_read,
+            "xmp_loaded": state.xmp_loaded,
+            "complete": error is None,
+            "error": error,
+        }
+        if error:
+            logger.warning(f"Extraction PDF bornée incomplète {file_path}: {error}")
+        return metadata
+
+    def _read_document(
+        self, document: _PdfDocument, metadata: dict[str, Any], state: _ReadState
+    ) -> None:
+        """Enchaîne les étapes de lecture en mesurant chacune."""
+        with state.step("xref_ms"):
+            trailer = document.load_trailer()
+        if "Encrypt" in trailer:
+            raise PdfStructureError("PDF chiffré : chaînes /Info illisibles sans déchiffrement")
+
+        with state.step("info_ms"):
+            info = document.resolve(trailer.get("Info"))
+            if isinstance(info, dict):
+                self._apply_info(info, metadata)
+
+        root = document.resolve(trailer.get("Root"))
+        if not isinstance(root, dict):
+            raise PdfStructureError("Catalogue /Root introuvable")
+
+        if not metadata["title"] or not metadata["author"]:
+            with state.step("xmp_ms"):
+                xmp = document.resolve_stream(root.get("Metadata"))
+                if xmp is not None:
+                    state.xmp_loaded = True
+                    self._apply_xmp(xmp, metadata)
+
+        with state.step("pages_ms"):
+            pages = document.resolve(root.get("Pages"))
+            if isinstance(pages, dict) and isinstance(document.resolve(pages.get("Count")), int):
+                metadata["page_count"] = document.resolve(pages.get("Count"))
+
+    def _apply_info(self, info: dict[str, Any], metadata: dict[str, Any]) -> None:
+        """Reporte les champs du dictionnaire /Info (mêmes règles que le mode pypdf)."""
+        title = _decode_text(info.get("Title"))
+        author = _decode_text(info.get("Author"))
+        subject = _decode_text(info.get("Subject"))
+        date = _decode_text(info.get("CreationDate")) or _decode_text(info.get("ModDate"))
+
+        if title:
+            metadata["title"] = title
+        if author:
+            metadata["author"] = (
+                [a.strip() for a in author.split(",")] if "," in author else [author]
+            )
+        if subject:
+            metadata["description"] = subject
+        if date:
+            metadata["publication_date"] = date
+
+    def _apply_xmp(self, xmp: bytes, metadata: dict[str, Any]) -> None:
+        """Complète les champs absents depuis le paquet XMP (dc:*, xmp:CreateDate)."""
+        root = ET.fromstring(xmp.strip(b"\x00 \r\n\t"))
+
+        def items(name: str) -> list[str]:
+            values: list[str] = []
+            for element in root.iter(f"{{{DC_NS}}}{name}"):
+                lis = list(element.iter(f"{{{RDF_NS}}}li")) or [element]
+                values.extend((li.text or "").strip() for li in lis if (li.text or "").strip())
+            return values
+
+        if not metadata["title"] and items("title"):
+            metadata["title"] = items("title")[0]
+        if not metadata["author"]:
+            metadata["author"] = items("creator")
+        if not metadata["description"] and items("description"):
+            metadata["description"] = items("description")[0]
+        if not metadata["publication_date"]:
+            for description in root.iter(f"{{{RDF_NS}}}Description"):
+                create_date = description.get(f"{{{XMP_NS}}}CreateDate") or next(
+                    (e.text for e in description.iter(f"{{{XMP_NS}}}CreateDate")), None
+                )
+                if create_date:
+                    metadata["publication_date"] = create_date.strip()
+                    break
+
+
+class _ReadState:
+    """Comptabilité des budgets et des durées d'une lecture."""
+
+    def __init__(self, max_bytes: int, time_budget: float) -> None:
+        self.max_bytes = max_bytes
+        self.time_budget = time_budget
+        self.started = time.perf_counter()
+        self.bytes_read = 0
+        self.timings: dict[str, float] = {}
+        self.xmp_loaded = False
+
+    def charge(self, size: int) -> None:
+        """Décompte `size` octets et vérifie les deux budgets.
+
+        Raises:
+            PdfBudgetExceededError: Si un budget est épuisé.
+        """
+        self.bytes_read += size
+        if self.bytes_read > self.max_bytes:
+            raise PdfBudgetExceededError(
+                f"Budget d'octets dépassé ({self.bytes_read} > {self.max_bytes})"
+            )
+        if time.perf_counter() - self.started > self.time_budget:
+            raise PdfBudgetExceededError(f"Budget de temps dépassé ({self.time_budget}s)")
+
+    def step(self, name: str) -> _StepTimer:
+        """Retourne un context manager mesurant la durée d'une étape."""
+        return _StepTimer(self.timings, name)
+
+
+class _StepTimer:
+    """Context manager accumulant la durée d'une étape dans timings (ms)."""
+
+    def __init__(self, timings: dict[str, float], name: str) -> None:
+        self.timings = timings
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        elapsed = (time.perf_counter() - self.start) * 1000
+        self.timings[self.name] = round(self.timings.get(self.name, 0.0) + elapsed, 3)
+
+
+class _PdfDocument:
+    """Accès paresseux aux objets d'un PDF mappé en mémoire."""
+
+    def __init__(self, buf: mmap.mmap, state: _ReadState) -> None:
+        self.buf = buf
+        self.size = len(buf)
+        self.state = state
+        self.sections: list[_XrefSection] = []
+        self.next_section_offset: int | None = None
+        self.object_streams: dict[int, tuple[bytes, list[tuple[int, int]], int]] = {}
+
+    def read(self, start: int, end: int) -> bytes:
+        """Lit une plage du mmap en la décomptant du budget."""
+        start = max(0, start)
+        end = min(self.size, end)
+        self.state.charge(end - start)
+        return self.buf[start:end]
+
+    def load_trailer(self) -> dict[str, Any]:
+        """Localise startxref et charge la section xref la plus récente.
+
+        Returns:
+            Dictionnaire trailer (ou dictionnaire du flux xref).
+
+        Raises:
+            PdfStructureError: Si startxref ou la section xref est invalide.
+        """
+        tail = self.read(self.size - TAIL_SIZE, self.size)
+        index = tail.rfind(b"startxref")
+        if index < 0:
+            raise PdfStructureError("Mot-clé startxref absent de la fin du fichier")
+        match = NUMBER_PATTERN.search(tail, index + len(b"startxref"))
+        if not match:
+            raise PdfStructureError("Offset startxref invalide")
+        self.next_section_offset = int(match.group(0))
+        section = self._load_next_section()
+        if section is None:
+            raise PdfStructureError("Section xref introuvable")
+        return section.trailer
+
+    def _load_next_section(self) -> _XrefSection | None:
+        """Charge la section xref suivante de la chaîne /Prev (ou None)."""
+        offset = self.next_section_offset
+        if offset is None:
+            return None
+        if not 0 <= offset < self.size:
+            raise PdfStructureError(f"Offset xref hors fichier: {offset}")
+
+        head = self.read(offset, offset + 4)
+        if head == b"xref":
+            section: _XrefSection = _XrefTable(self, offset)
+        else:
+            section = _XrefStream(self, offset)
+        self.sections.append(section)
+
+        prev = section.trailer.get("Prev")
+        self.next_section_offset = prev if isinstance(prev, int) else None
+        xref_stm = section.trailer.get("XRefStm")
+        if isinstance(xref_stm, int):
+            # Fichier hybride : le flux xref complète la table classique
+            self.sections.append(_XrefStream(self, xref_stm))
+        return section
+
+    def _lookup(self, num: int) -> tuple[int, int, int] | None:
+        """Retourne l'entrée xref d'un objet, en suivant /Prev si nécessaire.
+
+        Returns:
+            (1, offset, 0) pour un objet non compressé, (2, numéro du flux
+            d'objets, index) pour un objet compressé, ou None si l'objet est
+            libre ou absent.
+        """
+        index = 0
+        while True:
+            while index < len(self.sections):
+                entry = self.sections[index].lookup(num)
+                if entry is not None:
+                    return entry
+                index += 1
+            if self._load_next_section() is None:
+                return None
+
+    def resolve(self, value: Any) -> Any:
+        """Résout une référence indirecte (les autres valeurs sont retournées telles quelles)."""
+        if not isinstance(value, Ref):
+            return value
+        obj, _stream_start = self.get_object(value)
+        return obj
+
+    def resolve_stream(self, value: Any) -> bytes | None:
+        """Résout une référence vers un flux et retourne ses données décodées."""
+        if not isinstance(value, Ref):
+            return None
+        obj, stream_start = self.get_object(value)
+        if not isinstance(obj, dict) or stream_start is None:
+            return None
+        return self.stream_data(obj, stream_start)
+
+    def get_object(self, ref: Ref) -> tuple[Any, int | None]:
+        """Lit un objet indirect.
+
+        Returns:
+            Tuple (objet, début des données de flux ou None).
+
+        Raises:
+            PdfStructureError: Si l'objet est absent ou mal formé.
+        """
+        entry = self._lookup(ref.num)
+        if entry is None:
+            raise PdfStructureError(f"Objet {ref.num} absent de la table xref")
+        kind, location, index = entry
+        if kind == XREF_COMPRESSED:
+            return self._get_compressed_object(location, index), None
+
+        window = self.read(location, location + OBJECT_WINDOW)
+        parser = _Parser(window)
+        num, gen = parser.parse(), parser.parse()
+        if (num, gen) != (ref.num, ref.gen) or not parser.keyword(b"obj"):
+            raise PdfStructureError(f"En-tête d'objet {ref.num} invalide à l'offset {location}")
+        obj = parser.parse()
+        stream_start = None
+        if isinstance(obj, dict) and parser.keyword(b"stream"):
+            stream_start = location + parser.pos
+            if window[parser.pos : parser.pos + 2] == b"\r\n":
+                stream_start += 2
+            elif window[parser.pos : parser.pos + 1] in (b"\n", b"\r"):
+                stream_start += 1
+        return obj, stream_start
+
+    def stream_data(self, stream_dict: dict[str, Any], start: int) -> bytes:
+        """Lit et décode (FlateDecode uniquement) les données d'un flux."""
+        length = self.resolve(stream_dict.get("Length"))
+        if not isinstance(length, int) or length < 0:
+            raise PdfStructureError("Longueur de flux invalide")
+        data = self.read(start, start + length)
+
+        filters = self.resolve(stream_dict.get("Filter"))
+        filters = filters if isinstance(filters, list) else [filters] if filters else []
+        for name in filters:
+            if name != "FlateDecode":
+                raise PdfStructureError(f"Filtre de flux non supporté: {name}")
+            decompressor = zlib.decompressobj()
+            remaining = self.state.max_bytes - self.state.bytes_read
+            data = decompressor.decompress(data, max(remaining, 1))
+            if decompressor.unconsumed_tail:
+                raise PdfBudgetExceededError("Budget d'octets dépassé (décompression)")
+            self.state.charge(len(data))
+
+        params = self.resolve(stream_dict.get("DecodeParms"))
+        if isinstance(params, dict):
+            data = _apply_png_predictor(data, params)
+        return data
+
+    def _get_compressed_object(self, stream_num: int, index: int) -> Any:
+        """Lit l'objet `index` d'un flux d'objets (ObjStm), décodé une seule fois."""
+        if stream_num not in self.object_streams:
+            stream_dict, start = self.get_object(Ref(stream_num, 0))
+            if not isinstance(stream_dict, dict) or start is None:
+                raise PdfStructureError(f"Flux d'objets {stream_num} invalide")
+            data = self.stream_data(stream_dict, start)
+            count = self.resolve(stream_dict.get("N"))
+            first = self.resolve(stream_dict.get("First"))
+            parser = _Parser(data[:first])
+            header = [(parser.parse(), parser.parse()) for _ in range(count)]
+            self.object_streams[stream_num] = (data, header, first)
+
+        data, header, first = self.object_streams[stream_num]
+        _num, offset = header[index]
+        return _Parser(data, first + offset).parse()
+
+
+class _XrefSection:
+    """Section xref : trailer et résolution d'entrées."""
+
+    trailer: dict[str, Any]
+
+    def lookup(self, num: int) -> tuple[int, int, int] | None:
+        """Retourne (type, offset ou numéro de flux, index) ou None."""
+        raise NotImplementedError
+
+
+class _XrefTable(_XrefSection):
+    """Table xref classique : entrées à taille fixe, accès direct par calcul."""
+
+    def __init__(self, document: _PdfDocument, offset: int) -> None:
+        self.document = document
+        self.subsections: list[tuple[int, int, int]] = []  # (premier objet, nombre, offset)
+        position = offset + len(b"xref")
+        while True:
+            window = document.read(position, position + 64)
+            parser = _Parser(window)
+            if parser.keyword(b"trailer"):
+                trailer_window = document.read(position + parser.pos, position + OBJECT_WINDOW)
+                trailer = _Parser(trailer_window).parse()
+                if not isinstance(trailer, dict):
+                    raise PdfStructureError("Dictionnaire trailer invalide")
+                self.trailer = trailer
+                return
+            first, count = parser.parse(), parser.parse()
+            if not isinstance(first, int) or not isinstance(count, int):
+                raise PdfStructureError(f"En-tête de sous-section xref invalide à {position}")
+            parser.skip_whitespace()
+            entries_offset = position + parser.pos
+            self.subsections.append((first, count, entries_offset))
+            position = entries_offset + count * XREF_ENTRY_SIZE
+
+    def lookup(self, num: int) -> tuple[int, int, int] | None:
+        for first, count, entries_offset in self.subsections:
+            if first <= num < first + count:
+                start = entries_offset + (num - first) * XREF_ENTRY_SIZE
+                entry = self.document.read(start, start + XREF_ENTRY_SIZE).split()
+                if len(entry) >= XREF_TABLE_FIELDS and entry[2] == b"n":
+                    return XREF_IN_USE, int(entry[0]), 0
+                return None
+        return None
+
+
+class _XrefStream(_XrefSection):
+    """Flux xref (PDF 1.5+) : un seul flux décodé, entrées binaires /W."""
+
+    def __init__(self, document: _PdfDocument, offset: int) -> None:
+        window = document.read(offset, offset + OBJECT_WINDOW)
+        parser = _Parser(window)
+        parser.parse(), parser.parse()
+        if not parser.keyword(b"obj"):
+            raise PdfStructureError(f"Flux xref invalide à l'offset {offset}")
+        stream_dict = parser.parse()
+        if not isinstance(stream_dict, dict) or not parser.keyword(b"stream"):
+            raise PdfStructureError(f"Flux xref invalide à l'offset {offset}")
+        start = offset + parser.pos
+        start += 2 if window[parser.pos : parser.pos + 2] == b"\r\n" else 1
+
+        self.trailer = stream_dict
+        self.data = document.stream_data(stream_dict, start)
+        self.widths = [int(w) for w in stream_dict.get("W", [])]
+        index = stream_dict.get("Index") or [0, stream_dict.get("Size", 0)]
+        self.ranges = list(zip(index[::2], index[1::2], strict=False))
+
+    def lookup(self, num: int) -> tuple[int, int, int] | None:
+        row_size = sum(self.widths)
+        row = 0
+        for first, count in self.ranges:
+            if first <= num < first + count:
+                start = (row + num - first) * row_size
+                fields = []
+                for width in self.widths:
+                    fields.append(int.from_bytes(self.data[start : start + width], "big"))
+                    start += width
+                kind = fields[0] if self.widths[0] else XREF_IN_USE
+                if kind in (XREF_IN_USE, XREF_COMPRESSED):
+                    return kind, fields[1], fields[2] if kind == XREF_COMPRESSED else 0
+                return None
+            row += count
+        return None
+
+
+class _Parser:
+    """Analyseur minimal d'objets PDF (dictionnaires, tableaux, chaînes, nombres, refs)."""
+
+    def __init__(self, data: bytes, pos: int = 0) -> None:
+        self.data = data
+        self.pos = pos
+
+    def skip_whitespace(self) -> None:
+        """Avance après les blancs et commentaires."""
+        data = self.data
+        while self.pos < len(data):
+            char = data[self.pos]
+            if char in WHITESPACE:
+                self.pos += 1
+            elif char == ord("%"):
+                while self.pos < len(data) and data[self.pos] not in b"\r\n":
+                    self.pos += 1
+            else:
+                return
+
+    def keyword(self, word: bytes) -> bool:
+        """Consomme un mot-clé s'il est présent à la position courante."""
+        self.skip_whitespace()
+        if self.data.startswith(word, self.pos):
+            self.pos += len(word)
+            return True
+        return False
+
+    def _token(self) -> bytes:
+        start = self.pos
+        while (
+            self.pos < len(self.data)
+            and self.data[self.pos] not in WHITESPACE
+            and self.data[self.pos] not in DELIMITERS
+        ):
+            self.pos += 1
+        return self.data[start : self.pos]
+
+    def parse(self) -> Any:  # noqa: PLR0911, PLR0912
+        """Analyse l'objet à la position courante.
+
+        Returns:
+            dict (clés sans "/"), list, bytes (chaîne), str (nom), int, float,
+            bool, None ou Ref.
+
+        Raises:
+            PdfStructureError: Si la fin des données est atteinte.
+        """
+        self.skip_whitespace()
+        if self.pos >= len(self.data):
+            raise PdfStructureError("Fin de données inattendue")
+        data = self.data
+        char = data[self.pos]
+
+        if data.startswith(b"<<", self.pos):
+            self.pos += 2
+            result: dict[str, Any] = {}
+            while not self.keyword(b">>"):
+                key = self.parse()
+                result[str(key)] = self.parse()
+            return result
+        if char == ord("<"):
+            end = data.index(b">", self.pos)
+            hex_digits = bytes(c for c in data[self.pos + 1 : end] if c not in WHITESPACE)
+            self.pos = end + 1
+            return bytes.fromhex((hex_digits + b"0" * (len(hex_digits) % 2)).decode())
+        if char == ord("["):
+            self.pos += 1
+            items = []
+            while not self.keyword(b"]"):
+                items.append(self.parse())
+            return items
+        if char == ord("("):
+            return self._literal_string()
+        if char == ord("/"):
+            self.pos += 1
+            return re.sub(
+                rb"#([0-9A-Fa-f]{2})", lambda m: bytes([int(m.group(1), 16)]), self._token()
+            ).decode("latin-1")
+
+        token = self._token()
+        if not token:
+            raise PdfStructureError(f"Caractère inattendu: {chr(char)!r}")
+        if token == b"true":
+            return True
+        if token == b"false":
+            return False
+        if token == b"null":
+            return None
+        if NUMBER_PATTERN.fullmatch(token):
+            number = int(token)
+            saved = self.pos
+            self.skip_whitespace()
+            gen_token = self._token()
+            if gen_token.isdigit() and self.keyword(b"R"):
+                return Ref(number, int(gen_token))
+            self.pos = saved
+            return number
+        try:
+            return float(token)
+        except ValueError:
+            return token.decode("latin-1")
+
+    def _literal_string(self) -> bytes:
+        """Analyse une chaîne littérale (parenthèses imbriquées, échappements)."""
+        data = self.data
+        self.pos += 1
+        depth = 1
+        out = bytearray()
+        while depth:
+            char = data[self.pos]
+            self.pos += 1
+            if char == ord("\\"):
+                escaped = data[self.pos]
+                self.pos += 1
+                if escaped in STRING_ESCAPES:
+                    out += STRING_ESCAPES[escaped]
+                elif escaped in b"01234567":
+                    digits = bytes([escaped])
+                    while len(digits) < OCTAL_ESCAPE_DIGITS and data[self.pos] in b"01234567":
+                        digits += bytes([data[self.pos]])
+                        self.pos += 1
+                    out.append(int(digits, 8) & 0xFF)
+                elif escaped in b"\r\n":
+                    if escaped == ord("\r") and data[self.pos] == ord("\n"):
+                        self.pos += 1
+                else:
+                    out.append(escaped)
+                continue
+            if char == ord("("):
+                depth += 1
+            elif char == ord(")"):
+                depth -= 1
+                if not depth:
+                    break
+            out.append(char)
+        return bytes(out)
+
+
+def _decode_text(value: Any) -> str | None:
+    """Décode une chaîne texte PDF (UTF-16BE avec BOM, UTF-8 avec BOM, sinon PDFDocEncoding)."""
+    if not isinstance(value, bytes) or not value:
+        return None
+    if value.startswith(b"\xfe\xff"):
+        text = value[2:].decode("utf-16-be", errors="replace")
+    elif value.startswith(b"\xef\xbb\xbf"):
+        text = value[3:].decode("utf-8", errors="replace")
+    else:
+        # PDFDocEncoding coïncide avec Latin-1 pour les caractères imprimables usuels
+        text = value.decode("latin-1")
+    return text.strip("\x00 ") or None
+
+
+def _apply_png_predictor(data: bytes, params: dict[str, Any]) -> bytes:
+    """Annule un prédicteur PNG (/Predictor ≥ 10) sur des lignes de /Columns octets."""
+    predictor = params.get("Predictor", 1)
+    if not isinstance(predictor, int) or predictor < PNG_PREDICTOR_MIN:
+        return data
+    columns = int(params.get("Columns", 1))
+    bpp = 1
+    row_size = columns + 1
+    previous = bytearray(columns)
+    out = bytearray()
+    for start in range(0, len(data) - row_size + 1, row_size):
+        filter_type = data[start]
+        row = bytearray(data[start + 1 : start + row_size])
+        for i in range(columns):
+            left = row[i - bpp] if i >= bpp else 0
+            up = previous[i]
+            up_left = previous[i - bpp] if i >= bpp else 0
+            if filter_type == PNG_SUB:
+                row[i] = (row[i] + left) & 0xFF
+            elif filter_type == PNG_UP:
+                row[i] = (row[i] + up) & 0xFF
+            elif filter_type == PNG_AVERAGE:
+                row[i] = (row[i] + (left + up) // 2) & 0xFF
+            elif filter_type == PNG_PAETH:
+                p = left + up - up_left
+                pa, pb, pc = abs(p - left), abs(p - up), abs(p - up_left)
+                predictor_value = left if pa <= pb and pa <= pc else up if pb <= pc else up_left
+                row[i] = (row[i] + predictor_value) & 0xFF
+        out += row
+        previous = row
+    return bytes(out)
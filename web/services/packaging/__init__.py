@@ -1,6 +1,14 @@
 """Services packaging - Génération packages Scene et fichiers NFO."""
 
+from web.services.packaging.disk_space import DiskSpaceLedger, InsufficientDiskSpaceError
 from web.services.packaging.nfo_generator import NfoGeneratorService
 from web.services.packaging.packaging_service import PackagingService
+from web.services.packaging.staging import StagingService
 
-__all__ = ["NfoGeneratorService", "PackagingService"]
+__all__ = [
+    "DiskSpaceLedger",
+    "InsufficientDiskSpaceError",
+    "NfoGeneratorService",
+    "PackagingService",
+    "StagingService",
+]
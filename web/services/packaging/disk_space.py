@@ -0,0 +1,331 @@
+"""Préflight espace disque et registre partagé de réservations.
+
+Ce module évite de découvrir un disque plein au milieu de l'écriture d'un ZIP
+de plusieurs Go : la taille de sortie est estimée depuis les entrées et la
+politique de compression, puis réservée dans un registre partagé par tous les
+workers d'une même machine avant de commencer le packaging.
+
+Architecture :
+- estimate_package_size() : borne supérieure des octets écrits (staging hors
+  système de fichiers de sortie, NFO, ZIP dans le pire cas de compression)
+- DiskSpaceLedger : fichier JSON protégé par fcntl.flock, réservations
+  indexées par clé (chemin du ZIP) et par périphérique (st_dev) ; une
+  réservation est accordée si espace libre - réservations en cours -
+  marge minimale >= taille demandée
+- Les réservations de processus morts ou plus anciennes que le TTL sont purgées
+
+Complexité : O(r) par réservation où r est le nombre de réservations actives.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import errno
+import json
+import logging
+import os
+import shutil
+import time
+import zipfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - plateformes sans fcntl (Windows)
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+logger = logging.getLogger(__name__)
+
+# Surcoût ZIP par membre : en-tête local (30) + entrée centrale (46) + extra
+# ZIP64 (2 x 28) ; le nom du membre est compté deux fois en plus
+ZIP_MEMBER_OVERHEAD = 30 + 46 + 2 * 28
+
+# Enregistrements de fin de répertoire central (EOCD + ZIP64 EOCD + locator)
+ZIP_END_OVERHEAD = 22 + 56 + 20
+
+# Longueur maximale d'un nom de membre (nom du NFO, inconnu de l'estimation)
+MAX_MEMBER_NAME_BYTES = 255
+
+# Expansion maximale de deflate : 5 octets par bloc stocké de 16 Kio + 6 (zlib)
+DEFLATE_BLOCK_SIZE = 16383
+DEFLATE_BLOCK_OVERHEAD = 5
+
+# Durée de vie maximale d'une réservation (secondes) avant purge
+DEFAULT_RESERVATION_TTL = 6 * 3600
+
+# Marge d'espace libre conservée sur chaque volume
+DEFAULT_MIN_FREE_BYTES = 256 * 1024 * 1024
+
+
+class InsufficientDiskSpaceError(OSError):
+    """Espace disque insuffisant pour satisfaire une réservation."""
+
+    def __init__(self, message: str, required: int, available: int) -> None:
+        """Initialise l'erreur (errno ENOSPC).
+
+        Args:
+            message: Message explicite.
+            required: Octets demandés.
+            available: Octets encore réservables.
+        """
+        super().__init__(errno.ENOSPC, message)
+        self.required = required
+        self.available = available
+
+
+def estimate_package_size(
+    files: list[tuple[Path, str]],
+    output_path: Path,
+    compression: int = zipfile.ZIP_DEFLATED,
+    nfo_size: int = 0,
+) -> int:
+    """Estime une borne supérieure des octets écrits par un packaging.
+
+    Algorithme :
+    1. Staging : taille des sources situées sur un autre périphérique que
+       output_path (sur le même périphérique, hardlink/reflink : 0 octet)
+    2. NFO : écrit une fois dans la structure
+    3. ZIP : pour chaque membre, taille + surcoût d'en-têtes ; en deflate,
+       expansion maximale des blocs incompressibles (déjà compressés : EPUB, PDF)
+
+    Complexité : O(f) où f est le nombre de fichiers (un stat par fichier).
+
+    Args:
+        files: Couples (chemin source, nom du membre).
+        output_path: Répertoire de sortie du package.
+        compression: ZIP_DEFLATED ou ZIP_STORED.
+        nfo_size: Taille du NFO en octets.
+
+    Returns:
+        Nombre d'octets à réserver.
+    """
+    output_dev = _device_of(output_path)
+    staging = 0
+    members = [("n" * MAX_MEMBER_NAME_BYTES, nfo_size)]
+    for source, name in files:
+        stat = source.stat()
+        if stat.st_dev != output_dev:
+            staging += stat.st_size
+        members.append((name, stat.st_size))
+
+    zip_size = ZIP_END_OVERHEAD
+    for name, size in members:
+        zip_size += size + ZIP_MEMBER_OVERHEAD + 2 * len(name.encode("utf-8"))
+        if compression == zipfile.ZIP_DEFLATED:
+            zip_size += DEFLATE_BLOCK_OVERHEAD * (size // DEFLATE_BLOCK_SIZE + 1) + 6
+
+    return staging + nfo_size + zip_size
+
+
+def _device_of(path: Path) -> int:
+    """Retourne le st_dev du chemin ou de son premier parent existant.
+
+    Args:
+        path: Chemin (éventuellement pas encore créé).
+
+    Returns:
+        Identifiant du périphérique.
+    """
+    for candidate in (path, *path.parents):
+        with contextlib.suppress(FileNotFoundError):
+            return candidate.stat().st_dev
+    return Path.cwd().stat().st_dev  # pragma: no cover
+
+
+def _existing_dir(path: Path) -> Path:
+    """Retourne le chemin ou son premier parent existant (pour disk_usage)."""
+    for candidate in (path, *path.parents):
+        if candidate.exists():
+            return candidate
+    return Path.cwd()  # pragma: no cover
+
+
+class DiskSpaceLedger:
+    """Registre de réservations d'espace disque partagé entre workers.
+
+    Le registre est un petit fichier JSON verrouillé par fcntl.flock : tous
+    les processus d'une même machine (workers gunicorn, jobs) qui pointent
+    vers le même fichier voient les mêmes réservations.
+
+    Pièges potentiels :
+    - Une réservation reste comptée pendant toute l'écriture du package alors
+      que l'espace libre diminue déjà : l'estimation est volontairement
+      conservatrice (pas de sur-allocation, au prix de jobs parfois retenus)
+    - Le registre n'est partagé qu'entre processus voyant le même fichier
+      (même machine ou stockage partagé supportant flock)
+
+    Exemple d'utilisation :
+        ledger = DiskSpaceLedger(Path("/var/lib/packer/ledger.json"))
+        with ledger.reservation("/out/Release.zip", Path("/out"), 20 * 1024**3):
+            ...  # packaging
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        min_free_bytes: int = DEFAULT_MIN_FREE_BYTES,
+        ttl: float = DEFAULT_RESERVATION_TTL,
+    ) -> None:
+        """Initialise le registre.
+
+        Args:
+            path: Fichier JSON du registre (créé si absent).
+            min_free_bytes: Marge d'espace libre jamais réservée.
+            ttl: Âge maximal d'une réservation en secondes.
+        """
+        self.path = path
+        self.min_free_bytes = min_free_bytes
+        self.ttl = ttl
+
+    @classmethod
+    def from_config(cls, config: Any) -> DiskSpaceLedger:
+        """Construit le registre depuis la configuration Flask.
+
+        Args:
+            config: app.config (PACKAGING_LEDGER_PATH, PACKAGING_MIN_FREE_BYTES,
+                PACKAGING_RESERVATION_TTL).
+
+        Returns:
+            Instance de DiskSpaceLedger.
+        """
+        return cls(
+            Path(config.get("PACKAGING_LEDGER_PATH")),
+            min_free_bytes=int(config.get("PACKAGING_MIN_FREE_BYTES", DEFAULT_MIN_FREE_BYTES)),
+            ttl=float(config.get("PACKAGING_RESERVATION_TTL", DEFAULT_RESERVATION_TTL)),
+        )
+
+    def reserve(self, key: str, target: Path, nbytes: int) -> bool:
+        """Réserve de l'espace sur le volume de target.
+
+        Algorithme :
+        1. Verrou exclusif sur le registre
+        2. Purge des réservations expirées ou de processus morts
+        3. Si key est déjà réservée : réservation réutilisée (False)
+        4. Disponible = libre - réservations du même périphérique - marge
+        5. Refus (InsufficientDiskSpaceError) ou enregistrement (True)
+
+        Args:
+            key: Identifiant unique de la réservation (ex : chemin du ZIP).
+            target: Répertoire de sortie (périphérique concerné).
+            nbytes: Octets à réserver.
+
+        Returns:
+            True si la réservation a été créée, False si key existait déjà.
+
+        Raises:
+            InsufficientDiskSpaceError: Si l'espace disponible est insuffisant.
+        """
+        device = _device_of(target)
+        with self._locked() as entries:
+            if key in entries:
+                return False
+            reserved = sum(entry["bytes"] for entry in entries.values() if entry["dev"] == device)
+            free = shutil.disk_usage(_existing_dir(target)).free
+            available = free - reserved - self.min_free_bytes
+            if nbytes > available:
+                raise InsufficientDiskSpaceError(
+                    f"Espace insuffisant sur {target}: {nbytes} octets demandés, "
+                    f"{max(available, 0)} disponibles ({reserved} déjà réservés)",
+                    required=nbytes,
+                    available=max(available, 0),
+                )
+            entries[key] = {
+                "bytes": nbytes,
+                "dev": device,
+                "pid": os.getpid(),
+                "created_at": time.time(),
+            }
+        logger.info(f"Espace réservé: {nbytes} octets pour {key}")
+        return True
+
+    def release(self, key: str) -> None:
+        """Libère une réservation (sans effet si elle n'existe pas).
+
+        Args:
+            key: Identifiant de la réservation.
+        """
+        with self._locked() as entries:
+            entries.pop(key, None)
+
+    def reserved_bytes(self, target: Path) -> int:
+        """Retourne le total réservé sur le volume de target.
+
+        Args:
+            target: Chemin situé sur le volume concerné.
+
+        Returns:
+            Octets réservés (réservations actives uniquement).
+        """
+        device = _device_of(target)
+        with self._locked() as entries:
+            return sum(entry["bytes"] for entry in entries.values() if entry["dev"] == device)
+
+    @contextlib.contextmanager
+    def reservation(self, key: str, target: Path, nbytes: int) -> Iterator[bool]:
+        """Réserve pendant la durée du bloc ; libère seulement si créée ici.
+
+        Args:
+            key: Identifiant de la réservation.
+            target: Répertoire de sortie.
+            nbytes: Octets à réserver.
+
+        Yields:
+            True si la réservation a été créée par ce bloc.
+
+        Raises:
+            InsufficientDiskSpaceError: Si l'espace disponible est insuffisant.
+        """
+        created = self.reserve(key, target, nbytes)
+        try:
+            yield created
+        finally:
+            if created:
+                self.release(key)
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[dict[str, dict[str, Any]]]:
+        """Ouvre le registre sous verrou exclusif et le réécrit en sortie.
+
+        Yields:
+            Réservations actives (dict modifiable), purgées des entrées mortes.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a+", encoding="utf-8") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    entries = json.loads(f.read() or "{}")
+                except ValueError:
+                    logger.warning(f"Registre de réservations illisible, réinitialisé: {self.path}")
+                    entries = {}
+                entries = {key: entry for key, entry in entries.items() if self._is_alive(entry)}
+                yield entries
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(entries))
+                f.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _is_alive(self, entry: dict[str, Any]) -> bool:
+        """Indique si une réservation est encore valide (TTL et processus vivant)."""
+        if time.time() - entry.get("created_at", 0) > self.ttl:
+            return False
+        pid = entry.get("pid")
+        if not isinstance(pid, int) or pid <= 0:
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            # Processus vivant appartenant à un autre utilisateur (EPERM)
+            return True
+        return True
@@ -5,11 +5,19 @@ structure de dossiers, fichiers ZIP, NFO conforme, checksums et validation final
 
 Architecture :
 - Création structure dossiers conforme Scene (GROUPE-ReleaseName-YYYYMMDD)
-- Copie fichiers source dans structure
+- Staging fichiers source dans structure (StagingService : hardlink, reflink,
+  copy_file_range/sendfile, copie espace utilisateur en dernier recours)
 - Génération fichier NFO avec NfoGeneratorService
-- Création fichier ZIP final
+- Création fichier ZIP final déterministe (ordre des membres trié,
+  horodatages et attributs fixes : sortie identique octet pour octet)
 - Génération checksums (SHA-256, MD5)
 - Validation finale avant retour
+- Callback de progression optionnel (octets lus, octets écrits, membre courant)
+- Préflight espace disque : taille estimée depuis les entrées et la politique
+  de compression, réservée dans un registre partagé (DiskSpaceLedger) avant
+  toute écriture
+- Cache de build : un manifeste (checksums fichiers, NFO, nommage, politique
+  de compression) est haché ; un ZIP existant avec le même manifeste est réutilisé
 
 Complexité moyenne : O(n) où n est la taille totale des fichiers à packager.
 Les opérations de copie et création ZIP sont dépendantes de la taille des fichiers.
@@ -19,16 +27,48 @@ from __future__ import annotations
 
 import contextlib
 import hashlib
+import json
 import logging
 import shutil
 import zipfile
 from pathlib import Path
-from typing import Any
-
+from typing import TYPE_CHECKING, Any
+
+from web.services.archive import ArchiveVerifierService
+from web.services.packaging.disk_space import (
+    DiskSpaceLedger,
+    InsufficientDiskSpaceError,
+    estimate_package_size,
+)
 from web.services.packaging.nfo_generator import NfoGeneratorService
+from web.services.packaging.staging import StagingService
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    ProgressCallback = Callable[[dict[str, Any]], None]
 
 logger = logging.getLogger(__name__)
 
+# Version du format de manifeste (à incrémenter si la sortie ZIP change)
+MANIFEST_VERSION = 1
+
+# Horodatage fixe des membres ZIP (plus petite date DOS représentable)
+ZIP_FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Attributs Unix fixes des membres ZIP (fichier régulier 0644)
+ZIP_MEMBER_ATTRIBUTES = 0o100644 << 16
+
+# Système créateur fixe (3 = Unix) pour une sortie identique quelle que soit la plateforme
+ZIP_CREATE_SYSTEM = 3
+
+# Suffixe du fichier manifeste écrit à côté du ZIP
+MANIFEST_SUFFIX = ".manifest.json"
+
+COMPRESSION_NAMES = {zipfile.ZIP_STORED: "stored", zipfile.ZIP_DEFLATED: "deflated"}
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
 
 class PackagingService:
     """Service de packaging complet de releases selon format Scene.
@@ -68,17 +108,48 @@ class PackagingService:
         # Retourne : {"success": True, "zip_path": "...", "checksums": {...}}
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        staging: StagingService | None = None,
+        compression: int = zipfile.ZIP_DEFLATED,
+        ledger: DiskSpaceLedger | None = None,
+        verify_mode: str = "full",
+    ) -> None:
         """Initialise le service de packaging.
 
         Cette méthode initialise le NfoGeneratorService pour la génération
-        des fichiers NFO conformes Scene.
+        des fichiers NFO conformes Scene et le StagingService pour placer les
+        fichiers source dans la structure sans dupliquer les données.
 
         Complexité : O(1) - Initialisation simple.
+
+        Args:
+            staging: Service de staging (optionnel, défaut StagingService()).
+            compression: Méthode de compression ZIP (ZIP_DEFLATED ou ZIP_STORED).
+                Fait partie du manifeste de build.
+            ledger: Registre partagé de réservations d'espace disque (optionnel) ;
+                sans registre, seul l'espace libre courant est vérifié.
+            verify_mode: Mode de validation finale ("full" : CRC-32 de chaque
+                membre, "quick" : répertoire central et en-têtes locaux).
+
+        Raises:
+            ValueError: Si la méthode de compression n'est pas supportée.
         """
+        if compression not in COMPRESSION_NAMES:
+            raise ValueError(f"Méthode de compression non supportée: {compression}")
         self.nfo_generator = NfoGeneratorService()
-
-    def package_release(self, release_data: dict[str, Any], output_path: Path) -> dict[str, Any]:
+        self.staging = staging or StagingService()
+        self.compression = compression
+        self.ledger = ledger
+        self.verifier = ArchiveVerifierService()
+        self.verify_mode = verify_mode
+
+    def package_release(
+        self,
+        release_data: dict[str, Any],
+        output_path: Path,
+        progress_callback: ProgressCallback | None = None,
+    ) -> dict[str, Any]:
         """Package une release complète selon format Scene.
 
         Cette méthode orchestratrice effectue tout le processus de packaging :
@@ -91,16 +162,22 @@ class PackagingService:
 
         Algorithme :
         1. Validation données release (nom, groupe, fichiers)
-        2. Création structure dossiers avec _create_directory_structure()
-        3. Copie fichiers source vers structure
-        4. Génération NFO avec NfoGeneratorService
-        5. Création ZIP avec _create_zip_file()
-        6. Génération checksums avec _generate_checksums()
-        7. Validation finale avec _validate_final_package()
-        8. Nettoyage structure temporaire
+        2. Génération contenu NFO avec NfoGeneratorService
+        3. Calcul du manifeste de build avec compute_manifest() ; si un ZIP
+           existant porte le même manifeste, il est réutilisé (retour immédiat)
+        4. Préflight : estimation de la taille écrite et réservation d'espace
+           (InsufficientDiskSpaceError avant toute écriture si insuffisant)
+           puis création structure dossiers avec _create_directory_structure()
+        5. Staging fichiers source vers structure (zéro-copie si possible)
+        6. Écriture NFO, création ZIP déterministe avec _create_zip_file()
+        7. Génération checksums avec _generate_checksums()
+        8. Validation finale avec _validate_final_package()
+        9. Écriture du manifeste à côté du ZIP
+        10. Nettoyage structure temporaire en cas d'erreur
 
         Complexité : O(n) où n est la taille totale des fichiers à packager.
-        Les opérations de copie et création ZIP sont O(n).
+        La création ZIP est O(n) ; le staging est O(1) par fichier sur un même
+        système de fichiers (hardlink/reflink), O(n) sinon.
 
         Gestion des erreurs :
         - Toute erreur pendant le packaging est loggée et levée
@@ -122,6 +199,12 @@ class PackagingService:
                 - metadata : Dictionnaire de métadonnées pour NFO (obligatoire)
                 - nfo_content : Contenu NFO pré-généré (optionnel)
             output_path: Chemin du répertoire de sortie pour le package final.
+            progress_callback: Fonction appelée avec un événement (dict) à chaque
+                étape : phase ("staging", "zip", "done"), bytes_read,
+                bytes_written, bytes_total (octets des membres du ZIP) et
+                member (membre courant). Appelée à chaque bloc de 1 MiB pendant
+                la création du ZIP ; le throttling est à la charge de l'appelant
+                (voir JobProgressReporter).
 
         Returns:
             Dictionnaire contenant :
@@ -129,11 +212,17 @@ class PackagingService:
                 - zip_path : Chemin du fichier ZIP créé
                 - checksums : Dictionnaire avec sha256 et md5
                 - structure_path : Chemin de la structure créée (optionnel)
+                - staging : Rapport de StagingService.stage_files() (méthode
+                  par fichier, bytes_total, bytes_avoided) ; None si réutilisé
+                - manifest_hash : Hash SHA-256 du manifeste de build
+                - cached : True si un ZIP existant a été réutilisé
+                - estimated_bytes : Octets estimés et réservés (absent si réutilisé)
 
         Raises:
             ValueError: Si release_data est invalide (nom vide, fichiers manquants).
             FileNotFoundError: Si un fichier source n'existe pas.
             PermissionError: Si permissions insuffisantes pour créer fichiers/dossiers.
+            InsufficientDiskSpaceError: Si l'espace disque estimé ne peut pas être réservé.
         """
         # Validation données release
         release_name = release_data.get("name", "").strip()
@@ -144,51 +233,119 @@ class PackagingService:
         if not files:
             raise ValueError("Au moins un fichier est requis pour le packaging")
 
+        # Générer contenu NFO (fait partie du manifeste de build)
+        metadata = release_data.get("metadata", {})
+        metadata["group"] = release_data.get("group", "")
+        metadata["date"] = release_data.get("date", "")
+
+        nfo_content = release_data.get("nfo_content")
+        if not nfo_content:
+            nfo_content = self.nfo_generator.generate_nfo(metadata)
+
+        # Réutiliser un ZIP existant si le manifeste est identique
+        manifest = self.compute_manifest(release_name, files, nfo_content)
+        zip_path = output_path / f"{release_name}.zip"
+        cached = self._load_cached_package(zip_path, manifest["hash"])
+        if cached is not None:
+            logger.info(f"Package réutilisé (manifeste {manifest['hash'][:12]}): {zip_path}")
+            if progress_callback:
+                progress_callback({"phase": "done", "bytes_written": cached.get("zip_size", 0)})
+            return {
+                "success": True,
+                "zip_path": str(zip_path),
+                "checksums": cached["checksums"],
+                "structure_path": str(output_path / release_name),
+                "staging": None,
+                "manifest_hash": manifest["hash"],
+                "cached": True,
+            }
+
+        # Préflight espace disque : estimation et réservation avant toute écriture
+        estimated_bytes = self.estimate_output_size(files, output_path, nfo_content)
+        with self._space_reservation(str(zip_path), output_path, estimated_bytes):
+            result = self._build_package(
+                files, nfo_content, manifest, output_path, progress_callback
+            )
+        result["estimated_bytes"] = estimated_bytes
+        return result
+
+    def _build_package(
+        self,
+        files: list[dict[str, Any]],
+        nfo_content: str,
+        manifest: dict[str, Any],
+        output_path: Path,
+        progress_callback: ProgressCallback | None,
+    ) -> dict[str, Any]:
+        """Construit le package (staging, NFO, ZIP, checksums, validation).
+
+        Appelée par package_release() une fois le cache manqué et l'espace
+        disque réservé. La structure est supprimée en cas d'erreur.
+
+        Args:
+            files: Fichiers source (voir package_release()).
+            nfo_content: Contenu NFO final.
+            manifest: Résultat de compute_manifest() (porte le nom de la release).
+            output_path: Répertoire de sortie.
+            progress_callback: Callback de progression (optionnel).
+
+        Returns:
+            Résultat de package_release() (sans estimated_bytes).
+        """
+        release_name = manifest["manifest"]["release_name"]
+
         # Créer structure dossiers conforme Scene
         structure_path = self._create_directory_structure(release_name, output_path)
 
         try:
-            # Copier fichiers source dans structure
-            copied_files = []
+            # Stager fichiers source dans structure (sans duplication si possible)
+            pairs = []
             for file_info in files:
                 source_path = Path(file_info["path"])
                 dest_name = file_info.get("name", source_path.name)
-                dest_path = structure_path / dest_name
-
-                if not source_path.exists():
-                    raise FileNotFoundError(f"Fichier source introuvable: {source_path}")
-
-                shutil.copy2(source_path, dest_path)
-                copied_files.append(dest_path)
-                logger.info(f"Fichier copié: {source_path} -> {dest_path}")
-
-            # Générer fichier NFO
-            metadata = release_data.get("metadata", {})
-            metadata["group"] = release_data.get("group", "")
-            metadata["date"] = release_data.get("date", "")
-
-            nfo_content = release_data.get("nfo_content")
-            if not nfo_content:
-                nfo_content = self.nfo_generator.generate_nfo(metadata)
-
+                pairs.append((source_path, structure_path / dest_name))
+                if progress_callback:
+                    progress_callback({"phase": "staging", "member": dest_name})
+
+            staging_report = self.staging.stage_files(pairs)
+            logger.info(
+                f"Fichiers stagés: {len(pairs)} ({staging_report['methods']}), "
+                f"{staging_report['bytes_avoided']}/{staging_report['bytes_total']} octets "
+                "non dupliqués"
+            )
+
+            # Écrire fichier NFO
             nfo_path = structure_path / f"{release_name}.nfo"
             nfo_path.write_text(nfo_content, encoding="utf-8")
             logger.info(f"Fichier NFO généré: {nfo_path}")
 
             # Créer fichier ZIP final
-            zip_path = self._create_zip_file(structure_path, output_path)
+            zip_path = self._create_zip_file(
+                structure_path, output_path, progress_callback=progress_callback
+            )
 
             # Générer checksums du ZIP final
             checksums = self._generate_checksums(zip_path)
 
-            # Validation finale
-            self._validate_final_package(zip_path)
+            # Validation finale : un ZIP invalide est supprimé et n'est jamais
+            # enregistré dans le manifeste (il serait réutilisé par les builds suivants)
+            if not self._validate_final_package(zip_path):
+                zip_path.unlink(missing_ok=True)
+                raise ValueError(f"Package final invalide (archive corrompue): {zip_path}")
+
+            # Enregistrer le manifeste pour les builds suivants
+            self._write_manifest(zip_path, manifest, checksums)
+            if progress_callback:
+                progress_callback({"phase": "done", "bytes_written": zip_path.stat().st_size})
 
             return {
                 "success": True,
                 "zip_path": str(zip_path),
                 "checksums": checksums,
                 "structure_path": str(structure_path),
+                "staging": staging_report,
+                "manifest_hash": manifest["hash"],
+                "cached": False,
             }
 
         except Exception as e:
@@ -199,6 +356,191 @@ class PackagingService:
                     shutil.rmtree(structure_path)
             raise
 
+    def estimate_output_size(
+        self, files: list[dict[str, Any]], output_path: Path, nfo_content: str
+    ) -> int:
+        """Estime les octets écrits par le packaging (borne supérieure).
+
+        Voir estimate_package_size() : staging hors périphérique de sortie,
+        NFO et ZIP dans le pire cas de la politique de compression.
+
+        Complexité : O(f) où f est le nombre de fichiers.
+
+        Args:
+            files: Fichiers source (voir package_release()).
+            output_path: Répertoire de sortie.
+            nfo_content: Contenu NFO final.
+
+        Returns:
+            Nombre d'octets à réserver.
+        """
+        pairs = []
+        for file_info in files:
+            source_path = Path(file_info["path"])
+            pairs.append((source_path, file_info.get("name", source_path.name)))
+        return estimate_package_size(
+            pairs, output_path, self.compression, len(nfo_content.encode("utf-8"))
+        )
+
+    @contextlib.contextmanager
+    def _space_reservation(self, key: str, output_path: Path, nbytes: int) -> Iterator[None]:
+        """Réserve l'espace disque pendant la construction du package.
+
+        Avec un DiskSpaceLedger, la réservation est partagée entre workers (une
+        réservation déjà prise sous la même clé, par exemple par le scheduler
+        de jobs, est réutilisée). Sans registre, seul l'espace libre courant
+        est vérifié.
+
+        Args:
+            key: Clé de réservation (chemin du ZIP).
+            output_path: Répertoire de sortie.
+            nbytes: Octets estimés.
+
+        Yields:
+            None pendant la construction.
+
+        Raises:
+            InsufficientDiskSpaceError: Si l'espace est insuffisant (avant
+                toute écriture).
+        """
+        if self.ledger is not None:
+            with self.ledger.reservation(key, output_path, nbytes):
+                yield
+            return
+
+        output_path.mkdir(parents=True, exist_ok=True)
+        free = shutil.disk_usage(output_path).free
+        if nbytes > free:
+            raise InsufficientDiskSpaceError(
+                f"Espace insuffisant sur {output_path}: {nbytes} octets estimés, {free} libres",
+                required=nbytes,
+                available=free,
+            )
+        yield
+
+    def compute_manifest(
+        self, release_name: str, files: list[dict[str, Any]], nfo_content: str
+    ) -> dict[str, Any]:
+        """Calcule le manifeste de build d'une release et son hash.
+
+        Le manifeste décrit tout ce qui détermine le contenu du ZIP final :
+        nom de la release (nommage des membres NFO/ZIP), nom et checksum de
+        chaque fichier, checksum du NFO et politique de compression. Comme le
+        ZIP est déterministe, deux manifestes identiques produisent deux ZIP
+        identiques octet pour octet.
+
+        Algorithme :
+        1. Pour chaque fichier : SHA-256 fourni (file_info["sha256"]) ou calculé
+        2. Tri des entrées par nom de membre (l'ordre d'entrée est sans effet)
+        3. Sérialisation JSON canonique (clés triées) puis SHA-256
+
+        Complexité : O(n) où n est la taille totale des fichiers sans checksum
+        fourni ; O(f log f) sinon où f est le nombre de fichiers.
+
+        Args:
+            release_name: Nom de la release.
+            files: Liste de dictionnaires avec 'path', 'name' (optionnel) et
+                'sha256' (optionnel, évite de relire le fichier).
+            nfo_content: Contenu NFO final.
+
+        Returns:
+            Dictionnaire contenant :
+                - hash : SHA-256 hexadécimal du manifeste
+                - manifest : Manifeste (version, release_name, files,
+                  nfo_sha256, compression)
+
+        Raises:
+            FileNotFoundError: Si un fichier source n'existe pas.
+        """
+        entries = []
+        for file_info in files:
+            source_path = Path(file_info["path"])
+            if not source_path.exists():
+                raise FileNotFoundError(f"Fichier source introuvable: {source_path}")
+            entries.append(
+                {
+                    "name": file_info.get("name", source_path.name),
+                    "size": source_path.stat().st_size,
+                    "sha256": file_info.get("sha256") or self._hash_file(source_path),
+                }
+            )
+        entries.sort(key=lambda entry: entry["name"])
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "release_name": release_name,
+            "files": entries,
+            "nfo_sha256": hashlib.sha256(nfo_content.encode("utf-8")).hexdigest(),
+            "compression": COMPRESSION_NAMES[self.compression],
+        }
+        canonical = json.dumps(manifest, sort_keys=True, separators=(",", ":"))
+        return {"hash": hashlib.sha256(canonical.encode("utf-8")).hexdigest(), "manifest": manifest}
+
+    def _load_cached_package(self, zip_path: Path, manifest_hash: str) -> dict[str, Any] | None:
+        """Charge le manifeste enregistré d'un ZIP existant s'il correspond.
+
+        Le ZIP est considéré réutilisable si son manifeste porte le même hash
+        et si sa taille correspond à celle enregistrée (détection d'un ZIP
+        remplacé ou tronqué sans relecture complète).
+
+        Complexité : O(1) - Lecture du petit fichier manifeste et stat du ZIP.
+
+        Args:
+            zip_path: Chemin du ZIP attendu.
+            manifest_hash: Hash du manifeste courant.
+
+        Returns:
+            Contenu du manifeste enregistré (avec checksums du ZIP), ou None si
+            le ZIP doit être reconstruit.
+        """
+        manifest_path = zip_path.with_name(zip_path.name + MANIFEST_SUFFIX)
+        try:
+            stored = json.loads(manifest_path.read_text(encoding="utf-8"))
+            if stored.get("hash") != manifest_hash:
+                return None
+            if zip_path.stat().st_size != stored.get("zip_size"):
+                return None
+        except (OSError, ValueError):
+            return None
+        return stored
+
+    def _write_manifest(
+        self, zip_path: Path, manifest: dict[str, Any], checksums: dict[str, str]
+    ) -> None:
+        """Écrit le manifeste de build à côté du ZIP (écriture atomique).
+
+        Args:
+            zip_path: Chemin du ZIP construit.
+            manifest: Résultat de compute_manifest().
+            checksums: Checksums du ZIP.
+        """
+        manifest_path = zip_path.with_name(zip_path.name + MANIFEST_SUFFIX)
+        tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+        payload = {
+            "hash": manifest["hash"],
+            "manifest": manifest["manifest"],
+            "checksums": checksums,
+            "zip_size": zip_path.stat().st_size,
+        }
+        tmp_path.write_text(json.dumps(payload, sort_keys=True, indent=2), encoding="utf-8")
+        tmp_path.replace(manifest_path)
+
+    @staticmethod
+    def _hash_file(file_path: Path) -> str:
+        """Calcule le SHA-256 d'un fichier par blocs de 1 MiB.
+
+        Args:
+            file_path: Fichier à hacher.
+
+        Returns:
+            SHA-256 hexadécimal.
+        """
+        sha256_hash = hashlib.sha256()
+        with file_path.open("rb") as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                sha256_hash.update(chunk)
+        return sha256_hash.hexdigest()
+
     def _create_directory_structure(self, release_name: str, output_path: Path) -> Path:
         """Crée la structure de dossiers conforme Scene.
 
@@ -241,18 +583,28 @@ class PackagingService:
 
         return structure_path
 
-    def _create_zip_file(self, source_dir: Path, output_path: Path) -> Path:
+    def _create_zip_file(
+        self,
+        source_dir: Path,
+        output_path: Path,
+        progress_callback: ProgressCallback | None = None,
+    ) -> Path:
         """Crée un fichier ZIP à partir d'un répertoire source.
 
         Cette méthode crée un fichier ZIP contenant tous les fichiers et dossiers
-        du répertoire source, en préservant la structure arborescente.
+        du répertoire source, en préservant la structure arborescente. La sortie
+        est déterministe : deux appels sur le même contenu produisent un ZIP
+        identique octet pour octet, quels que soient le worker, l'horloge ou
+        l'ordre du système de fichiers.
 
         Algorithme :
         1. Déterminer nom fichier ZIP (basé sur nom répertoire source)
-        2. Créer fichier ZIP avec zipfile.ZipFile
-        3. Parcourir récursivement tous les fichiers du répertoire source
-        4. Ajouter chaque fichier au ZIP avec chemin relatif préservé
-        5. Fermer le ZIP et retourner chemin
+        2. Lister les fichiers du répertoire source, triés par chemin relatif
+        3. Écrire chaque membre avec un ZipInfo normalisé (date fixe
+           ZIP_FIXED_DATE_TIME, attributs 0644, système Unix) par flux de 1 MiB
+        4. Écriture dans un fichier temporaire puis renommage atomique
+        5. Après chaque bloc : progress_callback avec octets lus (sources),
+           octets écrits (position dans le ZIP) et membre courant
 
         Complexité : O(n) où n est le nombre de fichiers à compresser.
         La compression dépend de la taille des fichiers (O(m) où m est la taille).
@@ -266,6 +618,8 @@ class PackagingService:
         Args:
             source_dir: Répertoire source à compresser.
             output_path: Répertoire de sortie pour le fichier ZIP.
+            progress_callback: Callback de progression (optionnel), voir
+                package_release().
 
         Returns:
             Chemin Path du fichier ZIP créé.
@@ -281,15 +635,50 @@ class PackagingService:
         zip_filename = f"{source_dir.name}.zip"
         zip_path = output_path / zip_filename
 
-        # Créer le fichier ZIP
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-            # Parcourir récursivement tous les fichiers du répertoire source
-            for file_path in source_dir.rglob("*"):
-                if file_path.is_file():
-                    # Chemin relatif dans le ZIP (préserver structure)
-                    arcname = file_path.relative_to(source_dir)
-                    zipf.write(file_path, arcname)
+        # Membres triés par chemin relatif (ordre indépendant du système de fichiers)
+        members = sorted(
+            (file_path.relative_to(source_dir).as_posix(), file_path)
+            for file_path in source_dir.rglob("*")
+            if file_path.is_file()
+        )
+
+        sizes = {arcname: file_path.stat().st_size for arcname, file_path in members}
+        bytes_total = sum(sizes.values())
+        bytes_read = 0
+
+        # Créer le fichier ZIP (temporaire puis renommage atomique)
+        tmp_path = zip_path.with_name(zip_path.name + ".tmp")
+        try:
+            with tmp_path.open("wb") as raw, zipfile.ZipFile(raw, "w", self.compression) as zipf:
+                for arcname, file_path in members:
+                    info = zipfile.ZipInfo(arcname, date_time=ZIP_FIXED_DATE_TIME)
+                    info.compress_type = self.compression
+                    info.external_attr = ZIP_MEMBER_ATTRIBUTES
+                    info.create_system = ZIP_CREATE_SYSTEM
+                    force_zip64 = sizes[arcname] > zipfile.ZIP64_LIMIT
+                    with (
+                        file_path.open("rb") as src,
+                        zipf.open(info, "w", force_zip64=force_zip64) as dst,
+                    ):
+                        while chunk := src.read(HASH_CHUNK_SIZE):
+                            dst.write(chunk)
+                            bytes_read += len(chunk)
+                            if progress_callback:
+                                progress_callback(
+                                    {
+                                        "phase": "zip",
+                                        "bytes_read": bytes_read,
+                                        "bytes_written": raw.tell(),
+                                        "bytes_total": bytes_total,
+                                        "member": arcname,
+                                    }
+                                )
                     logger.debug(f"Ajouté au ZIP: {arcname}")
+            tmp_path.replace(zip_path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                tmp_path.unlink()
+            raise
 
         logger.info(f"Fichier ZIP créé: {zip_path}")
 
@@ -349,15 +738,17 @@ class PackagingService:
     def _validate_final_package(self, zip_path: Path) -> bool:
         """Valide le package final créé.
 
-        Cette méthode effectue une validation basique du package ZIP final :
-        vérification existence, taille non nulle, et validité du format ZIP.
+        Cette méthode valide le package ZIP final : existence, taille non nulle,
+        puis intégrité via ArchiveVerifierService (répertoire central, en-têtes
+        locaux et CRC-32 de chaque membre, vérifiés en parallèle).
 
         Algorithme :
         1. Vérification existence fichier
         2. Vérification taille > 0
-        3. Vérification format ZIP valide (tentative ouverture)
+        3. Vérification d'intégrité (mode verify_mode, "full" par défaut)
 
-        Complexité : O(1) - Vérifications simples.
+        Complexité : O(n / w) où n est la taille du ZIP et w le nombre de
+        workers du vérificateur ; O(m) en mode "quick" (m membres).
 
         Args:
             zip_path: Chemin du fichier ZIP à valider.
@@ -376,13 +767,10 @@ class PackagingService:
             logger.error(f"Fichier ZIP vide: {zip_path}")
             return False
 
-        # Vérifier format ZIP valide (tentative ouverture)
-        try:
-            with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                # Vérifier que le ZIP n'est pas corrompu
-                zip_ref.testzip()
-        except zipfile.BadZipFile:
-            logger.error(f"Fichier ZIP corrompu: {zip_path}")
+        # Vérifier intégrité du ZIP (CRC-32 en parallèle)
+        report = self.verifier.verify(zip_path, mode=self.verify_mode)
+        if not report["valid"]:
+            logger.error(f"Fichier ZIP corrompu: {zip_path} ({report['errors'][:5]})")
             return False
 
         logger.info(f"Package validé: {zip_path}")
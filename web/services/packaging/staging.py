@@ -0,0 +1,243 @@
+"""Service de staging des fichiers source avant packaging.
+
+Ce service place les fichiers source dans la structure de release sans
+dupliquer les données lorsque le système de fichiers le permet. Sur un même
+système de fichiers, un fichier de 20 Go est "copié" en O(1) sans consommer
+d'espace disque supplémentaire.
+
+Architecture (stratégies essayées dans l'ordre) :
+- hardlink : os.link, même inode, aucun bloc alloué (même système de fichiers)
+- reflink : ioctl FICLONE, blocs partagés copy-on-write (Btrfs, XFS, bcachefs...)
+- copy_file_range : copie dans le noyau, sans passer par l'espace utilisateur
+  (peut elle-même partager les blocs sur NFS 4.2, XFS, Btrfs)
+- sendfile : copie dans le noyau pour les noyaux sans copy_file_range inter-FS
+- copy : copie espace utilisateur (shutil.copyfileobj), dernier recours
+
+Chaque stratégie qui échoue (EXDEV, EOPNOTSUPP, EPERM, ...) laisse la place à
+la suivante ; la destination partiellement écrite est supprimée avant le repli.
+
+Complexité : O(1) pour hardlink/reflink, O(n) pour les copies où n est la
+taille du fichier.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import shutil
+from typing import TYPE_CHECKING, Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - plateformes sans fcntl (Windows)
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Numéro d'ioctl Linux FICLONE (_IOW(0x94, 9, int))
+FICLONE = 0x40049409
+
+# Taille maximale d'un appel copy_file_range/sendfile (limite noyau ~2 Go)
+KERNEL_COPY_CHUNK = 1 << 30
+
+STAGING_METHODS = ("hardlink", "reflink", "copy_file_range", "sendfile", "copy")
+
+# Méthodes qui n'allouent aucun nouveau bloc de données
+SHARED_EXTENT_METHODS = frozenset({"hardlink", "reflink"})
+
+
+class StagingService:
+    """Service de staging zéro-copie des fichiers source.
+
+    Ce service remplace shutil.copy2 lors du packaging : il essaie d'abord
+    les stratégies qui ne dupliquent pas les données (hardlink, reflink),
+    puis les copies noyau (copy_file_range, sendfile) et enfin la copie
+    espace utilisateur. Il rapporte la méthode utilisée et les octets dont
+    la duplication sur disque a été évitée.
+
+    Pièges potentiels :
+    - Un hardlink partage l'inode : toute modification du fichier stagé
+      modifie la source. Le packaging ne fait que lire les fichiers stagés ;
+      passer allow_hardlink=False si la structure doit être modifiée ensuite.
+    - Un hardlink conserve les permissions/horodatages de la source (même
+      inode) ; les autres méthodes les recopient avec shutil.copystat.
+
+    Exemple d'utilisation :
+        service = StagingService()
+        report = service.stage_file(Path("/uploads/book.epub"), dest)
+        # {"method": "hardlink", "bytes": 123, "bytes_avoided": 123, ...}
+    """
+
+    def __init__(self, allow_hardlink: bool = True, methods: tuple[str, ...] | None = None) -> None:
+        """Initialise le service de staging.
+
+        Args:
+            allow_hardlink: Autoriser os.link (défaut True).
+            methods: Stratégies autorisées, dans l'ordre (défaut STAGING_METHODS).
+                "copy" est toujours ajoutée en dernier recours.
+
+        Raises:
+            ValueError: Si une méthode inconnue est demandée.
+        """
+        selected = list(methods or STAGING_METHODS)
+        unknown = set(selected) - set(STAGING_METHODS)
+        if unknown:
+            raise ValueError(f"Méthodes de staging inconnues: {sorted(unknown)}")
+        if not allow_hardlink and "hardlink" in selected:
+            selected.remove("hardlink")
+        if "copy" not in selected:
+            selected.append("copy")
+        self.methods = tuple(selected)
+
+    def stage_file(self, source: Path, dest: Path) -> dict[str, Any]:
+        """Place un fichier source à la destination avec la stratégie la moins coûteuse.
+
+        Algorithme :
+        1. Vérification existence source et absence de destination
+        2. Pour chaque stratégie autorisée : tentative, repli sur OSError
+        3. Pour les méthodes autres que hardlink : copie des métadonnées
+           (permissions, horodatages) comme shutil.copy2
+
+        Complexité : O(1) pour hardlink/reflink, O(n) sinon.
+
+        Args:
+            source: Fichier source.
+            dest: Chemin de destination (ne doit pas exister).
+
+        Returns:
+            Dictionnaire contenant :
+                - source, dest : Chemins
+                - method : Stratégie utilisée (voir STAGING_METHODS)
+                - bytes : Taille du fichier
+                - bytes_avoided : Octets non dupliqués sur disque
+                  (taille complète pour hardlink/reflink, 0 sinon)
+                - fallbacks : Stratégies essayées sans succès et leur erreur
+
+        Raises:
+            FileNotFoundError: Si la source n'existe pas.
+            FileExistsError: Si la destination existe déjà.
+        """
+        if not source.is_file():
+            raise FileNotFoundError(f"Fichier source introuvable: {source}")
+        if dest.exists():
+            raise FileExistsError(f"Destination déjà existante: {dest}")
+
+        size = source.stat().st_size
+        fallbacks: list[dict[str, str]] = []
+
+        for method in self.methods:
+            try:
+                getattr(self, f"_stage_{method}")(source, dest, size)
+            except (OSError, NotImplementedError) as e:
+                fallbacks.append({"method": method, "error": str(e)})
+                with contextlib.suppress(FileNotFoundError):
+                    dest.unlink()
+                if method == "copy":
+                    raise
+                continue
+
+            if method != "hardlink":
+                shutil.copystat(source, dest)
+            logger.debug(f"Fichier stagé ({method}): {source} -> {dest}")
+            return {
+                "source": str(source),
+                "dest": str(dest),
+                "method": method,
+                "bytes": size,
+                "bytes_avoided": size if method in SHARED_EXTENT_METHODS else 0,
+                "fallbacks": fallbacks,
+            }
+
+        raise OSError(f"Aucune stratégie de staging disponible pour {source}")  # pragma: no cover
+
+    def stage_files(self, pairs: list[tuple[Path, Path]]) -> dict[str, Any]:
+        """Stage plusieurs fichiers et agrège le rapport.
+
+        Args:
+            pairs: Liste de couples (source, destination).
+
+        Returns:
+            Dictionnaire contenant :
+                - files : Rapports individuels de stage_file()
+                - bytes_total : Taille cumulée
+                - bytes_avoided : Octets non dupliqués cumulés
+                - methods : Nombre de fichiers par stratégie
+
+        Raises:
+            FileNotFoundError: Si une source n'existe pas.
+            FileExistsError: Si une destination existe déjà.
+        """
+        reports = [self.stage_file(source, dest) for source, dest in pairs]
+        methods: dict[str, int] = {}
+        for report in reports:
+            methods[report["method"]] = methods.get(report["method"], 0) + 1
+        return {
+            "files": reports,
+            "bytes_total": sum(report["bytes"] for report in reports),
+            "bytes_avoided": sum(report["bytes_avoided"] for report in reports),
+            "methods": methods,
+        }
+
+    def _stage_hardlink(self, source: Path, dest: Path, size: int) -> None:  # noqa: ARG002
+        """Crée un lien physique (EXDEV si systèmes de fichiers différents)."""
+        os.link(source, dest)
+
+    def _stage_reflink(self, source: Path, dest: Path, size: int) -> None:  # noqa: ARG002
+        """Clone les extents via ioctl FICLONE (EOPNOTSUPP/EXDEV si non supporté)."""
+        if fcntl is None:
+            raise NotImplementedError("fcntl indisponible")
+        with source.open("rb") as src, dest.open("xb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+    def _stage_copy_file_range(self, source: Path, dest: Path, size: int) -> None:
+        """Copie dans le noyau avec os.copy_file_range (Linux >= 4.5)."""
+        if not hasattr(os, "copy_file_range"):
+            raise NotImplementedError("os.copy_file_range indisponible")
+        with source.open("rb") as src, dest.open("xb") as dst:
+            self._kernel_copy(
+                lambda remaining: os.copy_file_range(
+                    src.fileno(), dst.fileno(), min(remaining, KERNEL_COPY_CHUNK)
+                ),
+                size,
+            )
+
+    def _stage_sendfile(self, source: Path, dest: Path, size: int) -> None:
+        """Copie dans le noyau avec os.sendfile (fichier vers fichier, Linux >= 2.6.33)."""
+        if not hasattr(os, "sendfile"):
+            raise NotImplementedError("os.sendfile indisponible")
+        with source.open("rb") as src, dest.open("xb") as dst:
+            self._kernel_copy(
+                lambda remaining: os.sendfile(
+                    dst.fileno(), src.fileno(), None, min(remaining, KERNEL_COPY_CHUNK)
+                ),
+                size,
+            )
+
+    def _stage_copy(self, source: Path, dest: Path, size: int) -> None:  # noqa: ARG002
+        """Copie espace utilisateur (dernier recours)."""
+        with source.open("rb") as src, dest.open("xb") as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+
+    @staticmethod
+    def _kernel_copy(step: Any, size: int) -> None:
+        """Boucle de copie noyau jusqu'à EOF.
+
+        Args:
+            step: Fonction (octets restants) -> octets copiés par l'appel.
+            size: Taille attendue du fichier.
+
+        Raises:
+            OSError: Si le noyau refuse la copie ou si la copie est incomplète.
+        """
+        copied = 0
+        while copied < size:
+            sent = step(size - copied)
+            if sent == 0:
+                break
+            copied += sent
+        if copied != size:
+            raise OSError(f"Copie noyau incomplète ({copied}/{size} octets)")
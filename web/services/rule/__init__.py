@@ -1,6 +1,20 @@
 """Services rule - Parsing et téléchargement des règles Scene."""
 
+from web.services.rule.rule_catalog import RuleCatalogService
+from web.services.rule.rule_ingest import RuleIngestError, RuleIngestService
 from web.services.rule.rule_parser import RuleParserService
+from web.services.rule.rule_revisions import RuleRevisionService
+from web.services.rule.rule_search import RuleSearchService
 from web.services.rule.scenerules_download import ScenerulesDownloadService
+from web.services.rule.scenerules_sync import ScenerulesSyncService
 
-__all__ = ["RuleParserService", "ScenerulesDownloadService"]
+__all__ = [
+    "RuleCatalogService",
+    "RuleIngestError",
+    "RuleIngestService",
+    "RuleParserService",
+    "RuleRevisionService",
+    "RuleSearchService",
+    "ScenerulesDownloadService",
+    "ScenerulesSyncService",
+]
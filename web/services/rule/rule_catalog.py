@@ -0,0 +1,128 @@
+"""Service de catalogue des règles scenerules.org avec état de téléchargement local.
+
+La liste des règles scenerules.org indique pour chaque règle si elle est
+déjà présente en base (is_downloaded, local_rule_id). Ce calcul chargeait
+toutes les règles (Rule.query.all(), contenu NFO de plusieurs dizaines de Ko
+compris) à chaque requête, uniquement pour en extraire (section, year).
+
+Architecture :
+- Index local (section, year) -> id construit par une requête de projection
+  (id, section, year) : aucun contenu de règle chargé
+- Catalogue complet annoté (is_downloaded, local_rule_id) mis en cache
+  (extension Flask-Caching) ; les filtres sont appliqués sur une copie
+- Invalidation explicite après chaque écriture de règle (création,
+  modification, suppression, téléchargement, upload) ; le délai d'expiration
+  borne l'obsolescence en cas d'écriture hors API
+
+Complexité : O(r) pour reconstruire le catalogue (r règles locales, trois
+colonnes par ligne) ; O(c) par requête en cas de succès du cache (c règles
+du catalogue, copie et filtres).
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from sqlalchemy import select
+
+from web.extensions import cache, db
+from web.models import Rule
+from web.services.rule.scenerules_download import ScenerulesDownloadService
+
+logger = logging.getLogger(__name__)
+
+# Clé de cache du catalogue annoté (incrémenter si le format change)
+CATALOGUE_CACHE_KEY = "rules:scenerules-catalogue:v1"
+
+# Durée de conservation du catalogue en cache (secondes)
+DEFAULT_CACHE_TIMEOUT = 3600
+
+
+class RuleCatalogService:
+    """Service du catalogue scenerules.org annoté avec les règles locales.
+
+    Pièges potentiels :
+    - Toute écriture de règle doit appeler invalidate() après le commit,
+      sinon is_downloaded reste périmé jusqu'à l'expiration du cache
+    - Avec SimpleCache, le cache est propre à chaque worker : l'invalidation
+      ne touche que le worker qui a écrit (backend partagé type Redis
+      nécessaire pour une invalidation globale)
+
+    Exemple d'utilisation :
+        service = RuleCatalogService()
+        rules = service.catalogue()
+        # après db.session.commit() d'une règle :
+        RuleCatalogService.invalidate()
+    """
+
+    def __init__(
+        self,
+        downloader: ScenerulesDownloadService | None = None,
+        cache_timeout: int = DEFAULT_CACHE_TIMEOUT,
+    ) -> None:
+        """Initialise le service.
+
+        Args:
+            downloader: Service scenerules.org (défaut : instance dédiée, créée
+                uniquement lors d'une reconstruction du catalogue).
+            cache_timeout: Durée de conservation du catalogue (secondes).
+        """
+        self._downloader = downloader
+        self.cache_timeout = cache_timeout
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> RuleCatalogService:
+        """Construit le service depuis la configuration Flask (RULES_CATALOGUE_CACHE_TIMEOUT)."""
+        return cls(cache_timeout=int(config.get("RULES_CATALOGUE_CACHE_TIMEOUT", 3600)))
+
+    @staticmethod
+    def local_rule_ids() -> dict[tuple[str, int], int]:
+        """Retourne l'index (section, year) -> id des règles locales.
+
+        Requête de projection sur trois colonnes ; en cas de doublon, la règle
+        la plus récente (id le plus grand) l'emporte.
+
+        Returns:
+            Dictionnaire (section, year) -> id de la règle.
+        """
+        rows = db.session.execute(
+            select(Rule.section, Rule.year, Rule.id)
+            .where(Rule.section.is_not(None), Rule.year.is_not(None))
+            .order_by(Rule.id)
+        )
+        return {(section, year): rule_id for section, year, rule_id in rows if section and year}
+
+    def catalogue(self) -> list[dict[str, Any]]:
+        """Retourne le catalogue scenerules.org annoté avec les règles locales.
+
+        Returns:
+            Copie de la liste des règles disponibles ; chaque règle porte
+            is_downloaded et, si elle est présente en base, local_rule_id.
+        """
+        rules = cache.get(CATALOGUE_CACHE_KEY)
+        if rules is None:
+            rules = self._build()
+            cache.set(CATALOGUE_CACHE_KEY, rules, timeout=self.cache_timeout)
+        # Copie : les appelants peuvent modifier les entrées sans altérer le cache
+        return [dict(rule) for rule in rules]
+
+    @staticmethod
+    def invalidate() -> None:
+        """Invalide le catalogue en cache (à appeler après une écriture de règle)."""
+        cache.delete(CATALOGUE_CACHE_KEY)
+
+    def _build(self) -> list[dict[str, Any]]:
+        """Construit le catalogue annoté (liste scenerules.org + index local)."""
+        downloader = self._downloader or ScenerulesDownloadService()
+        local_ids = self.local_rule_ids()
+        rules = []
+        for available in downloader.list_available_rules():
+            rule = dict(available)
+            local_id = local_ids.get((rule.get("section"), rule.get("year")))
+            rule["is_downloaded"] = local_id is not None
+            if local_id is not None:
+                rule["local_rule_id"] = local_id
+            rules.append(rule)
+        logger.debug(f"Catalogue scenerules reconstruit: {len(rules)} règles")
+        return rules
@@ -0,0 +1,341 @@
+"""Ingestion des fichiers de règles (upload simple, multi-fichiers ou ZIP).
+
+POST /rules/upload décodait le fichier deux fois (UTF-8, puis ISO-8859-1
+après relecture) et _extract_metadata_from_content parcourait le contenu
+une fois par motif (deux motifs de scène, trois de section, trois d'année).
+
+Architecture :
+- Décodage unique avec détection du jeu de caractères : BOM (UTF-8,
+  UTF-16), UTF-8 strict, puis CP437 (NFO en art ASCII DOS : suites d'octets
+  0xB0-0xDF de dessin de cadres) ou CP1252 / ISO-8859-1 (texte accentué)
+- Détection des métadonnées en un seul parcours : une expression régulière
+  unique (alternatives nommées) ; les priorités entre motifs de l'ancienne
+  implémentation sont appliquées après le parcours
+- Spécification compilée (RuleParserService) pour les règles eBOOK
+- Lots : fichiers multiples et archives ZIP lues membre par membre (taille
+  déclarée vérifiée avant lecture, lecture bornée), insertion groupée des
+  règles et de leur première révision en un seul flush
+
+Complexité : O(n) par règle (n octets) pour le décodage et la détection ;
+O(k) requêtes d'insertion groupées pour k règles.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import zipfile
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING, Any
+
+from web.extensions import db
+from web.models import Rule
+from web.services.rule.rule_parser import RuleParserService
+from web.services.rule.rule_revisions import RuleRevisionService
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from werkzeug.datastructures import FileStorage
+
+logger = logging.getLogger(__name__)
+
+# Extensions acceptées pour un fichier de règle
+RULE_EXTENSIONS = (".nfo", ".txt")
+
+# Taille maximale d'une règle (fichier ou membre d'archive)
+DEFAULT_MAX_RULE_BYTES = 5 * 1024 * 1024
+
+# Nombre maximal de règles par requête (fichiers et membres d'archives)
+DEFAULT_MAX_FILES = 500
+
+MIN_YEAR = 1900
+MAX_YEAR = 2100
+
+_SCENES = (
+    "English|Baltic|Danish|Dutch|Flemish|French|German|Hungarian|Italian|"
+    "Lithuanian|Polish|Spanish|Swedish"
+)
+_SECTIONS = "eBOOK|TV-720p|TV-SD|X264|X265|BLURAY|MP3|FLAC"
+
+# Une alternative par motif historique, dans l'ordre où elles peuvent se
+# chevaucher à une même position ([2022] eBOOK avant [2022])
+_SNIFF_RE = re.compile(
+    rf"""
+    \A(?P<title_section>[A-Z0-9-]+)\s+Rules?\s+\[(?P<title_year>\d{{4}})\]
+    | \[(?P<scene_bracket>{_SCENES})\s*Scene\]
+    | Scene\s*[:;]\s*(?P<scene_field>{_SCENES})
+    | \[(?P<section_year>\d{{4}})\]\s*(?P<section_bracket>{_SECTIONS})
+    | Section\s*[:;]\s*(?P<section_field>{_SECTIONS})
+    | \[(?P<year_bracket>\d{{4}})\]
+    | \((?P<year_paren>\d{{4}})\)
+    | \b(?P<year_bare>(?:19|20)\d{{2}})\b
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+# Octets de dessin de cadres et de blocs CP437 (art ASCII des NFO)
+_CP437_ART_RE = re.compile(rb"[\xb0-\xdf]{2,}")
+_HIGH_BYTES_RE = re.compile(rb"[\x80-\xff]")
+
+
+class RuleIngestError(ValueError):
+    """Fichier de règle refusé (extension, taille, encodage, archive invalide)."""
+
+
+class RuleIngestService:
+    """Service d'ingestion des fichiers de règles Scene.
+
+    Pièges potentiels :
+    - La détection CP437 / Latin-1 est heuristique : un texte Latin-1 avec
+      beaucoup de suites de lettres accentuées majuscules (0xC0-0xDF) peut
+      être lu comme CP437
+    - Les archives ZIP imbriquées ne sont pas parcourues
+    - create_rules n'effectue pas le commit (à la charge de l'appelant)
+
+    Exemple d'utilisation :
+        ingester = RuleIngestService()
+        rule_data = ingester.ingest(raw_bytes, "ebook.nfo")
+        rules = ingester.create_rules([rule_data], user_id=user.id)
+        db.session.commit()
+    """
+
+    def __init__(
+        self,
+        max_rule_bytes: int = DEFAULT_MAX_RULE_BYTES,
+        max_files: int = DEFAULT_MAX_FILES,
+        parser: RuleParserService | None = None,
+    ) -> None:
+        """Initialise le service.
+
+        Args:
+            max_rule_bytes: Taille maximale d'une règle (octets).
+            max_files: Nombre maximal de règles par lot.
+            parser: Parser de spécifications (défaut : RuleParserService()).
+        """
+        self.max_rule_bytes = max_rule_bytes
+        self.max_files = max_files
+        self.parser = parser or RuleParserService()
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> RuleIngestService:
+        """Construit le service depuis la configuration Flask.
+
+        Clés lues : RULES_UPLOAD_MAX_BYTES, RULES_UPLOAD_MAX_FILES.
+        """
+        return cls(
+            max_rule_bytes=int(config.get("RULES_UPLOAD_MAX_BYTES", DEFAULT_MAX_RULE_BYTES)),
+            max_files=int(config.get("RULES_UPLOAD_MAX_FILES", DEFAULT_MAX_FILES)),
+        )
+
+    @staticmethod
+    def decode(raw: bytes) -> tuple[str, str]:
+        """Décode le contenu brut d'une règle en détectant son jeu de caractères.
+
+        Algorithme :
+        1. BOM UTF-8 ou UTF-16
+        2. UTF-8 strict
+        3. Octets hauts majoritairement en suites 0xB0-0xDF : CP437 (art ASCII)
+        4. Sinon CP1252, ou ISO-8859-1 (décode tous les octets) en dernier recours
+
+        Args:
+            raw: Contenu brut du fichier.
+
+        Returns:
+            Tuple (contenu décodé, nom de l'encodage retenu).
+        """
+        if raw.startswith(b"\xef\xbb\xbf"):
+            return raw[3:].decode("utf-8", errors="replace"), "utf-8-sig"
+        if raw[:2] in (b"\xff\xfe", b"\xfe\xff") and len(raw) % 2 == 0:
+            try:
+                return raw.decode("utf-16"), "utf-16"
+            except UnicodeDecodeError:
+                pass
+        try:
+            return raw.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            pass
+
+        high_bytes = len(_HIGH_BYTES_RE.findall(raw))
+        art_bytes = sum(len(run) for run in _CP437_ART_RE.findall(raw))
+        if high_bytes and art_bytes * 2 >= high_bytes:
+            return raw.decode("cp437"), "cp437"
+        try:
+            return raw.decode("cp1252"), "cp1252"
+        except UnicodeDecodeError:
+            return raw.decode("iso-8859-1"), "iso-8859-1"
+
+    @staticmethod
+    def sniff(content: str) -> dict[str, str | int | None]:
+        """Détecte scène, section et année d'une règle en un seul parcours.
+
+        Priorités (identiques aux motifs historiques) :
+        - scène : [English Scene], puis "Scene: English"
+        - section : "[2022] eBOOK", puis "Section: eBOOK", puis titre
+          "eBOOK Rules [2022]" en tête de fichier
+        - année : la plus récente des [YYYY], sinon des (YYYY), sinon des
+          années isolées 19xx/20xx
+
+        Args:
+            content: Contenu décodé de la règle.
+
+        Returns:
+            Dictionnaire {scene, section, year} (None si non détecté).
+        """
+        found: dict[str, str] = {}
+        years: dict[str, int] = {}
+        for match in _SNIFF_RE.finditer(content):
+            kind = match.lastgroup
+            if kind == "title_year":
+                found.setdefault("title_section", match.group("title_section"))
+                kind, value = "year_bracket", match.group("title_year")
+            elif kind == "section_bracket":
+                found.setdefault("section_bracket", match.group("section_bracket"))
+                kind, value = "year_bracket", match.group("section_year")
+            else:
+                value = match.group(kind)
+            if kind.startswith("year_"):
+                year = int(value)
+                if MIN_YEAR <= year <= MAX_YEAR:
+                    years[kind] = max(year, years.get(kind, year))
+                    # [YYYY] et (YYYY) comptent aussi comme années isolées
+                    years["year_bare"] = max(year, years.get("year_bare", year))
+            else:
+                found.setdefault(kind, value)
+
+        return {
+            "scene": found.get("scene_bracket") or found.get("scene_field"),
+            "section": (
+                found.get("section_bracket")
+                or found.get("section_field")
+                or found.get("title_section")
+            ),
+            "year": years.get("year_bracket") or years.get("year_paren") or years.get("year_bare"),
+        }
+
+    def ingest(
+        self, raw: bytes, filename: str, overrides: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Prépare une règle à partir d'un fichier : décodage, métadonnées, spécification.
+
+        Args:
+            raw: Contenu brut du fichier.
+            filename: Nom du fichier (nom de règle par défaut, sans extension).
+            overrides: Valeurs fournies par l'utilisateur (name, scene,
+                section, year) prioritaires sur la détection.
+
+        Returns:
+            Dictionnaire {filename, name, content, encoding, scene, section,
+            year, metadata_extracted, spec} ; spec est la spécification
+            compilée pour une règle eBOOK, None sinon.
+
+        Raises:
+            RuleIngestError: Si le fichier dépasse la taille maximale.
+        """
+        if len(raw) > self.max_rule_bytes:
+            raise RuleIngestError(f"Rule file too large (max {self.max_rule_bytes} bytes)")
+        overrides = {key: value for key, value in (overrides or {}).items() if value}
+        content, encoding = self.decode(raw)
+        detected = self.sniff(content)
+        metadata = {
+            key: overrides.get(key) or detected[key] for key in ("scene", "section", "year")
+        }
+        basename = PurePosixPath(filename).name
+        section = metadata["section"]
+        return {
+            "filename": filename,
+            "name": overrides.get("name") or basename.rsplit(".", 1)[0],
+            "content": content,
+            "encoding": encoding,
+            **metadata,
+            "metadata_extracted": metadata,
+            "spec": (
+                self.parser.parse_ebook_rule_2022(content)
+                if isinstance(section, str) and section.casefold() == "ebook"
+                else None
+            ),
+        }
+
+    def iter_files(self, files: Iterable[FileStorage]) -> Iterator[tuple[str, bytes]]:
+        """Parcourt les fichiers d'un upload, archives ZIP développées.
+
+        Les fichiers sont lus un par un (lecture bornée à max_rule_bytes + 1) ;
+        les membres d'une archive sont lus à la demande.
+
+        Args:
+            files: Fichiers de la requête (werkzeug FileStorage).
+
+        Yields:
+            Tuples (nom de fichier, contenu brut) ; pour un membre d'archive,
+            le nom est "archive.zip/chemin/membre.nfo".
+
+        Raises:
+            RuleIngestError: Si un fichier est refusé (extension, taille,
+                archive invalide) ou si le lot dépasse max_files règles.
+        """
+        count = 0
+        for storage in files:
+            filename = storage.filename or ""
+            lowered = filename.lower()
+            if lowered.endswith(".zip"):
+                members = self._iter_zip(storage, filename)
+            elif lowered.endswith(RULE_EXTENSIONS):
+                members = iter([(filename, storage.stream.read(self.max_rule_bytes + 1))])
+            else:
+                raise RuleIngestError(f"{filename}: invalid file type (allowed: .nfo, .txt, .zip)")
+            for member in members:
+                count += 1
+                if count > self.max_files:
+                    raise RuleIngestError(f"Too many rule files (max {self.max_files})")
+                yield member
+
+    def _iter_zip(self, storage: FileStorage, filename: str) -> Iterator[tuple[str, bytes]]:
+        """Parcourt les membres .nfo/.txt d'une archive ZIP uploadée."""
+        try:
+            archive = zipfile.ZipFile(storage.stream)
+        except zipfile.BadZipFile as e:
+            raise RuleIngestError(f"{filename}: invalid ZIP archive") from e
+        with archive:
+            for info in archive.infolist():
+                path = PurePosixPath(info.filename)
+                if (
+                    info.is_dir()
+                    or not path.name.lower().endswith(RULE_EXTENSIONS)
+                    or path.name.startswith(".")
+                    or "__MACOSX" in path.parts
+                ):
+                    continue
+                if info.file_size > self.max_rule_bytes:
+                    raise RuleIngestError(
+                        f"{filename}/{info.filename}: rule file too large "
+                        f"(max {self.max_rule_bytes} bytes)"
+                    )
+                with archive.open(info) as member:
+                    yield f"{filename}/{info.filename}", member.read(self.max_rule_bytes + 1)
+
+    @staticmethod
+    def create_rules(items: list[dict[str, Any]], user_id: int | None = None) -> list[Rule]:
+        """Insère des règles ingérées en un seul flush, avec leur première révision.
+
+        Args:
+            items: Règles préparées par ingest().
+            user_id: Auteur des révisions (optionnel).
+
+        Returns:
+            Règles créées (identifiants attribués ; commit à la charge de l'appelant).
+        """
+        rules = [
+            Rule(
+                name=item["name"],
+                content=item["content"],
+                scene=item.get("scene"),
+                section=item.get("section"),
+                year=item.get("year"),
+            )
+            for item in items
+        ]
+        db.session.add_all(rules)
+        db.session.flush()
+        RuleRevisionService().record_new(rules, user_id)
+        logger.info(f"{len(rules)} règle(s) importée(s)")
+        return rules
@@ -0,0 +1,350 @@
+"""Historique des versions du contenu des règles (snapshots et deltas de lignes).
+
+Les règles Scene sont des NFO volumineux qui changent de quelques lignes d'une
+révision à l'autre. Les modifications (PUT /rules, téléchargement, upload,
+synchronisation du miroir) écrasaient Rule.content sans conserver l'historique.
+
+Architecture :
+- Table rule_revisions : une ligne par révision (numérotées à partir de 1
+  par règle), empreinte SHA-256 du contenu complet
+- Snapshot périodique : contenu complet, toutes les SNAPSHOT_INTERVAL
+  révisions (et pour la première révision)
+- Delta : opérations de lignes (difflib.SequenceMatcher) par rapport au
+  dernier snapshot, et non à la révision précédente ; la reconstruction
+  d'une révision lit au plus deux lignes (snapshot + delta) et applique un
+  seul delta, sans chaîne à rejouer
+- Un delta qui dépasse DELTA_MAX_RATIO du contenu est remplacé par un
+  snapshot (réécriture importante de la règle)
+- Les releases référencent (rule_id, revision) : aucun contenu dupliqué
+
+Format d'un delta (JSON) : liste d'opérations appliquées dans l'ordre ;
+[i, j] copie les lignes i..j-1 du snapshot, une chaîne est insérée telle quelle.
+
+Complexité : O(n·m) au pire pour calculer un delta (SequenceMatcher, n et m
+lignes), O(n) pour reconstruire une révision.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+import logging
+from typing import Any
+
+from sqlalchemy import delete, func, select
+
+from web.extensions import db
+from web.models import Rule, RuleRevision
+
+logger = logging.getLogger(__name__)
+
+# Nombre maximal de révisions entre deux snapshots
+SNAPSHOT_INTERVAL = 20
+
+# Taille maximale d'un delta, relative à la taille du contenu
+DELTA_MAX_RATIO = 0.5
+
+
+def _sha256(content: str) -> str:
+    """Retourne l'empreinte SHA-256 (hex) d'un contenu de règle."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class RuleRevisionService:
+    """Service d'historique des révisions de règles.
+
+    Pièges potentiels :
+    - record() doit être appelé dans la transaction qui modifie Rule.content
+      (l'appelant valide avec db.session.commit())
+    - Les règles créées avant l'historique n'ont aucune révision : appeler
+      record() avant d'écraser le contenu conserve l'ancienne version comme
+      révision de base
+    - Deux écritures concurrentes sur la même règle peuvent viser le même
+      numéro de révision : la contrainte unique fait échouer la seconde
+
+    Exemple d'utilisation :
+        service = RuleRevisionService()
+        service.record(rule)  # conserve la version courante si nécessaire
+        rule.content = new_content
+        revision = service.record(rule, user_id=user.id)
+        db.session.commit()
+        diff = service.diff(rule.id, revision - 1, revision)
+    """
+
+    def __init__(
+        self,
+        snapshot_interval: int = SNAPSHOT_INTERVAL,
+        delta_max_ratio: float = DELTA_MAX_RATIO,
+    ) -> None:
+        """Initialise le service.
+
+        Args:
+            snapshot_interval: Nombre maximal de révisions entre deux snapshots.
+            delta_max_ratio: Taille maximale d'un delta relative au contenu.
+        """
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.delta_max_ratio = delta_max_ratio
+
+    def record(self, rule: Rule, user_id: int | None = None) -> int:
+        """Enregistre le contenu courant d'une règle comme révision, si nécessaire.
+
+        Algorithme :
+        1. Dernière révision de la règle (projection, sans payload)
+        2. Contenu identique (même SHA-256) : aucune écriture
+        3. Sinon, nouvelle révision : snapshot si première révision, intervalle
+           atteint ou delta trop volumineux ; delta contre le dernier snapshot
+           dans les autres cas
+
+        Args:
+            rule: Règle (ajoutée à la session ; flush effectué si nécessaire).
+            user_id: Auteur de la révision (optionnel).
+
+        Returns:
+            Numéro de la révision correspondant au contenu courant.
+        """
+        if rule.id is None:
+            db.session.flush()
+        content = rule.content or ""
+        digest = _sha256(content)
+        latest = db.session.execute(
+            select(
+                RuleRevision.revision,
+                RuleRevision.content_sha256,
+                RuleRevision.kind,
+                RuleRevision.base_revision,
+            )
+            .where(RuleRevision.rule_id == rule.id)
+            .order_by(RuleRevision.revision.desc())
+            .limit(1)
+        ).first()
+        if latest is not None and latest.content_sha256 == digest:
+            return latest.revision
+
+        number = 1 if latest is None else latest.revision + 1
+        kind, base_revision, payload = "snapshot", None, content
+        if latest is not None:
+            snapshot_revision = (
+                latest.revision if latest.kind == "snapshot" else latest.base_revision
+            )
+            if number - snapshot_revision < self.snapshot_interval:
+                snapshot = self._payload(rule.id, snapshot_revision)
+                delta = json.dumps(
+                    self.compute_delta(snapshot, content),
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                )
+                if len(delta) <= len(content) * self.delta_max_ratio:
+                    kind, base_revision, payload = "delta", snapshot_revision, delta
+
+        db.session.add(
+            RuleRevision(
+                rule_id=rule.id,
+                revision=number,
+                kind=kind,
+                base_revision=base_revision,
+                payload=payload,
+                content_sha256=digest,
+                content_size=len(content),
+                line_count=len(content.splitlines()),
+                created_by=user_id,
+            )
+        )
+        db.session.flush()
+        logger.debug(f"Règle {rule.id}: révision {number} ({kind}, {len(payload)} caractères)")
+        return number
+
+    @staticmethod
+    def record_new(rules: list[Rule], user_id: int | None = None) -> None:
+        """Enregistre la première révision (snapshot) de règles nouvellement créées.
+
+        Variante groupée de record() pour les imports : aucune lecture de
+        l'historique (les règles n'en ont pas), un seul flush.
+
+        Args:
+            rules: Règles créées (identifiants attribués par un flush préalable).
+            user_id: Auteur des révisions (optionnel).
+        """
+        db.session.add_all(
+            RuleRevision(
+                rule_id=rule.id,
+                revision=1,
+                kind="snapshot",
+                base_revision=None,
+                payload=rule.content or "",
+                content_sha256=_sha256(rule.content or ""),
+                content_size=len(rule.content or ""),
+                line_count=len((rule.content or "").splitlines()),
+                created_by=user_id,
+            )
+            for rule in rules
+        )
+        db.session.flush()
+
+    @staticmethod
+    def compute_delta(base: str, content: str) -> list[list[int] | str]:
+        """Calcule le delta de lignes transformant base en content.
+
+        Args:
+            base: Contenu du snapshot.
+            content: Nouveau contenu.
+
+        Returns:
+            Liste d'opérations : [i, j] copie les lignes base[i:j], une chaîne
+            est insérée telle quelle (lignes consécutives fusionnées).
+        """
+        base_lines = base.splitlines(keepends=True)
+        lines = content.splitlines(keepends=True)
+        matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+        ops: list[list[int] | str] = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                ops.append([i1, i2])
+            elif tag in ("replace", "insert"):
+                ops.append("".join(lines[j1:j2]))
+        return ops
+
+    @staticmethod
+    def apply_delta(base: str, ops: list[list[int] | str]) -> str:
+        """Applique un delta de lignes (compute_delta) à un snapshot.
+
+        Args:
+            base: Contenu du snapshot.
+            ops: Opérations du delta.
+
+        Returns:
+            Contenu reconstruit.
+        """
+        base_lines = base.splitlines(keepends=True)
+        parts: list[str] = []
+        for op in ops:
+            if isinstance(op, str):
+                parts.append(op)
+            else:
+                parts.extend(base_lines[op[0] : op[1]])
+        return "".join(parts)
+
+    def latest_revision(self, rule_id: int) -> int | None:
+        """Retourne le numéro de la dernière révision d'une règle (None si aucune)."""
+        return db.session.scalar(
+            select(func.max(RuleRevision.revision)).where(RuleRevision.rule_id == rule_id)
+        )
+
+    def list_revisions(self, rule_id: int) -> list[dict[str, Any]]:
+        """Liste les révisions d'une règle (métadonnées, sans contenu).
+
+        Args:
+            rule_id: Identifiant de la règle.
+
+        Returns:
+            Révisions par numéro croissant (voir RuleRevision.to_dict).
+        """
+        rows = db.session.execute(
+            select(
+                RuleRevision.rule_id,
+                RuleRevision.revision,
+                RuleRevision.kind,
+                RuleRevision.base_revision,
+                RuleRevision.content_sha256,
+                RuleRevision.content_size,
+                RuleRevision.line_count,
+                func.length(RuleRevision.payload).label("stored_size"),
+                RuleRevision.created_by,
+                RuleRevision.created_at,
+            )
+            .where(RuleRevision.rule_id == rule_id)
+            .order_by(RuleRevision.revision)
+        )
+        return [
+            {
+                **row._asdict(),
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+            }
+            for row in rows
+        ]
+
+    def content(self, rule_id: int, revision: int) -> str | None:
+        """Reconstruit le contenu d'une révision.
+
+        Args:
+            rule_id: Identifiant de la règle.
+            revision: Numéro de la révision.
+
+        Returns:
+            Contenu de la règle à cette révision, None si la révision n'existe pas.
+
+        Raises:
+            ValueError: Si le contenu reconstruit ne correspond pas à l'empreinte
+                enregistrée (historique corrompu).
+        """
+        row = db.session.execute(
+            select(
+                RuleRevision.kind,
+                RuleRevision.base_revision,
+                RuleRevision.payload,
+                RuleRevision.content_sha256,
+            ).where(RuleRevision.rule_id == rule_id, RuleRevision.revision == revision)
+        ).first()
+        if row is None:
+            return None
+        if row.kind == "snapshot":
+            content = row.payload
+        else:
+            snapshot = self._payload(rule_id, row.base_revision)
+            content = self.apply_delta(snapshot, json.loads(row.payload))
+        if _sha256(content) != row.content_sha256:
+            raise ValueError(f"Corrupted revision {revision} of rule {rule_id}")
+        return content
+
+    def diff(
+        self, rule_id: int, from_revision: int, to_revision: int, context: int = 3
+    ) -> dict[str, Any] | None:
+        """Calcule le diff unifié entre deux révisions d'une règle.
+
+        Args:
+            rule_id: Identifiant de la règle.
+            from_revision: Révision de départ.
+            to_revision: Révision d'arrivée.
+            context: Nombre de lignes de contexte autour des modifications.
+
+        Returns:
+            Dictionnaire {rule_id, from_revision, to_revision, added, removed,
+            diff} ; None si l'une des révisions n'existe pas.
+        """
+        before = self.content(rule_id, from_revision)
+        after = self.content(rule_id, to_revision)
+        if before is None or after is None:
+            return None
+        lines = list(
+            difflib.unified_diff(
+                before.splitlines(keepends=True),
+                after.splitlines(keepends=True),
+                fromfile=f"rule-{rule_id}@{from_revision}",
+                tofile=f"rule-{rule_id}@{to_revision}",
+                n=context,
+            )
+        )
+        added = sum(1 for line in lines if line.startswith("+") and not line.startswith("+++"))
+        removed = sum(1 for line in lines if line.startswith("-") and not line.startswith("---"))
+        return {
+            "rule_id": rule_id,
+            "from_revision": from_revision,
+            "to_revision": to_revision,
+            "added": added,
+            "removed": removed,
+            "diff": "".join(line if line.endswith("\n") else f"{line}\n" for line in lines),
+        }
+
+    @staticmethod
+    def purge(rule_id: int) -> None:
+        """Supprime l'historique d'une règle (à appeler avant sa suppression)."""
+        db.session.execute(delete(RuleRevision).where(RuleRevision.rule_id == rule_id))
+
+    @staticmethod
+    def _payload(rule_id: int, revision: int) -> str:
+        """Retourne le payload d'une révision (contenu complet pour un snapshot)."""
+        return db.session.scalar(
+            select(RuleRevision.payload).where(
+                RuleRevision.rule_id == rule_id, RuleRevision.revision == revision
+            )
+        )
@@ -0,0 +1,458 @@
+"""Recherche plein texte indexée dans le contenu des règles.
+
+GET /rules?search= filtrait par Rule.name LIKE '%q%' OR Rule.content LIKE
+'%q%' : chaque recherche relisait et parcourait le contenu NFO de toutes les
+règles. Ce service maintient un index inversé en mémoire, propre à chaque
+application (worker), rafraîchi après les écritures de règles.
+
+Architecture :
+- Documents : nom + contenu de chaque règle, découpés en jetons \\w+
+  (casefold) ; décalages de caractères conservés pour les extraits
+- Index inversé : jeton -> {rule_id -> positions} (array('I'))
+- Fraîcheur : empreinte (nombre, id max, updated_at max, id max des
+  révisions) vérifiée par une requête d'agrégat à chaque recherche ; en cas
+  de changement, seules les règles créées, modifiées ou supprimées sont
+  réindexées (projection id, updated_at, dernière révision puis lecture du
+  contenu des seules règles modifiées). updated_at seul ne suffit pas : MySQL
+  le stocke à la seconde, deux écritures dans la même seconde le laissent
+  inchangé ; chaque écriture de contenu crée en revanche une révision
+- Les écritures de règles appellent invalidate(rule_ids) : les règles
+  concernées sont réindexées par le worker qui a écrit, même sans nouvelle
+  révision (nom, section, année, scène)
+- Requêtes : termes (ET), préfixes (term*), phrases ("..."), filtres
+  section:, year:, scene: ; score = occurrences, bonus pour le nom
+- Extraits : fenêtres autour des occurrences, échappées HTML, occurrences
+  entourées de <mark>
+
+Complexité : O(Σ postings des termes) par recherche, indépendante de la
+taille totale des NFO ; O(taille des règles modifiées) par rafraîchissement.
+"""
+
+from __future__ import annotations
+
+import bisect
+import html
+import logging
+import re
+import threading
+from array import array
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import TYPE_CHECKING, Any
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from web.extensions import db
+from web.models import Rule, RuleRevision
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Clé de l'index dans app.extensions (un index par application)
+EXTENSION_KEY = "rule_search_index"
+
+# Bonus de score pour une occurrence dans le nom de la règle
+NAME_BOOST = 5
+
+# Caractères de contexte de part et d'autre d'une occurrence dans un extrait
+SNIPPET_CONTEXT = 60
+
+_TOKEN_RE = re.compile(r"\w+")
+_QUERY_RE = re.compile(r'(\w+):("[^"]*"|\S+)|"([^"]*)"|(\S+)')
+_FILTER_FIELDS = ("section", "year", "scene")
+
+
+@dataclass(slots=True)
+class _Document:
+    """Règle indexée : texte (nom + contenu) et décalages de ses jetons."""
+
+    name: str
+    section: str | None
+    year: int | None
+    scene: str | None
+    version: Any
+    text: str
+    name_tokens: int
+    starts: array = field(default_factory=lambda: array("I"))
+    ends: array = field(default_factory=lambda: array("I"))
+    tokens: frozenset[str] = frozenset()
+
+
+def _tokenize(text: str) -> list[str]:
+    """Découpe un texte en jetons normalisés (casefold)."""
+    return [match.group().casefold() for match in _TOKEN_RE.finditer(text)]
+
+
+class RuleSearchIndex:
+    """Index inversé du contenu des règles (une instance par application).
+
+    Pièges potentiels :
+    - L'index vit dans le processus : chaque worker construit le sien à sa
+      première recherche (lecture complète des règles)
+    - Une modification sans nouvelle révision (nom, section, année, scène)
+      dans la même seconde qu'une écriture précédente n'est vue que par le
+      worker qui l'a faite (invalidate) ; les autres la voient à l'écriture
+      suivante
+    - Une écriture SQL directe du contenu, sans révision ni mise à jour
+      d'updated_at, n'est pas détectée
+    """
+
+    def __init__(self) -> None:
+        """Initialise un index vide."""
+        self._lock = threading.Lock()
+        self._docs: dict[int, _Document] = {}
+        self._postings: dict[str, dict[int, array]] = {}
+        self._vocabulary: list[str] | None = None
+        self._fingerprint: tuple[Any, ...] | None = None
+
+    def __len__(self) -> int:
+        """Nombre de règles indexées."""
+        return len(self._docs)
+
+    def refresh(self) -> int:
+        """Met l'index à jour si les règles ont changé depuis le dernier appel.
+
+        Returns:
+            Nombre de règles réindexées ou retirées (0 si l'index était à jour).
+        """
+        fingerprint = tuple(
+            db.session.execute(
+                select(
+                    func.count(Rule.id),
+                    func.max(Rule.id),
+                    func.max(Rule.updated_at),
+                    select(func.max(RuleRevision.id)).scalar_subquery(),
+                )
+            ).one()
+        )
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                return 0
+            latest = (
+                select(RuleRevision.rule_id, func.max(RuleRevision.revision).label("revision"))
+                .group_by(RuleRevision.rule_id)
+                .subquery()
+            )
+            versions = {
+                row.id: (row.updated_at, row.revision)
+                for row in db.session.execute(
+                    select(Rule.id, Rule.updated_at, latest.c.revision).outerjoin(
+                        latest, latest.c.rule_id == Rule.id
+                    )
+                )
+            }
+            removed = [rule_id for rule_id in self._docs if rule_id not in versions]
+            changed = [
+                rule_id
+                for rule_id, version in versions.items()
+                if rule_id not in self._docs or self._docs[rule_id].version != version
+            ]
+            for rule_id in removed + changed:
+                self._remove(rule_id)
+            if changed:
+                rows = db.session.execute(
+                    select(
+                        Rule.id,
+                        Rule.name,
+                        Rule.content,
+                        Rule.section,
+                        Rule.year,
+                        Rule.scene,
+                    ).where(Rule.id.in_(changed))
+                )
+                for row in rows:
+                    self._add(row, versions[row.id])
+            self._vocabulary = None
+            self._fingerprint = fingerprint
+        logger.debug(
+            f"Index de recherche des règles: {len(changed)} indexée(s), {len(removed)} retirée(s)"
+        )
+        return len(changed) + len(removed)
+
+    def invalidate(self, rule_ids: Iterable[int] | None = None) -> None:
+        """Force la réindexation de règles à la prochaine recherche.
+
+        Args:
+            rule_ids: Règles écrites (toutes si None).
+        """
+        with self._lock:
+            self._fingerprint = None
+            for rule_id in self._docs if rule_ids is None else rule_ids:
+                doc = self._docs.get(rule_id)
+                if doc is not None:
+                    doc.version = None
+
+    def search(
+        self,
+        query: str,
+        section: str | None = None,
+        limit: int | None = 20,
+        snippets: int = 3,
+    ) -> list[dict[str, Any]]:
+        """Recherche les règles correspondant à une requête.
+
+        Syntaxe de la requête :
+        - termes séparés par des espaces : tous requis (ET)
+        - term* : jetons commençant par term
+        - "phrase exacte" ou mot composé (TV-720p) : jetons consécutifs
+        - section:eBOOK, year:2022, scene:English : filtres (insensibles à la casse)
+
+        Args:
+            query: Requête de recherche.
+            section: Filtre de section supplémentaire (optionnel).
+            limit: Nombre maximal de résultats (None : tous).
+            snippets: Nombre maximal d'extraits par règle (0 : aucun).
+
+        Returns:
+            Résultats par score décroissant : {id, name, section, year, scene,
+            score, snippets} ; liste vide si la requête ne contient aucun terme.
+        """
+        clauses, filters = self.parse_query(query)
+        if section:
+            filters["section"] = section.casefold()
+        self.refresh()
+        if not clauses:
+            return []
+
+        with self._lock:
+            # rule_id -> [(positions triées, longueur en jetons)] pour chaque clause
+            hits: dict[int, list[tuple[Sequence[int], int]]] | None = None
+            for clause in clauses:
+                matches = self._match(clause)
+                if hits is None:
+                    hits = {rule_id: [match] for rule_id, match in matches.items()}
+                else:
+                    hits = {
+                        rule_id: [*hits[rule_id], match]
+                        for rule_id, match in matches.items()
+                        if rule_id in hits
+                    }
+                if not hits:
+                    return []
+
+            results = []
+            for rule_id, rule_hits in hits.items():
+                doc = self._docs[rule_id]
+                if not self._accepts(doc, filters):
+                    continue
+                # Positions triées : occurrences dans le nom = positions < name_tokens
+                count = sum(len(positions) for positions, _ in rule_hits)
+                in_name = sum(
+                    bisect.bisect_left(positions, doc.name_tokens) for positions, _ in rule_hits
+                )
+                results.append((count + NAME_BOOST * in_name, rule_id, rule_hits))
+            results.sort(key=lambda result: (-result[0], result[1]))
+            if limit is not None:
+                results = results[:limit]
+
+            return [
+                {
+                    "id": rule_id,
+                    "name": self._docs[rule_id].name,
+                    "section": self._docs[rule_id].section,
+                    "year": self._docs[rule_id].year,
+                    "scene": self._docs[rule_id].scene,
+                    "score": score,
+                    "snippets": (
+                        self._snippets(self._docs[rule_id], rule_hits, snippets) if snippets else []
+                    ),
+                }
+                for score, rule_id, rule_hits in results
+            ]
+
+    def matching_ids(self, query: str) -> list[int]:
+        """Retourne les identifiants des règles correspondant à une requête (par score)."""
+        return [result["id"] for result in self.search(query, limit=None, snippets=0)]
+
+    @staticmethod
+    def parse_query(query: str) -> tuple[list[tuple[str, list[str]]], dict[str, str]]:
+        """Analyse une requête de recherche.
+
+        Args:
+            query: Requête brute.
+
+        Returns:
+            Tuple (clauses, filtres) : clauses ("term" | "prefix" | "phrase",
+            jetons) et filtres {section|year|scene: valeur casefold}.
+        """
+        clauses: list[tuple[str, list[str]]] = []
+        filters: dict[str, str] = {}
+        for match in _QUERY_RE.finditer(query or ""):
+            key, value, phrase, word = match.groups()
+            if key is not None and key.casefold() in _FILTER_FIELDS:
+                filters[key.casefold()] = value.strip('"').casefold()
+                continue
+            text = phrase if phrase is not None else (word if word is not None else match.group())
+            tokens = _tokenize(text)
+            if not tokens:
+                continue
+            if len(tokens) > 1:
+                # Phrase entre guillemets ou mot composé (TV-720p) : jetons consécutifs
+                clauses.append(("phrase", tokens))
+            elif text.endswith("*"):
+                clauses.append(("prefix", tokens))
+            else:
+                clauses.append(("term", tokens))
+        return clauses, filters
+
+    def _add(self, row: Any, version: Any) -> None:
+        """Indexe une règle (ligne de projection) avec sa version (updated_at, révision)."""
+        name = row.name or ""
+        text = f"{name}\n{row.content or ''}"
+        matches = list(_TOKEN_RE.finditer(text))
+        # casefold groupé (un seul appel) : ne produit jamais de saut de ligne
+        tokens = "\n".join(match.group() for match in matches).casefold().split("\n")
+        positions: dict[str, list[int]] = {}
+        for position, token in enumerate(tokens if matches else ()):
+            positions.setdefault(token, []).append(position)
+        for token, token_positions in positions.items():
+            self._postings.setdefault(token, {})[row.id] = array("I", token_positions)
+        self._docs[row.id] = _Document(
+            name=name,
+            section=row.section,
+            year=row.year,
+            scene=row.scene,
+            version=version,
+            text=text,
+            name_tokens=len(_TOKEN_RE.findall(name)),
+            starts=array("I", [match.start() for match in matches]),
+            ends=array("I", [match.end() for match in matches]),
+            tokens=frozenset(positions),
+        )
+
+    def _remove(self, rule_id: int) -> None:
+        """Retire une règle de l'index."""
+        doc = self._docs.pop(rule_id, None)
+        if doc is None:
+            return
+        for token in doc.tokens:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(rule_id, None)
+                if not postings:
+                    del self._postings[token]
+
+    def _match(self, clause: tuple[str, list[str]]) -> dict[int, tuple[Sequence[int], int]]:
+        """Retourne les occurrences d'une clause : rule_id -> (positions triées, longueur)."""
+        kind, tokens = clause
+        if kind == "term":
+            return {
+                rule_id: (positions, 1)
+                for rule_id, positions in self._postings.get(tokens[0], {}).items()
+            }
+        if kind == "prefix":
+            if self._vocabulary is None:
+                self._vocabulary = sorted(self._postings)
+            start = bisect.bisect_left(self._vocabulary, tokens[0])
+            merged: dict[int, list[Sequence[int]]] = {}
+            for token in self._vocabulary[start:]:
+                if not token.startswith(tokens[0]):
+                    break
+                for rule_id, positions in self._postings[token].items():
+                    merged.setdefault(rule_id, []).append(positions)
+            return {
+                rule_id: (parts[0] if len(parts) == 1 else sorted(chain(*parts)), 1)
+                for rule_id, parts in merged.items()
+            }
+
+        # Phrase : position p du premier jeton telle que p + i porte le jeton i
+        postings = [self._postings.get(token) for token in tokens]
+        if not all(postings):
+            return {}
+        matches = {}
+        for rule_id in set(postings[0]).intersection(*postings[1:]):
+            starts = set(postings[0][rule_id])
+            for offset, token_postings in enumerate(postings[1:], 1):
+                starts.intersection_update(
+                    position - offset for position in token_postings[rule_id]
+                )
+                if not starts:
+                    break
+            if starts:
+                matches[rule_id] = (sorted(starts), len(tokens))
+        return matches
+
+    @staticmethod
+    def _accepts(doc: _Document, filters: dict[str, str]) -> bool:
+        """Indique si une règle satisfait les filtres section/year/scene."""
+        for key, expected in filters.items():
+            value = getattr(doc, key)
+            if value is None or str(value).casefold() != expected:
+                return False
+        return True
+
+    @staticmethod
+    def _snippets(doc: _Document, hits: list[tuple[Sequence[int], int]], count: int) -> list[str]:
+        """Construit jusqu'à count extraits surlignés autour des premières occurrences."""
+        # Quelques occurrences par clause suffisent pour count fenêtres
+        spans = sorted(
+            {
+                (doc.starts[position], doc.ends[position + length - 1])
+                for positions, length in hits
+                for position in positions[: count * 8]
+            }
+        )
+        snippets: list[str] = []
+        index = 0
+        while index < len(spans) and len(snippets) < count:
+            window_start = max(0, spans[index][0] - SNIPPET_CONTEXT)
+            window_end = min(len(doc.text), spans[index][1] + SNIPPET_CONTEXT)
+            parts = ["…" if window_start else ""]
+            cursor = window_start
+            while index < len(spans) and spans[index][0] < window_end:
+                start, end = spans[index]
+                if start >= cursor:
+                    parts.append(html.escape(doc.text[cursor:start]))
+                    parts.append(f"<mark>{html.escape(doc.text[start:end])}</mark>")
+                    cursor = end
+                    window_end = min(len(doc.text), max(window_end, end + SNIPPET_CONTEXT // 2))
+                index += 1
+            parts.append(html.escape(doc.text[cursor:window_end]))
+            parts.append("…" if window_end < len(doc.text) else "")
+            snippets.append(" ".join("".join(parts).split()))
+        return snippets
+
+
+class RuleSearchService:
+    """Service de recherche plein texte dans les règles.
+
+    L'index inversé est conservé dans app.extensions : il est partagé par
+    toutes les requêtes de l'application et rafraîchi avant chaque recherche.
+
+    Exemple d'utilisation :
+        results = RuleSearchService().search('"file size" section:eBOOK')
+        for result in results:
+            print(result["name"], result["snippets"])
+    """
+
+    @staticmethod
+    def index() -> RuleSearchIndex:
+        """Retourne l'index de l'application courante (créé au premier appel)."""
+        return current_app.extensions.setdefault(EXTENSION_KEY, RuleSearchIndex())
+
+    def search(
+        self,
+        query: str,
+        section: str | None = None,
+        limit: int | None = 20,
+        snippets: int = 3,
+    ) -> list[dict[str, Any]]:
+        """Recherche dans les règles (voir RuleSearchIndex.search)."""
+        return self.index().search(query, section=section, limit=limit, snippets=snippets)
+
+    def matching_ids(self, query: str) -> list[int]:
+        """Identifiants des règles correspondant à la requête, par score décroissant."""
+        return self.index().matching_ids(query)
+
+    @staticmethod
+    def parse_query(query: str) -> tuple[list[tuple[str, list[str]]], dict[str, str]]:
+        """Analyse une requête de recherche (voir RuleSearchIndex.parse_query)."""
+        return RuleSearchIndex.parse_query(query)
+
+    @classmethod
+    def invalidate(cls, rule_ids: Iterable[int] | None = None) -> None:
+        """Force la réindexation des règles écrites (toutes si None), après le commit."""
+        cls.index().invalidate(rule_ids)
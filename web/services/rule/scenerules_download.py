@@ -5,7 +5,8 @@ le site scenerules.org, qui est la référence officielle pour les règles de
 nommage et packaging des releases Scene.
 
 Architecture :
-- Utilise requests.Session pour réutiliser les connexions HTTP
+- Utilise une requests.Session poolée partagée par le processus (connexions
+  TCP/TLS réutilisées d'une requête API à l'autre et entre threads)
 - Gère les timeouts et erreurs réseau
 - Supporte les formats NFO (ASCII art) et HTML
 - Gère les encodages UTF-8 et ISO-8859-1 (standard pour fichiers NFO)
@@ -23,15 +24,51 @@ Les URLs suivent le pattern : /nfo/{year}_{section}.nfo
 from __future__ import annotations
 
 import re
+import threading
 from typing import Any
 from urllib.parse import urljoin
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from web.services.rule.rule_ingest import RuleIngestService
 
 # Constants
 HTTP_STATUS_NOT_FOUND = 404
 HTTP_STATUS_OK = 200
 
+# Connexions conservées par hôte dans la session partagée (une par worker de
+# synchronisation concurrente)
+DEFAULT_POOL_SIZE = 8
+
+USER_AGENT = "eBook-Scene-Packer-v2/1.0"
+
+_SHARED_SESSION: requests.Session | None = None
+_SHARED_SESSION_LOCK = threading.Lock()
+
+
+def shared_session() -> requests.Session:
+    """Retourne la session HTTP poolée partagée par le processus.
+
+    La session est créée au premier appel ; son pool (DEFAULT_POOL_SIZE
+    connexions par hôte) est dimensionné pour la synchronisation concurrente.
+    requests.Session peut être utilisée depuis plusieurs threads tant que ses
+    en-têtes et adaptateurs ne sont pas modifiés après sa création.
+
+    Returns:
+        Session requests avec User-Agent configuré.
+    """
+    global _SHARED_SESSION  # noqa: PLW0603
+    with _SHARED_SESSION_LOCK:
+        if _SHARED_SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=DEFAULT_POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"User-Agent": USER_AGENT})
+            _SHARED_SESSION = session
+        return _SHARED_SESSION
+
 
 class ScenerulesDownloadService:
     """Service de téléchargement et gestion des règles Scene depuis scenerules.org.
@@ -57,41 +94,41 @@ class ScenerulesDownloadService:
     NFO_URL_TEMPLATE = "{base_url}/nfo/{year}_{section}.nfo"
     HTML_URL_TEMPLATE = "{base_url}/html/{year}_{section}.html"
 
-    def __init__(self, timeout: int = 30) -> None:
+    def __init__(
+        self,
+        timeout: int = 30,
+        session: requests.Session | None = None,
+        base_url: str | None = None,
+    ) -> None:
         """Initialise le service de téléchargement.
 
-        Cette méthode configure une session HTTP réutilisable avec un User-Agent
-        personnalisé et un timeout configurable. L'utilisation de requests.Session
-        permet de réutiliser les connexions TCP, améliorant les performances
-        lors de multiples téléchargements.
+        Le service utilise par défaut la session HTTP poolée partagée par le
+        processus (shared_session) : créer un service par requête API ne crée
+        plus de nouvelle connexion TCP/TLS vers scenerules.org.
 
         Algorithme :
-        1. Création d'une session HTTP réutilisable
-        2. Configuration du User-Agent pour identification
-        3. Configuration du timeout pour éviter les blocages
+        1. Session fournie, ou session partagée (User-Agent déjà configuré)
+        2. Configuration du timeout pour éviter les blocages
+        3. URL de base surchargée si fournie (miroir, serveur de test)
 
         Complexité : O(1) - Initialisation simple sans dépendances externes.
 
         Pièges potentiels :
         - Le timeout doit être suffisant pour les téléchargements lents
         - Le User-Agent peut être bloqué par certains serveurs (rare)
-        - La session doit être fermée si le service n'est plus utilisé
-          (mais généralement géré automatiquement par le garbage collector)
+        - Ne pas modifier les en-têtes de la session partagée : utiliser une
+          session dédiée pour un comportement spécifique
 
         Args:
             timeout: Timeout en secondes pour les requêtes HTTP (défaut: 30).
                      Doit être adapté selon la vitesse de connexion réseau.
+            session: Session HTTP (défaut : session poolée partagée).
+            base_url: URL de base des règles (défaut : BASE_URL).
         """
         self.timeout = timeout
-        # Création d'une session HTTP réutilisable
-        # Avantage : réutilisation des connexions TCP, amélioration des performances
-        self.session = requests.Session()
-        # Configuration du User-Agent pour identification dans les logs serveur
-        self.session.headers.update(
-            {
-                "User-Agent": "eBook-Scene-Packer-v2/1.0",
-            }
-        )
+        self.session = session or shared_session()
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
 
     def list_available_rules(self) -> list[dict[str, Any]]:
         """Liste les règles disponibles sur scenerules.org.
@@ -262,15 +299,11 @@ class ScenerulesDownloadService:
             # Lève une HTTPError si le statut est >= 400
             response.raise_for_status()
 
-            # Décodage du contenu avec gestion des encodages
-            # Essai UTF-8 en premier (standard moderne)
-            try:
-                content = response.text
-            except UnicodeDecodeError:
-                # Fallback vers ISO-8859-1 (standard pour fichiers NFO ASCII art)
-                # Les fichiers NFO Scene utilisent souvent cet encodage pour les
-                # caractères spéciaux ASCII art (box-drawing characters)
-                content = response.content.decode("iso-8859-1")
+            # Décodage des octets bruts avec détection du jeu de caractères
+            # (UTF-8, CP437 pour l'ASCII art NFO, CP1252/ISO-8859-1) : même
+            # décodage que le miroir local et les uploads. response.text décode
+            # text/plain sans charset en ISO-8859-1, ce qui altère l'UTF-8.
+            content, _encoding = RuleIngestService.decode(response.content)
 
             # Extraction des métadonnées depuis les paramètres
             # Construction du nom complet de la règle
@@ -352,12 +385,8 @@ class ScenerulesDownloadService:
             response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
 
-            # Décodage du contenu avec gestion des encodages
-            # Même logique que download_rule : UTF-8 puis ISO-8859-1
-            try:
-                content = response.text
-            except UnicodeDecodeError:
-                content = response.content.decode("iso-8859-1")
+            # Même décodage que download_rule
+            content, _encoding = RuleIngestService.decode(response.content)
 
             # Extraction des métadonnées depuis l'URL via regex
             # Pattern : /{year}_{section}.nfo à la fin de l'URL
@@ -0,0 +1,335 @@
+"""Synchronisation conditionnelle et concurrente des règles scenerules.org.
+
+Ce service maintient un miroir local des fichiers NFO de toutes les règles
+connues (ScenerulesDownloadService.list_available_rules), pour que la
+validation et le parsing des règles fonctionnent sans accès réseau.
+
+Architecture :
+- Miroir : <mirror_dir>/nfo/{year}_{section}.nfo (corps bruts, octets tels
+  que servis) et <mirror_dir>/index.json (validateurs HTTP et empreintes)
+- Requêtes conditionnelles : If-None-Match (ETag) et If-Modified-Since
+  (Last-Modified) mémorisés à la synchronisation précédente ; une réponse
+  304 ne transfère aucun corps et ne réécrit rien
+- Téléchargements concurrents (ThreadPoolExecutor) sur la session poolée
+  partagée du ScenerulesDownloadService
+- Écritures atomiques (fichier temporaire puis os.replace) : un lecteur ne
+  voit jamais un NFO tronqué ; l'index est réécrit une seule fois, depuis le
+  thread appelant, à la fin de la synchronisation
+- Lecture hors ligne (read) au format de ScenerulesDownloadService.download_rule
+
+Complexité : O(r) requêtes pour r règles, dont seules les règles modifiées
+transfèrent leur corps ; latence ~ r / workers allers-retours.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import requests
+
+from web.services.rule.rule_ingest import RuleIngestService
+from web.services.rule.scenerules_download import (
+    DEFAULT_POOL_SIZE,
+    HTTP_STATUS_NOT_FOUND,
+    HTTP_STATUS_OK,
+    ScenerulesDownloadService,
+)
+
+logger = logging.getLogger(__name__)
+
+HTTP_STATUS_NOT_MODIFIED = 304
+
+# Version du format de index.json (incrémenter si le format change)
+INDEX_VERSION = 1
+
+_UNSAFE_CHARS_RE = re.compile(r"[^A-Za-z0-9._-]")
+
+
+class ScenerulesSyncService:
+    """Service de synchronisation des règles scenerules.org vers un miroir local.
+
+    Pièges potentiels :
+    - Un serveur qui ignore les en-têtes conditionnels renvoie 200 : le corps
+      est alors comparé à l'empreinte SHA-256 du miroir et le fichier n'est
+      réécrit que s'il a changé
+    - Deux synchronisations simultanées sur le même miroir ne corrompent pas
+      les fichiers (remplacements atomiques) mais la dernière écriture de
+      l'index l'emporte
+    - Les règles absentes du serveur (404) sont conservées dans le miroir
+
+    Exemple d'utilisation :
+        service = ScenerulesSyncService("uploads/scenerules")
+        report = service.sync()
+        rule_data = service.read("eBOOK", 2022)  # sans réseau
+    """
+
+    def __init__(
+        self,
+        mirror_dir: str | Path,
+        downloader: ScenerulesDownloadService | None = None,
+        workers: int = DEFAULT_POOL_SIZE,
+    ) -> None:
+        """Initialise le service.
+
+        Args:
+            mirror_dir: Répertoire du miroir local.
+            downloader: Service scenerules.org fournissant la liste des règles
+                et la session HTTP (défaut : session poolée partagée).
+            workers: Nombre de téléchargements simultanés (borné par la taille
+                du pool de connexions de la session).
+        """
+        self.mirror_dir = Path(mirror_dir)
+        self.downloader = downloader or ScenerulesDownloadService()
+        self.workers = max(1, workers)
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> ScenerulesSyncService:
+        """Construit le service depuis la configuration Flask.
+
+        Clés lues : SCENERULES_MIRROR_DIR, SCENERULES_BASE_URL,
+        SCENERULES_SYNC_WORKERS, SCENERULES_TIMEOUT.
+        """
+        downloader = ScenerulesDownloadService(
+            timeout=int(config.get("SCENERULES_TIMEOUT", 30)),
+            base_url=config.get("SCENERULES_BASE_URL"),
+        )
+        return cls(
+            config.get("SCENERULES_MIRROR_DIR", "uploads/scenerules"),
+            downloader=downloader,
+            workers=int(config.get("SCENERULES_SYNC_WORKERS", DEFAULT_POOL_SIZE)),
+        )
+
+    @property
+    def index_path(self) -> Path:
+        """Chemin de l'index du miroir (validateurs HTTP et empreintes)."""
+        return self.mirror_dir / "index.json"
+
+    @staticmethod
+    def rule_key(section: str, year: int) -> str:
+        """Retourne la clé d'une règle dans le miroir (nom de fichier sans extension).
+
+        Args:
+            section: Section de la règle (ex: "eBOOK", "TV-720p").
+            year: Année de la règle.
+
+        Returns:
+            Clé "{year}_{section}" limitée aux caractères sûrs pour un nom de fichier.
+        """
+        return _UNSAFE_CHARS_RE.sub("_", f"{year}_{section.replace(' ', '_')}")
+
+    def rule_path(self, section: str, year: int) -> Path:
+        """Retourne le chemin du NFO d'une règle dans le miroir."""
+        return self.mirror_dir / "nfo" / f"{self.rule_key(section, year)}.nfo"
+
+    def load_index(self) -> dict[str, dict[str, Any]]:
+        """Charge l'index du miroir.
+
+        Returns:
+            Dictionnaire clé de règle -> entrée (url, etag, last_modified,
+            sha256, size, section, year, scene, name, fetched_at, checked_at) ;
+            vide si l'index est absent, illisible ou d'une autre version.
+        """
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return {}
+        rules = data.get("rules")
+        return rules if isinstance(rules, dict) else {}
+
+    def sync(
+        self, rules: list[dict[str, Any]] | None = None, force: bool = False
+    ) -> dict[str, Any]:
+        """Synchronise les règles connues vers le miroir local.
+
+        Algorithme :
+        1. Liste des règles (défaut : list_available_rules du downloader)
+        2. Pour chaque règle, en parallèle : GET conditionnel (validateurs de
+           l'index si le fichier est présent dans le miroir)
+        3. 304 → inchangée ; 200 → corps comparé à l'empreinte du miroir et
+           écrit atomiquement s'il diffère ; 404 → absente ; autre → échec
+        4. Index mis à jour et réécrit atomiquement depuis le thread appelant
+
+        Complexité : O(r) requêtes, O(taille) octets pour les seules règles
+        modifiées.
+
+        Args:
+            rules: Règles à synchroniser (dictionnaires section, year, scene,
+                name, url_nfo). Défaut : toutes les règles connues.
+            force: Si True, n'envoie pas d'en-têtes conditionnels.
+
+        Returns:
+            Rapport {checked, updated, unchanged, missing, failed, errors,
+            updated_rules} ; updated_rules liste les (section, year) réécrits.
+        """
+        rules = self.downloader.list_available_rules() if rules is None else rules
+        index = self.load_index()
+        (self.mirror_dir / "nfo").mkdir(parents=True, exist_ok=True)
+
+        report: dict[str, Any] = {
+            "checked": len(rules),
+            "updated": 0,
+            "unchanged": 0,
+            "missing": 0,
+            "failed": 0,
+            "errors": [],
+            "updated_rules": [],
+        }
+        if not rules:
+            return report
+
+        workers = min(self.workers, len(rules))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scenerules") as pool:
+            futures = [
+                pool.submit(self._sync_one, rule, index.get(self._key_of(rule)), force)
+                for rule in rules
+            ]
+            outcomes = [future.result() for future in futures]
+
+        checked_at = datetime.now(UTC).isoformat()
+        for rule, (status, entry, error) in zip(rules, outcomes, strict=True):
+            report[status] += 1
+            if entry is not None:
+                entry["checked_at"] = checked_at
+                index[self._key_of(rule)] = entry
+            if status == "updated":
+                report["updated_rules"].append({"section": rule["section"], "year": rule["year"]})
+            elif error:
+                report["errors"].append({"name": rule.get("name"), "error": error})
+
+        self._write_atomic(
+            self.index_path,
+            json.dumps({"version": INDEX_VERSION, "rules": index}, indent=2).encode("utf-8"),
+        )
+        logger.info(
+            f"Synchronisation scenerules: {report['updated']} mise(s) à jour, "
+            f"{report['unchanged']} inchangée(s), {report['failed']} échec(s)"
+        )
+        return report
+
+    def read(self, section: str, year: int = 2022) -> dict[str, Any] | None:
+        """Lit une règle depuis le miroir local, sans accès réseau.
+
+        Args:
+            section: Section de la règle (ex: "eBOOK").
+            year: Année de la règle (défaut: 2022).
+
+        Returns:
+            Dictionnaire au format de ScenerulesDownloadService.download_rule
+            (name, content, section, year, scene, source, url) complété de
+            fetched_at ; None si la règle n'est pas dans le miroir.
+        """
+        path = self.rule_path(section, year)
+        try:
+            raw = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        entry = self.load_index().get(self.rule_key(section, year), {})
+        scene = entry.get("scene") or "English"
+        # Même décodage que download_rule : le contenu relu du miroir est
+        # identique à celui d'un téléchargement (pas de fausse modification)
+        content, _encoding = RuleIngestService.decode(raw)
+        name = f"[{year}] {section}"
+        if scene != "English":
+            name = f"[{scene}] {name}"
+        return {
+            "name": name,
+            "content": content,
+            "section": section,
+            "year": year,
+            "scene": scene,
+            "source": "mirror",
+            "url": entry.get("url"),
+            "fetched_at": entry.get("fetched_at"),
+        }
+
+    def _key_of(self, rule: dict[str, Any]) -> str:
+        """Retourne la clé de miroir d'une règle du catalogue."""
+        return self.rule_key(rule["section"], rule["year"])
+
+    def _sync_one(
+        self, rule: dict[str, Any], entry: dict[str, Any] | None, force: bool
+    ) -> tuple[str, dict[str, Any] | None, str | None]:
+        """Synchronise une règle (exécuté dans un worker).
+
+        Returns:
+            Tuple (statut, entrée d'index à conserver, message d'erreur) ;
+            statut parmi "updated", "unchanged", "missing", "failed".
+        """
+        path = self.rule_path(rule["section"], rule["year"])
+        url = rule.get("url_nfo") or self.downloader.NFO_URL_TEMPLATE.format(
+            base_url=self.downloader.BASE_URL,
+            year=rule["year"],
+            section=rule["section"].replace(" ", "_"),
+        )
+        headers = {}
+        # Sans fichier local, un 304 ne laisserait rien à lire : requête complète
+        if entry and not force and path.exists():
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = self.downloader.session.get(
+                url, headers=headers, timeout=self.downloader.timeout
+            )
+        except requests.RequestException as e:
+            return "failed", entry, f"Network error: {e}"
+
+        if response.status_code == HTTP_STATUS_NOT_MODIFIED:
+            return "unchanged", entry, None
+        if response.status_code == HTTP_STATUS_NOT_FOUND:
+            return "missing", entry, f"Rule not found: {url}"
+        if response.status_code != HTTP_STATUS_OK:
+            return "failed", entry, f"HTTP {response.status_code} for {url}"
+
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        changed = not (entry and entry.get("sha256") == digest and path.exists())
+        if changed:
+            try:
+                self._write_atomic(path, body)
+            except OSError as e:
+                return "failed", entry, f"Mirror write failed: {e}"
+
+        new_entry = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": digest,
+            "size": len(body),
+            "section": rule["section"],
+            "year": rule["year"],
+            "scene": rule.get("scene") or "English",
+            "name": rule.get("name"),
+            "fetched_at": (
+                datetime.now(UTC).isoformat() if changed else (entry or {}).get("fetched_at")
+            ),
+        }
+        return ("updated" if changed else "unchanged"), new_entry, None
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        """Écrit un fichier atomiquement (temporaire dans le même répertoire puis os.replace)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            Path(tmp_name).replace(path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                Path(tmp_name).unlink()
+            raise
@@ -0,0 +1,14 @@
+"""Services storage - Stockage dédoublonné des fichiers uploadés."""
+
+from web.services.storage.blob_store import BlobStoreService, BlobTooLargeError, BlobWriter
+from web.services.storage.orphan_gc import OrphanCollectorService
+from web.services.storage.remote_fetch import RemoteFetchService, UnsafeURLError
+
+__all__ = [
+    "BlobStoreService",
+    "BlobTooLargeError",
+    "BlobWriter",
+    "OrphanCollectorService",
+    "RemoteFetchService",
+    "UnsafeURLError",
+]
@@ -0,0 +1,517 @@
+"""Stockage adressé par contenu (SHA-256) des fichiers uploadés.
+
+Ce service remplace l'écriture d'une copie par release
+(release_{id}_{filename}) par un blob unique par contenu : un même EPUB/PDF
+uploadé pour plusieurs drafts n'occupe le disque qu'une fois, chaque release
+référençant le même blob par Release.file_path.
+
+Architecture :
+- Blobs : <root>/objects/<aa>/<bb>/<sha256><extension> (deux niveaux de
+  sharding, 65536 répertoires, aucun répertoire géant)
+- Écriture : fichier temporaire <root>/tmp/ haché pendant l'écriture, puis
+  renommage atomique vers le chemin final (ou suppression si déjà présent)
+- Upload HTTP : BlobWriter sert de conteneur au parseur multipart
+  (StreamingRequest), le corps est écrit une seule fois, directement dans
+  <root>/tmp, avec SHA-256, CRC-32 et taille calculés au fil de l'eau
+- Court-circuit : si le client annonce le SHA-256 et que le blob existe, le
+  flux est seulement haché (vérification) sans aucune écriture disque
+- Comptage de références : nombre de Release.file_path pointant sur le blob
+- Téléchargements distants : fichiers partiels reprenables dans
+  <root>/partial/, intégrés sans copie par import_file()
+- Garbage collector : suppression des blobs non référencés plus anciens que
+  le délai de grâce (upload en cours non encore commité en base)
+
+Complexité : O(n) pour un upload de n octets (une lecture, un hachage, au
+plus une écriture) ; O(b + r) pour le GC (b blobs, r releases).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import errno
+import hashlib
+import logging
+import os
+import re
+import time
+import uuid
+import zlib
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+from sqlalchemy import func, select
+
+from web.extensions import db
+from web.models import Release
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+logger = logging.getLogger(__name__)
+
+# Taille des blocs lus et hachés pendant l'upload
+CHUNK_SIZE = 1024 * 1024
+
+# Délai pendant lequel un blob non référencé est conservé (upload en cours)
+DEFAULT_GC_GRACE_SECONDS = 3600
+
+# Extension conservée sur le blob (détection de format par suffixe en aval)
+_SUFFIX_RE = re.compile(r"^\.[a-z0-9]{1,10}$")
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class BlobTooLargeError(OSError):
+    """Upload dépassant la taille maximale autorisée (détecté pendant l'écriture).
+
+    OSError (EFBIG) et non ValueError : le parseur multipart de Werkzeug
+    ignore silencieusement les ValueError levées pendant l'analyse du corps.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """Initialise l'erreur.
+
+        Args:
+            max_bytes: Taille maximale autorisée.
+        """
+        super().__init__(errno.EFBIG, f"Fichier trop volumineux (max {max_bytes} octets)")
+        self.max_bytes = max_bytes
+
+
+class BlobWriter:
+    """Destination d'upload hachée au fil de l'écriture (SHA-256 et CRC-32).
+
+    L'objet se comporte comme un fichier (write, seek, tell, read) : il peut
+    servir de conteneur au parseur multipart de Werkzeug, qui y écrit le
+    corps de la requête directement (une seule écriture disque par upload).
+
+    En mode discard (SHA-256 annoncé dont le blob existe déjà), les octets
+    sont seulement hachés : aucun fichier n'est créé.
+
+    Exemple d'utilisation :
+        writer = store.open_writer(suffix=".epub", max_bytes=20 * 1024**3)
+        for chunk in stream:
+            writer.write(chunk)
+        blob = writer.commit()
+    """
+
+    def __init__(
+        self,
+        store: BlobStoreService,
+        suffix: str = "",
+        max_bytes: int | None = None,
+        expected_sha256: str | None = None,
+    ) -> None:
+        """Crée le fichier temporaire dans <root>/tmp (sauf mode discard).
+
+        Args:
+            store: Store propriétaire.
+            suffix: Extension normalisée du blob final.
+            max_bytes: Taille maximale acceptée (None : illimitée).
+            expected_sha256: Empreinte annoncée par le client (optionnelle).
+        """
+        self.store = store
+        self.suffix = suffix
+        self.max_bytes = max_bytes
+        self.expected_sha256 = expected_sha256.lower() if expected_sha256 else None
+        self.discard = bool(
+            self.expected_sha256 and store.blob_path(self.expected_sha256, suffix).exists()
+        )
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._crc32 = 0
+        self.temp_path: Path | None = None
+        self._file: IO[bytes] | None = None
+        if not self.discard:
+            self.temp_path = store.tmp_dir / f"{uuid.uuid4().hex}.part"
+            self._file = self.temp_path.open("w+b")
+
+    def write(self, data: bytes) -> int:
+        """Écrit et hache un bloc.
+
+        Args:
+            data: Octets reçus.
+
+        Returns:
+            Nombre d'octets reçus.
+
+        Raises:
+            BlobTooLargeError: Si max_bytes est dépassé.
+        """
+        if self.max_bytes is not None and self.size + len(data) > self.max_bytes:
+            raise BlobTooLargeError(self.max_bytes)
+        self._hash.update(data)
+        self._crc32 = zlib.crc32(data, self._crc32)
+        self.size += len(data)
+        if self._file is not None:
+            self._file.write(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Repositionne la lecture (fin d'écriture par le parseur multipart).
+
+        Args:
+            offset: Décalage.
+            whence: Origine (os.SEEK_SET, os.SEEK_CUR, os.SEEK_END).
+
+        Returns:
+            Nouvelle position (taille reçue en mode discard).
+        """
+        if self._file is None:
+            return self.size
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        """Position courante (taille reçue en mode discard)."""
+        return self._file.tell() if self._file is not None else self.size
+
+    def read(self, size: int = -1) -> bytes:
+        """Relit le contenu écrit (vide en mode discard).
+
+        Args:
+            size: Nombre d'octets maximal (-1 : tout).
+
+        Returns:
+            Octets lus.
+        """
+        return self._file.read(size) if self._file is not None else b""
+
+    def readline(self, size: int = -1) -> bytes:
+        """Relit une ligne du contenu écrit (vide en mode discard)."""
+        return self._file.readline(size) if self._file is not None else b""
+
+    @property
+    def sha256(self) -> str:
+        """SHA-256 hexadécimal des octets écrits jusqu'ici."""
+        return self._hash.hexdigest()
+
+    @property
+    def crc32(self) -> str:
+        """CRC-32 hexadécimal (SFV) des octets écrits jusqu'ici."""
+        return f"{self._crc32:08x}"
+
+    def commit(self) -> dict[str, Any]:
+        """Finalise le blob : renommage atomique ou dédoublonnage.
+
+        Returns:
+            Dictionnaire {sha256, crc32, path, size, deduplicated}.
+
+        Raises:
+            ValueError: Si le SHA-256 annoncé ne correspond pas au contenu reçu
+                (le temporaire est alors supprimé).
+        """
+        self._close()
+        if self.expected_sha256 and self.sha256 != self.expected_sha256:
+            self.abort()
+            raise ValueError("Le SHA-256 annoncé ne correspond pas au fichier reçu")
+
+        path = self.store.blob_path(self.sha256, self.suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        deduplicated = self.discard or path.exists()
+        if self.temp_path is not None:
+            if deduplicated:
+                self.temp_path.unlink()
+            else:
+                self.temp_path.replace(path)
+        if deduplicated:
+            # Rafraîchit la date : protège le blob du GC pendant le délai de grâce
+            os.utime(path)
+        return {
+            "sha256": self.sha256,
+            "crc32": self.crc32,
+            "path": path,
+            "size": self.size,
+            "deduplicated": deduplicated,
+        }
+
+    def abort(self) -> None:
+        """Abandonne l'écriture et supprime le fichier temporaire (idempotent)."""
+        self._close()
+        if self.temp_path is not None:
+            self.temp_path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Ferme le fichier (appelé par Werkzeug en fin de requête)."""
+        self._close()
+
+    def _close(self) -> None:
+        """Ferme le fichier temporaire (idempotent)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class BlobStoreService:
+    """Service de stockage dédoublonné des uploads.
+
+    Pièges potentiels :
+    - Les blobs sont partagés : ne jamais modifier ni supprimer directement le
+      fichier d'une release, passer par collect_garbage()
+    - Le comptage de références repose sur Release.file_path ; un fichier
+      référencé ailleurs (job en cours hors release) doit être plus récent
+      que le délai de grâce pour survivre au GC
+
+    Exemple d'utilisation :
+        store = BlobStoreService(Path("uploads/blobs"))
+        blob = store.store(source_file, suffix=".epub")
+        release.file_path = str(blob["path"])
+    """
+
+    def __init__(self, root: Path, gc_grace_seconds: float = DEFAULT_GC_GRACE_SECONDS) -> None:
+        """Initialise le store (répertoires créés si absents).
+
+        Args:
+            root: Racine du store (chemin résolu en absolu).
+            gc_grace_seconds: Délai de grâce par défaut du garbage collector.
+        """
+        self.root = root.resolve()
+        self.gc_grace_seconds = gc_grace_seconds
+        self.objects_dir = self.root / "objects"
+        self.tmp_dir = self.root / "tmp"
+        self.partial_dir = self.root / "partial"
+        for directory in (self.objects_dir, self.tmp_dir, self.partial_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config: Any) -> BlobStoreService:
+        """Construit le store depuis la configuration Flask.
+
+        Args:
+            config: app.config (UPLOAD_BLOB_ROOT, UPLOAD_GC_GRACE_SECONDS).
+
+        Returns:
+            Instance de BlobStoreService.
+        """
+        return cls(
+            Path(config.get("UPLOAD_BLOB_ROOT", "uploads/blobs")),
+            gc_grace_seconds=float(config.get("UPLOAD_GC_GRACE_SECONDS", DEFAULT_GC_GRACE_SECONDS)),
+        )
+
+    @staticmethod
+    def normalize_suffix(filename: str | None) -> str:
+        """Retourne l'extension normalisée d'un nom de fichier ("" si invalide).
+
+        Args:
+            filename: Nom de fichier d'origine.
+
+        Returns:
+            Extension en minuscules (ex : ".epub") ou "".
+        """
+        suffix = Path(filename or "").suffix.lower()
+        return suffix if _SUFFIX_RE.match(suffix) else ""
+
+    def blob_path(self, sha256: str, suffix: str = "") -> Path:
+        """Chemin du blob d'un contenu.
+
+        Args:
+            sha256: Empreinte hexadécimale.
+            suffix: Extension normalisée.
+
+        Returns:
+            Chemin <root>/objects/<aa>/<bb>/<sha256><suffix>.
+
+        Raises:
+            ValueError: Si sha256 n'est pas une empreinte hexadécimale valide.
+        """
+        if not _SHA256_RE.match(sha256):
+            raise ValueError(f"Empreinte SHA-256 invalide: {sha256}")
+        return self.objects_dir / sha256[:2] / sha256[2:4] / f"{sha256}{suffix}"
+
+    def open_writer(
+        self,
+        suffix: str = "",
+        max_bytes: int | None = None,
+        expected_sha256: str | None = None,
+    ) -> BlobWriter:
+        """Ouvre une destination hachée au fil de l'écriture.
+
+        Args:
+            suffix: Extension normalisée (voir normalize_suffix()).
+            max_bytes: Taille maximale acceptée (None : illimitée).
+            expected_sha256: Empreinte annoncée ; si son blob existe, le
+                writer ne fait que hacher (aucune écriture disque).
+
+        Returns:
+            BlobWriter à finaliser par commit() ou abort().
+
+        Raises:
+            ValueError: Si expected_sha256 n'est pas une empreinte valide.
+        """
+        return BlobWriter(self, suffix, max_bytes=max_bytes, expected_sha256=expected_sha256)
+
+    def store(
+        self, stream: IO[bytes], suffix: str = "", expected_sha256: str | None = None
+    ) -> dict[str, Any]:
+        """Stocke un flux dans le store, sans écriture si le contenu existe déjà.
+
+        Algorithme :
+        1. Si expected_sha256 est fourni et que son blob existe : hachage seul
+           du flux ; si l'empreinte correspond, aucune écriture (court-circuit)
+        2. Sinon : écriture dans un temporaire en hachant chaque bloc
+        3. Renommage atomique vers le chemin du blob, ou suppression du
+           temporaire si un upload concurrent a déjà créé le blob
+
+        Args:
+            stream: Flux binaire (fichier ouvert, réponse HTTP...).
+            suffix: Extension normalisée (voir normalize_suffix()).
+            expected_sha256: Empreinte annoncée par le client (optionnelle).
+
+        Returns:
+            Dictionnaire {sha256, crc32, path, size, deduplicated}.
+
+        Raises:
+            ValueError: Si expected_sha256 est fourni et ne correspond pas au flux.
+        """
+        writer = self.open_writer(suffix, expected_sha256=expected_sha256)
+        try:
+            for chunk in self._chunks(stream):
+                writer.write(chunk)
+            return writer.commit()
+        except BaseException:
+            writer.abort()
+            raise
+
+    def import_file(
+        self, source: Path, suffix: str = "", expected_sha256: str | None = None
+    ) -> dict[str, Any]:
+        """Intègre un fichier déjà écrit sur le volume du store (sans copie).
+
+        Le fichier est haché en lecture seule puis renommé vers son blob (ou
+        supprimé si le blob existe déjà) : aucune seconde écriture des données.
+
+        Args:
+            source: Fichier à intégrer (même système de fichiers que le store).
+            suffix: Extension normalisée.
+            expected_sha256: Empreinte attendue (optionnelle).
+
+        Returns:
+            Dictionnaire {sha256, crc32, path, size, deduplicated}.
+
+        Raises:
+            ValueError: Si l'empreinte ne correspond pas (source conservée).
+        """
+        digest = hashlib.sha256()
+        crc = 0
+        size = 0
+        with source.open("rb") as f:
+            for chunk in self._chunks(f):
+                digest.update(chunk)
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+        sha256 = digest.hexdigest()
+        if expected_sha256 and sha256 != expected_sha256.lower():
+            raise ValueError("Le SHA-256 annoncé ne correspond pas au fichier reçu")
+
+        path = self.blob_path(sha256, suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        deduplicated = path.exists()
+        if deduplicated:
+            source.unlink()
+            os.utime(path)
+        else:
+            source.replace(path)
+        return {
+            "sha256": sha256,
+            "crc32": f"{crc:08x}",
+            "path": path,
+            "size": size,
+            "deduplicated": deduplicated,
+        }
+
+    def contains(self, path: str | Path) -> bool:
+        """Indique si un chemin désigne un blob de ce store.
+
+        Args:
+            path: Chemin (typiquement Release.file_path).
+
+        Returns:
+            True si le chemin est sous <root>/objects.
+        """
+        return Path(path).is_relative_to(self.objects_dir)
+
+    def reference_counts(self) -> dict[str, int]:
+        """Compte les releases référençant chaque blob.
+
+        Returns:
+            Dictionnaire {chemin du blob: nombre de releases}.
+        """
+        rows = db.session.execute(
+            select(Release.file_path, func.count(Release.id))
+            .where(Release.file_path.startswith(str(self.objects_dir) + os.sep, autoescape=True))
+            .group_by(Release.file_path)
+        )
+        return dict(rows.tuples().all())
+
+    def refcount(self, path: str | Path) -> int:
+        """Nombre de releases référençant un blob.
+
+        Args:
+            path: Chemin du blob.
+
+        Returns:
+            Nombre de références.
+        """
+        return db.session.scalar(
+            select(func.count(Release.id)).where(Release.file_path == str(path))
+        )
+
+    def collect_garbage(self, grace_seconds: float | None = None) -> dict[str, int]:
+        """Supprime les blobs non référencés et les temporaires abandonnés.
+
+        Algorithme :
+        1. Comptage des références en une requête groupée
+        2. Parcours des shards ; suppression des blobs sans référence dont la
+           date de modification dépasse le délai de grâce
+        3. Suppression des temporaires plus anciens que le délai de grâce
+
+        Args:
+            grace_seconds: Âge minimal d'un blob non référencé avant suppression
+                (défaut : gc_grace_seconds du store).
+
+        Returns:
+            Dictionnaire {scanned, removed, bytes_reclaimed}.
+        """
+        references = self.reference_counts()
+        if grace_seconds is None:
+            grace_seconds = self.gc_grace_seconds
+        cutoff = time.time() - grace_seconds
+        scanned = removed = reclaimed = 0
+
+        for entry in self.iter_blobs():
+            scanned += 1
+            stat = entry.stat()
+            if entry.path in references or stat.st_mtime > cutoff:
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                Path(entry.path).unlink()
+                removed += 1
+                reclaimed += stat.st_size
+
+        with os.scandir(self.tmp_dir) as entries:
+            for entry in entries:
+                stat = entry.stat()
+                if entry.is_file() and stat.st_mtime <= cutoff:
+                    with contextlib.suppress(FileNotFoundError):
+                        Path(entry.path).unlink()
+                        reclaimed += stat.st_size
+
+        logger.info(f"GC blobs: {removed}/{scanned} supprimés, {reclaimed} octets récupérés")
+        return {"scanned": scanned, "removed": removed, "bytes_reclaimed": reclaimed}
+
+    def iter_blobs(self) -> Iterator[os.DirEntry[str]]:
+        """Parcourt les blobs des deux niveaux de shards."""
+        with os.scandir(self.objects_dir) as level1:
+            for shard1 in level1:
+                if not shard1.is_dir():
+                    continue
+                with os.scandir(shard1.path) as level2:
+                    for shard2 in level2:
+                        if not shard2.is_dir():
+                            continue
+                        with os.scandir(shard2.path) as blobs:
+                            yield from (blob for blob in blobs if blob.is_file())
+
+    @staticmethod
+    def _chunks(stream: IO[bytes]) -> Iterator[bytes]:
+        """Lit un flux par blocs de CHUNK_SIZE."""
+        while chunk := stream.read(CHUNK_SIZE):
+            yield chunk
@@ -0,0 +1,302 @@
+"""Garbage collector des uploads et répertoires de staging orphelins.
+
+Les drafts abandonnés du wizard, les téléchargements distants interrompus et
+les répertoires de staging créés par PackagingService._create_directory_structure
+restent sur disque indéfiniment ; la suppression d'une release ne supprime pas
+non plus son fichier. Ce service rapproche le système de fichiers des
+références en base et supprime les orphelins.
+
+Architecture :
+- Candidats : un seul parcours os.scandir par racine (shards du store de
+  blobs, tmp/, partial/, répertoires d'uploads hérités, racines de staging)
+- Références : Release.file_path (une requête) et chemins des jobs actifs
+  (pending/running : file_path, path, files[].path, output_path, partiels
+  des jobs fetch)
+- Protection : un candidat est conservé s'il est référencé, s'il contient un
+  chemin référencé, s'il se trouve sous l'output_path d'un job actif ou s'il
+  a été modifié pendant le délai de grâce
+- Suppression : par lots de batch_size, pause de batch_pause secondes entre
+  deux lots (limitation de la charge I/O sur les volumes partagés)
+
+Complexité : O(n + r·p) où n est le nombre d'entrées parcourues, r le
+nombre de chemins référencés et p la profondeur moyenne des chemins.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import select
+
+from web.extensions import db
+from web.models import Job, Release
+from web.services.storage.blob_store import DEFAULT_GC_GRACE_SECONDS, BlobStoreService
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Statuts des jobs dont les fichiers ne doivent jamais être collectés
+ACTIVE_JOB_STATUSES = ("pending", "running")
+
+# Nombre de suppressions par lot et pause entre deux lots (secondes)
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_BATCH_PAUSE = 0.05
+
+
+@dataclass(frozen=True)
+class _Candidate:
+    """Entrée orpheline potentielle (fichier ou répertoire de staging)."""
+
+    path: Path
+    is_dir: bool
+    size: int
+    mtime: float
+
+
+class OrphanCollectorService:
+    """Service de collecte des fichiers orphelins (uploads, partiels, staging).
+
+    Pièges potentiels :
+    - Seuls les répertoires de premier niveau des racines de staging sont
+      candidats (les ZIP livrés à côté ne sont jamais supprimés)
+    - L'âge d'un répertoire est celui de son entrée la plus récente : un
+      staging en cours d'écriture n'est jamais collecté
+    - Un job actif portant output_path protège toute l'arborescence : le nom
+      du répertoire de staging n'est connu qu'une fois le manifeste calculé
+
+    Exemple d'utilisation :
+        collector = OrphanCollectorService.from_config(current_app.config)
+        report = collector.collect()
+        logger.info(f"{report['bytes_reclaimed']} octets récupérés")
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        store: BlobStoreService,
+        upload_roots: Iterable[Path] = (),
+        staging_roots: Iterable[Path] = (),
+        grace_seconds: float = DEFAULT_GC_GRACE_SECONDS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_pause: float = DEFAULT_BATCH_PAUSE,
+    ) -> None:
+        """Initialise le collecteur.
+
+        Args:
+            store: Store de blobs (objects/, tmp/, partial/ collectés).
+            upload_roots: Répertoires d'uploads hérités (fichiers de premier niveau).
+            staging_roots: Racines de sortie du packaging (répertoires de premier niveau).
+            grace_seconds: Âge minimal d'un orphelin avant suppression.
+            batch_size: Nombre de suppressions par lot (minimum 1).
+            batch_pause: Pause entre deux lots, en secondes.
+        """
+        self.store = store
+        self.upload_roots = [Path(root).resolve() for root in upload_roots]
+        self.staging_roots = [Path(root).resolve() for root in staging_roots]
+        self.grace_seconds = grace_seconds
+        self.batch_size = max(1, batch_size)
+        self.batch_pause = batch_pause
+        self.sleep: Callable[[float], None] = time.sleep
+
+    @classmethod
+    def from_config(cls, config: Any) -> OrphanCollectorService:
+        """Construit le collecteur depuis la configuration Flask.
+
+        Args:
+            config: app.config (UPLOAD_BLOB_ROOT, UPLOAD_GC_*, PACKAGING_STAGING_ROOTS).
+
+        Returns:
+            Instance de OrphanCollectorService.
+        """
+        return cls(
+            BlobStoreService.from_config(config),
+            upload_roots=[Path(root) for root in config.get("UPLOAD_GC_LEGACY_DIRS", [])],
+            staging_roots=[Path(root) for root in config.get("PACKAGING_STAGING_ROOTS", [])],
+            grace_seconds=float(config.get("UPLOAD_GC_GRACE_SECONDS", DEFAULT_GC_GRACE_SECONDS)),
+            batch_size=int(config.get("UPLOAD_GC_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+            batch_pause=float(config.get("UPLOAD_GC_BATCH_PAUSE", DEFAULT_BATCH_PAUSE)),
+        )
+
+    def collect(self, dry_run: bool = False) -> dict[str, Any]:
+        """Supprime les fichiers et répertoires orphelins.
+
+        Algorithme :
+        1. Références : Release.file_path + chemins des jobs actifs, avec
+           l'ensemble de leurs répertoires parents
+        2. Parcours unique des racines (os.scandir), filtrage des candidats
+           référencés, protégés ou trop récents
+        3. Suppression par lots, pause entre les lots ; chaque entrée est
+           re-vérifiée (mtime) juste avant suppression
+
+        Complexité : O(n + r·p) (voir docstring du module).
+
+        Args:
+            dry_run: Si True, rapporte les orphelins sans rien supprimer.
+
+        Returns:
+            Dictionnaire {scanned, orphans, removed, bytes_reclaimed, batches,
+            dry_run}.
+        """
+        referenced, trees = self._protected_paths()
+        cutoff = time.time() - self.grace_seconds
+        scanned = 0
+        orphans: list[_Candidate] = []
+
+        for candidate in self._iter_candidates():
+            scanned += 1
+            if candidate.mtime > cutoff or self._is_protected(candidate, referenced, trees):
+                continue
+            orphans.append(candidate)
+
+        removed = reclaimed = batches = 0
+        if not dry_run:
+            for start in range(0, len(orphans), self.batch_size):
+                if batches:
+                    self.sleep(self.batch_pause)
+                batches += 1
+                for candidate in orphans[start : start + self.batch_size]:
+                    if self._remove(candidate, cutoff):
+                        removed += 1
+                        reclaimed += candidate.size
+
+        logger.info(
+            f"GC orphelins: {len(orphans)}/{scanned} orphelins, {removed} supprimés "
+            f"en {batches} lot(s), {reclaimed} octets récupérés"
+        )
+        return {
+            "scanned": scanned,
+            "orphans": len(orphans),
+            "removed": removed,
+            "bytes_reclaimed": reclaimed,
+            "batches": batches,
+            "dry_run": dry_run,
+        }
+
+    def _protected_paths(self) -> tuple[set[Path], set[Path]]:
+        """Construit les chemins référencés (et leurs parents) et les arborescences protégées.
+
+        Returns:
+            Tuple (chemins référencés et leurs répertoires parents, racines
+            d'arborescences protégées par un job actif).
+        """
+        paths = [
+            path
+            for path in db.session.scalars(
+                select(Release.file_path).where(Release.file_path.is_not(None))
+            )
+            if path
+        ]
+        trees: set[Path] = set()
+        jobs = db.session.scalars(select(Job).where(Job.status.in_(ACTIVE_JOB_STATUSES)))
+        for job in jobs:
+            config = job.config_json or {}
+            paths.extend(str(config[key]) for key in ("file_path", "path") if config.get(key))
+            paths.extend(
+                str(item["path"])
+                for item in config.get("files") or []
+                if isinstance(item, dict) and item.get("path")
+            )
+            if config.get("output_path"):
+                trees.add(Path(config["output_path"]).resolve())
+            if job.job_type == "fetch" and config.get("url"):
+                key = hashlib.sha256(str(config["url"]).encode("utf-8")).hexdigest()
+                paths.extend(
+                    str(self.store.partial_dir / f"{key}{ext}") for ext in (".part", ".json")
+                )
+
+        # Normalisation identique aux racines parcourues (resolve()) : un
+        # file_path relatif ou passant par un lien symbolique doit correspondre
+        # au chemin du candidat. Le lien lui-même (parent résolu) et sa cible
+        # sont tous deux protégés.
+        referenced: set[Path] = set()
+        for path in paths:
+            raw = Path(path)
+            for normalized in {raw.parent.resolve() / raw.name, raw.resolve()}:
+                current = normalized
+                while current not in referenced:
+                    referenced.add(current)
+                    if current.parent == current:
+                        break
+                    current = current.parent
+        return referenced, trees
+
+    @staticmethod
+    def _is_protected(candidate: _Candidate, referenced: set[Path], trees: set[Path]) -> bool:
+        """Indique si un candidat est référencé ou situé sous une arborescence protégée."""
+        if candidate.path in referenced:
+            return True
+        return any(path in trees for path in (candidate.path, *candidate.path.parents))
+
+    def _iter_candidates(self) -> Iterator[_Candidate]:
+        """Parcourt une fois chaque racine et produit les candidats."""
+        for entry in self.store.iter_blobs():
+            yield self._file_candidate(entry)
+        for directory in (self.store.tmp_dir, self.store.partial_dir, *self.upload_roots):
+            for entry in self._scan(directory):
+                if entry.is_file(follow_symlinks=False):
+                    yield self._file_candidate(entry)
+        for directory in self.staging_roots:
+            for entry in self._scan(directory):
+                if entry.is_dir(follow_symlinks=False):
+                    path = Path(entry.path)
+                    size, mtime = self._tree_usage(path)
+                    yield _Candidate(path, True, size, mtime)
+
+    @staticmethod
+    def _scan(directory: Path) -> Iterator[os.DirEntry[str]]:
+        """Liste un répertoire (vide s'il n'existe pas)."""
+        with contextlib.suppress(FileNotFoundError), os.scandir(directory) as entries:
+            yield from entries
+
+    @staticmethod
+    def _file_candidate(entry: os.DirEntry[str]) -> _Candidate:
+        """Construit un candidat depuis une entrée fichier (stat mis en cache par scandir)."""
+        stat = entry.stat(follow_symlinks=False)
+        return _Candidate(Path(entry.path), False, stat.st_size, stat.st_mtime)
+
+    @classmethod
+    def _tree_usage(cls, path: Path) -> tuple[int, float]:
+        """Calcule la taille totale et la date de modification la plus récente d'une arborescence."""
+        size = 0
+        mtime = path.lstat().st_mtime
+        for entry in cls._scan(path):
+            if entry.is_dir(follow_symlinks=False):
+                child_size, child_mtime = cls._tree_usage(Path(entry.path))
+            else:
+                stat = entry.stat(follow_symlinks=False)
+                child_size, child_mtime = stat.st_size, stat.st_mtime
+            size += child_size
+            mtime = max(mtime, child_mtime)
+        return size, mtime
+
+    def _remove(self, candidate: _Candidate, cutoff: float) -> bool:
+        """Supprime un orphelin, sauf s'il a été modifié depuis le parcours.
+
+        Returns:
+            True si l'entrée a été supprimée.
+        """
+        path = candidate.path
+        try:
+            if candidate.is_dir:
+                if self._tree_usage(path)[1] > cutoff:
+                    return False
+                shutil.rmtree(path)
+            else:
+                if path.stat().st_mtime > cutoff:
+                    return False
+                path.unlink()
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning(f"GC orphelins: suppression impossible de {path}: {e}")
+            return False
+        return True
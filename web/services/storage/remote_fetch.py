@@ -0,0 +1,543 @@
+"""Téléchargement parallèle et reprenable des sources distantes (file_url).
+
+Ce service rapatrie le fichier d'une release fournie par URL dans le store
+d'uploads, pour que l'analyse et le packaging puissent le traiter comme un
+upload local.
+
+Architecture :
+- Protection SSRF : l'hôte de l'URL (et de chaque redirection, suivies
+  manuellement) doit résoudre uniquement vers des adresses publiques, sauf
+  hôtes explicitement autorisés (REMOTE_FETCH_ALLOWED_HOSTS)
+- Sonde HEAD (ou GET Range: bytes=0-0 si HEAD est refusé) : taille, support
+  des plages (Accept-Ranges / 206) et validateur (ETag ou Last-Modified)
+- Plages supportées : fichier préalloué, découpé en segments téléchargés en
+  parallèle (ThreadPoolExecutor) sur une requests.Session poolée, chaque
+  bloc écrit à son offset par os.pwrite
+- Reprise : état des segments (octets terminés) dans <partial>.json, relu
+  si l'URL, la taille et le validateur n'ont pas changé ; If-Range garantit
+  que le serveur n'envoie pas une autre version au milieu d'une reprise
+- Sans support des plages : un seul flux séquentiel
+- Vérification de la taille et du SHA-256, puis intégration sans copie dans
+  le store (BlobStoreService.import_file)
+- Progression émise depuis le thread appelant uniquement (les callbacks
+  peuvent écrire en base sans contexte applicatif dans les workers)
+
+Complexité : O(n) octets transférés et écrits une fois, plus une relecture
+pour le hachage ; latence ~ n / (débit par connexion × segments).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import ipaddress
+import json
+import logging
+import math
+import os
+import re
+import socket
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, Any
+from urllib.parse import unquote, urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from web.services.storage.blob_store import BlobStoreService, BlobTooLargeError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Nombre de connexions parallèles par téléchargement
+DEFAULT_SEGMENTS = 4
+
+# Taille minimale d'un segment (en dessous, moins de segments)
+DEFAULT_MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+
+# Taille des blocs lus sur chaque connexion (un bloc interrompu par une
+# coupure est perdu et redemandé à la reprise)
+CHUNK_SIZE = 64 * 1024
+
+# Intervalle de sauvegarde de l'état et d'émission de la progression (secondes)
+STATE_FLUSH_INTERVAL = 0.5
+
+# Nombre maximal de redirections suivies (chacune revalidée)
+MAX_REDIRECTS = 5
+
+HTTP_PARTIAL_CONTENT = 206
+_CONTENT_RANGE_RE = re.compile(r"bytes \d+-\d+/(\d+)")
+
+
+class RangeNotHonouredError(requests.RequestException):
+    """Le serveur a répondu 200 à une requête de plage (ressource modifiée)."""
+
+
+class UnsafeURLError(ValueError):
+    """URL refusée : schéma non supporté ou hôte résolu vers une adresse non publique."""
+
+
+def _check_public_address(
+    host: str, address: ipaddress.IPv4Address | ipaddress.IPv6Address
+) -> None:
+    """Refuse une adresse non publique (UnsafeURLError) pour l'hôte donné."""
+    if not address.is_global or address.is_multicast:
+        raise UnsafeURLError(f"Adresse non publique refusée: {host} ({address})")
+
+
+class RemoteFetchService:
+    """Service de rapatriement des fichiers distants dans le store d'uploads.
+
+    Pièges potentiels :
+    - Un serveur qui change de contenu sans changer de taille ni de
+      validateur ne peut pas être détecté avant la vérification du SHA-256
+    - Les octets déjà écrits restent dans le cache du système : une coupure
+      de courant (pas un simple crash) peut rendre l'état de reprise optimiste,
+      d'où la vérification finale de la taille et, si fourni, du SHA-256
+    - La résolution DNS de la validation et celle de la connexion sont
+      distinctes : un DNS malveillant à TTL nul peut encore changer de réponse
+      entre les deux (rebinding) ; un proxy sortant filtrant reste recommandé
+
+    Exemple d'utilisation :
+        fetcher = RemoteFetchService(BlobStoreService.from_config(app.config))
+        blob = fetcher.fetch("https://example.com/book.epub", expected_sha256=digest)
+        release.file_path = str(blob["path"])
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        store: BlobStoreService,
+        session: requests.Session | None = None,
+        segments: int = DEFAULT_SEGMENTS,
+        min_segment_size: int = DEFAULT_MIN_SEGMENT_SIZE,
+        timeout: float = 30,
+        retries: int = 3,
+        max_bytes: int | None = None,
+        allowed_hosts: Iterable[str] = (),
+    ) -> None:
+        """Initialise le service.
+
+        Args:
+            store: Store d'uploads de destination.
+            session: Session HTTP (défaut : session poolée à `segments` connexions).
+            segments: Nombre maximal de connexions parallèles.
+            min_segment_size: Taille minimale d'un segment.
+            timeout: Timeout de connexion et de lecture (secondes).
+            retries: Nouvelles tentatives par segment après erreur réseau.
+            max_bytes: Taille maximale acceptée (None : illimitée).
+            allowed_hosts: Hôtes acceptés sans contrôle d'adresse (miroirs internes).
+        """
+        self.store = store
+        self.segments = max(1, segments)
+        self.min_segment_size = max(1, min_segment_size)
+        self.timeout = timeout
+        self.retries = retries
+        self.max_bytes = max_bytes
+        self.allowed_hosts = frozenset(host.lower() for host in allowed_hosts)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.segments)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = "eBook-Scene-Packer/2.0"
+        self.session = session
+
+    def fetch(
+        self,
+        url: str,
+        expected_sha256: str | None = None,
+        expected_size: int | None = None,
+        progress_callback: Callable[[dict[str, Any]], None] | None = None,
+    ) -> dict[str, Any]:
+        """Télécharge une URL dans le store d'uploads.
+
+        Algorithme :
+        1. Sonde : taille, support des plages, validateur
+        2. Reprise de l'état partiel s'il correspond à la même ressource
+        3. Téléchargement parallèle des segments restants (ou flux unique)
+        4. Vérification de la taille puis intégration dans le store
+           (SHA-256 vérifié s'il est fourni)
+
+        Args:
+            url: URL http(s) de la source.
+            expected_sha256: Empreinte attendue (optionnelle).
+            expected_size: Taille attendue (optionnelle).
+            progress_callback: Reçoit {"phase": "fetch", "bytes_read",
+                "bytes_total", "member"} (thread appelant uniquement).
+
+        Returns:
+            Dictionnaire {sha256, crc32, path, size, deduplicated, url,
+            filename, segments, resumed_bytes}.
+
+        Raises:
+            UnsafeURLError: URL non http(s) ou hôte (ou redirection) non public.
+            ValueError: Taille ou SHA-256 différents de l'attendu.
+            BlobTooLargeError: Si la source dépasse max_bytes.
+            requests.RequestException: Erreur réseau après toutes les tentatives
+                (l'état partiel est conservé pour une reprise).
+        """
+        self.validate_url(url, self.allowed_hosts)
+        filename = PurePosixPath(unquote(urlparse(url).path)).name or "download"
+
+        probe = self._probe(url)
+        size = probe["size"]
+        if expected_size is not None and size is not None and size != expected_size:
+            raise ValueError(f"Taille distante {size} différente de la taille attendue")
+        if self.max_bytes is not None and size is not None and size > self.max_bytes:
+            raise BlobTooLargeError(self.max_bytes)
+
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        partial = self.store.partial_dir / f"{key}.part"
+        state_path = self.store.partial_dir / f"{key}.json"
+
+        if probe["ranges"] and size:
+            segments, resumed = self._download_ranged(
+                probe, partial, state_path, filename, progress_callback
+            )
+        else:
+            segments, resumed = 1, 0
+            size = self._download_stream(probe["url"], partial, filename, progress_callback)
+
+        actual = partial.stat().st_size
+        if actual != size or (expected_size is not None and actual != expected_size):
+            self._discard(partial, state_path)
+            raise ValueError(f"Taille téléchargée incorrecte ({actual} octets)")
+        try:
+            blob = self.store.import_file(
+                partial, BlobStoreService.normalize_suffix(filename), expected_sha256
+            )
+        except ValueError:
+            self._discard(partial, state_path)
+            raise
+        state_path.unlink(missing_ok=True)
+
+        if progress_callback:
+            progress_callback({"phase": "done", "bytes_written": blob["size"]})
+        logger.info(
+            f"Fetched {url}: {blob['size']} bytes, {segments} segment(s), {resumed} resumed"
+        )
+        return {
+            **blob,
+            "url": url,
+            "filename": filename,
+            "segments": segments,
+            "resumed_bytes": resumed,
+        }
+
+    @staticmethod
+    def validate_url(url: str, allowed_hosts: Iterable[str] = (), resolve: bool = True) -> None:
+        """Vérifie qu'une URL peut être téléchargée côté serveur.
+
+        L'hôte doit résoudre uniquement vers des adresses publiques (ni
+        loopback, ni privée, ni lien local, ni réservée, ni multicast), sauf
+        s'il figure dans allowed_hosts.
+
+        Args:
+            url: URL à vérifier.
+            allowed_hosts: Hôtes acceptés sans contrôle d'adresse.
+            resolve: Si False, aucune résolution DNS : seuls le schéma, les
+                adresses IP littérales et localhost sont contrôlés (contrôle
+                préalable ; le téléchargement revalide avec résolution).
+
+        Raises:
+            UnsafeURLError: Si l'URL est refusée.
+        """
+        parsed = urlparse(url)
+        host = (parsed.hostname or "").lower()
+        if parsed.scheme not in ("http", "https") or not host:
+            raise UnsafeURLError(f"URL non supportée: {url}")
+        if host in {allowed.lower() for allowed in allowed_hosts}:
+            return
+        if not resolve:
+            if host == "localhost" or host.endswith(".localhost"):
+                raise UnsafeURLError(f"Adresse non publique refusée: {host}")
+            try:
+                address = ipaddress.ip_address(host)
+            except ValueError:
+                return  # Nom d'hôte : contrôlé à la résolution, au téléchargement
+            _check_public_address(host, address)
+            return
+        try:
+            infos = socket.getaddrinfo(host, parsed.port, proto=socket.IPPROTO_TCP)
+        except (socket.gaierror, UnicodeError) as e:
+            raise UnsafeURLError(f"Hôte introuvable: {host}") from e
+        for info in infos:
+            _check_public_address(host, ipaddress.ip_address(str(info[4][0]).split("%", 1)[0]))
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Envoie une requête en suivant les redirections, chacune revalidée.
+
+        Args:
+            method: Méthode HTTP (HEAD, GET).
+            url: URL de départ.
+            **kwargs: Arguments de requests.Session.request (headers, stream...).
+
+        Returns:
+            Réponse finale (response.url : URL après redirections).
+
+        Raises:
+            UnsafeURLError: Si une redirection mène vers un hôte non public.
+            requests.TooManyRedirects: Au-delà de MAX_REDIRECTS redirections.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            self.validate_url(url, self.allowed_hosts)
+            response = self.session.request(
+                method, url, allow_redirects=False, timeout=self.timeout, **kwargs
+            )
+            if not response.is_redirect:
+                return response
+            url = urljoin(url, response.headers["Location"])
+            response.close()
+        raise requests.TooManyRedirects(f"Plus de {MAX_REDIRECTS} redirections")
+
+    def _probe(self, url: str) -> dict[str, Any]:
+        """Détermine taille, support des plages et validateur de la ressource.
+
+        Args:
+            url: URL de la source.
+
+        Returns:
+            Dictionnaire {url (après redirections), size, ranges, validator}.
+
+        Raises:
+            requests.RequestException: Si la ressource est inaccessible.
+        """
+        response = self._request("HEAD", url)
+        headers = response.headers
+        if response.ok and headers.get("Content-Length"):
+            return {
+                "url": response.url,
+                "size": int(headers["Content-Length"]),
+                "ranges": headers.get("Accept-Ranges", "").lower() == "bytes",
+                "validator": headers.get("ETag") or headers.get("Last-Modified"),
+            }
+
+        # HEAD refusé ou sans taille : sonde par un GET d'un seul octet
+        with self._request("GET", url, headers={"Range": "bytes=0-0"}, stream=True) as response:
+            response.raise_for_status()
+            match = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+            ranges = response.status_code == HTTP_PARTIAL_CONTENT and match is not None
+            length = response.headers.get("Content-Length")
+            return {
+                "url": response.url,
+                "size": int(match.group(1)) if ranges else (int(length) if length else None),
+                "ranges": ranges,
+                "validator": response.headers.get("ETag") or response.headers.get("Last-Modified"),
+            }
+
+    def _download_ranged(
+        self,
+        probe: dict[str, Any],
+        partial: Path,
+        state_path: Path,
+        filename: str,
+        progress_callback: Callable[[dict[str, Any]], None] | None,
+    ) -> tuple[int, int]:
+        """Télécharge les segments restants en parallèle.
+
+        Args:
+            probe: Résultat de _probe().
+            partial: Fichier partiel préalloué.
+            state_path: État de reprise (JSON).
+            filename: Nom affiché dans la progression.
+            progress_callback: Callback de progression (optionnel).
+
+        Returns:
+            Tuple (nombre de segments, octets repris d'un téléchargement antérieur).
+        """
+        size = probe["size"]
+        state = self._load_state(state_path, probe)
+        if state is None or not partial.exists():
+            count = min(self.segments, max(1, math.ceil(size / self.min_segment_size)))
+            bounds = [size * index // count for index in range(count + 1)]
+            state = {
+                "url": probe["url"],
+                "size": size,
+                "validator": probe["validator"],
+                "segments": [
+                    {"start": bounds[i], "end": bounds[i + 1] - 1, "done": 0} for i in range(count)
+                ],
+            }
+            with partial.open("wb") as f:
+                f.truncate(size)
+        segments = state["segments"]
+        resumed = sum(segment["done"] for segment in segments)
+        pending = [s for s in segments if s["done"] < s["end"] - s["start"] + 1]
+
+        fd = os.open(partial, os.O_WRONLY)
+        stop = threading.Event()
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, len(pending))) as pool:
+                futures = [
+                    pool.submit(self._fetch_segment, probe, fd, segment, stop)
+                    for segment in pending
+                ]
+                remaining = set(futures)
+                while remaining:
+                    done, remaining = wait(
+                        remaining, timeout=STATE_FLUSH_INTERVAL, return_when=FIRST_EXCEPTION
+                    )
+                    self._save_state(state_path, state)
+                    if progress_callback:
+                        progress_callback(
+                            {
+                                "phase": "fetch",
+                                "bytes_read": sum(segment["done"] for segment in segments),
+                                "bytes_total": size,
+                                "member": filename,
+                            }
+                        )
+                    if any(future.exception() for future in done):
+                        stop.set()
+                for future in futures:
+                    future.result()
+        except RangeNotHonouredError:
+            # Ressource modifiée depuis le début du téléchargement : repartir de zéro
+            self._discard(partial, state_path)
+            raise
+        finally:
+            os.close(fd)
+            if state_path.exists() or partial.exists():
+                self._save_state(state_path, state)
+        return len(segments), resumed
+
+    def _fetch_segment(
+        self, probe: dict[str, Any], fd: int, segment: dict[str, int], stop: threading.Event
+    ) -> None:
+        """Télécharge un segment, avec reprise à l'octet près après erreur réseau.
+
+        Args:
+            probe: Résultat de _probe() (URL, validateur).
+            fd: Descripteur du fichier partiel (écritures positionnelles).
+            segment: {"start", "end" (inclus), "done"}, mis à jour en place.
+            stop: Événement d'arrêt (échec d'un autre segment).
+
+        Raises:
+            RangeNotHonouredError: Si le serveur ignore la plage (réponse 200).
+            requests.RequestException: Après `retries` tentatives infructueuses.
+        """
+        failures = 0
+        end = segment["end"]
+        while segment["start"] + segment["done"] <= end and not stop.is_set():
+            offset = segment["start"] + segment["done"]
+            headers = {"Range": f"bytes={offset}-{end}", "Accept-Encoding": "identity"}
+            if probe["validator"]:
+                headers["If-Range"] = probe["validator"]
+            try:
+                with self._request("GET", probe["url"], headers=headers, stream=True) as response:
+                    response.raise_for_status()
+                    if response.status_code != HTTP_PARTIAL_CONTENT:
+                        raise RangeNotHonouredError(f"Plage ignorée par le serveur ({offset})")
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        if stop.is_set():
+                            return
+                        data = chunk[: end - offset + 1]
+                        _pwrite_all(fd, data, offset)
+                        offset += len(data)
+                        segment["done"] += len(data)
+                        if offset > end:
+                            break
+            except RangeNotHonouredError:
+                raise
+            except requests.RequestException:
+                failures += 1
+                if failures > self.retries:
+                    raise
+                logger.warning(f"Segment {segment['start']}-{end}: nouvelle tentative")
+            else:
+                if offset <= end:
+                    failures += 1
+                    if failures > self.retries:
+                        raise requests.ConnectionError(f"Segment tronqué à {offset}")
+
+    def _download_stream(
+        self,
+        url: str,
+        partial: Path,
+        filename: str,
+        progress_callback: Callable[[dict[str, Any]], None] | None,
+    ) -> int:
+        """Téléchargement séquentiel (serveur sans support des plages).
+
+        Args:
+            url: URL de la source.
+            partial: Fichier de destination (réécrit).
+            filename: Nom affiché dans la progression.
+            progress_callback: Callback de progression (optionnel).
+
+        Returns:
+            Nombre d'octets reçus.
+
+        Raises:
+            BlobTooLargeError: Si max_bytes est dépassé pendant le flux.
+        """
+        received = 0
+        with (
+            self._request(
+                "GET", url, headers={"Accept-Encoding": "identity"}, stream=True
+            ) as response,
+            partial.open("wb") as f,
+        ):
+            response.raise_for_status()
+            total = int(response.headers.get("Content-Length") or 0) or None
+            for chunk in response.iter_content(CHUNK_SIZE):
+                received += len(chunk)
+                if self.max_bytes is not None and received > self.max_bytes:
+                    raise BlobTooLargeError(self.max_bytes)
+                f.write(chunk)
+                if progress_callback:
+                    progress_callback(
+                        {
+                            "phase": "fetch",
+                            "bytes_read": received,
+                            "bytes_total": total,
+                            "member": filename,
+                        }
+                    )
+        return received
+
+    @staticmethod
+    def _load_state(state_path: Path, probe: dict[str, Any]) -> dict[str, Any] | None:
+        """Relit l'état de reprise s'il correspond à la même ressource.
+
+        Args:
+            state_path: Fichier d'état.
+            probe: Résultat de _probe().
+
+        Returns:
+            État, ou None si absent, illisible ou obsolète.
+        """
+        try:
+            state = json.loads(state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if state.get("size") != probe["size"] or state.get("validator") != probe["validator"]:
+            return None
+        return state
+
+    @staticmethod
+    def _save_state(state_path: Path, state: dict[str, Any]) -> None:
+        """Écrit l'état de reprise de manière atomique."""
+        temp = state_path.with_suffix(".json.tmp")
+        temp.write_text(json.dumps(state), encoding="utf-8")
+        temp.replace(state_path)
+
+    @staticmethod
+    def _discard(partial: Path, state_path: Path) -> None:
+        """Supprime le fichier partiel et son état."""
+        for path in (partial, state_path):
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+
+
+def _pwrite_all(fd: int, data: bytes, offset: int) -> None:
+    """Écrit tout le bloc à l'offset donné (os.pwrite peut écrire partiellement)."""
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
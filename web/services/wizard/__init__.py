@@ -0,0 +1,5 @@
+"""Services wizard - État des drafts du wizard de création de releases."""
+
+from web.services.wizard.draft_service import DraftConflictError, WizardDraftService
+
+__all__ = ["DraftConflictError", "WizardDraftService"]
@@ -0,0 +1,249 @@
+"""Service de gestion de l'état des drafts du wizard (table wizard_drafts).
+
+Chaque étape du wizard (upload, analyse, métadonnées, template, options)
+écrivait auparavant tout le document JSON release_metadata (analyse
+comprise) pour ne modifier que quelques clés. L'état du wizard est
+désormais porté par WizardDraft : une colonne typée par information, chaque
+étape ne met à jour que ses propres colonnes.
+
+Architecture :
+- Une ligne wizard_drafts par release en cours de création (créée à la
+  première étape, supprimée à la finalisation)
+- Écritures : UPDATE ciblé sur les colonnes de l'étape, version incrémentée
+  à chaque sauvegarde
+- Concurrence optimiste : le client peut fournir la version sur laquelle il
+  travaille (If-Match) ; une sauvegarde basée sur une version périmée est
+  rejetée (DraftConflictError) au lieu d'écraser l'autre onglet
+- Fusion des colonnes JSON (métadonnées enrichies, options) : lecture puis
+  UPDATE gardé par la version lue, rejoué en cas de course
+- Finalisation : release_metadata et config matérialisés en une seule
+  écriture à partir du draft
+
+Compatibilité : les drafts créés avant la table (état dans
+release_metadata) restent lisibles ; effective_metadata() superpose l'état
+du draft au document existant.
+
+Complexité : O(1) requêtes par étape (un SELECT, un UPDATE).
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from web.extensions import db
+from web.models import WizardDraft
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from web.models import Release
+
+logger = logging.getLogger(__name__)
+
+# Nombre de tentatives d'une fusion JSON en cas de sauvegarde concurrente
+MERGE_RETRIES = 3
+
+# Colonnes du draft reportées dans release_metadata (vue compatible)
+METADATA_FIELDS = ("file_url", "file_size", "original_filename", "sha256", "crc32")
+
+# Étape atteinte à la création du draft (étapes 1-3 : groupe, type, règle)
+INITIAL_STEP = 3
+
+
+class DraftConflictError(Exception):
+    """Exception levée lorsqu'une sauvegarde porte sur une version périmée du draft.
+
+    Exemple :
+        raise DraftConflictError(release_id=12, current_version=5)
+    """
+
+    def __init__(self, release_id: int, current_version: int) -> None:
+        """Initialise l'exception avec la version courante du draft.
+
+        Args:
+            release_id: Release du draft.
+            current_version: Version actuellement enregistrée.
+        """
+        self.release_id = release_id
+        self.current_version = current_version
+        super().__init__(
+            f"Draft of release {release_id} was modified concurrently "
+            f"(current version {current_version})"
+        )
+
+
+class WizardDraftService:
+    """Service de lecture et de sauvegarde de l'état du wizard.
+
+    Pièges potentiels :
+    - save_step() valide la transaction (commit) : les autres modifications
+      de la session (Release.file_path, job de rapatriement) sont enregistrées
+      dans la même transaction
+    - Les objets WizardDraft de la session sont expirés après chaque
+      sauvegarde (UPDATE hors unit of work)
+
+    Exemple d'utilisation :
+        service = WizardDraftService()
+        draft = service.save_step(release, 7, {"template_id": 1}, expected_version=4)
+        return {"draft_version": draft.version}, 200
+    """
+
+    def get_or_create(self, release: Release) -> WizardDraft:
+        """Retourne le draft de la release, créé si absent.
+
+        Un draft créé pour une release antérieure à la table reprend l'étape
+        enregistrée dans release_metadata["wizard_step"].
+
+        Args:
+            release: Release en cours de création.
+
+        Returns:
+            Instance de WizardDraft (persistée).
+        """
+        draft = db.session.scalar(select(WizardDraft).where(WizardDraft.release_id == release.id))
+        if draft is not None:
+            return draft
+
+        legacy_step = (release.release_metadata or {}).get("wizard_step")
+        draft = WizardDraft(release_id=release.id, step=int(legacy_step or INITIAL_STEP))
+        try:
+            with db.session.begin_nested():
+                db.session.add(draft)
+        except IntegrityError:
+            # Créé entre-temps par une requête concurrente
+            return db.session.scalars(
+                select(WizardDraft).where(WizardDraft.release_id == release.id)
+            ).one()
+        return draft
+
+    def save_step(
+        self,
+        release: Release,
+        step: int | None,
+        fields: dict[str, Any],
+        expected_version: int | None = None,
+        merge: Iterable[str] = (),
+    ) -> WizardDraft:
+        """Enregistre les colonnes d'une étape et incrémente la version.
+
+        Algorithme :
+        1. Chargement (ou création) du draft
+        2. Colonnes de fusion : valeur courante complétée par la nouvelle
+        3. UPDATE des seules colonnes de l'étape, gardé par la version
+           attendue (client) ou par la version lue (fusion)
+        4. Aucune ligne modifiée : conflit signalé si le client a fourni une
+           version, sinon la fusion est rejouée (MERGE_RETRIES tentatives)
+
+        Args:
+            release: Release du draft.
+            step: Étape atteinte (None : inchangée).
+            fields: Colonnes de l'étape et leurs valeurs.
+            expected_version: Version sur laquelle le client a travaillé.
+            merge: Colonnes JSON fusionnées avec leur valeur courante.
+
+        Returns:
+            Draft rechargé (version incrémentée).
+
+        Raises:
+            DraftConflictError: Si le draft a été modifié depuis expected_version
+                (ou si la fusion échoue MERGE_RETRIES fois).
+        """
+        merge = tuple(merge)
+        for _attempt in range(MERGE_RETRIES):
+            draft = self.get_or_create(release)
+            values = dict(fields)
+            for column in merge:
+                values[column] = {**(getattr(draft, column) or {}), **(fields.get(column) or {})}
+            if step is not None:
+                values["step"] = step
+
+            guard = expected_version if expected_version is not None else draft.version
+            statement = update(WizardDraft).where(WizardDraft.id == draft.id)
+            if expected_version is not None or merge:
+                statement = statement.where(WizardDraft.version == guard)
+            result = db.session.execute(
+                statement.values(
+                    **values,
+                    version=WizardDraft.version + 1,
+                    updated_at=datetime.now(UTC),
+                ).execution_options(synchronize_session=False)
+            )
+            if result.rowcount:
+                db.session.commit()
+                return draft  # expiré par le commit, rechargé à l'accès
+
+            db.session.expire(draft)
+            if expected_version is not None:
+                db.session.rollback()
+                raise DraftConflictError(release.id, self.current_version(release))
+
+        db.session.rollback()
+        raise DraftConflictError(release.id, self.current_version(release))
+
+    def current_version(self, release: Release) -> int:
+        """Retourne la version enregistrée du draft (0 si absent)."""
+        version = db.session.scalar(
+            select(WizardDraft.version).where(WizardDraft.release_id == release.id)
+        )
+        return int(version or 0)
+
+    def effective_metadata(self, release: Release) -> dict[str, Any]:
+        """Construit la vue release_metadata du draft (format historique).
+
+        Le document existant de la release est complété par l'état du draft :
+        métadonnées enrichies, informations du fichier, wizard_step, analyse et
+        template.
+
+        Args:
+            release: Release du draft.
+
+        Returns:
+            Dictionnaire au format release_metadata.
+        """
+        metadata = dict(release.release_metadata or {})
+        draft = db.session.scalar(select(WizardDraft).where(WizardDraft.release_id == release.id))
+        if draft is None:
+            return metadata
+
+        metadata.update(draft.enriched_metadata or {})
+        metadata.update(
+            {field: getattr(draft, field) for field in METADATA_FIELDS if getattr(draft, field)}
+        )
+        metadata["wizard_step"] = draft.step
+        if draft.analysis is not None:
+            metadata["analysis"] = draft.analysis
+        if draft.template_id is not None:
+            metadata["template_id"] = draft.template_id
+        return metadata
+
+    def effective_options(self, release: Release) -> dict[str, Any]:
+        """Retourne la configuration de la release complétée par les options du draft."""
+        draft = db.session.scalar(select(WizardDraft).where(WizardDraft.release_id == release.id))
+        return {**(release.config or {}), **((draft.options if draft else None) or {})}
+
+    def finalize(self, release: Release, extra_metadata: dict[str, Any]) -> dict[str, Any]:
+        """Matérialise le draft dans la release et supprime le draft.
+
+        release_metadata et config sont écrits une seule fois, à la
+        finalisation. La transaction n'est pas validée (commit à la charge de
+        l'appelant, avec les autres modifications de la finalisation).
+
+        Args:
+            release: Release finalisée.
+            extra_metadata: Clés ajoutées à release_metadata (étape 9).
+
+        Returns:
+            release_metadata final.
+        """
+        metadata = {**self.effective_metadata(release), **extra_metadata}
+        release.config = self.effective_options(release)
+        release.release_metadata = metadata
+        draft = db.session.scalar(select(WizardDraft).where(WizardDraft.release_id == release.id))
+        if draft is not None:
+            db.session.delete(draft)
+        return metadata
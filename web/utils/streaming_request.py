@@ -0,0 +1,50 @@
+"""Request class letting a view choose where multipart file parts are written."""
+
+from __future__ import annotations
+
+from typing import IO, TYPE_CHECKING
+
+from flask import Request
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class StreamingRequest(Request):
+    """Flask request whose multipart file stream factory can be set per request.
+
+    By default Werkzeug spools every file part into a ``SpooledTemporaryFile``;
+    a view that sets ``file_stream_factory`` before touching ``request.files``
+    receives the parts in its own writable objects instead (e.g. straight into
+    the upload store), so large uploads are written to disk exactly once.
+    """
+
+    file_stream_factory: (
+        Callable[[int | None, str | None, str | None, int | None], IO[bytes]] | None
+    ) = None
+
+    def _get_file_stream(
+        self,
+        total_content_length: int | None,
+        content_type: str | None,
+        filename: str | None = None,
+        content_length: int | None = None,
+    ) -> IO[bytes]:
+        """Return the container for one uploaded file part.
+
+        Args:
+            total_content_length: Length of the whole request body.
+            content_type: Mimetype of the part.
+            filename: Client filename of the part.
+            content_length: Length of the part, when the client sent one.
+
+        Returns:
+            Writable, seekable file-like object.
+        """
+        if self.file_stream_factory is not None:
+            return self.file_stream_factory(
+                total_content_length, content_type, filename, content_length
+            )
+        return super()._get_file_stream(
+            total_content_length, content_type, filename, content_length
+        )